@@ -0,0 +1,57 @@
+"""Benchmark the import time of the ``abaqus`` package with and without the lazy import mode, and of ``abqpy``.
+
+Each measurement runs ``from abaqus import *`` or ``import abqpy`` in a fresh interpreter, usage::
+
+    python benchmarks/import_time.py [--repeat 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+SNIPPET = """
+import sys, time
+start = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - start
+print(elapsed, len([name for name in sys.modules if name.split(".")[0] == "{package}"]))
+"""
+
+
+def measure(lazy: bool, repeat: int, statement: str = "from abaqus import *") -> tuple[list[float], int]:
+    """Measure the import time in seconds and the number of modules imported from the imported package."""
+    env = dict(os.environ, ABQPY_SKIP_ABAQUS="true", ABQPY_LAZY_IMPORT=str(lazy).lower())
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(SRC), env.get("PYTHONPATH")]))
+    snippet = SNIPPET.format(statement=statement, package=statement.split()[1])
+    times, modules = [], 0
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, "-c", snippet], env=env, capture_output=True, text=True, check=True)
+        elapsed, modules = output.stdout.split()
+        times.append(float(elapsed))
+    return times, int(modules)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="number of fresh interpreters per mode")
+    args = parser.parse_args()
+
+    results = {mode: measure(mode == "lazy", args.repeat) for mode in ("eager", "lazy")}
+    print(f"{'mode':<8}{'median [ms]':>14}{'min [ms]':>12}{'modules':>10}")
+    for mode, (times, modules) in results.items():
+        print(f"{mode:<8}{statistics.median(times) * 1e3:>14.1f}{min(times) * 1e3:>12.1f}{modules:>10}")
+    eager, lazy = (statistics.median(results[mode][0]) for mode in ("eager", "lazy"))
+    print(f"\nLazy import saves {(eager - lazy) * 1e3:.1f} ms ({(1 - lazy / eager) * 100:.0f}%) per import.")
+
+    times, modules = measure(False, args.repeat, "import abqpy")
+    print(f"\n{'import abqpy':<20}{statistics.median(times) * 1e3:>10.1f} ms median{modules:>6} modules")
+
+
+if __name__ == "__main__":
+    main()
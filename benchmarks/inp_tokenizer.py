@@ -0,0 +1,70 @@
+"""Benchmark the throughput of ``InputFile.parse`` on bulk ``*NODE`` and ``*ELEMENT`` data.
+
+A synthetic input file is parsed line by line (without numpy), with the vectorized numpy tokenizer and with the
+vectorized tokenizer in a process pool of an increasing number of workers, usage::
+
+    python benchmarks/inp_tokenizer.py [--nodes 1000000] [--workers 1 2 4 8] [--repeat 3]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+
+
+def write_deck(path: Path, nodes: int):
+    """Write an input file with **nodes** nodes and as many C3D8 elements."""
+    with open(path, "w") as f:
+        f.write("*NODE\n")
+        f.writelines(f"{i}, {i * 0.1:.6f}, {i * 0.2:.6f}, {i * 0.3:.6f}\n" for i in range(1, nodes + 1))
+        f.write("*ELEMENT, TYPE=C3D8\n")
+        f.writelines(f"{i}, {', '.join(str(i + j) for j in range(8))}\n" for i in range(1, nodes + 1))
+
+
+def measure(path: Path, repeat: int, vectorized: bool, workers: int) -> float:
+    """The median parse time in seconds."""
+    from concurrent.futures import ProcessPoolExecutor
+
+    from inpParser import InputFile
+
+    times = []
+    for _ in range(repeat):
+        executor = ProcessPoolExecutor(workers) if workers > 1 else None
+        start = time.perf_counter()
+        InputFile(path.name, str(path.parent))._parse(str(path), False, True, True, None, vectorized, executor)
+        if executor is not None:
+            executor.shutdown()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--nodes", type=int, default=1_000_000, help="number of nodes and elements")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8], help="process pool sizes")
+    parser.add_argument("--repeat", type=int, default=3, help="number of parses per mode")
+    args = parser.parse_args()
+
+    os.environ["ABQPY_SKIP_ABAQUS"] = "true"
+    sys.path.insert(0, str(SRC))
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "bulk.inp"
+        write_deck(path, args.nodes)
+        size = path.stat().st_size / 1e6
+        print(f"{size:.1f} MB, {os.cpu_count()} CPUs\n")
+        print(f"{'mode':<16}{'median [s]':>12}{'MB/s':>10}")
+        modes = [("line by line", False, 0)] + [(f"numpy x {n}", True, n) for n in args.workers]
+        for mode, vectorized, workers in modes:
+            elapsed = measure(path, args.repeat, vectorized, workers)
+            print(f"{mode:<16}{elapsed:>12.2f}{size / elapsed:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Benchmark the vectorized invariants of ``abqpy.invariants`` against a computation one value at a time.
+
+Random ``TENSOR_3D_FULL`` stresses are reduced to each invariant with the vectorized kernels, and a sample of them
+one value at a time as a loop over ``FieldValue`` objects would, usage::
+
+    python benchmarks/invariants.py [--values 1000000] [--sample 10000] [--repeat 3]
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+LABELS = ("S11", "S22", "S33", "S12", "S13", "S23")
+INVARIANTS = ("MISES", "TRESCA", "PRESS", "INV3", "MAX_PRINCIPAL")
+
+
+def per_value(name: str, data: np.ndarray) -> list:
+    """The invariant of each value, computed one at a time."""
+    result = []
+    for s11, s22, s33, s12, s13, s23 in data.tolist():
+        tensor = np.array([[s11, s12, s13], [s12, s22, s23], [s13, s23, s33]])
+        deviator = tensor - np.trace(tensor) / 3 * np.eye(3)
+        if name == "MISES":
+            result.append(np.sqrt(1.5 * np.sum(deviator * deviator)))
+        elif name == "PRESS":
+            result.append(-np.trace(tensor) / 3)
+        elif name == "INV3":
+            result.append(np.cbrt(4.5 * np.trace(deviator @ deviator @ deviator)))
+        else:
+            principals = np.linalg.eigvalsh(tensor)
+            result.append(principals[2] - principals[0] if name == "TRESCA" else principals[2])
+    return result
+
+
+def measure(function, repeat: int) -> float:
+    """The median time of a function in seconds."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--values", type=int, default=1_000_000, help="number of values of the vectorized kernels")
+    parser.add_argument("--sample", type=int, default=10_000, help="number of values computed one at a time")
+    parser.add_argument("--repeat", type=int, default=3, help="number of runs per invariant")
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(SRC))
+    from abqpy.invariants import invariant
+
+    data = np.random.RandomState(0).uniform(-100, 100, (args.values, 6)).astype("f4")
+    sample = data[: args.sample]
+    print(f"{args.values} values, {args.sample} computed one at a time\n")
+    print(f"{'invariant':<16}{'per value [M/s]':>16}{'vectorized [M/s]':>18}{'speedup':>10}")
+    for name in INVARIANTS:
+        assert np.allclose(invariant(name, sample, LABELS, "TENSOR_3D_FULL"), per_value(name, sample), atol=1e-6)
+        slow = len(sample) / measure(lambda: per_value(name, sample), 1) / 1e6
+        fast = len(data) / measure(lambda: invariant(name, data, LABELS, "TENSOR_3D_FULL"), args.repeat) / 1e6
+        print(f"{name:<16}{slow:>16.3f}{fast:>18.1f}{fast / slow:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,7 +7,7 @@ Script to build the compression model for the parameter identification
 The optimize script of this example can be found :doc:`here <optimize>`.
 """
 
-# run with: python compression.py 1000,0.2
+# run with: python compression.py 1000,0.2 (or with the E=1000 mu=0.2 parameters of a job farm case)
 
 import numpy as np
 
@@ -108,5 +108,6 @@ def run(modulus, poisson=0.2):
 
 
 if __name__ == "__main__":
-    E, mu = sys.argv[-1].split(",")
+    parameters = dict(arg.split("=", 1) for arg in sys.argv if "=" in arg)
+    E, mu = (parameters["E"], parameters["mu"]) if "E" in parameters else sys.argv[-1].split(",")
     run(float(E), float(mu))
@@ -41,27 +41,31 @@ import os
 import numpy as np
 import pandas as pd
 
+from abqpy.farm import Case, CaseResult, JobFarm
 
-def fitness(x: float, maxdisp_expected: float = -0.1):
-    # Change the working directory to a new folder
-    wd = os.path.join(os.path.dirname(__file__), f"Job-E={x}")
-    os.makedirs(wd, exist_ok=True)
-    os.chdir(wd)
 
-    # Run the model and read the output, the additional argument can be read by the Abaqus/Python script
-    os.system(f"python ../compression.py {x},0.2")
-
-    # Read the output and calculate the fitness
-    data = pd.read_csv("data.csv")
+def fitness(result: CaseResult, maxdisp_expected: float = -0.1):
+    # Read the output of a model and calculate the fitness, the failed models get the worst fitness
+    path = os.path.join(result.directory, "data.csv")
+    if result.error or result.returncode != 0 or not os.path.isfile(path):
+        print(f"{result.case.name} failed, see the log files in {result.directory}")
+        return np.inf
+    data = pd.read_csv(path)
     maxdisp = data["U3"].iloc[-1]
     return abs(maxdisp - maxdisp_expected)
 
 
 def grid_search(search_space: list[float], expected: float):
-    fs = []
-    for x in search_space:
-        print(f"Running model for E={x}")
-        fs.append(fitness(x, expected))
+    # Run the models in parallel, each one in its own folder, the parameters can be read by the Abaqus/Python script
+    script = os.path.join(os.path.dirname(__file__), "compression.py")
+    cases = [Case(f"Job-E={x}", script, {"E": x, "mu": 0.2}) for x in search_space]
+    farm = JobFarm(cases, directory=os.path.join(os.path.dirname(__file__), "farm"))
+    results = farm.run()
+    print(results)
+
+    fs = [fitness(result, expected) for result in results.results]
+    if np.isinf(fs).all():
+        raise RuntimeError(f"All the models failed, see the log files in {farm.directory}")
     argmin = np.argmin(fs)
     best = search_space[argmin]
     print("Search results:", pd.DataFrame({"modulus": search_space, "fitness": fs}), sep="\n")
@@ -1,10 +1,17 @@
 from __future__ import annotations
 
+from array import array
+
 from abqpy.decorators import abaqus_class_doc
 
+try:
+    from numpy import ndarray
+except ImportError:  # numpy is an optional dependency, only required for usePyArray=True
+    ndarray = object  # type: ignore
+
 
 @abaqus_class_doc
-class AbaqusNDarray:
+class AbaqusNDarray(ndarray):  # type: ignore
     """The AbaqusNDarray object is a sequence object derived from numpy.ndarray and is used to store numeric
     keyword data from an Abaqus input file. This object is similar to the numpy.ndarray object, but the numeric
     elements are returned as standard Python objects, not numpy numeric types. The numeric elements can be:
@@ -14,7 +21,152 @@ class AbaqusNDarray:
     - First column int, all other columns floats.
 
     In the last of these cases, the member **colZeroIsInt** will be True; in the other two
-    cases, it will be False.
+    cases, it will be False. The ints of the first column are then also stored as a separate array of ints, see
+    **labels**.
+
+    The arrays returned by InputFile.parse() are writable, except those loaded from the parse cache (see
+    :envvar:`ABQPY_INP_CACHE_DIR`), which are read-only views of memory-mapped files.
     """
 
-    ...
+    #: A Boolean specifying whether the first column holds ints and all other columns floats.
+    colZeroIsInt: bool = False
+
+    #: The ints of the first column of float data with **colZeroIsInt**, None if they are not split (yet).
+    _labels = None
+
+    @classmethod
+    def fromBuffer(cls, buffer: array, width: int, colZeroIsInt: bool = False) -> AbaqusNDarray:
+        """Create an AbaqusNDarray object from a row-major buffer of numeric keyword data.
+
+        The buffer is not copied, the AbaqusNDarray object is a view of it.
+
+        Parameters
+        ----------
+        buffer
+            An ``array.array`` of ints (typecode ``q``) or floats (typecode ``d``).
+        width
+            An Int specifying the number of values per row.
+        colZeroIsInt
+            A Boolean specifying whether the first column of a float buffer holds ints.
+
+        Returns
+        -------
+        AbaqusNDarray
+            An AbaqusNDarray object with shape (len(buffer) // width, width).
+        """
+        import numpy as np
+
+        dtype = np.int64 if buffer.typecode == "q" else np.float64
+        return cls.fromArray(np.frombuffer(buffer, dtype=dtype).reshape(-1, width), colZeroIsInt)
+
+    @classmethod
+    def fromArray(cls, values: ndarray, colZeroIsInt: bool = False) -> AbaqusNDarray:
+        """Create an AbaqusNDarray object viewing a two-dimensional numpy.ndarray of ints or floats.
+
+        The ints of the first column of float data with **colZeroIsInt** are copied once into a separate array of
+        ints, see **labels**.
+
+        Parameters
+        ----------
+        values
+            A two-dimensional numpy.ndarray of ints or floats.
+        colZeroIsInt
+            A Boolean specifying whether the first column of float data holds ints.
+
+        Returns
+        -------
+        AbaqusNDarray
+            An AbaqusNDarray object with the shape of the values.
+        """
+        import numpy as np
+
+        self = values.view(cls)
+        self.colZeroIsInt = colZeroIsInt and values.dtype.kind == "f"
+        if self.colZeroIsInt and self.ndim == 2:
+            self._labels = np.asarray(values)[:, 0].astype(np.int64)
+        return self
+
+    def __array_finalize__(self, obj):
+        self.colZeroIsInt = getattr(obj, "colZeroIsInt", False)
+        self._labels = None
+
+    @property
+    def labels(self) -> ndarray:
+        """The first column as a numpy.ndarray of ints, e.g., the node or element labels.
+
+        Only available for two-dimensional arrays. The labels of int data are a view of the first column. Those of
+        float data with **colZeroIsInt** are a separate array of ints, made when the object is created (or on the
+        first access for an array derived from another one), kept up to date by item assignments and returned on
+        each access. The labels are converted from floats, they are exact up to 2**53, well above the 32-bit
+        labels of Abaqus. So the labels and the float columns (see **values**) can be used separately without
+        boxing the values into Python objects.
+        """
+        import numpy as np
+
+        if self.ndim != 2:
+            raise ValueError("labels are only available for two-dimensional arrays")
+        column = np.asarray(self)[:, 0]
+        if column.dtype == np.int64:
+            return column
+        if self._labels is None:
+            self._labels = column.astype(np.int64)
+        return self._labels
+
+    @property
+    def values(self) -> ndarray:
+        """The columns after the first one as a numpy.ndarray view, e.g., the node coordinates.
+
+        Only available for two-dimensional arrays.
+        """
+        if self.ndim != 2:
+            raise ValueError("values are only available for two-dimensional arrays")
+        return self.view(ndarray)[:, 1:]
+
+    def _isColZero(self, key) -> bool:
+        """Whether the scalar selected by **key** lies in the first column."""
+        if self.ndim == 1:
+            return isinstance(key, int) and key in (0, -self.shape[0])
+        return isinstance(key, tuple) and len(key) == 2 and isinstance(key[1], int) and key[1] in (0, -self.shape[1])
+
+    def _keepsColZero(self, key) -> bool:
+        """Whether the first column of the array selected by **key** is the first column of this array."""
+        column = key if self.ndim == 1 else key[1] if isinstance(key, tuple) and len(key) == 2 else slice(None)
+        return isinstance(column, slice) and column.start in (None, 0) and column.step in (None, 1)
+
+    def __getitem__(self, key):
+        item = super().__getitem__(key)
+        if isinstance(item, ndarray):
+            if self.colZeroIsInt and not self._keepsColZero(key):
+                item.colZeroIsInt = False
+            elif self._labels is not None and item.ndim == 2:
+                # The labels of the selected rows, a view of the labels of this array for a slice
+                item._labels = self._labels[key[0] if isinstance(key, tuple) else key]
+            return item
+        if self.colZeroIsInt and self._isColZero(key):
+            return int(item)
+        return item.item()
+
+    def __setitem__(self, key, value):
+        import numpy as np
+
+        super().__setitem__(key, value)
+        labels = self._labels
+        if labels is not None:
+            rows = key[0] if isinstance(key, tuple) else key
+            try:
+                labels[rows] = np.asarray(self)[rows, 0]
+            except (IndexError, ValueError):
+                labels[:] = np.asarray(self)[:, 0]
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def tolist(self):
+        rows = super().tolist()
+        if self.colZeroIsInt:
+            if self.ndim == 2:
+                return [[int(row[0])] + row[1:] for row in rows]
+            if self.ndim == 1 and rows:
+                return [int(rows[0])] + rows[1:]
+        return rows
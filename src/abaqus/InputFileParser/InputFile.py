@@ -1,8 +1,82 @@
 from __future__ import annotations
 
+import importlib.util
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Dict, Iterator, List, Tuple
+
+from abqpy.config import config
 from abqpy.decorators import abaqus_class_doc, abaqus_method_doc
 
 from ..UtilityAndView.abaqusConstants import Boolean
+from ._DataBlock import _DataBlock, _split
+from ._ParseCache import _CacheWriter, _ParseCache
+from .Keyword import Keyword
+from .KeywordSequence import KeywordSequence
+
+#: Keywords whose data is bulk data, skipped if InputFile.parse() is called with bulk=False.
+BULK_KEYWORDS = frozenset({"NODE", "ELEMENT", "NSET", "ELSET"})
+
+#: Keywords whose data lines are continued on the next line if they end with a comma.
+CONTINUED_KEYWORDS = frozenset({"ELEMENT"})
+
+#: Keywords that open a block closed by the corresponding ``*END ...`` keyword.
+BLOCK_KEYWORDS = frozenset({"PART", "ASSEMBLY", "INSTANCE", "STEP"})
+
+#: Keywords that are suboptions of the preceding ``*MATERIAL`` keyword.
+MATERIAL_KEYWORDS = frozenset(
+    {
+        "CONDUCTIVITY",
+        "CREEP",
+        "DAMPING",
+        "DENSITY",
+        "DEPVAR",
+        "DRUCKER PRAGER",
+        "ELASTIC",
+        "EXPANSION",
+        "HYPERELASTIC",
+        "HYPERFOAM",
+        "LATENT HEAT",
+        "PLASTIC",
+        "SPECIFIC HEAT",
+        "USER MATERIAL",
+        "VISCOELASTIC",
+    }
+)
+
+
+def _parse_keyword_line(line: str) -> Tuple[str, Dict[str, str]]:
+    """Split a keyword line, without the leading ``*``, into the keyword name and its parameters."""
+    fields = _split(line)
+    parameter = {}
+    for field in fields[1:]:
+        key, _, value = field.partition("=")
+        key = " ".join(key.split()).lower()
+        if key:
+            parameter[key] = value.strip().strip('"')
+    return " ".join(fields[0].split()), parameter
+
+
+def _readData(path: str, offset: int, usePyArray: Boolean = False):
+    """Read the data of the keyword whose keyword line starts at the given byte offset of an input file."""
+    lines = InputFile._raw_lines(path, offset)
+    _, line = next(lines, (offset, ""))
+    if not line.startswith("*") or line.startswith("**"):
+        raise ValueError(f"There is no keyword line at byte offset {offset} of {path}")
+    upper = _parse_keyword_line(line[1:])[0].upper()
+    vectorized = upper in BULK_KEYWORDS and importlib.util.find_spec("numpy") is not None
+    block = _DataBlock(upper in CONTINUED_KEYWORDS, vectorized)
+    continued = line.endswith(",")
+    for _, line in lines:
+        if line.startswith("*"):
+            if not line.startswith("**"):
+                break
+            continued = False
+        elif continued:
+            continued = line.endswith(",")
+        else:
+            block.addLine(line)
+    return block.data(usePyArray)
 
 
 @abaqus_class_doc
@@ -51,7 +125,14 @@ class InputFile:
         InputFile
             An InputFile object.
         """
-        ...
+        self.file = file
+        self.directory = directory
+        self.includes = ()
+        self.missingIncludes = ()
+        self._parsed = False
+
+        #: The real paths of the files being read, from the main file to the innermost include.
+        self._openFiles: List[str] = []
 
     @abaqus_method_doc
     def parse(
@@ -90,6 +171,190 @@ class InputFile:
         ------
         ValueError
             If you parse an input file more than once, a ValueError is raised for each subsequent
-            parsing.
+            parsing. A ValueError is also raised if an input file includes itself, directly or through
+            other included files.
+        """
+        if self._parsed:
+            raise ValueError(f"The input file {self.file} has already been parsed")
+        self._parsed = True
+        self._includes: List[str] = []
+        self._includeFiles: List[str] = []
+        self._missingIncludes: List[str] = []
+        self._missingFiles: List[str] = []
+
+        path = os.path.join(self.directory, self.file)
+        cache, writer = _ParseCache.fromConfig(), None
+        if cache is not None:
+            key = cache.key(path, bulk)
+            cached = cache.load(key, usePyArray)
+            if cached is not None:
+                keywords, includes, missingIncludes = cached
+                self.includes, self.missingIncludes = tuple(includes), tuple(missingIncludes)
+                return self._finish(keywords, organize)
+            writer = cache.writer(key)
+
+        vectorized = importlib.util.find_spec("numpy") is not None
+        executor = (
+            ProcessPoolExecutor(config.inp_parse_workers) if vectorized and config.inp_parse_workers > 1 else None
+        )
+        try:
+            keywords = self._parse(path, verbose, bulk, usePyArray, writer, vectorized, executor)
+        except BaseException:
+            if writer is not None:
+                writer.discard()
+            raise
+        finally:
+            if executor is not None:
+                executor.shutdown()
+        self.includes = tuple(self._includes)
+        self.missingIncludes = tuple(self._missingIncludes)
+        if writer is not None:
+            files = [os.path.abspath(path), *self._includeFiles]
+            writer.commit(keywords, self.includes, files, self.missingIncludes, self._missingFiles)
+        return self._finish(keywords, organize)
+
+    @classmethod
+    def _finish(cls, keywords: KeywordSequence, organize: Boolean) -> KeywordSequence:
+        """Organize the keywords into suboptions if **organize** is True and index them for the lookups of
+        :meth:`KeywordSequence.find`."""
+        if organize:
+            keywords = cls._organize(keywords)
+        keywords._index()
+        return keywords
+
+    def _parse(
+        self,
+        path: str,
+        verbose: Boolean,
+        bulk: Boolean,
+        usePyArray: Boolean,
+        writer: _CacheWriter | None = None,
+        vectorized: bool = False,
+        executor: Executor | None = None,
+    ) -> KeywordSequence:
+        """Parse the input file into a flat sequence of keywords.
+
+        The data blocks are stored in the cache if a cache writer is given. The data lines of bulk keywords are
+        converted to numbers in chunks with numpy if **vectorized** is True, in parallel if an executor is given.
+        """
+        keywords = KeywordSequence()
+        comments: List[str] = []
+        keyword, block = None, None
+
+        def finish():
+            if writer is not None:
+                writer.add(len(keywords) - 1, block)
+            keyword.data = block.data(usePyArray)
+
+        for file, offset, line in self._lines(path, verbose):
+            if line.startswith("**"):
+                comments.append(line[2:].strip())
+            elif line.startswith("*"):
+                if keyword is not None and block is not None:
+                    finish()
+                name, parameter = _parse_keyword_line(line[1:])
+                keyword = Keyword(name, parameter, comments=comments, file=file, offset=offset)
+                keywords.append(keyword)
+                comments = []
+                upper = name.upper()
+                if upper in BULK_KEYWORDS:
+                    block = _DataBlock(upper in CONTINUED_KEYWORDS, vectorized, executor) if bulk else None
+                else:
+                    block = _DataBlock()
+            elif block is not None:
+                block.addLine(line)
+            elif keyword is None and verbose:
+                print(f"Data line before the first keyword ignored: {line}")
+        if keyword is not None:
+            if block is not None:
+                finish()
+            if comments:
+                keyword.comments += tuple(comments)
+        return keywords
+
+    def _lines(self, path: str, verbose: Boolean = False) -> Iterator[Tuple[str, int, str]]:
+        """Read an input file line by line, resolving the ``*INCLUDE`` keywords in place.
+
+        The file is streamed instead of read as a whole, blank lines are skipped and the keyword lines that are
+        continued on the next line (i.e., ending with a comma) are joined. Yields the absolute path of the file and
+        the byte offset of each line in it together with the line. The files being read are kept in a stack to
+        detect the include cycles.
+        """
+        path = os.path.abspath(path)
+        real = os.path.realpath(path)
+        if real in self._openFiles:
+            cycle = self._openFiles[self._openFiles.index(real) :] + [real]
+            raise ValueError(f"The input file {real} includes itself: {' -> '.join(cycle)}")
+        self._openFiles.append(real)
+        try:
+            keyword_line: Tuple[int, str] | None = None
+            for offset, line in self._raw_lines(path):
+                if keyword_line is not None:
+                    if not line.startswith("*") and keyword_line[1].endswith(","):
+                        keyword_line = keyword_line[0], keyword_line[1] + line
+                        continue
+                    yield from self._include(path, *keyword_line, verbose)
+                    keyword_line = None
+                if line.startswith("*") and not line.startswith("**"):
+                    keyword_line = offset, line
+                else:
+                    yield path, offset, line
+            if keyword_line is not None:
+                yield from self._include(path, *keyword_line, verbose)
+        finally:
+            self._openFiles.pop()
+
+    @staticmethod
+    def _raw_lines(path: str, offset: int = 0) -> Iterator[Tuple[int, str]]:
+        """Yield the byte offset and the stripped text of the non-blank lines of a file, from the given offset on."""
+        with open(path, "rb") as f:
+            f.seek(offset)
+            for raw in f:
+                line = raw.decode("utf-8", "replace").strip()
+                if line:
+                    yield offset, line
+                offset += len(raw)
+
+    def _include(self, path: str, offset: int, line: str, verbose: Boolean) -> Iterator[Tuple[str, int, str]]:
+        """Yield a keyword line, or the lines of the included file if it is an ``*INCLUDE`` keyword."""
+        name, parameter = _parse_keyword_line(line[1:])
+        if name.upper() != "INCLUDE" or "input" not in parameter:
+            yield path, offset, line
+            return
+        include = parameter["input"]
+        candidates = (os.path.join(os.path.dirname(path), include), os.path.join(self.directory, include))
+        for candidate in candidates:
+            if os.path.isfile(candidate):
+                self._includes.append(include)
+                self._includeFiles.append(os.path.abspath(candidate))
+                yield from self._lines(candidate, verbose)
+                return
+        self._missingIncludes.append(include)
+        self._missingFiles.extend(os.path.abspath(candidate) for candidate in candidates)
+        if verbose:
+            print(f"Included input file not found: {include}")
+
+    @staticmethod
+    def _organize(keywords: KeywordSequence) -> KeywordSequence:
+        """Organize a flat sequence of keywords into suboptions.
+
+        The keywords between a block keyword (e.g., ``*PART``) and its ``*END`` keyword, the latter included, become
+        the suboptions of the block keyword, and the material behaviors (e.g., ``*ELASTIC``) become the suboptions of
+        the preceding ``*MATERIAL`` keyword.
         """
-        ...
+        organized = KeywordSequence()
+        stack: List[Tuple[str, KeywordSequence]] = [("", organized)]
+        material = None
+        for keyword in keywords:
+            name = keyword.name.upper()
+            if name in MATERIAL_KEYWORDS and material is not None:
+                material.suboptions.append(keyword)
+                continue
+            material = keyword if name == "MATERIAL" else None
+            if name.startswith("END ") and name[4:].strip() == stack[-1][0]:
+                stack.pop()[1].append(keyword)
+                continue
+            stack[-1][1].append(keyword)
+            if name in BLOCK_KEYWORDS:
+                stack.append((name, keyword.suboptions))
+        return organized
@@ -1,9 +1,17 @@
 from __future__ import annotations
 
+from typing import TYPE_CHECKING, Dict, Sequence
+
 from abqpy.decorators import abaqus_class_doc
 
 from .AbaqusNDarray import AbaqusNDarray
 
+if TYPE_CHECKING:  # to avoid circular imports
+    from .KeywordSequence import KeywordSequence
+
+#: The attributes of a keyword that are indexed by :meth:`KeywordSequence.find` and :meth:`KeywordSequence.atOffset`.
+_INDEXED = ("name", "parameter", "suboptions", "file", "offset")
+
 
 @abaqus_class_doc
 class Keyword:
@@ -30,7 +38,80 @@ class Keyword:
     data: tuple[tuple[float, ...], ...] | AbaqusNDarray = ()
 
     #: A KeywordSequence specifying the suboptions of the keyword.
-    suboptions: str = ""
+    suboptions: KeywordSequence
 
     #: A sequence of Strings specifying the comments.
     comments: tuple[str, ...] = ()
+
+    #: A String specifying the absolute path of the input file the keyword is defined in.
+    file: str = ""
+
+    #: An Int specifying the byte offset of the keyword line in the input file, -1 if unknown.
+    offset: int = -1
+
+    #: The KeywordSequence the keyword was last added to, it is notified of the modifications of the keyword.
+    _parent: KeywordSequence | None = None
+
+    def __init__(
+        self,
+        name: str,
+        parameter: Dict[str, str] | None = None,
+        data: tuple[tuple[float, ...], ...] | AbaqusNDarray = (),
+        comments: Sequence[str] = (),
+        file: str = "",
+        offset: int = -1,
+    ):
+        from .KeywordSequence import KeywordSequence
+
+        self.name = name
+        self.parameter = {} if parameter is None else parameter
+        self.data = data
+        self.suboptions = KeywordSequence()
+        self.comments = tuple(comments)
+        self.file = file
+        self.offset = offset
+
+    def __setattr__(self, name: str, value):
+        if name == "suboptions":
+            value._owner = self
+        # The keyword indexes of the sequences that contain the keyword are stale once an indexed attribute is
+        # assigned again
+        if name in _INDEXED and name in self.__dict__:
+            self._modified()
+        super().__setattr__(name, value)
+
+    def _modified(self):
+        """Notify the sequence that contains the keyword, and in turn the sequences that contain it, of a
+        modification."""
+        if self._parent is not None:
+            self._parent._modified()
+
+    def readData(self, usePyArray: bool = False) -> tuple[tuple[float, ...], ...] | AbaqusNDarray:
+        """This method reads the data of the keyword from the input file again, starting at the byte offset of the
+        keyword line. It allows to parse an input file with bulk=False and to read the bulk data of single keywords
+        only when they are needed. The data is returned, not stored in the **data** member.
+
+        Parameters
+        ----------
+        usePyArray
+            A Boolean specifying whether numeric data is returned as an AbaqusNDarray object. The default is
+            False.
+
+        Returns
+        -------
+        tuple | AbaqusNDarray
+            The keyword data, as the **data** member.
+
+        Raises
+        ------
+        ValueError
+            If the byte offset of the keyword line is unknown or the keyword line is not found at it.
+        """
+        from .InputFile import _readData
+
+        if not self.file or self.offset < 0:
+            raise ValueError(f"The byte offset of the keyword {self.name} is unknown")
+        return _readData(self.file, self.offset, usePyArray)
+
+    def __repr__(self) -> str:
+        return f"Keyword(name={self.name!r}, parameter={self.parameter!r})"
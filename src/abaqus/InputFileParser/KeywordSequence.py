@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import os
+from typing import TYPE_CHECKING, Dict, Iterator, List, Tuple
+
+from abqpy.decorators import abaqus_class_doc
+
+if TYPE_CHECKING:  # to avoid circular imports
+    from .Keyword import Keyword
+
+
+def _keywordName(keyword: Keyword) -> str | None:
+    """The name of a keyword definition, i.e., its **name** parameter or, e.g., the **elset** parameter of an
+    ``*ELSET`` keyword."""
+    name = keyword.parameter.get("name", keyword.parameter.get(keyword.name.lower()))
+    return name.upper() if name else None
+
+
+@abaqus_class_doc
+class KeywordSequence(list):
+    """The KeywordSequence object is a sequence of Keyword objects. KeywordSequence objects are returned via the
+    InputFile.parse() method and as the **suboptions** of a Keyword object.
+
+    The keywords, including the suboptions, can be looked up by name, by the name of their definition and by their
+    byte offset in the input file without scanning the sequence, see :meth:`find`. The index is built by
+    InputFile.parse(), or on the first lookup, and rebuilt only after the sequence, the suboptions of its keywords, or
+    the name, parameters, suboptions, file or offset of one of its keywords are modified. A keyword notifies the
+    sequence it was last added to, and a sequence of suboptions notifies the sequence of its keyword. Changes made in
+    place to the **parameter** dictionary of a keyword are not tracked.
+
+    .. note::
+        This object can be accessed by::
+
+            import inpParser
+    """
+
+    #: The keywords indexed by name, by name and definition name and by byte offset, see :meth:`_index`, with the
+    #: version of the sequence when they were indexed.
+    _keywordIndex = None
+
+    #: The version of the sequence, incremented when the sequence, its keywords or their suboptions are modified.
+    _version = 0
+
+    #: The keyword whose suboptions the sequence is, None for the keywords of an input file.
+    _owner: Keyword | None = None
+
+    def _modified(self):
+        """Increment the version of the sequence and of the sequences that contain it."""
+        self._version += 1
+        if self._owner is not None:
+            self._owner._modified()
+
+    def _adopt(self, keywords) -> list:
+        """Make the sequence the parent of the keywords, which are returned as a list."""
+        keywords = list(keywords)
+        for keyword in keywords:
+            keyword._parent = self
+        self._modified()
+        return keywords
+
+    def __repr__(self) -> str:
+        return f"KeywordSequence({list.__repr__(self)})"
+
+    def walk(self) -> Iterator[Keyword]:
+        """Iterate over the keywords and, depth first, their suboptions.
+
+        Returns
+        -------
+        Iterator[Keyword]
+            An iterator of Keyword objects.
+        """
+        for keyword in self:
+            yield keyword
+            yield from keyword.suboptions.walk()
+
+    def _index(self):
+        """The keywords indexed by name, by name and definition name and by byte offset."""
+        if self._keywordIndex is None or self._keywordIndex[0] != self._version:
+            byName: Dict[str, List[Keyword]] = {}
+            byDefinition: Dict[Tuple[str, str], List[Keyword]] = {}
+            byOffset: Dict[int, List[Keyword]] = {}
+            for keyword in self.walk():
+                name = keyword.name.upper()
+                byName.setdefault(name, []).append(keyword)
+                definition = _keywordName(keyword)
+                if definition is not None:
+                    byDefinition.setdefault((name, definition), []).append(keyword)
+                byOffset.setdefault(keyword.offset, []).append(keyword)
+            self._keywordIndex = self._version, (byName, byDefinition, byOffset)
+        return self._keywordIndex[1]
+
+    def findAll(self, keyword: str, **parameters: str) -> KeywordSequence:
+        """This method returns all the keywords, including the suboptions, with the given name and parameters.
+
+        Parameters
+        ----------
+        keyword
+            A String specifying the keyword name, e.g., "ELSET". The name is case-insensitive.
+        **parameters
+            Strings specifying keyword parameters that must match, case-insensitively. **name** matches the name
+            of the definition, i.e., the **name** parameter or the parameter named after the keyword, e.g., the
+            **elset** parameter of an ``*ELSET`` keyword. A parameter without a value is matched by an empty
+            String.
+
+        Returns
+        -------
+        KeywordSequence
+            A KeywordSequence object, in the order of the input file.
+        """
+        byName, byDefinition, _ = self._index()
+        name = parameters.pop("name", None)
+        if name is None:
+            candidates = byName.get(keyword.upper(), [])
+        else:
+            candidates = byDefinition.get((keyword.upper(), name.upper()), [])
+        parameters = {key.lower(): value.upper() for key, value in parameters.items()}
+        return KeywordSequence(
+            candidate
+            for candidate in candidates
+            if all(
+                key in candidate.parameter and candidate.parameter[key].upper() == value
+                for key, value in parameters.items()
+            )
+        )
+
+    def find(self, keyword: str, **parameters: str) -> Keyword | None:
+        """This method returns the first keyword, including the suboptions, with the given name and parameters,
+        e.g., ``find("ELSET", name="TOP")``. See :meth:`findAll` for the arguments.
+
+        Returns
+        -------
+        Keyword
+            A Keyword object, or None if there is no such keyword.
+        """
+        found = self.findAll(keyword, **parameters)
+        return found[0] if found else None
+
+    def atOffset(self, offset: int, file: str | None = None) -> Keyword | None:
+        """This method returns the keyword, including the suboptions, whose keyword line starts at the given byte
+        offset of the input file.
+
+        Parameters
+        ----------
+        offset
+            An Int specifying the byte offset.
+        file
+            A String specifying the path of the input file. The default is the file of the first keyword of the
+            sequence, i.e., usually the main input file.
+
+        Returns
+        -------
+        Keyword
+            A Keyword object, or None if there is no keyword at the offset.
+        """
+        candidates = self._index()[2].get(offset, [])
+        if file is None:
+            file = self[0].file if self else ""
+        file = os.path.abspath(file) if file else ""
+        return next((keyword for keyword in candidates if keyword.file == file), None)
+
+    # The list methods that modify the sequence
+
+    def __setitem__(self, index, value):
+        super().__setitem__(index, self._adopt(value) if isinstance(index, slice) else self._adopt([value])[0])
+
+    def __delitem__(self, index):
+        self._modified()
+        super().__delitem__(index)
+
+    def __iadd__(self, keywords):
+        return super().__iadd__(self._adopt(keywords))
+
+    def __imul__(self, count):
+        self._modified()
+        return super().__imul__(count)
+
+    def append(self, keyword):
+        super().append(self._adopt([keyword])[0])
+
+    def extend(self, keywords):
+        super().extend(self._adopt(keywords))
+
+    def insert(self, index, keyword):
+        super().insert(index, self._adopt([keyword])[0])
+
+    def remove(self, keyword):
+        self._modified()
+        super().remove(keyword)
+
+    def pop(self, index=-1):
+        self._modified()
+        return super().pop(index)
+
+    def clear(self):
+        self._modified()
+        super().clear()
+
+    def sort(self, *args, **kwargs):
+        self._modified()
+        super().sort(*args, **kwargs)
+
+    def reverse(self):
+        self._modified()
+        super().reverse()
@@ -0,0 +1,285 @@
+from __future__ import annotations
+
+import re
+import warnings
+from array import array
+from concurrent.futures import Executor, Future
+from operator import methodcaller
+from typing import Any, List, Tuple, Union
+
+#: The number of data lines converted at once by the vectorized tokenizer.
+CHUNK_LINES = 65536
+
+_non_numeric = re.compile(r"[^0-9eE.,+\-\s]")
+_float_in_col_zero = re.compile(r"^[^,\n]*[.eE]", re.M)
+
+
+def _split(line: str) -> List[str]:
+    """Split a line at the commas that are not within double quotes."""
+    if '"' not in line:
+        return line.split(",")
+    fields, field, quoted = [], [], False
+    for char in line:
+        if char == '"':
+            quoted = not quoted
+        elif char == "," and not quoted:
+            fields.append("".join(field))
+            field = []
+            continue
+        field.append(char)
+    fields.append("".join(field))
+    return fields
+
+
+def _convert(token: str) -> Union[int, float, str]:
+    """Convert a data token to an Int, a Float or, if it is not a number, a String."""
+    try:
+        return int(token)
+    except ValueError:
+        try:
+            return float(token)
+        except ValueError:
+            return token
+
+
+def _tokenize_chunk(text: str, continued: bool) -> Tuple[str, int, bytes, bool] | None:
+    """Convert a chunk of numeric data lines, joined by newlines, to numbers with numpy in one go.
+
+    It is a module level function so that it can be run in a process pool.
+
+    Parameters
+    ----------
+    text
+        A String specifying the data lines joined by newlines.
+    continued
+        A Boolean specifying whether a line ending with a comma is continued on the next line.
+
+    Returns
+    -------
+    tuple
+        The typecode (``q`` or ``d``), the number of values per line, the raw values and whether the first column
+        holds ints, or None if the lines are not all numeric with the same number of values, in which case they must
+        be tokenized line by line.
+    """
+    import numpy as np
+
+    text = text.replace(",\n", "," if continued else "\n").rstrip(",")
+    if not text or _non_numeric.search(text):
+        return None
+    lines = text.split("\n")
+    counts = set(map(methodcaller("count", ","), lines))
+    if len(counts) != 1:
+        return None
+    width = counts.pop() + 1
+    isFloat = "." in text or "e" in text or "E" in text
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        try:
+            values = np.fromstring(text.replace("\n", ","), dtype=np.float64 if isFloat else np.int64, sep=",")
+        except (ValueError, DeprecationWarning):
+            return None
+    if values.size != len(lines) * width:
+        return None
+    colZeroIsInt = not isFloat or _float_in_col_zero.search(text) is None
+    return "d" if isFloat else "q", width, values.tobytes(), colZeroIsInt
+
+
+class _DataBlock:
+    """Accumulate the data lines of a keyword.
+
+    As long as all the lines are numeric and have the same number of values, the values are stored row by row in a
+    typed buffer (an ``array.array`` of 64-bit ints while all the values are ints, of doubles otherwise) instead of
+    as Python objects, so large node and element tables take 8 bytes per value while they are being read. A
+    non-numeric line or a line with a different number of values turns the block into a generic sequence of
+    tuples.
+    """
+
+    __slots__ = (
+        "buffer",
+        "width",
+        "colZeroIsInt",
+        "rows",
+        "pending",
+        "continued",
+        "vectorized",
+        "executor",
+        "lines",
+        "chunks",
+    )
+
+    def __init__(self, continued: bool = False, vectorized: bool = False, executor: Executor | None = None):
+        #: The typed buffer of numeric values, or None once the block is generic.
+        self.buffer: array | None = array("q")
+
+        #: The number of values per line, None before the first line.
+        self.width: int | None = None
+
+        #: Whether the values of the first column are all ints.
+        self.colZeroIsInt = True
+
+        #: The lines of a generic block.
+        self.rows: List[Tuple[Any, ...]] = []
+
+        #: The tokens of a line continued on the next line.
+        self.pending: List[str] = []
+
+        #: Whether a data line ending with a comma is continued on the next line.
+        self.continued = continued
+
+        #: Whether the data lines are collected into chunks converted with numpy instead of line by line.
+        self.vectorized = vectorized
+
+        #: An executor to convert the chunks in parallel.
+        self.executor = executor
+
+        #: The data lines of the current chunk.
+        self.lines: List[str] = []
+
+        #: The chunks submitted to the executor and their futures, in order.
+        self.chunks: List[Tuple[str, Future]] = []
+
+    def __len__(self) -> int:
+        if self.buffer is None:
+            return len(self.rows)
+        return len(self.buffer) // self.width if self.width else 0
+
+    def addLine(self, line: str):
+        """Add a data line.
+
+        Parameters
+        ----------
+        line
+            A String specifying the stripped data line.
+        """
+        if not self.vectorized:
+            return self._addLine(line)
+        self.lines.append(line)
+        if len(self.lines) >= CHUNK_LINES and not line.endswith(","):
+            text, self.lines = "\n".join(self.lines), []
+            if self.executor is None:
+                self._addChunk(text, _tokenize_chunk(text, self.continued))
+            else:
+                self.chunks.append((text, self.executor.submit(_tokenize_chunk, text, self.continued)))
+                if len(self.chunks) > 2 * getattr(self.executor, "_max_workers", 1):
+                    self._addChunk(*self._result(self.chunks.pop(0)))
+
+    def _addLine(self, line: str):
+        """Tokenize a data line and add it."""
+        tokens = [token.strip() for token in _split(line)]
+        if self.continued and line.endswith(","):
+            self.add(tokens[:-1], continued=True)
+        else:
+            self.add(tokens if tokens[-1] else tokens[:-1])
+
+    @staticmethod
+    def _result(chunk: Tuple[str, Future]) -> Tuple[str, Any]:
+        """Wait for a submitted chunk to be converted."""
+        text, future = chunk
+        return text, future.result()
+
+    def _addChunk(self, text: str, result: Tuple[str, int, bytes, bool] | None):
+        """Add a chunk of data lines converted by :func:`_tokenize_chunk`, or line by line if it could not be."""
+        buffer = self.buffer
+        if result is None or buffer is None or self.pending or self.width not in (None, result[1]):
+            for line in text.split("\n"):
+                self._addLine(line)
+            return
+        typecode, self.width, values, colZeroIsInt = result
+        if typecode == "d" and buffer.typecode == "q":
+            self.buffer = buffer = array("d", buffer)
+        elif typecode == "q" and buffer.typecode == "d":
+            values = array("d", array("q", values)).tobytes()
+        buffer.frombytes(values)
+        self.colZeroIsInt = self.colZeroIsInt and colZeroIsInt
+
+    def close(self):
+        """Convert the remaining data lines, after the last one has been added."""
+        for chunk in self.chunks:
+            self._addChunk(*self._result(chunk))
+        self.chunks = []
+        if self.lines:
+            text, self.lines = "\n".join(self.lines), []
+            self._addChunk(text, _tokenize_chunk(text, self.continued))
+        if self.pending:
+            self.add([])
+
+    def add(self, tokens: List[str], continued: bool = False):
+        """Add a data line, split into String tokens.
+
+        Parameters
+        ----------
+        tokens
+            A sequence of Strings specifying the values of the line.
+        continued
+            A Boolean specifying whether the line is continued on the next line, e.g., for elements with many
+            nodes.
+        """
+        if self.pending:
+            tokens, self.pending = self.pending + tokens, []
+        if continued:
+            self.pending = tokens
+            return
+        if self.buffer is not None:
+            if self.width is None:
+                self.width = len(tokens)
+            if len(tokens) == self.width and self._add_numeric(tokens):
+                return
+            self._to_generic()
+        self.rows.append(tuple(_convert(token) for token in tokens))
+
+    def _add_numeric(self, tokens: List[str]) -> bool:
+        """Add a numeric line to the buffer, return False if the line is not numeric."""
+        buffer = self.buffer
+        if buffer.typecode == "q":
+            try:
+                buffer.extend([int(token) for token in tokens])
+                return True
+            except (ValueError, OverflowError):
+                pass
+        try:
+            values = [float(token) for token in tokens]
+        except ValueError:
+            return False
+        if self.colZeroIsInt:
+            try:
+                int(tokens[0])
+            except ValueError:
+                self.colZeroIsInt = False
+        if buffer.typecode == "q":
+            self.buffer = buffer = array("d", buffer)
+        buffer.extend(values)
+        return True
+
+    def _to_generic(self):
+        """Move the values of the buffer to generic rows."""
+        self.rows = self.rows_from_buffer()
+        self.buffer = None
+
+    def rows_from_buffer(self) -> List[Tuple[Any, ...]]:
+        """The numeric lines as tuples of Ints and Floats, the first column is Ints if **colZeroIsInt**."""
+        buffer, width = self.buffer, self.width
+        if not width:
+            return []
+        values = buffer.tolist()
+        rows = [tuple(values[i : i + width]) for i in range(0, len(values), width)]
+        if buffer.typecode == "d" and self.colZeroIsInt:
+            rows = [(int(row[0]),) + row[1:] for row in rows]
+        return rows
+
+    def data(self, usePyArray: bool = False) -> Any:
+        """The keyword data of the block.
+
+        Parameters
+        ----------
+        usePyArray
+            A Boolean specifying whether numeric blocks are returned as an AbaqusNDarray object instead of a
+            tuple of tuples.
+        """
+        self.close()
+        if self.buffer is None:
+            return tuple(self.rows)
+        if usePyArray and self.width:
+            from .AbaqusNDarray import AbaqusNDarray
+
+            return AbaqusNDarray.fromBuffer(self.buffer, self.width, self.colZeroIsInt)
+        return tuple(self.rows_from_buffer())
@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+import hashlib
+import importlib.util
+import json
+import os
+import shutil
+import tempfile
+import time
+from typing import Any, Dict, List, Sequence, Tuple
+
+from abqpy.config import config
+
+from ._DataBlock import _DataBlock
+from .Keyword import Keyword
+from .KeywordSequence import KeywordSequence
+
+#: The version of the cache layout, part of the cache keys so that stale layouts are never read.
+CACHE_VERSION = 3
+
+#: The time in seconds after which the unfinished entry of a writer is considered to be left by a crashed process.
+WRITER_TIMEOUT = 3600
+
+
+def _hash(path: str) -> str:
+    """The SHA-256 hex digest of the content of a file."""
+    sha = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+def _stat(path: str) -> Tuple[int, int]:
+    """The modification time in nanoseconds and the size of a file."""
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _writeIndex(entry: str, index: Dict[str, Any]):
+    """Write the index of a cache entry, atomically so that concurrent parses never read a partial index."""
+    temporary = os.path.join(entry, f"index.json.{os.getpid()}.tmp")
+    with open(temporary, "w", encoding="utf-8") as f:
+        json.dump(index, f)
+    os.replace(temporary, os.path.join(entry, "index.json"))
+
+
+class _ParseCache:
+    """An on-disk cache of parsed input files.
+
+    Each entry is a directory named after the hash of the path of the main input file (and the parse options that
+    change the result), holding an ``index.json`` file with the keywords, the small keyword data blocks and the read
+    files, and one ``.npy`` file per numeric data block. The ``.npy`` files are memory-mapped when the entry is
+    loaded, so a warm parse neither tokenizes text nor reads the bulk data until it is used. An entry is only used if
+    the main input file and every included file are unchanged, which is checked with their modification time and
+    size first and with their hash only if those differ, so a warm parse does not read the input files; the
+    modification times and sizes of the files whose hash matches are written back to the index, so that they are
+    not hashed again by the next parse. The least recently used entries are evicted once the cache exceeds its size
+    limit, with the unfinished entries left by crashed writers.
+
+    Parameters
+    ----------
+    directory
+        A String specifying the cache directory.
+    size
+        An Int specifying the size limit of the cache in megabytes.
+    """
+
+    def __init__(self, directory: str, size: int):
+        self.directory = directory
+        self.size = size
+
+    @classmethod
+    def fromConfig(cls) -> _ParseCache | None:
+        """The cache configured with the ``ABQPY_INP_CACHE_DIR`` and ``ABQPY_INP_CACHE_SIZE`` environment variables,
+        None if it is not configured or numpy is not installed."""
+        if not config.inp_cache_dir or importlib.util.find_spec("numpy") is None:
+            return None
+        return cls(config.inp_cache_dir, config.inp_cache_size)
+
+    def key(self, path: str, bulk: bool) -> str:
+        """The cache key of an input file parsed with the given options."""
+        return hashlib.sha256(f"{CACHE_VERSION}:{os.path.abspath(path)}:{bool(bulk)}".encode()).hexdigest()
+
+    def load(self, key: str, usePyArray: bool) -> Tuple[KeywordSequence, List[str], List[str]] | None:
+        """Load a cache entry, return None if there is no valid entry.
+
+        Returns
+        -------
+        tuple
+            The flat sequence of keywords, the included files and the missing included files.
+        """
+        import numpy as np
+
+        from .AbaqusNDarray import AbaqusNDarray
+
+        entry = os.path.join(self.directory, key)
+        try:
+            with open(os.path.join(entry, "index.json"), encoding="utf-8") as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            return None
+        files = [list(record) for record in index["files"]]
+        if not self._valid(index):
+            return None
+        if index["files"] != files:  # touched files, they are not hashed again by the next parse
+            try:
+                _writeIndex(entry, index)
+            except OSError:
+                pass
+
+        keywords = KeywordSequence()
+        for item in index["keywords"]:
+            keyword = Keyword(
+                item["name"], item["parameter"], comments=item["comments"], file=item["file"], offset=item["offset"]
+            )
+            if "array" in item:
+                array = np.load(os.path.join(entry, item["array"]), mmap_mode="r")
+                if usePyArray:
+                    keyword.data = AbaqusNDarray.fromArray(array, item["colZeroIsInt"])
+                else:
+                    rows = array.tolist()
+                    if item["colZeroIsInt"]:
+                        rows = [[int(row[0])] + row[1:] for row in rows]
+                    keyword.data = tuple(map(tuple, rows))
+            elif "data" in item:
+                keyword.data = tuple(map(tuple, item["data"]))
+            keywords.append(keyword)
+        os.utime(os.path.join(entry, "index.json"))
+        return keywords, index["includes"], index["missingIncludes"]
+
+    @staticmethod
+    def _valid(index: Dict[str, Any]) -> bool:
+        """Whether the files read by the parse of a cache entry are unchanged, the modification times and sizes of
+        the files whose content is unchanged are refreshed in the index."""
+        for record in index["files"]:
+            path, mtime, size, sha = record
+            try:
+                stat = _stat(path)
+                if stat != (mtime, size):
+                    if _hash(path) != sha:
+                        return False
+                    record[1:3] = stat
+            except OSError:
+                return False
+        return not any(os.path.isfile(path) for path in index["missingFiles"])
+
+    def writer(self, key: str) -> _CacheWriter:
+        """Create a writer for a new cache entry."""
+        os.makedirs(self.directory, exist_ok=True)
+        return _CacheWriter(self, key)
+
+    def evict(self):
+        """Remove the least recently used entries until the cache fits in its size limit, and the unfinished entries
+        older than :data:`WRITER_TIMEOUT`."""
+        entries = []
+        for key in os.listdir(self.directory):
+            entry = os.path.join(self.directory, key)
+            if key.startswith("."):  # the unfinished entry of a writer
+                try:
+                    if time.time() - os.path.getmtime(entry) > WRITER_TIMEOUT:
+                        shutil.rmtree(entry, ignore_errors=True)
+                except OSError:
+                    pass
+                continue
+            try:
+                used = os.stat(os.path.join(entry, "index.json")).st_mtime_ns
+                size = sum(os.path.getsize(os.path.join(entry, name)) for name in os.listdir(entry))
+            except OSError:
+                continue
+            entries.append((used, size, entry))
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry in sorted(entries):
+            if total <= self.size * 1024 * 1024:
+                break
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+
+
+class _CacheWriter:
+    """Write a cache entry while an input file is parsed, so the data blocks are stored as soon as they are read."""
+
+    def __init__(self, cache: _ParseCache, key: str):
+        self.cache = cache
+        self.key = key
+        self.directory = tempfile.mkdtemp(prefix=f".{key}-", dir=cache.directory)
+        self.data: Dict[int, Dict[str, Any]] = {}
+
+    def add(self, position: int, block: _DataBlock):
+        """Store the data block of the keyword at the given position."""
+        import numpy as np
+
+        block.close()
+        if block.buffer is not None and block.width:
+            name = f"{position}.npy"
+            dtype = np.int64 if block.buffer.typecode == "q" else np.float64
+            np.save(os.path.join(self.directory, name), np.frombuffer(block.buffer, dtype).reshape(-1, block.width))
+            colZeroIsInt = block.colZeroIsInt and block.buffer.typecode == "d"
+            self.data[position] = {"array": name, "colZeroIsInt": colZeroIsInt}
+        else:
+            self.data[position] = {"data": block.data()}
+
+    def commit(
+        self,
+        keywords: Sequence[Keyword],
+        includes: Sequence[str],
+        files: Sequence[str],
+        missingIncludes: Sequence[str],
+        missingFiles: Sequence[str],
+    ):
+        """Write the keyword index and move the entry into the cache."""
+        index = {
+            "keywords": [
+                dict(
+                    name=keyword.name,
+                    parameter=keyword.parameter,
+                    comments=keyword.comments,
+                    file=keyword.file,
+                    offset=keyword.offset,
+                    **self.data.get(i, {}),
+                )
+                for i, keyword in enumerate(keywords)
+            ],
+            "includes": list(includes),
+            "files": [[path, *_stat(path), _hash(path)] for path in files],
+            "missingIncludes": list(missingIncludes),
+            "missingFiles": list(missingFiles),
+        }
+        _writeIndex(self.directory, index)
+        entry = os.path.join(self.cache.directory, self.key)
+        shutil.rmtree(entry, ignore_errors=True)
+        try:
+            os.replace(self.directory, entry)
+        except OSError:  # another process stored the same entry meanwhile
+            self.discard()
+        self.cache.evict()
+
+    def discard(self):
+        """Remove the unfinished entry."""
+        shutil.rmtree(self.directory, ignore_errors=True)
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from typing import TYPE_CHECKING
+
 from abqpy.decorators import abaqus_class_doc, abaqus_method_doc
 
 from ..UtilityAndView.abaqusConstants import (
@@ -11,6 +13,9 @@ from ..UtilityAndView.abaqusConstants import (
     SymbolicConstant,
 )
 
+if TYPE_CHECKING:
+    from abqpy.scheduler import LocalQueue
+
 
 @abaqus_class_doc
 class Queue:
@@ -126,4 +131,38 @@ class Queue:
             Directory in which to run the job on the remote computer is not set,
             If **fileCopy** = ON and **directory** is empty.
         """
-        ...
+        self.name = name
+        self.queueName = queueName
+        self.hostName = hostName
+        self.fileCopy = fileCopy
+        self.directory = directory
+        self.driver = driver
+        self.remotePlatform = remotePlatform
+        self.filesToCopy = filesToCopy
+        self.deleteAfterCopy = deleteAfterCopy
+        self.description = description
+
+    def localQueue(self, **kwargs) -> LocalQueue:
+        """The :class:`~abqpy.scheduler.LocalQueue` that runs the jobs of this queue on the local machine, it is
+        named by **queueName**.
+
+        Parameters
+        ----------
+        kwargs
+            The resources of the local queue, **cpus**, **memory** and **tokens**, and its **state_dir**.
+
+        Returns
+        -------
+        LocalQueue
+            The local queue.
+
+        Raises
+        ------
+        ValueError
+            If **hostName** is set, the jobs of remote queues are run by Abaqus.
+        """
+        if self.hostName:
+            raise ValueError(f"The queue {self.name} runs its jobs on the remote host {self.hostName}")
+        from abqpy.scheduler import LocalQueue
+
+        return LocalQueue.from_queue(self, **kwargs)
@@ -13,7 +13,7 @@ This page discusses:
 
 from __future__ import annotations
 
-from typing import Sequence, Union
+from typing import TYPE_CHECKING, Sequence, Union
 
 from typing_extensions import Literal
 
@@ -21,7 +21,9 @@ from abqpy.decorators import abaqus_function_doc
 
 from ..UtilityAndView.abaqusConstants import ALL, FIRST, INITIAL_AND_LAST
 from ..UtilityAndView.abaqusConstants import abaqusConstants as C
-from .Mdb import Mdb
+
+if TYPE_CHECKING:  # to defer importing the Mdb mixin hierarchy
+    from .Mdb import Mdb
 
 
 def upgradeMdb(existingMdbPath: str, upgradedMdbPath: str) -> None:
@@ -129,4 +131,6 @@ def openMdb(pathName: str) -> Mdb:
         cannot open file;
         If the command fails to open the model database file for reasons not mentioned above
     """
+    from .Mdb import Mdb
+
     return Mdb(pathName)
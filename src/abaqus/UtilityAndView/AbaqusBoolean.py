@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from typing import Dict
+
 from abqpy.decorators import abaqus_class_doc, abaqus_method_doc
 
 
@@ -47,6 +49,15 @@ class AbaqusBoolean(int):
         if value not in (0, 1):
             raise ValueError(f"AbaqusBoolean must have value argument 0 or 1.  {value} supplied")
 
+    def __new__(cls, value: int) -> AbaqusBoolean:
+        # ON and OFF are singletons
+        instance = _instances.get(value)
+        if instance is None:
+            instance = super().__new__(cls, value)
+            if value in (0, 1):
+                _instances[value] = instance
+        return instance
+
     @abaqus_method_doc
     def getId(self) -> int:
         return id(self)
@@ -59,3 +70,7 @@ class AbaqusBoolean(int):
 
     def isTrue(self) -> bool:
         return bool(self)
+
+
+#: The AbaqusBoolean objects ON and OFF.
+_instances: Dict[int, AbaqusBoolean] = {}
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from enum import Enum
+from typing import TYPE_CHECKING, Dict, Iterator
 
 from abqpy.decorators import abaqus_class_doc, abaqus_method_doc
 
@@ -64,16 +64,86 @@ class SymbolicConstant(str):
             return AbaqusBoolean(1)
         elif name == "OFF":
             return AbaqusBoolean(0)
-        else:
-            return super().__new__(cls, name)
+        constant = _interned.get(name)
+        if constant is None:
+            if not name.isupper() or not name.isidentifier():
+                raise ValueError(f"SymbolicConstant name {name} may only contain upper case, digit or underscore")
+            constant = _interned[name] = super().__new__(cls, name)
+            constant.text = name
+        return constant
 
 
-class abaqusConstants(SymbolicConstant, Enum):
-    def __str__(self) -> str:
-        return self.name
+#: The SymbolicConstant objects by text, two SymbolicConstant objects with the same text are the same Python object.
+_interned: Dict[str, SymbolicConstant] = {}
 
+
+if TYPE_CHECKING:
+    # Type checkers see abaqusConstants as an Enum, so that its members are valid in Literal[...] type hints
+    from enum import Enum as _Constants
+else:
+
+    class _SymbolicConstants(type):
+        """Metaclass of :class:`abaqusConstants`, a frozen namespace of interned SymbolicConstant objects.
+
+        The ``NAME = "NAME"`` strings of the class body are replaced by instances of the class when the class is
+        created. Compared to an :class:`~enum.Enum`, no per-member descriptors or lookup tables are built, so the
+        thousands of constants are created at a fraction of the import cost. Constants can be looked up by text in
+        constant time with ``abaqusConstants[text]`` or ``SymbolicConstant(text)``, and cannot be reassigned.
+        """
+
+        def __new__(mcs, name: str, bases: tuple, namespace: dict):
+            texts = [(key, text) for key, text in namespace.items() if isinstance(text, str) and key.isupper()]
+            cls = super().__new__(mcs, name, bases, namespace)
+            members: Dict[str, SymbolicConstant] = {}
+            for key, text in texts:
+                constant = _interned.get(text)
+                if constant is None:
+                    constant = _interned[text] = str.__new__(cls, text)
+                    constant.text = text
+                members[key] = constant
+                type.__setattr__(cls, key, constant)
+            type.__setattr__(cls, "__members__", members)
+            return cls
+
+        def __getitem__(cls, text: str) -> SymbolicConstant:
+            return cls.__members__[text]
+
+        def __iter__(cls) -> Iterator[SymbolicConstant]:
+            return iter(cls.__members__.values())
+
+        def __len__(cls) -> int:
+            return len(cls.__members__)
+
+        def __contains__(cls, constant: object) -> bool:
+            return isinstance(constant, str) and str(constant) in cls.__members__
+
+        def __setattr__(cls, name: str, value):
+            if name in cls.__dict__.get("__members__", {}):
+                raise AttributeError(f"cannot reassign SymbolicConstant {name!r}")
+            super().__setattr__(name, value)
+
+        def __delattr__(cls, name: str):
+            if name in cls.__dict__.get("__members__", {}):
+                raise AttributeError(f"cannot delete SymbolicConstant {name!r}")
+            super().__delattr__(name)
+
+    class _Constants(metaclass=_SymbolicConstants):
+        """The runtime base of :class:`abaqusConstants`, with the Enum API kept for code that used it."""
+
+        __slots__ = ()
+
+        @property
+        def name(self) -> str:
+            return self.text
+
+        @property
+        def value(self) -> str:
+            return self.text
+
+
+class abaqusConstants(SymbolicConstant, _Constants):
     def __repr__(self) -> str:
-        return self.name
+        return self.text
 
     YES = "YES"
     NO = "NO"
@@ -5,7 +5,7 @@ from typing import Union
 from auto_all import end_all, start_all
 from typing_extensions import Literal
 
-start_all()
+start_all(globals())
 
 from .AbaqusBoolean import AbaqusBoolean
 from .SymbolicConstant import SymbolicConstant, abaqusConstants
@@ -3224,4 +3224,4 @@ CODE = Literal[
     abaqusConstants.T3D2,
 ]
 
-end_all()
+end_all(globals())
@@ -1,20 +1,48 @@
 from __future__ import annotations
 
+import sys
+from functools import partial
+from importlib import import_module
+from typing import TYPE_CHECKING, Any, cast
+
 import auto_all
 
 from abqpy import run  # noqa
+from abqpy.config import config
+from abqpy.lazy import LazyModule, LazyObject
 
 run(cae=True)
-auto_all.start_all()
+
+#: The classes of the large mixin hierarchies, by name, with their modules. In the lazy import mode, they (and the
+#: hundreds of modules behind them) and the subpackages are only imported on first access, see :pep:`562`. They are
+#: then not exported by ``from abaqus import *`` since that would resolve them, use ``from abaqus import Mdb``.
+_classes = {"Mdb": ".Mdb.Mdb", "Odb": ".Odb.Odb", "Session": ".Session.Session"}
+
+
+def _create(name: str) -> Any:
+    """Create an object of one of the classes of :data:`_classes`."""
+    return getattr(import_module(_classes[name], __name__), name)()
+
+
+if TYPE_CHECKING:
+    from .Mdb.Mdb import Mdb
+    from .Odb.Odb import Odb  # noqa
+    from .Session.Session import Session
+
+if config.lazy_import:
+    __lazy_attributes__ = {name: (module, name) for name, module in _classes.items()}
+    sys.modules[__name__].__class__ = LazyModule
+
+auto_all.start_all(globals())
+
+if not config.lazy_import:
+    globals().update({name: getattr(import_module(module, __name__), name) for name, module in _classes.items()})
 
 from math import *  # noqa
 
 from .builtin import *  # noqa
 from .Canvas.Highlight import *  # noqa
-from .Mdb.Mdb import Mdb  # noqa
 from .Mdb.MdbCommands import *  # noqa
-from .Odb.Odb import Odb  # noqa
-from .Session.Session import Session  # noqa
 from .UtilityAndView import abaqusConstants  # noqa
 from .UtilityAndView.abaqusConstants import OFF, Boolean  # noqa
 from .UtilityAndView.AbaqusException import AbaqusException  # noqa
@@ -22,12 +50,12 @@ from .UtilityAndView.BackwardCompatibility import BackwardCompatibility  # noqa
 from .UtilityAndView.SymbolicConstant import SymbolicConstant  # noqa
 from .UtilityAndView.User import *  # noqa
 
-session = Session()
-mdb = Mdb()
+session = cast("Session", LazyObject(partial(_create, "Session")) if config.lazy_import else _create("Session"))
+mdb = cast("Mdb", LazyObject(partial(_create, "Mdb")) if config.lazy_import else _create("Mdb"))
 
 backwardCompatibility = BackwardCompatibility()
 
 YES = abaqusConstants.YES
 NO = abaqusConstants.NO
 
-auto_all.end_all()
+auto_all.end_all(globals())
@@ -1,6 +1,6 @@
 import auto_all
 
-auto_all.start_all()
+auto_all.start_all(globals())
 
 from abaqus.PlugInRegistration.AFXApp import *  # noqa
 from abaqus.PlugInRegistration.AFXBaseTable import *  # noqa
@@ -151,4 +151,4 @@ from abaqus.PlugInRegistration.MessageDialogs import *
 from abaqus.PlugInRegistration.MessageMaps import *
 from abaqusConstants import *
 
-auto_all.end_all()
+auto_all.end_all(globals())
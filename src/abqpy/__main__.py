@@ -2,8 +2,12 @@ import sys
 
 import fire
 
+from .batch import BatchResult
 from .cli import AbqpyCLI
 from .config import config
+from .farm import FarmResult
+from .runner import CommandResult
+from .tuning import TuningResult
 
 
 def main():
@@ -11,7 +15,10 @@ def main():
     # Print to stdout, a workaround from https://github.com/google/python-fire/issues/188#issuecomment-1528976874
     fire.core.Display = lambda lines, out: out.write("\n".join(lines) + "\n")
     sys.tracebacklimit = config.cli_traceback_limit
-    fire.Fire(AbqpyCLI())
+    # Exit with the return code of the Abaqus command (or of the farm, batch or tuning) instead of printing the result
+    result = fire.Fire(AbqpyCLI(), serialize=lambda result: None if isinstance(result, CommandResult) else result)
+    if isinstance(result, (CommandResult, FarmResult, BatchResult, TuningResult)):
+        sys.exit(result.returncode)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import json
+import os
+import re
+import shlex
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+from .cli import AbqpyCLI
+from .kernel import BATCH_PREFIX
+from .runner import LineCallback
+from .server import KERNEL_SCRIPT
+
+
+@dataclass
+class BatchScript:
+    """A script of a :class:`PythonBatch`."""
+
+    #: The path of the script.
+    script: str
+
+    #: The command line arguments of the script, in ``sys.argv[1:]``.
+    args: List[str] = field(default_factory=list)
+
+    #: The working directory of the script, by default the current directory.
+    cwd: str = ""
+
+    @classmethod
+    def parse(cls, entry: Union[str, Dict[str, Any]], cwd: str) -> BatchScript:
+        """Create a batch script from a command line, e.g., ``"post.py Job-1.odb"``, or a JSON object with the
+        ``script``, ``args`` and ``cwd`` keys, with paths relative to a directory."""
+        if isinstance(entry, str):
+            script, *args = shlex.split(entry, posix=os.name != "nt")
+            entry = {"script": script, "args": args}
+        directory = os.path.join(cwd, entry.get("cwd", ""))
+        return cls(os.path.join(cwd, entry["script"]), [str(arg) for arg in entry.get("args", [])], directory)
+
+
+@dataclass
+class BatchScriptResult:
+    """The result of a :class:`BatchScript`."""
+
+    #: The script.
+    script: BatchScript
+
+    #: The exit code of the script, -1 if it did not finish.
+    returncode: int = -1
+
+    #: The wall-clock time of the script in seconds.
+    wall_time: float = 0.0
+
+    #: The log file of the output of the script.
+    log: str = ""
+
+    #: The reason why the script did not finish.
+    error: str = ""
+
+
+@dataclass
+class BatchResult:
+    """The results of the scripts of a :class:`PythonBatch`, in the order of the scripts."""
+
+    #: The results of the scripts.
+    results: List[BatchScriptResult]
+
+    #: The wall-clock time of the whole batch in seconds.
+    wall_time: float = 0.0
+
+    #: The number of Abaqus/Python processes started, more than one if some of them crashed.
+    processes: int = 1
+
+    @property
+    def returncode(self) -> int:
+        """0 if all the scripts succeeded, 1 otherwise."""
+        return int(any(result.returncode != 0 for result in self.results))
+
+    def __str__(self) -> str:
+        lines = [f"{'script':<40}{'code':>6}{'wall [s]':>10}  error"]
+        for r in self.results:
+            name = " ".join([os.path.basename(r.script.script), *r.script.args])[:39]
+            lines.append(f"{name:<40}{r.returncode:>6}{r.wall_time:>10.2f}  {r.error}")
+        failed = sum(result.returncode != 0 for result in self.results)
+        lines.append(
+            f"\n{len(self.results) - failed} of {len(self.results)} scripts succeeded in {self.wall_time:.1f} s "
+            f"with {self.processes} Abaqus/Python process{'es' if self.processes > 1 else ''}"
+        )
+        return "\n".join(lines)
+
+
+class PythonBatch:
+    """Run many Abaqus/Python scripts, e.g., ``odbAccess`` post-processing scripts, one after another in a single
+    ``abaqus python`` process, to start the interpreter and check out a license once instead of once per script.
+
+    Each script runs in a fresh ``__main__`` namespace with its own ``sys.argv`` and working directory, as in the
+    kernel of :class:`~abqpy.server.KernelServer`. Its output is written to the ``<index>-<name>.log`` file in the
+    batch directory. A script that fails does not stop the batch, and if a script crashes the interpreter, the
+    following scripts are run in a new process.
+
+    Parameters
+    ----------
+    scripts : Sequence[BatchScript]
+        The scripts.
+    directory : str, optional
+        The directory of the manifest and the log files, by default "python-batch".
+    cwd : str, optional
+        The working directory of the Abaqus/Python process, by default the current directory.
+    timeout : float, optional
+        The time in seconds after which an Abaqus/Python process is killed, by default None, i.e., no timeout.
+    stdout, stderr : Callable[[str], None], optional
+        Callbacks called with each line of output of the Abaqus/Python process that is not written by the scripts,
+        by default the lines are written to the streams of the current process.
+    """
+
+    def __init__(
+        self,
+        scripts: Sequence[BatchScript],
+        directory: str = "python-batch",
+        *,
+        cwd: Optional[str] = None,
+        timeout: Optional[float] = None,
+        stdout: Optional[LineCallback] = None,
+        stderr: Optional[LineCallback] = None,
+    ):
+        self.scripts = list(scripts)
+        self.directory = os.path.abspath(directory)
+        self.cwd = cwd
+        self.timeout = timeout
+        self._stdout = stdout or (lambda line: print(line, end="", flush=True))
+        self._stderr = stderr
+
+    @classmethod
+    def from_file(cls, file: str, **kwargs) -> PythonBatch:
+        """Create a batch from a list of scripts.
+
+        The list is a text file with a command line per line, e.g., ``post.py Job-1.odb`` (empty lines and lines
+        starting with ``#`` are ignored), or a JSON file with a list of command lines or of objects with the
+        ``script``, ``args`` and ``cwd`` keys. Relative paths are relative to the directory of the list.
+
+        Parameters
+        ----------
+        file : str
+            The path of the list.
+        kwargs
+            The other arguments of :class:`PythonBatch`.
+        """
+        directory = os.path.dirname(os.path.abspath(file))
+        with open(file) as f:
+            if file.lower().endswith(".json"):
+                entries = json.load(f)
+            else:
+                entries = [line.strip() for line in f if line.strip() and not line.lstrip().startswith("#")]
+        return cls([BatchScript.parse(entry, directory) for entry in entries], **kwargs)
+
+    def _log(self, index: int) -> str:
+        name = re.sub(r"[^\w.\-]", "_", os.path.splitext(os.path.basename(self.scripts[index].script))[0])
+        return os.path.join(self.directory, f"{index:04d}-{name}.log")
+
+    def run(self) -> BatchResult:
+        """Run the scripts.
+
+        Returns
+        -------
+        BatchResult
+            The results of the scripts.
+        """
+        begin = time.perf_counter()
+        os.makedirs(self.directory, exist_ok=True)
+        cwd = os.path.abspath(self.cwd or os.getcwd())
+        results = [BatchScriptResult(script, log=self._log(i)) for i, script in enumerate(self.scripts)]
+        pending, processes = list(range(len(self.scripts))), 0
+        while pending:
+            manifest = os.path.join(self.directory, "manifest.json")
+            with open(manifest, "w") as f:
+                entries = [dict(index=i, script=os.path.abspath(self.scripts[i].script), args=self.scripts[i].args,
+                                cwd=os.path.abspath(self.scripts[i].cwd or cwd), log=results[i].log)
+                           for i in pending]  # fmt: skip
+                json.dump(entries, f, indent=4)
+            events: List[Dict[str, Any]] = []
+
+            def output(line: str):
+                if line.startswith(BATCH_PREFIX):
+                    events.append(json.loads(line[len(BATCH_PREFIX) :]))
+                else:
+                    self._stdout(line)
+
+            cli = AbqpyCLI(cwd=cwd, timeout=self.timeout, stdout=output, stderr=self._stderr)
+            process = cli.python(KERNEL_SCRIPT, "--batch", manifest)
+            processes += 1
+            started = None
+            for event in events:
+                result = results[event["index"]]
+                if event["event"] == "start":
+                    started = event["index"]
+                    pending.remove(started)
+                else:
+                    started = None
+                    result.returncode, result.wall_time = event["code"], event["wall_time"]
+            if started is not None:
+                results[started].error = f"the Abaqus/Python process exited with code {process.returncode}"
+            elif pending:  # the process could not start the scripts
+                for i in pending:
+                    results[i].error = f"the Abaqus/Python process exited with code {process.returncode}"
+                break
+        return BatchResult(results, time.perf_counter() - begin, processes)
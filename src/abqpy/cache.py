@@ -0,0 +1,374 @@
+from __future__ import annotations
+
+import fnmatch
+import glob
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from .config import config
+from .runner import CommandResult
+
+#: The version of the store layout, part of the cache keys so that stale layouts are never read.
+CACHE_VERSION = 1
+
+#: The files that are never recorded as outputs.
+IGNORED_OUTPUTS = ("*.lck", "*.pyc", "abaqus.rpy*", "abaqus_acis.log")
+
+
+def _hash(path: str) -> str:
+    """The SHA-256 hex digest of the content of a file."""
+    sha = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+def _reflink(source: str, destination: str) -> bool:
+    """Clone a file with a copy-on-write reflink, False if the file system does not support it."""
+    try:
+        import fcntl
+    except ImportError:  # Windows
+        return False
+    ficlone = 0x40049409  # FICLONE, Linux Btrfs, XFS and others
+    try:
+        with open(source, "rb") as src, open(destination, "wb") as dst:
+            fcntl.ioctl(dst.fileno(), ficlone, src.fileno())
+        return True
+    except OSError:
+        if os.path.exists(destination):
+            os.remove(destination)
+        return False
+
+
+def _snapshot(directory: str, exclude: str, patterns: Sequence[str] = ()) -> Dict[str, Tuple[int, int]]:
+    """The modification times and sizes of the files in a directory tree, or of the files matching glob patterns
+    relative to the directory, by relative path."""
+    files = {}
+    if patterns:
+        paths = {path for pattern in patterns for path in glob.glob(os.path.join(directory, pattern), recursive=True)}
+        for path in paths:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            if not path.startswith(exclude + os.sep) and os.path.isfile(path):
+                files[os.path.relpath(path, directory)] = stat.st_mtime_ns, stat.st_size
+        return files
+    for root, dirs, names in os.walk(directory):
+        dirs[:] = [name for name in dirs if os.path.join(root, name) != exclude and not name.startswith(".")]
+        for name in names:
+            path = os.path.join(root, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            files[os.path.relpath(path, directory)] = stat.st_mtime_ns, stat.st_size
+    return files
+
+
+class ResultCache:
+    """A content-addressed cache of the output files of the scripts run by :func:`abqpy.run`, enabled by the
+    :envvar:`ABQPY_RESULT_CACHE` environment variable.
+
+    The cache key of a run is the hash of the script, its arguments, the Abaqus command options and the content of
+    its input files: the Python modules next to the script, which it may import, the arguments that name existing
+    files and the files matching the patterns of the :envvar:`ABQPY_RESULT_CACHE_INPUTS` environment variable. After
+    a successful run, the files that the script created or modified in its working directory, or only those matching
+    the patterns of the :envvar:`ABQPY_RESULT_CACHE_OUTPUTS` environment variable, are recorded in the store, one
+    blob per distinct content. On a hit,
+    the files are restored instead of running Abaqus, as copy-on-write reflinks if the file system supports them,
+    otherwise as hard links. The blobs are read-only, so are the hard-linked files, which protects the store from
+    being modified through them. Entries not used for the maximum age are evicted, then the least recently used
+    entries until the store fits in its size limit.
+
+    Parameters
+    ----------
+    directory : str
+        The directory of the store.
+    size : float, optional
+        The size limit of the store in megabytes, by default 10240.
+    age : float, optional
+        The maximum age in days of an unused entry, by default 30.
+    inputs : Sequence[str], optional
+        Glob patterns of the input files, relative to the working directory, by default none.
+    outputs : Sequence[str], optional
+        Glob patterns of the output files, relative to the working directory, by default none, i.e., the whole
+        working directory is scanned for the files created or modified by a run.
+    """
+
+    def __init__(self, directory: str, size: float = 10240, age: float = 30, inputs: Sequence[str] = (),
+                 outputs: Sequence[str] = ()):  # fmt: skip
+        self.directory = os.path.abspath(directory)
+        self.size = size
+        self.age = age
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+
+    @classmethod
+    def from_config(cls) -> ResultCache:
+        """The cache configured with the :envvar:`ABQPY_RESULT_CACHE_DIR` environment variable and its companions."""
+        directory = config.result_cache_dir or os.path.join(os.path.expanduser("~"), ".abqpy", "results")
+        inputs = [pattern for pattern in config.result_cache_inputs.split(os.pathsep) if pattern]
+        outputs = [pattern for pattern in config.result_cache_outputs.split(os.pathsep) if pattern]
+        return cls(directory, config.result_cache_size, config.result_cache_age, inputs, outputs)
+
+    def _blob(self, sha: str) -> str:
+        return os.path.join(self.directory, "objects", sha[:2], sha)
+
+    def _entry(self, key: str) -> str:
+        return os.path.join(self.directory, "entries", f"{key}.json")
+
+    def _inputs(self, script: str, args: Sequence[str], cwd: str) -> List[str]:
+        """The input files of a run, sorted by relative path."""
+        paths = set(glob.glob(os.path.join(cwd, os.path.dirname(script), "*.py")))
+        paths.update(os.path.join(cwd, arg) for arg in args if os.path.isfile(os.path.join(cwd, arg)))
+        for pattern in self.inputs:
+            paths.update(path for path in glob.glob(os.path.join(cwd, pattern), recursive=True) if os.path.isfile(path))
+        return sorted(os.path.relpath(path, cwd) for path in paths)
+
+    def key(self, script: str, args: Sequence[str], options: Mapping[str, Any], cwd: Optional[str] = None) -> str:
+        """The cache key of a run.
+
+        Parameters
+        ----------
+        script : str
+            The path of the script.
+        args : Sequence[str]
+            The arguments of the script.
+        options : Mapping[str, Any]
+            The Abaqus command options, e.g., ``config.cae.model_dump()``, and anything else that changes the results.
+        cwd : str, optional
+            The working directory of the run, by default the current directory.
+        """
+        cwd = os.path.abspath(cwd or os.getcwd())
+        abaqus = os.environ.get("ABAQUS_BAT_PATH", "abaqus")
+        inputs = [[path, _hash(os.path.join(cwd, path))] for path in self._inputs(script, args, cwd)]
+        manifest = [CACHE_VERSION, os.path.basename(script), _hash(os.path.join(cwd, script)), list(args),
+                    dict(options), abaqus, inputs]  # fmt: skip
+        return hashlib.sha256(json.dumps(manifest, sort_keys=True, default=str).encode()).hexdigest()
+
+    def _log(self, event: str, key: str, **values):
+        """Append an event to the statistics of the store."""
+        os.makedirs(self.directory, exist_ok=True)
+        line = json.dumps(dict(event=event, key=key, time=time.time(), **values)) + "\n"
+        with open(os.path.join(self.directory, "events.jsonl"), "a") as f:
+            f.write(line)
+
+    def restore(self, key: str, cwd: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Restore the output files of a cached run into its working directory.
+
+        Returns
+        -------
+        Dict[str, Any]
+            The cache entry, with the recorded ``files``, ``returncode`` and ``wall_time``, or None on a miss.
+        """
+        cwd = os.path.abspath(cwd or os.getcwd())
+        try:
+            with open(self._entry(key)) as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            entry = None
+        if entry is None or not all(os.path.isfile(self._blob(sha)) for _, sha, _ in entry["files"]):
+            self._log("miss", key)
+            return None
+        for path, sha, _ in entry["files"]:
+            destination = os.path.join(cwd, path)
+            os.makedirs(os.path.dirname(destination), exist_ok=True)
+            if os.path.lexists(destination):
+                os.remove(destination)
+            if not _reflink(self._blob(sha), destination):
+                try:
+                    os.link(self._blob(sha), destination)
+                except OSError:  # another file system, or no hard links
+                    shutil.copy2(self._blob(sha), destination)
+        os.utime(self._entry(key))
+        size = sum(size for _, _, size in entry["files"])
+        self._log("hit", key, size=size, saved=entry["wall_time"])
+        return entry
+
+    def _ingest(self, path: str) -> str:
+        """Copy a file into the store, return the hash of its content."""
+        sha = _hash(path)
+        blob = self._blob(sha)
+        if not os.path.exists(blob):
+            os.makedirs(os.path.dirname(blob), exist_ok=True)
+            temporary = f"{blob}.{os.getpid()}.tmp"
+            if not _reflink(path, temporary):
+                shutil.copyfile(path, temporary)
+            os.chmod(temporary, 0o444)
+            os.replace(temporary, blob)
+        return sha
+
+    def _detach(self, cwd: str):
+        """Replace the files hard-linked to the store in a working directory by writable copies, so that a run can
+        modify them without modifying the store."""
+        inodes = set()
+        for root, _, names in os.walk(os.path.join(self.directory, "objects")):
+            for name in names:
+                stat = os.stat(os.path.join(root, name))
+                if stat.st_nlink > 1:
+                    inodes.add((stat.st_dev, stat.st_ino))
+        if not inodes:
+            return
+        for path in _snapshot(cwd, self.directory, self.outputs):
+            path = os.path.join(cwd, path)
+            stat = os.stat(path)
+            if (stat.st_dev, stat.st_ino) in inodes:
+                temporary = f"{path}.{os.getpid()}.tmp"
+                shutil.copyfile(path, temporary)
+                os.replace(temporary, path)
+
+    def store(self, key: str, files: Sequence[str], result: CommandResult, cwd: Optional[str] = None):
+        """Record the output files of a successful run.
+
+        Parameters
+        ----------
+        key : str
+            The cache key of the run, see :meth:`key`.
+        files : Sequence[str]
+            The output files, relative to the working directory.
+        result : CommandResult
+            The result of the run.
+        cwd : str, optional
+            The working directory of the run, by default the current directory.
+        """
+        cwd = os.path.abspath(cwd or os.getcwd())
+        records = []
+        for path in files:
+            absolute = os.path.join(cwd, path)
+            records.append([path.replace(os.sep, "/"), self._ingest(absolute), os.path.getsize(absolute)])
+        entry = dict(files=records, returncode=result.returncode, wall_time=result.wall_time, created=time.time())
+        os.makedirs(os.path.dirname(self._entry(key)), exist_ok=True)
+        with tempfile.NamedTemporaryFile("w", dir=os.path.dirname(self._entry(key)), delete=False) as f:
+            json.dump(entry, f)
+        os.replace(f.name, self._entry(key))
+        self._log("store", key, size=sum(size for _, _, size in records))
+        self.evict()
+
+    def run(
+        self,
+        script: str,
+        args: Sequence[str],
+        options: Mapping[str, Any],
+        submit: Callable[[], CommandResult],
+        cwd: Optional[str] = None,
+    ) -> CommandResult:
+        """Restore the output files of a run from the cache, or run it with **submit** and record them.
+
+        Parameters
+        ----------
+        script, args, options, cwd
+            The script, its arguments, the Abaqus command options and the working directory, see :meth:`key`.
+        submit : Callable[[], CommandResult]
+            A function that runs the script, e.g., ``lambda: abaqus.cae(script, *args)``. Only its successful runs
+            are cached.
+
+        Returns
+        -------
+        CommandResult
+            The result of **submit**, or a result with the ``cache`` command and the key on a hit.
+        """
+        cwd = os.path.abspath(cwd or os.getcwd())
+        start = time.perf_counter()
+        key = self.key(script, args, options, cwd)
+        if self.restore(key, cwd) is not None:
+            print(f"The results of {script} were restored from the cache {self.directory}.")
+            return CommandResult(["cache", key], 0, time.perf_counter() - start)
+        self._detach(cwd)
+        before = _snapshot(cwd, self.directory, self.outputs)
+        result = submit()
+        if result.returncode == 0:
+            after = _snapshot(cwd, self.directory, self.outputs)
+            inputs = {os.path.normpath(script), *self._inputs(script, args, cwd)}
+            outputs = [path for path, stat in after.items() if before.get(path) != stat and path not in inputs
+                       and not any(fnmatch.fnmatch(os.path.basename(path), p) for p in IGNORED_OUTPUTS)]  # fmt: skip
+            self.store(key, sorted(outputs), result, cwd)
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        """The statistics of the store.
+
+        Returns
+        -------
+        Dict[str, Any]
+            The numbers of ``hits``, ``misses``, ``stores`` and ``evictions``, the ``hit_rate``, the ``saved_time``
+            in seconds (the recorded wall-clock time of the runs restored from the cache), the number of
+            ``entries`` and the ``size`` of the store in megabytes.
+        """
+        counts = dict(hit=0, miss=0, store=0, evict=0)
+        saved = 0.0
+        try:
+            with open(os.path.join(self.directory, "events.jsonl")) as f:
+                for line in f:
+                    try:
+                        event = json.loads(line)
+                    except ValueError:  # a line being written
+                        continue
+                    counts[event["event"]] = counts.get(event["event"], 0) + 1
+                    saved += event.get("saved", 0.0)
+        except OSError:
+            pass
+        lookups = counts["hit"] + counts["miss"]
+        entries, blobs = self._scan()
+        return dict(hits=counts["hit"], misses=counts["miss"], stores=counts["store"], evictions=counts["evict"],
+                    hit_rate=counts["hit"] / lookups if lookups else 0.0, saved_time=saved, entries=len(entries),
+                    size=sum(blobs.values()) / 1024**2)  # fmt: skip
+
+    def _scan(self) -> Tuple[List[Tuple[float, str, List[str]]], Dict[str, int]]:
+        """The entries, as last use time, key and blob hashes, and the sizes of the blobs by hash."""
+        entries = []
+        directory = os.path.join(self.directory, "entries")
+        for name in os.listdir(directory) if os.path.isdir(directory) else []:
+            try:
+                with open(os.path.join(directory, name)) as f:
+                    files = json.load(f)["files"]
+                used = os.path.getmtime(os.path.join(directory, name))
+            except (OSError, ValueError, KeyError):
+                continue
+            entries.append((used, name[: -len(".json")], [sha for _, sha, _ in files]))
+        blobs = {}
+        for root, _, names in os.walk(os.path.join(self.directory, "objects")):
+            for name in names:
+                if not name.endswith(".tmp"):
+                    blobs[name] = os.path.getsize(os.path.join(root, name))
+        return entries, blobs
+
+    def evict(self, clear: bool = False):
+        """Remove the entries older than the maximum age, then the least recently used entries until the store fits
+        in its size limit, and the blobs that no entry uses anymore.
+
+        Parameters
+        ----------
+        clear : bool, optional
+            Remove all the entries, by default False. The statistics are kept.
+        """
+        entries, blobs = self._scan()
+        references: Dict[str, int] = {}
+        for _, _, shas in entries:
+            for sha in set(shas):
+                references[sha] = references.get(sha, 0) + 1
+        size = sum(blobs.get(sha, 0) for sha in references)
+        oldest = time.time() - self.age * 86400
+        for used, key, shas in sorted(entries):
+            if not clear and used >= oldest and size <= self.size * 1024**2:
+                continue
+            os.remove(self._entry(key))
+            self._log("evict", key)
+            for sha in set(shas):
+                references[sha] -= 1
+                if not references[sha]:
+                    size -= blobs.get(sha, 0)
+        for sha in blobs:
+            if not references.get(sha):
+                os.chmod(self._blob(sha), 0o644)  # read-only files cannot be removed on Windows
+                os.remove(self._blob(sha))
+
+    def clear(self):
+        """Remove all the entries and blobs of the store, the statistics are kept."""
+        self.evict(clear=True)
@@ -1,31 +1,84 @@
 from __future__ import annotations
 
 import os
+from typing import TYPE_CHECKING, Any, Awaitable, Mapping, Sequence
 
 from typeguard import typechecked
 from typing_extensions import Self
 
+from .commands import AbqpyCommands
+
+if TYPE_CHECKING:
+    from .runner import CommandResult, LineCallback
+
 
 @typechecked
 class AbqpyCLIBase:
-    """Base class for Abaqus/CAE command line interface to run Abaqus commands."""
+    """Base class for Abaqus/CAE command line interface to run Abaqus commands.
+
+    The commands are run in a subprocess with an argument vector, i.e., without a shell, see
+    :func:`~abqpy.runner.run_command`. The keyword arguments configure how every command of this object is run.
+
+    Parameters
+    ----------
+    cwd : str, optional
+        The working directory of the commands, by default the current directory.
+    env : Mapping[str, str], optional
+        The environment variables of the commands, by default the environment of the current process.
+    timeout : float, optional
+        The time in seconds after which a command is killed, by default None, i.e., no timeout.
+    stdout, stderr : Callable[[str], None], optional
+        Callbacks called with each line of the standard output and error streams of a command, by default the
+        streams are inherited from the current process. The command line is also written to the stdout callback.
+    asynchronous : bool, optional
+        Return an awaitable from every command to run it from asyncio, see
+        :func:`~abqpy.runner.run_command_async`, by default False.
+    """
+
+    def __init__(
+        self,
+        *,
+        cwd: str | None = None,
+        env: Mapping[str, str] | None = None,
+        timeout: float | None = None,
+        stdout: LineCallback | None = None,
+        stderr: LineCallback | None = None,
+        asynchronous: bool = False,
+    ):
+        self._run_options: dict[str, Any] = dict(cwd=cwd, env=env, timeout=timeout, stdout=stdout, stderr=stderr)
+        self._asynchronous = asynchronous
 
-    def _parse_options(self, **options: str | int | bool | None) -> str:
-        """Parse options to be passed to Abaqus/CAE command line interface.
+    def _option_args(self, **options: str | int | bool | None) -> list[str]:
+        """Parse options to be passed to Abaqus/CAE command line interface into command line arguments.
 
         If the value is a string or an integer, the option will be passed as ``option=value``; if the value is a
         boolean, the option will be passed as ``option`` if True, or ignored if False; if the value is None, the option
         will be ignored.
         """
-        return " ".join([f"{k}={v}" if isinstance(v, (str, int)) and not isinstance(v, bool) else
-                         k for k, v in options.items() if v])  # fmt: skip
+        return [f"{k}={v}" if isinstance(v, (str, int)) and not isinstance(v, bool) else
+                k for k, v in options.items() if v]  # fmt: skip
+
+    def _parse_options(self, **options: str | int | bool | None) -> str:
+        """Parse options to be passed to Abaqus/CAE command line interface, see :meth:`._option_args`."""
+        return " ".join(self._option_args(**options))
+
+    def run(self, cmd: str | Sequence[str]) -> CommandResult | Awaitable[CommandResult]:
+        """Run custom command.
+
+        Parameters
+        ----------
+        cmd : str | Sequence[str]
+            The argument vector of the command, a string is split like a shell would do.
+
+        Returns
+        -------
+        CommandResult
+            The return code and timing of the command, or an awaitable of it if the object is asynchronous.
+        """
+        from .runner import run_managed, split_command
 
-    def run(self, cmd: str):
-        """Run custom command."""
-        cmd = cmd.strip()
-        message = f"Running the following command: {cmd}"
-        print("", "-" * len(message), message, "-" * len(message), sep="\n")
-        os.system(cmd)
+        args = split_command(cmd) if isinstance(cmd, str) else list(cmd)
+        return run_managed(args, self._run_options, self._asynchronous)
 
     def abaqus(self, *args, **options):
         """Run custom Abaqus command: ``abaqus {args} {options}``, arguments are separated by space, options are
@@ -37,12 +90,11 @@ class AbqpyCLIBase:
             Arguments and options to be passed to the Abaqus command.
         """
         abaqus = os.environ.get("ABAQUS_BAT_PATH", "abaqus")
-        args, options = " ".join(args), self._parse_options(**options)
-        self.run(abaqus + (f" {args}" if args else "") + (f" {options}" if options else ""))
+        return self.run([abaqus, *args, *self._option_args(**options)])
 
 
 @typechecked
-class AbqpyCLI(AbqpyCLIBase):
+class AbqpyCLI(AbqpyCLIBase, AbqpyCommands):
     """The abqpy command line interface."""
 
     @property
@@ -102,17 +154,17 @@ class AbqpyCLI(AbqpyCLIBase):
             Record the GUI commands to a file, by default None
         """
         # Parse options
-        options = self._parse_options(script=script if gui else None, noGUI=script if not gui else None,
-                                      database=database, replay=replay, recover=recover, startup=startup,
-                                      noenvstartup=not envstartup, noSavedOptions=not savedOptions,
-                                      noSavedGuiPrefs=not savedGuiPrefs, noStartupDialog=not startupDialog,
-                                      custom=custom, guiTester=guiTester,
-                                      guiRecord=True if guiRecord is True else None,
-                                      guiNoRecord=True if guiRecord is False else None)  # fmt: skip
+        options = self._option_args(script=script if gui else None, noGUI=script if not gui else None,
+                                    database=database, replay=replay, recover=recover, startup=startup,
+                                    noenvstartup=not envstartup, noSavedOptions=not savedOptions,
+                                    noSavedGuiPrefs=not savedGuiPrefs, noStartupDialog=not startupDialog,
+                                    custom=custom, guiTester=guiTester,
+                                    guiRecord=True if guiRecord is True else None,
+                                    guiNoRecord=True if guiRecord is False else None)  # fmt: skip
         args = ("--", *args) if args else ()
 
         # Execute command
-        self.abaqus("cae", options, *args)
+        return self.abaqus("cae", *options, *args)
 
     viewer = cae
 
@@ -128,9 +180,8 @@ class AbqpyCLI(AbqpyCLIBase):
         options
             Abaqus/CAE command line arguments
         """
-        cae_opts = self._parse_options(**options)
-        args = (*scripts,) + ((f"script={script}",) if script else ()) + ("-pde",) + ((cae_opts,) if cae_opts else ())
-        self.abaqus("pde", *args)
+        args = (*scripts,) + ((f"script={script}",) if script else ()) + ("-pde",) + (*self._option_args(**options),)
+        return self.abaqus("pde", *args)
 
     def python(
         self,
@@ -153,10 +204,10 @@ class AbqpyCLI(AbqpyCLIBase):
             The name of the log file to open, by default None
         """
         # Parse options
-        options = self._parse_options(sim=sim, log=log)
+        options = self._option_args(sim=sim, log=log)
 
         # Execute command
-        self.abaqus("python", script, options, *args)
+        return self.abaqus("python", script, *options, *args)
 
     @typechecked
     def optimization(
@@ -170,6 +221,7 @@ class AbqpyCLI(AbqpyCLIBase):
         interactive: bool = False,
         globalmodel: str | None = None,
         scratch: str | None = None,
+        family: str | None = None,
     ):
         """Run Abaqus optimization command.
 
@@ -190,143 +242,152 @@ class AbqpyCLI(AbqpyCLIBase):
         globalmodel : str, optional
             The name of the global model's results file, ODB output database file, or SIM database file.
         scratch : str, optional
-            The name of the directory used for scratch files.
+            The name of the directory used for scratch files, by default the scratch directory managed by abqpy if
+            :envvar:`ABQPY_SCRATCH` is set.
+        family : str, optional
+            The model family whose settings recommended by ``abqpy tune`` are used for the **cpus** and **memory**
+            that are not given, see :class:`~abqpy.tuning.TuningStore`.
         """
+        if family is not None:
+            from .tuning import TuningStore
+
+            cpus, memory = TuningStore.from_config().complete(family, cpus, memory)
+
         # Execute command
-        self.abaqus("optimization", task=task, job=job, cpus=cpus, gpus=gpus, memory=memory,
-                    interactive=interactive, globalmodel=globalmodel, scratch=scratch)  # fmt: skip
+        return self.abaqus("optimization", task=task, job=job, cpus=cpus, gpus=gpus, memory=memory,
+                           interactive=interactive, globalmodel=globalmodel, scratch=scratch)  # fmt: skip
 
     def help(self, *args, **options):
-        self.abaqus("help", *args, **options)
+        return self.abaqus("help", *args, **options)
 
     def information(self, *args, **options):
-        self.abaqus("information", *args, **options)
+        return self.abaqus("information", *args, **options)
 
     def whereami(self, *args, **options):
-        self.abaqus("whereami", *args, **options)
+        return self.abaqus("whereami", *args, **options)
 
     def cse(self, *args, **options):
-        self.abaqus("cse", *args, **options)
+        return self.abaqus("cse", *args, **options)
 
     def cosimulation(self, *args, **options):
-        self.abaqus("cosimulation", *args, **options)
+        return self.abaqus("cosimulation", *args, **options)
 
     def fmu(self, *args, **options):
-        self.abaqus("fmu", *args, **options)
+        return self.abaqus("fmu", *args, **options)
 
     def script(self, *args, **options):
-        self.abaqus("script", *args, **options)
+        return self.abaqus("script", *args, **options)
 
     def doc(self, *args, **options):
-        self.abaqus("doc", *args, **options)
+        return self.abaqus("doc", *args, **options)
 
     def licensing(self, *args, **options):
-        self.abaqus("licensing", *args, **options)
+        return self.abaqus("licensing", *args, **options)
 
     def ascfil(self, *args, **options):
-        self.abaqus("ascfil", *args, **options)
+        return self.abaqus("ascfil", *args, **options)
 
     def append(self, *args, **options):
-        self.abaqus("append", *args, **options)
+        return self.abaqus("append", *args, **options)
 
     def findkeyword(self, *args, **options):
-        self.abaqus("findkeyword", *args, **options)
+        return self.abaqus("findkeyword", *args, **options)
 
     def fetch(self, *args, **options):
-        self.abaqus("fetch", *args, **options)
+        return self.abaqus("fetch", *args, **options)
 
     def make(self, *args, **options):
-        self.abaqus("make", *args, **options)
+        return self.abaqus("make", *args, **options)
 
     def upgrade(self, *args, **options):
-        self.abaqus("upgrade", *args, **options)
+        return self.abaqus("upgrade", *args, **options)
 
     def sim_version(self, *args, **options):
-        self.abaqus("sim_version", *args, **options)
+        return self.abaqus("sim_version", *args, **options)
 
     def odb2sim(self, *args, **options):
-        self.abaqus("odb2sim", *args, **options)
+        return self.abaqus("odb2sim", *args, **options)
 
     def odbreport(self, *args, **options):
-        self.abaqus("odbReport", *args, **options)
+        return self.abaqus("odbReport", *args, **options)
 
     def restartjoin(self, *args, **options):
-        self.abaqus("restartjoin", *args, **options)
+        return self.abaqus("restartjoin", *args, **options)
 
     def substructurecombine(self, *args, **options):
-        self.abaqus("substructurecombine", *args, **options)
+        return self.abaqus("substructurecombine", *args, **options)
 
     def substructurerecover(self, *args, **options):
-        self.abaqus("substructurerecover", *args, **options)
+        return self.abaqus("substructurerecover", *args, **options)
 
     def odbcombine(self, *args, **options):
-        self.abaqus("odbcombine", *args, **options)
+        return self.abaqus("odbcombine", *args, **options)
 
     def networkDBConnector(self, *args, **options):
-        self.abaqus("networkDBConnector", *args, **options)
+        return self.abaqus("networkDBConnector", *args, **options)
 
     def emloads(self, *args, **options):
-        self.abaqus("emloads", *args, **options)
+        return self.abaqus("emloads", *args, **options)
 
     def mtxasm(self, *args, **options):
-        self.abaqus("mtxasm", *args, **options)
+        return self.abaqus("mtxasm", *args, **options)
 
     def fromnastran(self, *args, **options):
-        self.abaqus("fromnastran", *args, **options)
+        return self.abaqus("fromnastran", *args, **options)
 
     def tonastran(self, *args, **options):
-        self.abaqus("tonastran", *args, **options)
+        return self.abaqus("tonastran", *args, **options)
 
     def fromansys(self, *args, **options):
-        self.abaqus("fromansys", *args, **options)
+        return self.abaqus("fromansys", *args, **options)
 
     def frompamcrash(self, *args, **options):
-        self.abaqus("frompamcrash", *args, **options)
+        return self.abaqus("frompamcrash", *args, **options)
 
     def fromradioss(self, *args, **options):
-        self.abaqus("fromradioss", *args, **options)
+        return self.abaqus("fromradioss", *args, **options)
 
     def toOutput2(self, *args, **options):
-        self.abaqus("toOutput2", *args, **options)
+        return self.abaqus("toOutput2", *args, **options)
 
     def fromdyna(self, *args, **options):
-        self.abaqus("fromdyna", *args, **options)
+        return self.abaqus("fromdyna", *args, **options)
 
     def tozaero(self, *args, **options):
-        self.abaqus("tozaero", *args, **options)
+        return self.abaqus("tozaero", *args, **options)
 
     def adams(self, *args, **options):
-        self.abaqus("adams", *args, **options)
+        return self.abaqus("adams", *args, **options)
 
     def tosimpack(self, *args, **options):
-        self.abaqus("tosimpack", *args, **options)
+        return self.abaqus("tosimpack", *args, **options)
 
     def fromsimpack(self, *args, **options):
-        self.abaqus("fromsimpack", *args, **options)
+        return self.abaqus("fromsimpack", *args, **options)
 
     def toexcite(self, *args, **options):
-        self.abaqus("toexcite", *args, **options)
+        return self.abaqus("toexcite", *args, **options)
 
     def moldflow(self, *args, **options):
-        self.abaqus("moldflow", *args, **options)
+        return self.abaqus("moldflow", *args, **options)
 
     def encrypt(self, *args, **options):
-        self.abaqus("encrypt", *args, **options)
+        return self.abaqus("encrypt", *args, **options)
 
     def decrypt(self, *args, **options):
-        self.abaqus("decrypt", *args, **options)
+        return self.abaqus("decrypt", *args, **options)
 
     def suspend(self, *args, **options):
-        self.abaqus("suspend", *args, **options)
+        return self.abaqus("suspend", *args, **options)
 
     def resume(self, *args, **options):
-        self.abaqus("resume", *args, **options)
+        return self.abaqus("resume", *args, **options)
 
     def terminate(self, *args, **options):
-        self.abaqus("terminate", *args, **options)
+        return self.abaqus("terminate", *args, **options)
 
     def sysVerify(self, *args, **options):
-        self.abaqus("sysVerify", *args, **options)
+        return self.abaqus("sysVerify", *args, **options)
 
 
 #: The abqpy command line interface, use this object to run abqpy commands from the python scripts
@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import os
+from typing import TYPE_CHECKING, Any, Sequence
+
+#: The script that exports the field output of an output database, run with ``abaqus python``.
+ODB_EXPORT_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "odb_export.py")
+
+
+class AbqpyCommands:
+    """The commands of the abqpy command line interface that are not Abaqus commands, mixed in
+    :class:`~abqpy.cli.AbqpyCLI`.
+
+    Each command imports the module that implements it when it is run, so that importing abqpy does not import them.
+    """
+
+    if TYPE_CHECKING:
+        _run_options: dict[str, Any]
+        _asynchronous: bool
+
+        def abaqus(self, *args, **options) -> Any: ...
+
+    @property
+    def server(self):
+        """Commands of the persistent Abaqus/CAE kernel that runs scripts without starting Abaqus/CAE each time, see
+        :class:`~abqpy.server.KernelServer`, e.g., ``abqpy server run script.py [args ...]``."""
+        from .server import KernelServer
+
+        options = self._run_options
+        return KernelServer(cwd=options["cwd"], stdout=options["stdout"], stderr=options["stderr"])
+
+    @property
+    def cache(self):
+        """Commands of the result cache of :func:`~abqpy.run`, see :class:`~abqpy.cache.ResultCache`, e.g.,
+        ``abqpy cache stats``."""
+        from .cache import ResultCache
+
+        return ResultCache.from_config()
+
+    @property
+    def trace(self):
+        """Commands of the phase timings of the traced runs, see :class:`~abqpy.trace.TraceLog`, e.g.,
+        ``abqpy trace summary``."""
+        from .trace import TraceLog
+
+        return TraceLog.from_config()
+
+    @property
+    def queue(self):
+        """Commands of the local job queue shared by the users of a machine, see
+        :class:`~abqpy.scheduler.LocalQueue`, e.g., ``abqpy queue submit Job-1.inp --cpus=4``."""
+        from .scheduler import LocalQueue
+
+        return LocalQueue()
+
+    def farm(
+        self,
+        table: str,
+        script: str | None = None,
+        *,
+        directory: str = "farm",
+        workers: int | None = None,
+        cpus: int | None = None,
+        memory: float | None = None,
+        tokens: int | None = None,
+    ):
+        """Run the cases of a case table in parallel, each one in its own working directory, see
+        :class:`~abqpy.farm.JobFarm`.
+
+        Parameters
+        ----------
+        table : str
+            The CSV or JSON case table, with a row of parameters per case.
+        script : str, optional
+            The script of the cases without a ``script`` column, by default None.
+        directory : str, optional
+            The directory of the working directories of the cases, by default "farm".
+        workers : int, optional
+            The maximum number of cases running at once, by default the number of CPUs.
+        cpus : int, optional
+            The number of CPUs shared by the running cases, by default the number of CPUs.
+        memory : float, optional
+            The memory in megabytes shared by the running cases, by default unlimited.
+        tokens : int, optional
+            The number of license tokens shared by the running cases, by default unlimited.
+        """
+        from .farm import JobFarm
+
+        farm = JobFarm.from_table(table, script, directory=directory, workers=workers, cpus=cpus, memory=memory,
+                                  tokens=tokens, timeout=self._run_options["timeout"])  # fmt: skip
+        return farm.run_async() if self._asynchronous else farm.run()
+
+    def tune(
+        self,
+        input: str,
+        *,
+        family: str | None = None,
+        cpus: int | Sequence[int] | None = None,
+        domains: int | Sequence[int] | None = None,
+        memory: float | Sequence[float] | None = None,
+        increments: int = 10,
+        directory: str = "tuning",
+        budget: int | None = None,
+    ):
+        """Time short trial analyses of a model over a grid of CPU, domain and memory settings, and record the
+        fastest settings for its model family, see :class:`~abqpy.tuning.Tuner`, e.g.,
+        ``abqpy tune bracket.inp --cpus=1,2,4,8 --memory=4000,16000``.
+
+        Parameters
+        ----------
+        input : str
+            The input file of the model.
+        family : str, optional
+            The model family, by default the name of the input file without its extension and trailing digits.
+        cpus : int | Sequence[int], optional
+            The numbers of CPUs of the grid, by default the powers of two up to the number of CPUs.
+        domains : int | Sequence[int], optional
+            The numbers of domains of the grid, by default the number of CPUs.
+        memory : float | Sequence[float], optional
+            The memory settings of the grid in megabytes, by default the setting of the environment file.
+        increments : int, optional
+            The number of increments timed per trial, by default 10.
+        directory : str, optional
+            The directory of the working directories of the trials, by default "tuning".
+        budget : int, optional
+            The number of CPUs shared by the trials running at once, by default the number of CPUs.
+        """
+        from .tuning import Tuner
+
+        cwd = os.path.abspath(self._run_options["cwd"] or os.getcwd())
+        tuner = Tuner(os.path.join(cwd, input), family, cpus, domains, memory, increments, os.path.join(cwd, directory),
+                      budget, timeout=self._run_options["timeout"])  # fmt: skip
+        return tuner.run_async() if self._asynchronous else tuner.run()
+
+    @property
+    def tuning(self):
+        """Commands of the settings recommended by ``abqpy tune`` for the model families, see
+        :class:`~abqpy.tuning.TuningStore`, e.g., ``abqpy tuning best bracket``."""
+        from .tuning import TuningStore
+
+        return TuningStore.from_config()
+
+    def python_batch(self, *scripts: str, file: str | None = None, directory: str = "python-batch"):
+        """Run many Abaqus/Python scripts one after another in a single ``abaqus python`` process, see
+        :class:`~abqpy.batch.PythonBatch`, e.g., ``abqpy python-batch "post.py Job-1.odb" "post.py Job-2.odb"``.
+
+        Parameters
+        ----------
+        scripts : str
+            The command lines of the scripts, a script followed by its arguments.
+        file : str, optional
+            A text file with a command line per line, or a JSON file, with the scripts run after the **scripts**, see
+            :meth:`~abqpy.batch.PythonBatch.from_file`.
+        directory : str, optional
+            The directory of the log files of the scripts, by default "python-batch".
+        """
+        from .batch import BatchScript, PythonBatch
+
+        cwd = os.path.abspath(self._run_options["cwd"] or os.getcwd())
+        options = dict(directory=os.path.join(cwd, directory), cwd=cwd, timeout=self._run_options["timeout"],
+                       stdout=self._run_options["stdout"], stderr=self._run_options["stderr"])  # fmt: skip
+        batch = PythonBatch([BatchScript.parse(script, cwd) for script in scripts], **options)
+        if file is not None:
+            batch.scripts += PythonBatch.from_file(os.path.join(cwd, file)).scripts
+        return batch.run()
+
+    def odb_export(
+        self,
+        odb: str,
+        store: str | None = None,
+        *,
+        steps: str | Sequence[str] | None = None,
+        fields: str | Sequence[str] | None = None,
+        frames: str = "all",
+        chunk_size: float = 256,
+        mesh: bool = True,
+    ):
+        """Export the field output of an output database in one pass to a directory store of binary arrays that
+        Python can read without Abaqus, e.g., ``abqpy odb-export Job-1.odb --fields=U,S``.
+
+        The export runs in ``abaqus python`` and reads the whole data of each field output at once with
+        :attr:`~abaqus.Odb.FieldOutput.FieldOutput.bulkDataBlocks`, see :mod:`abqpy.odb_export` for the layout of
+        the store.
+
+        Parameters
+        ----------
+        odb : str
+            The output database.
+        store : str, optional
+            The directory of the store, by default the name of the output database with a ``-store`` suffix, e.g.,
+            ``Job-1-store``.
+        steps : str | Sequence[str], optional
+            The names of the steps to export, by default all of them.
+        fields : str | Sequence[str], optional
+            The names of the field outputs to export, by default all of them.
+        frames : str, optional
+            ``all`` to export all the frames of the steps, or ``last`` only the last one, by default "all".
+        chunk_size : float, optional
+            The maximum size of a chunk file in megabytes, by default 256.
+        mesh : bool, optional
+            Export the node labels and coordinates of the instances, and the node and element labels of their sets,
+            by default True.
+        """
+        store = store or f"{os.path.splitext(odb)[0]}-store"
+        options = [f"--frames={frames}", f"--chunk-size={chunk_size:g}"] + ([] if mesh else ["--no-mesh"])
+        for option, names in (("steps", steps), ("fields", fields)):
+            if names is not None:
+                options.append(f"--{option}={names if isinstance(names, str) else ','.join(names)}")
+        return self.abaqus("python", ODB_EXPORT_SCRIPT, odb, store, *options)
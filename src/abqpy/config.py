@@ -42,6 +42,29 @@ class AbaqusConfig(CompatibleBaseModel):
     debug: bool = False
     skip_abaqus: bool = False
     make_docs: bool = False
+    lazy_import: bool = False
+    inp_cache_dir: Optional[str] = None
+    inp_cache_size: int = 1024
+    inp_parse_workers: int = 0
+    server: bool = False
+    server_dir: Optional[str] = None
+    server_idle_timeout: float = 1800
+    result_cache: bool = False
+    result_cache_dir: Optional[str] = None
+    result_cache_size: float = 10240
+    result_cache_age: float = 30
+    result_cache_inputs: str = ""
+    result_cache_outputs: str = ""
+    queue_dir: Optional[str] = None
+    queue_cpus: int = 0
+    queue_memory: float = 0
+    queue_tokens: int = 0
+    trace: bool = False
+    trace_dir: Optional[str] = None
+    scratch: bool = False
+    scratch_dirs: str = ""
+    scratch_min_free: float = 10240
+    tuning_file: Optional[str] = None
     cli_traceback_limit: int = 0
 
 
@@ -96,5 +119,28 @@ config = AbaqusConfig(
     debug=os.environ.get("ABQPY_DEBUG", "false").lower() in trues,
     skip_abaqus=os.environ.get("ABQPY_SKIP_ABAQUS", "false").lower() in trues,
     make_docs=os.environ.get("ABQPY_MAKE_DOCS", "false").lower() in trues,
+    lazy_import=os.environ.get("ABQPY_LAZY_IMPORT", "false").lower() in trues,
+    inp_cache_dir=os.environ.get("ABQPY_INP_CACHE_DIR") or None,
+    inp_cache_size=int(os.environ.get("ABQPY_INP_CACHE_SIZE", 1024)),
+    inp_parse_workers=int(os.environ.get("ABQPY_INP_PARSE_WORKERS", 0)),
+    server=os.environ.get("ABQPY_SERVER", "false").lower() in trues,
+    server_dir=os.environ.get("ABQPY_SERVER_DIR") or None,
+    server_idle_timeout=float(os.environ.get("ABQPY_SERVER_IDLE_TIMEOUT", 1800)),
+    result_cache=os.environ.get("ABQPY_RESULT_CACHE", "false").lower() in trues,
+    result_cache_dir=os.environ.get("ABQPY_RESULT_CACHE_DIR") or None,
+    result_cache_size=float(os.environ.get("ABQPY_RESULT_CACHE_SIZE", 10240)),
+    result_cache_age=float(os.environ.get("ABQPY_RESULT_CACHE_AGE", 30)),
+    result_cache_inputs=os.environ.get("ABQPY_RESULT_CACHE_INPUTS", ""),
+    result_cache_outputs=os.environ.get("ABQPY_RESULT_CACHE_OUTPUTS", ""),
+    queue_dir=os.environ.get("ABQPY_QUEUE_DIR") or None,
+    queue_cpus=int(os.environ.get("ABQPY_QUEUE_CPUS", 0)),
+    queue_memory=float(os.environ.get("ABQPY_QUEUE_MEMORY", 0)),
+    queue_tokens=int(os.environ.get("ABQPY_QUEUE_TOKENS", 0)),
+    trace=os.environ.get("ABQPY_TRACE", "false").lower() in trues,
+    trace_dir=os.environ.get("ABQPY_TRACE_DIR") or None,
+    scratch=os.environ.get("ABQPY_SCRATCH", "false").lower() in trues,
+    scratch_dirs=os.environ.get("ABQPY_SCRATCH_DIRS", ""),
+    scratch_min_free=float(os.environ.get("ABQPY_SCRATCH_MIN_FREE", 10240)),
+    tuning_file=os.environ.get("ABQPY_TUNING_FILE") or None,
     cli_traceback_limit=int(os.environ.get("ABQPY_CLI_TRACEBACK_LIMIT", 0)),
 )
@@ -140,6 +140,9 @@ def add_link_in_class_or_module_docstring(
     )
 
 
+#: The pattern of the parameters section in the docstring, the link is inserted before it.
+_parameters_section = re.compile(r"(\n\s+?)(Parameters\n\s+----------)")
+
 add_link_in_class_docstring = partial(add_link_in_class_or_module_docstring, "class")
 add_link_in_module_docstring = partial(add_link_in_class_or_module_docstring, "module")
 
@@ -182,11 +185,8 @@ def add_link_in_method_or_function_docstring(
     link, link_with_label = method_or_function_link(
         type, class_or_module_name, method_or_function_name, prefix, suffix, label
     )
-    return re.sub(
-        r"(\n\s+?)(Parameters\n\s+----------)",
-        r"\1" + ".. note::\n" + " " * (8 if type == "function" else 12) + link_with_label + r"\1\2",
-        docstring,
-    )
+    note = ".. note::\n" + " " * (8 if type == "function" else 12) + link_with_label
+    return _parameters_section.sub(lambda match: match[1] + note + match[1] + match[2], docstring)
 
 
 add_link_in_method_docstring = partial(add_link_in_method_or_function_docstring, "method")
@@ -244,7 +244,7 @@ class_suffix = {
 
 def abaqus_method_doc(method):
     """Add a link to the Abaqus documentation to the docstring of the method."""
-    if method.__name__ == "__init__":
+    if method.__name__ == "__init__" or not method.__doc__:
         return method
     class_name = method.__qualname__.split(".")[0]
     method.__doc__ = add_link_in_method_docstring(
@@ -258,15 +258,36 @@ def abaqus_method_doc(method):
     return method
 
 
+class _LazyClassDocstring:
+    """A descriptor for the ``__doc__`` attribute of a class that adds the link to the Abaqus documentation on
+    first access.
+
+    Python resolves descriptors stored as the ``__doc__`` of a class both for the class and for its instances, so
+    :func:`help`, :func:`inspect.getdoc` and Sphinx see the same docstring as if it was built at import time.
+    """
+
+    __slots__ = ("cls", "docstring")
+
+    def __init__(self, cls, docstring: str):
+        self.cls = cls
+        self.docstring = docstring
+
+    def __get__(self, instance, owner=None) -> str:
+        class_name = self.cls.__name__
+        docstring = add_link_in_class_docstring(
+            class_or_module_name=_process_class_name(class_name),
+            docstring=self.docstring,
+            prefix="gpr" if class_name.lower().startswith("cae") else "",
+            suffix=class_suffix.get(class_name, ""),
+            label=class_name,
+        )
+        self.cls.__doc__ = docstring  # replace the descriptor, the link is only built once
+        return docstring
+
+
 def abaqus_class_doc(cls):
-    """Add a link to the Abaqus documentation to the docstring of the class."""
-    class_name = cls.__name__
-    processed_class_name = _process_class_name(class_name)
-    cls.__doc__ = add_link_in_class_docstring(
-        class_or_module_name=processed_class_name,
-        docstring=cls.__doc__,
-        prefix="gpr" if class_name.lower().startswith("cae") else "",
-        suffix=class_suffix.get(class_name, ""),
-        label=class_name,
-    )
+    """Add a link to the Abaqus documentation to the docstring of the class, the link is built on first access
+    of ``cls.__doc__``."""
+    if cls.__doc__:
+        cls.__doc__ = _LazyClassDocstring(cls, cls.__doc__)
     return cls
@@ -0,0 +1,294 @@
+"""Streaming envelopes of field outputs over frames, with a bounded memory, see
+:func:`~abaqus.Odb.OdbCommands.maxEnvelope` and :func:`~abaqus.Odb.OdbCommands.minEnvelope`.
+
+Instead of a list of all the field outputs, an :class:`Envelope` consumes them one frame at a time and only keeps,
+for each value of each block, the running maximum or minimum of a component or an invariant and the index of the
+frame it comes from. The field outputs can be those of a live output database in ``abaqus python`` or those of a
+store opened with :func:`abqpy.odb_store.open_store`::
+
+    from abqpy.envelopes import Envelope
+
+    envelope = Envelope("max", invariant="MISES")
+    for index, frame in enumerate(odb.steps["Step-1"].frames):
+        envelope.add(frame.fieldOutputs["S"], index)
+
+The frames of a store can also be split in chunks that are reduced in parallel and merged, see :func:`reduce_store`.
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from . import invariants
+from .odb_export import _block_array
+
+#: The key of a block: its position, instance name, element type and section point number.
+BlockKey = Tuple[str, str, str, Optional[int]]
+
+
+@dataclass
+class EnvelopeBlock:
+    """The envelope of the values of a block."""
+
+    #: The position of the values, e.g., ``NODAL`` or ``INTEGRATION_POINT``.
+    position: str
+
+    #: The name of the instance of the values.
+    instance: str
+
+    #: The element type of the values.
+    elementType: str
+
+    #: The number of the section point of the values, None if they have none.
+    sectionPoint: Optional[int]
+
+    #: The node labels of the values, None if they are not nodal.
+    nodeLabels: Optional[np.ndarray]
+
+    #: The element labels of the values, None if they are nodal.
+    elementLabels: Optional[np.ndarray]
+
+    #: The integration points of the values, None if they have none.
+    integrationPoints: Optional[np.ndarray]
+
+    #: The maximum or minimum of each value over the frames.
+    values: np.ndarray
+
+    #: The index of the frame of the maximum or minimum of each value.
+    index: np.ndarray
+
+    @property
+    def key(self) -> BlockKey:
+        return self.position, self.instance, self.elementType, self.sectionPoint
+
+
+def _labels(block: Any, name: str) -> Optional[np.ndarray]:
+    labels = _block_array(block, name)
+    if labels is None:
+        return None
+    labels = np.array(labels)  # a copy, not a view of a store
+    return labels if labels.size else None
+
+
+class Envelope:
+    """The envelope of a field output over frames.
+
+    Parameters
+    ----------
+    criterion : str, optional
+        ``max`` for the maximum, ``min`` for the minimum, by default "max".
+    invariant : str, optional
+        The invariant of the values to compare, e.g., ``MISES``, see :mod:`abqpy.invariants`.
+    componentLabel : str, optional
+        The component of the values to compare, e.g., ``S11``. The values must be scalar if neither an invariant nor
+        a component is given.
+    """
+
+    def __init__(self, criterion: str = "max", invariant: Optional[str] = None, componentLabel: Optional[str] = None):
+        if criterion not in ("max", "min"):
+            raise ValueError(f"Expected the criterion max or min, got {criterion!r}")
+        if invariant is not None and componentLabel is not None:
+            raise ValueError("Expected either an invariant or a component label")
+        self.criterion = criterion
+        self.invariant = None if invariant is None else str(invariant)
+        self.componentLabel = componentLabel
+
+        #: The envelopes of the blocks, by :attr:`EnvelopeBlock.key`.
+        self.blocks: Dict[BlockKey, EnvelopeBlock] = {}
+
+        #: The number of field outputs added.
+        self.count = 0
+
+    def _values(self, block: Any, data: np.ndarray, name: str) -> np.ndarray:
+        """The values of a block that are compared."""
+        data = np.asarray(data)
+        data = data.reshape(len(data), int(np.prod(data.shape[1:])))  # -1 cannot be inferred for an empty block
+        labels = tuple(block.componentLabels)
+        if self.invariant is not None:
+            strain = name in invariants.STRAIN_FIELDS
+            return invariants.invariant(self.invariant, data, labels, str(block.type), strain)
+        if self.componentLabel is not None:
+            if self.componentLabel not in labels:
+                raise ValueError(f"The field output {name} has no component {self.componentLabel}")
+            return data[:, labels.index(self.componentLabel)]
+        if data.shape[1] != 1:
+            raise ValueError(f"The field output {name} is not scalar, expected an invariant or a component label")
+        return data[:, 0]
+
+    def _better(self, values: np.ndarray, current: np.ndarray) -> np.ndarray:
+        return values > current if self.criterion == "max" else values < current
+
+    def add(self, fieldOutput: Any, index: int) -> Envelope:
+        """Add the values of the field output of a frame.
+
+        Parameters
+        ----------
+        fieldOutput
+            The field output, of an output database or of a store.
+        index : int
+            The index of the frame, the earliest frame is kept if the values are equal.
+
+        Returns
+        -------
+        Envelope
+            The envelope itself.
+        """
+        for block in fieldOutput.bulkDataBlocks:
+            data = _block_array(block, "data")  # read once, the data of an output database are copied
+            if data is None:
+                continue
+            values = self._values(block, data, fieldOutput.name)
+            instance = block.instance.name if block.instance is not None else ""
+            section_point = block.sectionPoint.number if block.sectionPoint is not None else None
+            key = (str(block.position), instance, block.elementType or "", section_point)
+            current = self.blocks.get(key)
+            if current is None:
+                self.blocks[key] = EnvelopeBlock(
+                    *key,
+                    nodeLabels=_labels(block, "nodeLabels"),
+                    elementLabels=_labels(block, "elementLabels"),
+                    integrationPoints=_labels(block, "integrationPoints"),
+                    values=values.astype(np.float64),
+                    index=np.full(len(values), index, dtype=np.int32),
+                )
+                continue
+            if len(values) != len(current.values):
+                raise ValueError(f"The number of values of the {key} block of {fieldOutput.name} changed at {index}")
+            better = self._better(values, current.values)
+            current.values[better] = values[better]
+            current.index[better] = index
+        self.count += 1
+        return self
+
+    def merge(self, other: Envelope) -> Envelope:
+        """Merge the envelope of other frames into this one, the earliest frame is kept if the values are equal.
+
+        Returns
+        -------
+        Envelope
+            The envelope itself.
+        """
+        for key, block in other.blocks.items():
+            current = self.blocks.get(key)
+            if current is None:
+                self.blocks[key] = block
+                continue
+            if len(block.values) != len(current.values):
+                raise ValueError(f"The number of values of the {key} block differ")
+            equal = (block.values == current.values) & (block.index < current.index)
+            better = self._better(block.values, current.values) | equal
+            current.values[better] = block.values[better]
+            current.index[better] = block.index[better]
+        self.count += other.count
+        return self
+
+    def __iter__(self):
+        return iter(self.blocks.values())
+
+    def __str__(self) -> str:
+        name = self.invariant or self.componentLabel or "value"
+        values = [block.values for block in self.blocks.values()]
+        extreme = getattr(np, self.criterion)(np.concatenate(values)) if values else float("nan")
+        return f"{self.criterion.capitalize()} {name} of {self.count} frames: {extreme:g}"
+
+
+def maxEnvelope(fieldOutputs: Iterable[Any], invariant: Optional[str] = None,
+                componentLabel: Optional[str] = None) -> Envelope:  # fmt: skip
+    """The maximum envelope of field outputs, consumed one at a time, see
+    :func:`~abaqus.Odb.OdbCommands.maxEnvelope`. The index of a value is that of its field output in the
+    sequence."""
+    envelope = Envelope("max", invariant, componentLabel)
+    for index, fieldOutput in enumerate(fieldOutputs):
+        envelope.add(fieldOutput, index)
+    return envelope
+
+
+def minEnvelope(fieldOutputs: Iterable[Any], invariant: Optional[str] = None,
+                componentLabel: Optional[str] = None) -> Envelope:  # fmt: skip
+    """The minimum envelope of field outputs, consumed one at a time, see
+    :func:`~abaqus.Odb.OdbCommands.minEnvelope`. The index of a value is that of its field output in the
+    sequence."""
+    envelope = Envelope("min", invariant, componentLabel)
+    for index, fieldOutput in enumerate(fieldOutputs):
+        envelope.add(fieldOutput, index)
+    return envelope
+
+
+def _reduce_frames(store: str, name: str, criterion: str, invariant: Optional[str], componentLabel: Optional[str],
+                   frames: Sequence[Tuple[str, int]], start: int) -> Envelope:  # fmt: skip
+    """The envelope of a chunk of frames of a store, the frames are indexed from **start**."""
+    from .odb_store import open_store
+
+    envelope = Envelope(criterion, invariant, componentLabel)
+    with open_store(store) as odb:
+        for index, (step, frame) in enumerate(frames, start):
+            # Only the data of the frame being added are read, the memory used is that of the envelope
+            fieldOutputs = odb.steps[step].frames[frame].fieldOutputs
+            if name in fieldOutputs:
+                envelope.add(fieldOutputs[name], index)
+    return envelope
+
+
+def reduce_store(
+    store: str,
+    name: str,
+    criterion: str = "max",
+    invariant: Optional[str] = None,
+    componentLabel: Optional[str] = None,
+    steps: Optional[Sequence[str]] = None,
+    workers: int = 1,
+    chunks: Optional[int] = None,
+) -> Tuple[Envelope, List[Tuple[str, int]]]:
+    """The envelope of a field output over the frames of a store, reduced in parallel.
+
+    The frames are split in contiguous chunks, each reduced by a worker process that opens the store and streams its
+    frames, and the envelopes of the chunks are merged in order.
+
+    Parameters
+    ----------
+    store : str
+        The directory of the store.
+    name : str
+        The name of the field output, e.g., ``S``.
+    criterion : str, optional
+        ``max`` for the maximum, ``min`` for the minimum, by default "max".
+    invariant : str, optional
+        The invariant of the values to compare, e.g., ``MISES``.
+    componentLabel : str, optional
+        The component of the values to compare, e.g., ``S11``.
+    steps : Sequence[str], optional
+        The names of the steps, by default all of them.
+    workers : int, optional
+        The number of worker processes, by default 1 to reduce the frames in this process.
+    chunks : int, optional
+        The number of chunks of frames, by default the number of workers.
+
+    Returns
+    -------
+    Tuple[Envelope, List[Tuple[str, int]]]
+        The envelope, and the step name and frame index of each index of the envelope.
+    """
+    from .odb_store import open_store
+
+    with open_store(store) as odb:
+        frames = [(step.name, i) for step in odb.steps.values() if steps is None or step.name in steps
+                  for i in range(len(step.frames))]  # fmt: skip
+    count = max(1, min(len(frames), chunks or workers))
+    bounds = [len(frames) * i // count for i in range(count + 1)]
+    arguments = [
+        (store, name, criterion, invariant, componentLabel, frames[start:stop], start)
+        for start, stop in zip(bounds, bounds[1:])
+    ]
+    if workers > 1:
+        with ProcessPoolExecutor(workers) as executor:
+            partials = list(executor.map(_reduce_frames, *zip(*arguments)))
+    else:
+        partials = [_reduce_frames(*args) for args in arguments]
+    envelope = Envelope(criterion, invariant, componentLabel)
+    for partial in partials:
+        envelope.merge(partial)
+    return envelope, frames
@@ -0,0 +1,321 @@
+from __future__ import annotations
+
+import asyncio
+import csv
+import json
+import os
+import re
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional, Sequence
+
+from .cli import AbqpyCLI
+from .runner import CommandResult
+
+#: The case table columns that are not script parameters.
+CASE_COLUMNS = ("name", "script", "mode", "cpus", "memory", "tokens")
+
+
+def license_tokens(cpus: int) -> int:
+    """The number of Abaqus analysis license tokens of a job with the given number of CPUs, ``int(5 * cpus**0.422)``."""
+    return int(5 * cpus**0.422)
+
+
+def _value(text: str) -> Any:
+    """Convert a case table cell to an int or a float if possible."""
+    for convert in (int, float):
+        try:
+            return convert(text)
+        except ValueError:
+            pass
+    return text
+
+
+def _cast(key: str, value: Any) -> Any:
+    """Cast a case table cell to the type of the case attribute."""
+    if key in ("cpus", "tokens"):
+        return int(value)
+    if key == "memory":
+        return float(value)
+    return str(value)
+
+
+@dataclass
+class Case:
+    """A case of a :class:`JobFarm`: a script run with a set of parameters in its own working directory.
+
+    The script is run in the ``<farm directory>/<name>`` directory, with the parameters passed as ``key=value``
+    command line arguments and written to a ``parameters.json`` file. The ``ABQPY_FARM_CASE``, ``ABQPY_FARM_CPUS``
+    and ``ABQPY_FARM_MEMORY`` environment variables hold the name, the CPUs and the memory of the case.
+    """
+
+    #: The name of the case, also the name of its working directory.
+    name: str
+
+    #: The path of the script, or of the input file in the ``job`` mode.
+    script: str
+
+    #: The parameters of the case.
+    parameters: Dict[str, Any] = field(default_factory=dict)
+
+    #: How the script is run: ``cae`` (``abaqus cae noGUI=script``), ``python`` (``abaqus python script``) or
+    #: ``job`` (``abaqus job=name input=script cpus=cpus memory=memory interactive``).
+    mode: str = "cae"
+
+    #: The number of CPUs the case uses.
+    cpus: int = 1
+
+    #: The memory the case uses in megabytes, 0 if it is not accounted.
+    memory: float = 0
+
+    #: The number of license tokens the case uses, by default computed from the CPUs by :func:`license_tokens`.
+    tokens: Optional[int] = None
+
+    def __post_init__(self):
+        if self.mode not in ("cae", "python", "job"):
+            raise ValueError(f"Expected the mode cae, python or job, got {self.mode!r}")
+        if not re.fullmatch(r"[\w.\-=,+]+", self.name):
+            raise ValueError(f"The case name {self.name!r} is not a valid directory name")
+        if self.tokens is None:
+            self.tokens = license_tokens(self.cpus)
+
+    def arguments(self) -> List[Any]:
+        """The method of :class:`~abqpy.cli.AbqpyCLI` and its arguments that run the case."""
+        parameters = [f"{key}={value}" for key, value in self.parameters.items()]
+        if self.mode == "cae":
+            return ["cae", self.script, *parameters]
+        if self.mode == "python":
+            return ["python", self.script, *parameters]
+        options = [f"job={self.name}", f"input={self.script}", f"cpus={self.cpus}", "interactive"]
+        if self.memory:
+            options.append(f"memory={self.memory:g} mb")
+        return ["abaqus", *options]
+
+
+@dataclass
+class CaseResult:
+    """The result of a :class:`Case`."""
+
+    #: The case.
+    case: Case
+
+    #: The working directory of the case.
+    directory: str
+
+    #: The result of the Abaqus command, None if the case could not be run.
+    result: Optional[CommandResult] = None
+
+    #: The reason why the case could not be run.
+    error: str = ""
+
+    @property
+    def returncode(self) -> int:
+        """The return code of the Abaqus command, -1 if the case could not be run."""
+        return self.result.returncode if self.result is not None else -1
+
+
+@dataclass
+class FarmResult:
+    """The results of the cases of a :class:`JobFarm`, in the order of the cases."""
+
+    #: The results of the cases.
+    results: List[CaseResult]
+
+    #: The wall-clock time of the whole farm in seconds.
+    wall_time: float = 0.0
+
+    @property
+    def returncode(self) -> int:
+        """0 if all the cases succeeded, 1 otherwise."""
+        return int(any(result.returncode != 0 for result in self.results))
+
+    def __str__(self) -> str:
+        lines = [f"{'case':<24}{'code':>6}{'wall [s]':>10}{'cpu [s]':>10}  error"]
+        for r in self.results:
+            wall = f"{r.result.wall_time:.1f}" if r.result else "-"
+            cpu = f"{r.result.cpu_time:.1f}" if r.result and r.result.cpu_time is not None else "-"
+            error = r.error or ("timed out" if r.result and r.result.timed_out else "")
+            lines.append(f"{r.case.name:<24}{r.returncode:>6}{wall:>10}{cpu:>10}  {error}")
+        failed = sum(result.returncode != 0 for result in self.results)
+        lines.append(f"\n{len(self.results) - failed} of {len(self.results)} cases succeeded in {self.wall_time:.1f} s")
+        return "\n".join(lines)
+
+
+class JobFarm:
+    """Run many cases of Abaqus scripts in parallel, within a budget of workers, CPUs, memory and license tokens.
+
+    A case is started as soon as a worker is free and its CPUs, memory and license tokens fit in what the running
+    cases leave of the budgets. Cases are started in their order, a case that does not fit yet lets the following
+    cases that fit start first. The output of each case is written to the ``abqpy.log`` file in its working
+    directory, and the results of all the cases to the ``farm.json`` file in the farm directory. A case that cannot
+    be run, e.g., because its command is not found, fails with its error instead of stopping the farm.
+
+    The CPUs and the memory of a case are only passed to Abaqus in the ``job`` mode, as the ``cpus`` and ``memory``
+    options. In the ``cae`` and ``python`` modes they only reserve the budgets, and are passed to the script in the
+    ``ABQPY_FARM_CPUS`` and ``ABQPY_FARM_MEMORY`` environment variables, e.g., for the ``numCpus`` and ``memory`` of
+    the jobs it submits.
+
+    Parameters
+    ----------
+    cases : Sequence[Case]
+        The cases.
+    directory : str, optional
+        The directory of the working directories of the cases, by default "farm".
+    workers : int, optional
+        The maximum number of cases running at once, by default the number of CPUs.
+    cpus : int, optional
+        The number of CPUs shared by the running cases, by default the number of CPUs.
+    memory : float, optional
+        The memory in megabytes shared by the running cases, by default None, i.e., unlimited.
+    tokens : int, optional
+        The number of license tokens shared by the running cases, by default None, i.e., unlimited.
+    timeout : float, optional
+        The time in seconds after which a case is killed, by default None, i.e., no timeout.
+    """
+
+    def __init__(
+        self,
+        cases: Sequence[Case],
+        directory: str = "farm",
+        workers: Optional[int] = None,
+        cpus: Optional[int] = None,
+        memory: Optional[float] = None,
+        tokens: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ):
+        names = [case.name for case in cases]
+        if len(set(names)) != len(names):
+            raise ValueError("The case names must be unique")
+        self.cases = list(cases)
+        self.directory = os.path.abspath(directory)
+        self.workers = workers or os.cpu_count() or 1
+        self.cpus = cpus or os.cpu_count() or 1
+        self.memory = memory
+        self.tokens = tokens
+        self.timeout = timeout
+
+    @classmethod
+    def from_table(cls, table: str, script: Optional[str] = None, **kwargs) -> JobFarm:
+        """Create a job farm from a case table.
+
+        The table is a CSV file with a header row, or a JSON file with a list of objects. The ``name``, ``script``,
+        ``mode``, ``cpus``, ``memory`` and ``tokens`` columns (or keys) are the attributes of the :class:`Case`
+        objects, the other columns are their parameters (JSON objects can also have a ``parameters`` key).
+        Relative script paths are relative to the directory of the table.
+
+        Parameters
+        ----------
+        table : str
+            The path of the case table.
+        script : str, optional
+            The script of the cases without a ``script`` column, relative to the current directory.
+        kwargs
+            The other arguments of :class:`JobFarm`.
+        """
+        with open(table, newline="") as f:
+            if table.lower().endswith(".json"):
+                rows = json.load(f)
+            else:
+                rows = [{key: _value(value) for key, value in row.items() if value != ""} for row in csv.DictReader(f)]
+        cases = []
+        for i, row in enumerate(rows):
+            attributes = {key: row[key] for key in CASE_COLUMNS if key in row}
+            parameters = {key: value for key, value in row.items() if key not in CASE_COLUMNS + ("parameters",)}
+            parameters.update(row.get("parameters", {}))
+            if "script" in attributes:
+                attributes["script"] = os.path.join(os.path.dirname(os.path.abspath(table)), attributes["script"])
+            elif script is not None:
+                attributes["script"] = os.path.abspath(script)
+            else:
+                raise ValueError(f"The case {i} has no script")
+            attributes.setdefault("name", f"case-{i}")
+            cases.append(Case(parameters=parameters, **{key: _cast(key, value) for key, value in attributes.items()}))
+        return cls(cases, **kwargs)
+
+    def _fits(self, case: Case, running: List[Case]) -> bool:
+        """Whether a case fits in the budgets left by the running cases."""
+        if len(running) >= self.workers or sum(c.cpus for c in running) + case.cpus > self.cpus:
+            return False
+        if self.memory is not None and sum(c.memory for c in running) + case.memory > self.memory:
+            return False
+        return self.tokens is None or sum(c.tokens or 0 for c in running) + (case.tokens or 0) <= self.tokens
+
+    def _impossible(self, case: Case) -> str:
+        """The reason why a case can never run within the budgets, an empty string if it can."""
+        if case.cpus > self.cpus:
+            return f"needs {case.cpus} CPUs of {self.cpus}"
+        if self.memory is not None and case.memory > self.memory:
+            return f"needs {case.memory} MB of {self.memory} MB memory"
+        if self.tokens is not None and (case.tokens or 0) > self.tokens:
+            return f"needs {case.tokens} license tokens of {self.tokens}"
+        return ""
+
+    async def _run_case(self, case: Case) -> CaseResult:
+        directory = os.path.join(self.directory, case.name)
+        try:
+            os.makedirs(directory, exist_ok=True)
+            with open(os.path.join(directory, "parameters.json"), "w") as f:
+                json.dump(case.parameters, f, indent=4)
+            env = dict(os.environ, ABQPY_FARM_CASE=case.name, ABQPY_FARM_CPUS=str(case.cpus))
+            env["ABQPY_FARM_MEMORY"] = f"{case.memory:g}"
+            with open(os.path.join(directory, "abqpy.log"), "w") as log:
+                cli = AbqpyCLI(
+                    cwd=directory, env=env, timeout=self.timeout, stdout=log.write, stderr=log.write, asynchronous=True
+                )
+                method, *args = case.arguments()
+                result = await getattr(cli, method)(*args)
+        except Exception as e:  # a case that fails does not stop the others
+            return CaseResult(case, directory, error=repr(e))
+        return CaseResult(case, directory, result)
+
+    async def run_async(self) -> FarmResult:
+        """Run the cases from asyncio.
+
+        Returns
+        -------
+        FarmResult
+            The results of the cases.
+        """
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        results: Dict[int, CaseResult] = {}
+        pending = []
+        for i, case in enumerate(self.cases):
+            reason = self._impossible(case)
+            if reason:
+                results[i] = CaseResult(case, os.path.join(self.directory, case.name), error=reason)
+            else:
+                pending.append(i)
+        running: Dict[asyncio.Task, int] = {}
+        while pending or running:
+            for i in list(pending):
+                if self._fits(self.cases[i], [self.cases[j] for j in running.values()]):
+                    pending.remove(i)
+                    running[asyncio.ensure_future(self._run_case(self.cases[i]))] = i
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                results[running.pop(task)] = task.result()
+        farm = FarmResult([results[i] for i in range(len(self.cases))], loop.time() - start)
+        self._write(farm)
+        return farm
+
+    def run(self) -> FarmResult:
+        """Run the cases.
+
+        Returns
+        -------
+        FarmResult
+            The results of the cases.
+        """
+        return asyncio.run(self.run_async())
+
+    def _write(self, farm: FarmResult):
+        """Write the results of the cases to the ``farm.json`` file."""
+        os.makedirs(self.directory, exist_ok=True)
+        summary = []
+        for result in farm.results:
+            case = dict(asdict(result.case), directory=result.directory, returncode=result.returncode)
+            if result.result is not None:
+                case.update(asdict(result.result), args=None)
+            summary.append(dict(case, error=result.error))
+        with open(os.path.join(self.directory, "farm.json"), "w") as f:
+            json.dump(dict(wall_time=farm.wall_time, cases=summary), f, indent=4)
@@ -0,0 +1,171 @@
+"""Vectorized invariants of the vector and tensor values of a field output, see
+:meth:`abqpy.odb_store.FieldOutput.getScalarField`.
+
+The values of a block are an array with one row per value and one column per component. The components of a tensor
+are identified by the last two digits of their labels, e.g., ``S11`` or ``LE23``, so that all the tensor types
+(``TENSOR_3D_FULL``, ``TENSOR_3D_PLANAR``, ``TENSOR_3D_SURFACE``, ``TENSOR_2D_PLANAR`` and ``TENSOR_2D_SURFACE``)
+are handled alike, the components they do not have being zero. The invariants are computed for all the values at
+once in double precision, the principal values in closed form from the invariants of the tensors.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Optional, Sequence
+
+import numpy as np
+
+#: The invariants, by the names of their SymbolicConstants.
+INVARIANTS = (
+    "MAGNITUDE",
+    "MISES",
+    "TRESCA",
+    "PRESS",
+    "INV3",
+    "MAX_PRINCIPAL",
+    "MID_PRINCIPAL",
+    "MIN_PRINCIPAL",
+    "MAX_INPLANE_PRINCIPAL",
+    "MIN_INPLANE_PRINCIPAL",
+    "OUTOFPLANE_PRINCIPAL",
+)
+
+#: The field outputs of strains, whose shear components are engineering shear strains: they are halved before the
+#: invariants are computed.
+STRAIN_FIELDS = ("E", "LE", "NE", "PE", "EE", "IE", "THE", "ER", "CE", "VE")
+
+#: The indices of the components of a tensor in the rows ``11, 22, 33, 12, 13, 23`` of :func:`components`.
+INDICES = {(1, 1): 0, (2, 2): 1, (3, 3): 2, (1, 2): 3, (2, 1): 3, (1, 3): 4, (3, 1): 4, (2, 3): 5, (3, 2): 5}
+
+
+def components(data: np.ndarray, labels: Sequence[str], engineering_shear: bool = False) -> np.ndarray:
+    """The components ``11, 22, 33, 12, 13, 23`` of tensor values.
+
+    Parameters
+    ----------
+    data : np.ndarray
+        The values, one row per value and one column per component.
+    labels : Sequence[str]
+        The labels of the components, e.g., ``("S11", "S22", "S12")``.
+    engineering_shear : bool, optional
+        Whether the shear components are engineering shear strains, which are halved, by default False.
+
+    Returns
+    -------
+    np.ndarray
+        The components in double precision, 6 rows and one column per value, zero for the missing components.
+    """
+    result = np.zeros((6, len(data)))
+    for column, label in enumerate(labels):
+        match = re.search(r"(\d)(\d)$", label)
+        if match is None or (int(match.group(1)), int(match.group(2))) not in INDICES:
+            raise ValueError(f"{label} is not the label of a component of a tensor")
+        row = INDICES[int(match.group(1)), int(match.group(2))]
+        result[row] = data[:, column]
+        if engineering_shear and row > 2:
+            result[row] *= 0.5
+    return result
+
+
+def press(c: np.ndarray) -> np.ndarray:
+    """The pressure, minus the mean of the direct components."""
+    return -(c[0] + c[1] + c[2]) / 3
+
+
+def mises(c: np.ndarray) -> np.ndarray:
+    """The von Mises equivalent value, ``sqrt(3/2 s:s)`` with ``s`` the deviatoric part."""
+    direct = (c[0] - c[1]) ** 2 + (c[1] - c[2]) ** 2 + (c[2] - c[0]) ** 2
+    return np.sqrt(0.5 * direct + 3 * (c[3] ** 2 + c[4] ** 2 + c[5] ** 2))
+
+
+def inv3(c: np.ndarray) -> np.ndarray:
+    """The third invariant, ``(9/2 s.s:s)^(1/3)`` with ``s`` the deviatoric part."""
+    mean = (c[0] + c[1] + c[2]) / 3
+    s11, s22, s33 = c[0] - mean, c[1] - mean, c[2] - mean
+    determinant = s11 * s22 * s33 + 2 * c[3] * c[4] * c[5] - s11 * c[5] ** 2 - s22 * c[4] ** 2 - s33 * c[3] ** 2
+    # s.s:s is 3 det(s) for a deviatoric tensor
+    return np.cbrt(13.5 * determinant)
+
+
+def principals(c: np.ndarray) -> np.ndarray:
+    """The principal values, one row per value, in ascending order.
+
+    They are the roots of the characteristic polynomial, computed in closed form with the trigonometric solution
+    for symmetric matrices, which is an order of magnitude faster than :func:`numpy.linalg.eigvalsh` on a stack of
+    matrices, with an absolute error of about 1e-8 times the magnitude of the tensor for repeated roots.
+    """
+    mean = (c[0] + c[1] + c[2]) / 3
+    s11, s22, s33 = c[0] - mean, c[1] - mean, c[2] - mean
+    shear = c[3] ** 2 + c[4] ** 2 + c[5] ** 2
+    # The radius of the Mohr circle of the deviator, and the cosine of three times the Lode angle
+    radius = np.sqrt((s11**2 + s22**2 + s33**2 + 2 * shear) / 6)
+    determinant = s11 * s22 * s33 + 2 * c[3] * c[4] * c[5] - s11 * c[5] ** 2 - s22 * c[4] ** 2 - s33 * c[3] ** 2
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cosine = np.where(radius > 0, determinant / (2 * radius**3), 0.0)
+    angle = np.arccos(np.clip(cosine, -1, 1)) / 3
+    maximum = mean + 2 * radius * np.cos(angle)
+    minimum = mean + 2 * radius * np.cos(angle + 2 * np.pi / 3)
+    return np.stack([minimum, 3 * mean - maximum - minimum, maximum], axis=1)
+
+
+def inplane_principals(c: np.ndarray) -> np.ndarray:
+    """The principal values in the 1-2 plane, one row per value, in ascending order."""
+    center = (c[0] + c[1]) / 2
+    radius = np.hypot((c[0] - c[1]) / 2, c[3])
+    return np.stack([center - radius, center + radius], axis=1)
+
+
+def invariant(
+    name: str,
+    data: np.ndarray,
+    labels: Sequence[str],
+    type: Optional[str] = None,
+    engineering_shear: bool = False,
+) -> np.ndarray:
+    """An invariant of vector or tensor values.
+
+    Parameters
+    ----------
+    name : str
+        The invariant, one of :data:`INVARIANTS`.
+    data : np.ndarray
+        The values, one row per value and one column per component.
+    labels : Sequence[str]
+        The labels of the components.
+    type : str, optional
+        The type of the values, e.g., ``VECTOR`` or ``TENSOR_3D_FULL``. The in-plane principal values are not defined
+        for ``TENSOR_3D_FULL`` values, by default they are computed.
+    engineering_shear : bool, optional
+        Whether the shear components are engineering shear strains, by default False.
+
+    Returns
+    -------
+    np.ndarray
+        The invariant of each value, in double precision.
+    """
+    name = str(name)
+    if name not in INVARIANTS:
+        raise ValueError(f"Unknown invariant {name}, expected one of {', '.join(INVARIANTS)}")
+    data = np.asarray(data)
+    data = data.reshape(len(data), int(np.prod(data.shape[1:])))  # -1 cannot be inferred for an empty block
+    if name == "MAGNITUDE":
+        return np.sqrt(np.einsum("ij,ij->i", data, data, dtype=np.float64))
+    if type is not None and not str(type).startswith("TENSOR"):
+        raise ValueError(f"The invariant {name} is only defined for tensors, not for {type} values")
+    if type is not None and str(type) == "TENSOR_3D_FULL" and "PLANE" in name:
+        raise ValueError(f"The invariant {name} is not defined for TENSOR_3D_FULL values")
+    c = components(data, labels, engineering_shear)
+    if name == "MISES":
+        return mises(c)
+    if name == "PRESS":
+        return press(c)
+    if name == "INV3":
+        return inv3(c)
+    if name == "OUTOFPLANE_PRINCIPAL":
+        return c[2].copy()
+    if "INPLANE" in name:
+        return inplane_principals(c)[:, 1 if name.startswith("MAX") else 0]
+    values = principals(c)
+    if name == "TRESCA":
+        return values[:, 2] - values[:, 0]
+    return values[:, {"MIN_PRINCIPAL": 0, "MID_PRINCIPAL": 1, "MAX_PRINCIPAL": 2}[name]]
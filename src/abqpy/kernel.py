@@ -0,0 +1,292 @@
+"""The request loop of the persistent Abaqus kernel, see :class:`abqpy.server.KernelServer`.
+
+This script runs in the Python interpreter of Abaqus/CAE (``abaqus cae noGUI=kernel.py -- <state file> <idle
+timeout>``), so it only uses the standard library and is compatible with both Python 2.7 and Python 3. It can also be
+run with any Python interpreter as a stand-in kernel, to test the server without Abaqus.
+
+The kernel listens on a local TCP port, written with an authentication token to the state file, and runs one script
+per connection. The messages are JSON objects, one per line:
+
+- request: ``{"token": ..., "script": ..., "args": [...], "cwd": ..., "database": ..., "startup": ...}``, where the
+  model database to open and the startup script to run before the script are optional, or
+  ``{"token": ..., "command": "ping"}`` and ``{"token": ..., "command": "stop"}``;
+- replies: ``{"event": "start"}``, then ``{"event": "stdout", "data": ...}`` and ``{"event": "stderr", "data": ...}``
+  for each line of output, and finally ``{"event": "exit", "code": ...}``.
+
+Each script runs in a fresh ``__main__`` namespace with its own ``sys.argv`` and working directory. After each
+script, the model database is replaced by a new one (``Mdb()``), the output databases opened by the script are closed
+and the modules it imported from its directory are unloaded, so that no state leaks into the next script.
+
+With ``abaqus python kernel.py --batch <manifest>``, the kernel runs the scripts listed in a JSON manifest one after
+another and exits, see :class:`abqpy.batch.PythonBatch`. The output of each script is written to its log file, and
+the kernel prints a line ``BATCH_PREFIX {"event": "start" | "exit", "index": ..., ...}`` before and after each script.
+"""
+
+from __future__ import print_function
+
+import json
+import os
+import socket
+import sys
+import time
+import traceback
+import uuid
+
+try:
+    import builtins
+except ImportError:  # Python 2.7
+    import __builtin__ as builtins  # type: ignore[no-redef]
+
+
+#: The prefix of the lines of the batch events, to tell them apart from the output of the scripts.
+BATCH_PREFIX = "##abqpy-batch## "
+
+
+class _Connection(object):
+    """A connection to a client, sending JSON messages one per line."""
+
+    def __init__(self, sock):
+        self.sock = sock
+        self.reader = sock.makefile("rb")
+        self.closed = False
+
+    def receive(self):
+        line = self.reader.readline()
+        return json.loads(line.decode("utf-8")) if line else None
+
+    def send(self, **message):
+        if self.closed:
+            return
+        data = json.dumps(message) + "\n"
+        if not isinstance(data, bytes):
+            data = data.encode("utf-8")
+        try:
+            self.sock.sendall(data)
+        except (IOError, OSError):  # the client has gone, let the script finish anyway
+            self.closed = True
+
+    def close(self):
+        try:
+            self.reader.close()
+            self.sock.close()
+        except (IOError, OSError):
+            pass
+
+
+class _Stream(object):
+    """A file-like object that sends the lines written to it to the client."""
+
+    encoding = "utf-8"
+
+    def __init__(self, connection, name):
+        self.connection = connection
+        self.name = name
+        self.buffer = ""
+
+    def write(self, text):
+        if isinstance(text, bytes):
+            text = text.decode("utf-8", "replace")
+        self.buffer += text
+        if "\n" in self.buffer:
+            lines, self.buffer = self.buffer.rsplit("\n", 1)
+            for line in lines.split("\n"):
+                self.connection.send(event=self.name, data=line + "\n")
+
+    def writelines(self, lines):
+        for line in lines:
+            self.write(line)
+
+    def flush(self):
+        if self.buffer:
+            self.connection.send(event=self.name, data=self.buffer)
+            self.buffer = ""
+
+    def isatty(self):
+        return False
+
+
+class _LogFile(object):
+    """A file-like object that writes text to a log file in UTF-8, from both Python 2.7 and Python 3."""
+
+    encoding = "utf-8"
+
+    def __init__(self, path):
+        self.file = open(path, "wb")
+
+    def write(self, text):
+        if not isinstance(text, bytes):
+            text = text.encode("utf-8")
+        self.file.write(text)
+
+    def writelines(self, lines):
+        for line in lines:
+            self.write(line)
+
+    def flush(self):
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+    def isatty(self):
+        return False
+
+
+def _run(script, args, cwd, database=None, startup=None):
+    """Run a script as ``__main__``, after opening a model database and running a startup script like the
+    ``database`` and ``startup`` options of Abaqus/CAE, and return its exit code."""
+    namespace = {"__name__": "__main__", "__file__": script, "__builtins__": builtins}
+    os.chdir(cwd)
+    sys.argv = [script] + list(args)
+    sys.path.insert(0, os.path.dirname(os.path.abspath(script)))
+    try:
+        if database:
+            import abaqus
+
+            abaqus.openMdb(pathName=database)
+        for path in [startup, script] if startup else [script]:
+            with open(path, "rb") as f:
+                code = compile(f.read(), path, "exec", 0, True)  # without the print_function of this module
+            exec(code, namespace)
+    except SystemExit as e:
+        if e.code is None or isinstance(e.code, int):
+            return e.code or 0
+        print(e.code, file=sys.stderr)
+        return 1
+    except BaseException:
+        traceback.print_exc()
+        return 1
+    finally:
+        sys.path.pop(0)
+    return 0
+
+
+def _isolate(modules, directories):
+    """Reset the state that a script may have left in the kernel."""
+    abaqus = sys.modules.get("abaqus")
+    if abaqus is not None and hasattr(abaqus, "Mdb"):
+        try:
+            for odb in list(abaqus.session.odbs.values()):
+                odb.close()
+            abaqus.Mdb()
+        except Exception:
+            traceback.print_exc()
+    odbAccess = sys.modules.get("odbAccess")  # the output databases opened by Abaqus/Python scripts
+    if odbAccess is not None and hasattr(odbAccess, "session"):
+        try:
+            for odb in list(odbAccess.session.odbs.values()):
+                odb.close()
+        except Exception:
+            traceback.print_exc()
+    for name in set(sys.modules) - modules:
+        path = os.path.abspath(getattr(sys.modules[name], "__file__", None) or os.sep)
+        if any(path.startswith(directory + os.sep) for directory in directories):
+            del sys.modules[name]
+
+
+def _handle(connection, request, state):
+    """Handle a request of a client, return False to stop the kernel."""
+    command = request.get("command", "run")
+    if command == "ping":
+        connection.send(event="pong", pid=os.getpid(), requests=state["requests"], uptime=time.time() - state["start"])
+    elif command == "stop":
+        connection.send(event="exit", code=0)
+        return False
+    else:
+        connection.send(event="start")
+        cwd, script = os.path.abspath(request["cwd"]), os.path.abspath(os.path.join(request["cwd"], request["script"]))
+        stdout, stderr = _Stream(connection, "stdout"), _Stream(connection, "stderr")
+        saved = os.getcwd(), sys.argv, sys.stdout, sys.stderr, set(sys.modules)
+        sys.stdout, sys.stderr = stdout, stderr
+        try:
+            code = _run(script, request.get("args", []), cwd, request.get("database"), request.get("startup"))
+            _isolate(saved[4], (cwd, os.path.dirname(script)))
+        finally:
+            stdout.flush()
+            stderr.flush()
+            os.chdir(saved[0])
+            sys.argv, sys.stdout, sys.stderr = saved[1:4]
+        state["requests"] += 1
+        connection.send(event="exit", code=code)
+    return True
+
+
+def _write_state(path, state):
+    """Write the state file atomically, readable only by the current user."""
+    temporary = "%s.%d.tmp" % (path, os.getpid())
+    with os.fdopen(os.open(temporary, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), "w") as f:
+        json.dump(state, f)
+    if os.path.exists(path):
+        os.remove(path)  # os.rename does not replace existing files on Windows with Python 2.7
+    os.rename(temporary, path)
+
+
+def serve(path, idleTimeout):
+    """Serve requests until the kernel is idle for **idleTimeout** seconds (0 for no timeout) or stopped."""
+    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    server.bind(("127.0.0.1", 0))
+    server.listen(16)
+    server.settimeout(idleTimeout or None)
+    token = uuid.uuid4().hex
+    state = {"start": time.time(), "requests": 0}
+    _write_state(path, {"port": server.getsockname()[1], "pid": os.getpid(), "token": token})
+    try:
+        running = True
+        while running:
+            try:
+                sock, _ = server.accept()
+            except socket.timeout:
+                break
+            sock.settimeout(None)
+            connection = _Connection(sock)
+            try:
+                request = connection.receive()
+                if request is not None and request.get("token") == token:
+                    running = _handle(connection, request, state)
+            except (IOError, OSError, ValueError):
+                traceback.print_exc()
+            finally:
+                connection.close()
+    finally:
+        server.close()
+        try:
+            with open(path) as f:
+                mine = json.load(f).get("pid") == os.getpid()
+        except (IOError, OSError, ValueError):
+            mine = False
+        if mine:
+            os.remove(path)
+
+
+def _event(stream, **event):
+    stream.write(BATCH_PREFIX + json.dumps(event) + "\n")
+    stream.flush()
+
+
+def batch(manifest):
+    """Run the scripts of a batch manifest, a JSON list of ``{"index": ..., "script": ..., "args": [...], "cwd": ...,
+    "log": ...}`` objects, one after another."""
+    with open(manifest) as f:
+        scripts = json.load(f)
+    stdout = sys.stdout
+    for entry in scripts:
+        _event(stdout, event="start", index=entry["index"])
+        start = time.time()
+        log = _LogFile(entry["log"])
+        saved = os.getcwd(), sys.argv, sys.stdout, sys.stderr, set(sys.modules)
+        sys.stdout = sys.stderr = log
+        try:
+            code = _run(entry["script"], entry.get("args", []), entry["cwd"])
+            _isolate(saved[4], (entry["cwd"], os.path.dirname(entry["script"])))
+        finally:
+            log.close()
+            os.chdir(saved[0])
+            sys.argv, sys.stdout, sys.stderr = saved[1:4]
+        _event(stdout, event="exit", index=entry["index"], code=code, wall_time=time.time() - start)
+
+
+if __name__ == "__main__":
+    if sys.argv[-2] == "--batch":
+        batch(sys.argv[-1])
+    else:
+        serve(sys.argv[-2], float(sys.argv[-1]))
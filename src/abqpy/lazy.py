@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+from importlib import import_module
+from types import ModuleType
+from typing import Any, Callable
+
+
+class LazyObject:
+    """A proxy that creates the wrapped object on first attribute access.
+
+    It is used for the module level ``mdb`` and ``session`` objects of the :py:mod:`abaqus` package, so that the
+    large mixin hierarchies of :py:class:`~abaqus.Mdb.Mdb.Mdb` and :py:class:`~abaqus.Session.Session.Session` are
+    only resolved (and their modules only imported) when one of their members is actually used.
+
+    Parameters
+    ----------
+    factory : Callable[[], Any]
+        A callable without arguments that returns the wrapped object.
+    """
+
+    __slots__ = ("_factory", "_wrapped")
+
+    def __init__(self, factory: Callable[[], Any]):
+        object.__setattr__(self, "_factory", factory)
+        object.__setattr__(self, "_wrapped", None)
+
+    def _resolve(self) -> Any:
+        """Create the wrapped object if necessary and return it."""
+        wrapped = object.__getattribute__(self, "_wrapped")
+        if wrapped is None:
+            wrapped = object.__getattribute__(self, "_factory")()
+            object.__setattr__(self, "_wrapped", wrapped)
+        return wrapped
+
+    @property  # type: ignore[misc]
+    def __class__(self):
+        return type(self._resolve())
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._resolve(), name)
+
+    def __setattr__(self, name: str, value: Any):
+        setattr(self._resolve(), name, value)
+
+    def __delattr__(self, name: str):
+        delattr(self._resolve(), name)
+
+    def __dir__(self):
+        return dir(self._resolve())
+
+    def __repr__(self) -> str:
+        if object.__getattribute__(self, "_wrapped") is None:
+            return "<LazyObject, not yet created>"
+        return repr(self._resolve())
+
+    # The operators are looked up on the type and not with __getattr__, so they are forwarded one by one
+
+    def __str__(self) -> str:
+        return str(self._resolve())
+
+    def __eq__(self, other: object) -> bool:
+        return self._resolve() == other
+
+    def __ne__(self, other: object) -> bool:
+        return self._resolve() != other
+
+    def __hash__(self) -> int:
+        return hash(self._resolve())
+
+    def __bool__(self) -> bool:
+        return bool(self._resolve())
+
+    def __len__(self) -> int:
+        return len(self._resolve())
+
+    def __iter__(self):
+        return iter(self._resolve())
+
+    def __contains__(self, item: Any) -> bool:
+        return item in self._resolve()
+
+    def __getitem__(self, key: Any) -> Any:
+        return self._resolve()[key]
+
+    def __setitem__(self, key: Any, value: Any):
+        self._resolve()[key] = value
+
+    def __delitem__(self, key: Any):
+        del self._resolve()[key]
+
+    def __call__(self, *args, **kwargs) -> Any:
+        return self._resolve()(*args, **kwargs)
+
+
+class LazyModule(ModuleType):
+    """A module type that resolves some of its attributes on first access, see :pep:`562`.
+
+    The attributes are declared in the ``__lazy_attributes__`` mapping of the module, from attribute names to a
+    tuple of ``(module name, attribute name)``, relative module names are resolved against the module itself. Any
+    other missing name is tried as a submodule, e.g., ``Optimization`` for ``abaqus.Optimization``. Lazy attributes
+    take precedence over submodules of the same name, i.e., importing the ``abaqus.Mdb`` subpackage does not
+    shadow the ``abaqus.Mdb`` class.
+    """
+
+    def __getattr__(self, name: str) -> Any:
+        attributes = self.__dict__.get("__lazy_attributes__", {})
+        if name in attributes:
+            module_name, attribute = attributes[name]
+            value = getattr(import_module(module_name, self.__name__), attribute)
+        elif not name.startswith("__"):
+            try:
+                value = import_module(f"{self.__name__}.{name}")
+            except ModuleNotFoundError as e:
+                if e.name != f"{self.__name__}.{name}":
+                    raise
+                raise AttributeError(f"module {self.__name__!r} has no attribute {name!r}") from None
+        else:
+            raise AttributeError(f"module {self.__name__!r} has no attribute {name!r}")
+        self.__dict__[name] = value
+        return value
+
+    def __setattr__(self, name: str, value: Any):
+        # The import system binds submodules to their parent package, skip that for lazy attributes
+        if isinstance(value, ModuleType) and name in self.__dict__.get("__lazy_attributes__", {}):
+            return
+        super().__setattr__(name, value)
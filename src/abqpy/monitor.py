@@ -0,0 +1,353 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import re
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Sequence
+
+#: The number of bytes at the start of a followed file that identify it.
+HEAD_SIZE = 256
+
+#: The message types that end a job.
+FINAL_TYPES = ("JOB_COMPLETED", "JOB_ABORTED")
+
+
+@dataclass
+class JobMessage:
+    """A message about the progress of a job, read from its status, message or log file.
+
+    It mirrors the :class:`~abaqus.Job.Message.Message` objects that the Abaqus/CAE kernel passes to the callbacks of
+    :meth:`~abaqus.Messaging.MonitorMgr.MonitorMgr.addMessageCallback`: **type** is the name of the message type,
+    e.g., ``STATUS``, which compares equal to the SymbolicConstant of the same name, and **data** holds the members
+    of the :class:`~abaqus.Messaging.DataObject.DataObject` that the file provides.
+    """
+
+    #: The name of the job.
+    jobName: str
+
+    #: The message type: ``JOB_SUBMITTED``, ``STARTED``, ``STEP``, ``STATUS``, ``WARNING``, ``ERROR``,
+    #: ``END_STEP``, ``COMPLETED``, ``ABORTED``, ``JOB_COMPLETED`` or ``JOB_ABORTED``.
+    type: str
+
+    #: The data of the message, e.g., ``step``, ``increment``, ``attempts``, ``stepTime``, ``totalTime`` or
+    #: ``message``.
+    data: Dict[str, Any] = field(default_factory=dict)
+
+    #: The path of the file the message was read from.
+    file: str = ""
+
+    #: The byte offset of the line the message was read from.
+    offset: int = -1
+
+
+class FileTail:
+    """Follow a file that is being written, reading the complete lines appended since the last read.
+
+    The file is followed by byte offset, so each read costs only the appended bytes. If the file is replaced (its
+    inode or its first bytes change, e.g., when a job is submitted again) or truncated, it is read again from the
+    start.
+
+    Parameters
+    ----------
+    path : str
+        The path of the file, it does not need to exist yet.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.offset = 0
+        self.identity: Optional[tuple] = None
+        self._partial = b""
+        self._head = b""
+
+    def read(self) -> List[tuple]:
+        """Read the new complete lines.
+
+        Returns
+        -------
+        List[tuple]
+            The byte offsets and the lines, without the line endings. An offset of -1 and a line of None mean that
+            the file was replaced or truncated and is read again from the start.
+        """
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return []
+        lines: List[tuple] = []
+        identity = (stat.st_dev, stat.st_ino)
+        if identity == self.identity and stat.st_size == self.offset:
+            return lines
+        with open(self.path, "rb") as f:
+            # A new file may get the inode of the deleted one, so its first bytes are compared too
+            replaced = self.identity is not None and (
+                identity != self.identity or f.read(len(self._head)) != self._head
+            )
+            if replaced or stat.st_size < self.offset:
+                self.offset, self._partial, self._head = 0, b"", b""
+                lines.append((-1, None))
+            self.identity = identity
+            f.seek(self.offset)
+            data = f.read()
+        if len(self._head) < HEAD_SIZE:
+            self._head = (self._head + data)[:HEAD_SIZE]
+        start = self.offset - len(self._partial)
+        self.offset += len(data)
+        *complete, self._partial = (self._partial + data).split(b"\n")
+        for line in complete:
+            lines.append((start, line.rstrip(b"\r").decode("utf-8", "replace")))
+            start += len(line) + 1
+        return lines
+
+
+class _Parser(ABC):
+    """Parse the lines of a file of a job into messages."""
+
+    def __init__(self, job: str, path: str):
+        self.job = job
+        self.path = path
+        self.reset()
+
+    def reset(self):
+        pass
+
+    def message(self, type: str, offset: int, **data) -> JobMessage:
+        return JobMessage(self.job, type, data, self.path, offset)
+
+    @abstractmethod
+    def feed(self, offset: int, line: str) -> List[JobMessage]:
+        """The messages of a line that starts at the given byte offset of the file."""
+
+
+_number = r"[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?"
+_standard = re.compile(
+    rf"^\s*(\d+)\s+(\d+)\s+(\d+)(U?)\s+(\d+)\s+(\d+)\s+(\d+)\s+({_number})\s+({_number})\s+({_number})"
+)
+_explicit = re.compile(rf"^\s*(\d+)\s+({_number})\s+({_number})\s+\d+:\d+:\d+\s+({_number})")
+_explicit_step = re.compile(r"^\s*STEP\s+(\d+)\s+ORIGIN\s+(" + _number + ")")
+
+
+class _StatusParser(_Parser):
+    """Parse the increments of the status (``.sta``) file of Abaqus/Standard and Abaqus/Explicit."""
+
+    def reset(self):
+        self.step: Optional[int] = None
+        self.ended = False
+
+    def _step(self, step: int, offset: int, phase: str) -> List[JobMessage]:
+        if step == self.step:
+            return []
+        messages = [] if self.step is None else [self.message("END_STEP", offset, step=self.step, phase=phase)]
+        self.step = step
+        return messages + [self.message("STEP", offset, step=step, phase=phase)]
+
+    def feed(self, offset: int, line: str) -> List[JobMessage]:
+        match = _standard.match(line)
+        if match:
+            step, increment, attempts, cutback, severe, equilibrium, iterations = match.groups()[:7]
+            totalTime, stepTime, timeIncrement = map(float, match.groups()[7:])
+            data = dict(step=int(step), increment=int(increment), attempts=int(attempts), severe=int(severe),
+                        equilibrium=int(equilibrium), iterations=int(iterations), totalTime=totalTime,
+                        stepTime=stepTime, timeIncrement=timeIncrement, phase="STANDARD_PHASE")  # fmt: skip
+            messages = self._step(int(step), offset, "STANDARD_PHASE")
+            if cutback:
+                text = f"Attempt {attempts} of increment {increment} of step {step} did not converge, cutting back"
+                return messages + [self.message("WARNING", offset, cutback=True, message=text, **data)]
+            return messages + [self.message("STATUS", offset, **data)]
+        match = _explicit_step.match(line)
+        if match:
+            return self._step(int(match.group(1)), offset, "EXPLICIT_PHASE")
+        match = _explicit.match(line)
+        if match and self.step is not None:
+            times = dict(zip(("stepTime", "totalTime", "timeIncrement"), map(float, match.groups()[1:])))
+            data = dict(step=self.step, increment=int(match.group(1)), phase="EXPLICIT_PHASE", **times)
+            return [self.message("STATUS", offset, **data)]
+        text = line.strip()
+        if text.startswith("THE ANALYSIS HAS") and not self.ended:
+            self.ended = True
+            completed = "NOT BEEN COMPLETED" not in text
+            ended = [] if self.step is None or not completed else [self.message("END_STEP", offset, step=self.step)]
+            return ended + [self.message("COMPLETED" if completed else "ABORTED", offset, message=text)]
+        return []
+
+
+class _MessageParser(_Parser):
+    """Parse the warnings and errors of the message (``.msg``) file, with their continuation lines."""
+
+    def reset(self):
+        self.pending: Optional[JobMessage] = None
+
+    def feed(self, offset: int, line: str) -> List[JobMessage]:
+        text = line.strip()
+        match = re.match(r"^\*\*\*(WARNING|ERROR|NOTE):?\s*(.*)", text)
+        if match or not text:
+            messages = [self.pending] if self.pending is not None else []
+            self.pending = None
+            if match and match.group(1) != "NOTE":
+                self.pending = self.message(match.group(1), offset, message=match.group(2))
+            return messages
+        if self.pending is not None:
+            self.pending.data["message"] += " " + text
+        return []
+
+    def flush(self) -> List[JobMessage]:
+        """The last warning or error, which ends at the end of the file."""
+        messages = [self.pending] if self.pending is not None else []
+        self.pending = None
+        return messages
+
+
+class _LogParser(_Parser):
+    """Parse the analysis phases of the log (``.log``) file."""
+
+    def feed(self, offset: int, line: str) -> List[JobMessage]:
+        text = line.strip()
+        match = re.match(r"^Abaqus JOB (\S+)( COMPLETED)?$", text)
+        if match:
+            return [self.message("JOB_COMPLETED" if match.group(2) else "JOB_SUBMITTED", offset, message=text)]
+        match = re.match(r"^Begin (.+)$", text)
+        if match:
+            return [self.message("STARTED", offset, clientName=match.group(1), message=text)]
+        if re.search(r"exited with (an )?errors?", text, re.IGNORECASE):
+            type = "JOB_ABORTED" if text.startswith("Abaqus/Analysis") else "ERROR"
+            return [self.message(type, offset, message=text)]
+        return []
+
+
+class JobMonitor:
+    """Follow the progress of an Abaqus job from outside the Abaqus/CAE kernel, by reading its status (``.sta``),
+    message (``.msg``) and log (``.log``) files incrementally as they are written.
+
+    The messages are parsed into :class:`JobMessage` objects, which mirror the messages of
+    :meth:`~abaqus.Messaging.MonitorMgr.MonitorMgr.addMessageCallback`: ``STEP`` and ``END_STEP`` for the steps,
+    ``STATUS`` for each converged increment, ``WARNING`` for each cut back attempt and each warning of the message
+    file, ``ERROR`` for the errors, ``COMPLETED`` or ``ABORTED`` at the end of the analysis, and ``JOB_SUBMITTED``,
+    ``STARTED`` and ``JOB_COMPLETED`` or ``JOB_ABORTED`` for the phases of the log file. Many jobs can be followed
+    from one event loop, see :func:`monitor_jobs`.
+
+    Parameters
+    ----------
+    job : str
+        The name of the job.
+    directory : str, optional
+        The working directory of the job, by default the current directory.
+    interval : float, optional
+        The time in seconds between two reads of the files, by default 0.5.
+    """
+
+    def __init__(self, job: str, directory: str = "", interval: float = 0.5):
+        self.job = os.path.basename(job)
+        self.interval = interval
+        self.finished = False
+        path = os.path.join(os.path.abspath(directory or os.getcwd()), job)
+        self._log = FileTail(path + ".log"), _LogParser(self.job, path + ".log")
+        self._sta = FileTail(path + ".sta"), _StatusParser(self.job, path + ".sta")
+        self._msg = FileTail(path + ".msg"), _MessageParser(self.job, path + ".msg")
+        self._callbacks: List[tuple] = []
+
+    def add_message_callback(self, message_type: str, callback: Callable[[JobMessage], Any]):
+        """Call a function with each message of a type, like
+        :meth:`~abaqus.Messaging.MonitorMgr.MonitorMgr.addMessageCallback`.
+
+        Parameters
+        ----------
+        message_type : str
+            The message type, or ``ANY_MESSAGE_TYPE``.
+        callback : Callable[[JobMessage], Any]
+            The function, called with the message by :meth:`poll`.
+        """
+        self._callbacks.append((message_type, callback))
+
+    @staticmethod
+    def _read(tail: FileTail, parser: _Parser) -> List[JobMessage]:
+        messages = []
+        for offset, line in tail.read():
+            if line is None:
+                parser.reset()
+            else:
+                messages += parser.feed(offset, line)
+        return messages
+
+    def poll(self) -> List[JobMessage]:
+        """Read the lines written since the last poll and return their messages.
+
+        Returns
+        -------
+        List[JobMessage]
+            The messages, in the order of each file, and those that end the job last.
+        """
+        log, sta, msg = (self._read(*files) for files in (self._log, self._sta, self._msg))
+        log_ended = any(message.type in FINAL_TYPES for message in log)
+        if log_ended:  # the last warning or error ends with the message file
+            msg += self._msg[1].flush()
+        # Without a log file, e.g., for interactive jobs, the job ends with the analysis
+        self.finished = log_ended or (self._sta[1].ended and self._log[0].identity is None)
+        messages = sta + msg + log if log_ended else log + sta + msg
+        for message in messages:
+            for message_type, callback in self._callbacks:
+                if message_type in (message.type, "ANY_MESSAGE_TYPE"):
+                    callback(message)
+        return messages
+
+    async def messages(self, timeout: Optional[float] = None) -> AsyncIterator[JobMessage]:
+        """Iterate over the messages of the job as they are written, until the job ends.
+
+        Parameters
+        ----------
+        timeout : float, optional
+            The time in seconds after which to stop waiting for the end of the job, by default None, i.e., no timeout.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            for message in self.poll():
+                yield message
+            if self.finished or (deadline is not None and time.monotonic() > deadline):
+                return
+            await asyncio.sleep(self.interval)
+
+    async def wait_for_completion(self, timeout: Optional[float] = None) -> Optional[JobMessage]:
+        """Wait for the end of the job, like :meth:`~abaqus.Job.Job.Job.waitForCompletion`.
+
+        Returns
+        -------
+        JobMessage
+            The last message, ``JOB_COMPLETED`` or ``JOB_ABORTED`` (``COMPLETED`` or ``ABORTED`` without a log file),
+            None if the timeout expired first.
+        """
+        last = None
+        async for message in self.messages(timeout):
+            last = message
+        return last if self.finished else None
+
+
+async def monitor_jobs(
+    jobs: Sequence[str], directory: str = "", interval: float = 0.5, timeout: Optional[float] = None
+) -> AsyncIterator[JobMessage]:
+    """Iterate over the messages of many jobs as they are written, polling all of them from one task, until all
+    of them end.
+
+    Parameters
+    ----------
+    jobs : Sequence[str]
+        The names of the jobs, or paths of the jobs relative to **directory**, without extension.
+    directory : str, optional
+        The working directory of the jobs, by default the current directory.
+    interval : float, optional
+        The time in seconds between two reads of the files, by default 0.5.
+    timeout : float, optional
+        The time in seconds after which to stop waiting for the end of the jobs, by default None, i.e., no timeout.
+    """
+    monitors = [JobMonitor(job, directory, interval) for job in jobs]
+    deadline = None if timeout is None else time.monotonic() + timeout
+    while True:
+        for monitor in monitors:
+            if not monitor.finished:
+                for message in monitor.poll():
+                    yield message
+        if all(monitor.finished for monitor in monitors):
+            return
+        if deadline is not None and time.monotonic() > deadline:
+            return
+        await asyncio.sleep(interval)
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+
+#: The lines of IPython magics and shell commands, also those assigning their output, e.g., ``files = !ls``. They are
+#: replaced by a ``pass`` statement at the same indentation followed by the line as a comment in the converted scripts.
+MAGIC = re.compile(r"^(\s*)(?:[\w.]+(?:\s*,\s*[\w.]+)*\s*=\s*)?[%!]")
+
+
+def _comment(line: str) -> str:
+    """Replace a magic line by a ``pass`` statement at the same indentation, followed by the line as a comment."""
+    match = MAGIC.match(line)
+    return f"{match.group(1)}pass  # {line.lstrip()}" if match else line
+
+
+def notebook_source(notebook: str) -> str:
+    """The python source of the code cells of a notebook, with the IPython magics and shell commands commented out.
+    The magic lines of a block are replaced by ``pass`` statements, so that the block is never left empty.
+
+    Parameters
+    ----------
+    notebook : str
+        The content of the notebook, in the ``.ipynb`` JSON format.
+
+    Returns
+    -------
+    str
+        The python source, with a ``# In[n]:`` comment before each cell, like ``jupyter nbconvert --to python``.
+    """
+    import nbformat
+
+    cells = []
+    for cell in nbformat.reads(notebook, as_version=4).cells:
+        if cell.cell_type != "code":
+            continue
+        lines = cell.source.splitlines()
+        if lines and lines[0].lstrip().startswith("%%"):  # a cell magic, the cell is not python
+            lines = ["# " + line for line in lines]
+        else:
+            lines = [_comment(line) for line in lines]
+        count = cell.get("execution_count") or " "
+        cells.append(f"# In[{count}]:\n\n\n" + "\n".join(lines) + "\n")
+    return "\n\n".join(cells)
+
+
+def convert_notebook(path: str, output: str | None = None) -> str:
+    """Convert a notebook to a python script, unless it has not changed since its last conversion.
+
+    The SHA-256 hash of the notebook is written in the header of the script, so that the script is only written
+    again when the content of the notebook changes.
+
+    Parameters
+    ----------
+    path : str
+        The path of the notebook.
+    output : str, optional
+        The path of the script, by default the path of the notebook with the ``.py`` extension.
+
+    Returns
+    -------
+    str
+        The path of the script.
+    """
+    with open(path, "rb") as f:
+        content = f.read()
+    output = output or os.path.splitext(path)[0] + ".py"
+    header = f"# -*- coding: utf-8 -*-\n# Converted from {os.path.basename(path)} by abqpy, sha256: "
+    header += hashlib.sha256(content).hexdigest() + "\n"
+    try:
+        with open(output, encoding="utf-8") as f:
+            if f.read(len(header)) == header:
+                return output
+    except (OSError, UnicodeDecodeError):
+        pass
+    temporary = f"{output}.{os.getpid()}.tmp"
+    with open(temporary, "w", encoding="utf-8") as f:
+        f.write(header + "\n\n" + notebook_source(content.decode("utf-8")))
+    os.replace(temporary, output)
+    return output
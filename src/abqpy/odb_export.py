@@ -0,0 +1,325 @@
+"""Export the field output of an output database to a directory store in one pass, see
+:meth:`abqpy.cli.AbqpyCLI.odb_export`.
+
+This script runs in the Python interpreter of Abaqus (``abaqus python odb_export.py <odb> <store> [options]``), so it
+only uses the standard library, numpy and ``odbAccess``, and is compatible with both Python 2.7 and Python 3.
+
+The steps and frames are walked once, and the :class:`~abaqus.Odb.FieldBulkData.FieldBulkData` blocks of each field
+output (``data``, ``conjugateData``, ``nodeLabels``, ``elementLabels``, ``integrationPoints`` and
+``localCoordSystem``) are appended as raw little-endian arrays to the chunk files of their field, position and
+instance::
+
+    <store>/manifest.json
+    <store>/steps/<step>/frames.json
+    <store>/steps/<step>/frame-<index>.json
+    <store>/fields/<field>/<position>/<instance>/<array>-<chunk>.bin
+    <store>/instances/<instance>/<array>-<chunk>.bin
+    <store>/sets/labels-<chunk>.bin
+
+A new chunk file is started when a chunk exceeds the chunk size. The labels and integration points of a block are
+only written again if they differ from those of the previous frame. ``manifest.json`` describes the output database,
+its instances, sets and steps, with the number of frames of each step and the path of its ``frames.json``, which
+lists the frames and the paths of their ``frame-<index>.json``, which describe their field outputs and blocks. Every
+array is a reference ``{"file": ..., "offset": ..., "dtype": ..., "shape": [...]}`` to a chunk file, and every path
+is relative to the store. The JSON files are compact, and a reader only parses those of the frames it reads. The
+manifest is written last, so a store without one is incomplete.
+"""
+
+from __future__ import print_function
+
+import argparse
+import json
+import os
+import re
+import shutil
+import sys
+import time
+
+import numpy
+
+#: The format and the version of the store.
+FORMAT = "abqpy-odb-store"
+VERSION = 2
+
+#: The arrays of a block, with their data types. The data are float32, or float64 if the output is in double
+#: precision. The local coordinate systems are quaternions ``(q1, q2, q3, q0)``, one row per value.
+BLOCK_ARRAYS = (
+    ("data", None),
+    ("conjugateData", None),
+    ("nodeLabels", "<i4"),
+    ("elementLabels", "<i4"),
+    ("integrationPoints", "<i4"),
+    ("localCoordSystem", "<f4"),
+)
+
+#: The arrays of a block that change from frame to frame, the others are only written again if they change.
+DATA_ARRAYS = ("data", "conjugateData")
+
+
+def _name(text):
+    """A file name for a field, position or instance name."""
+    return re.sub(r"[^\w.\-]", "_", str(text)) or "_"
+
+
+def _dump(store, relative, value):
+    """Write a compact JSON file of the store."""
+    path = os.path.join(store, *relative.split("/"))
+    if not os.path.isdir(os.path.dirname(path)):
+        os.makedirs(os.path.dirname(path))
+    with open(path, "w") as f:
+        json.dump(value, f, separators=(",", ":"))
+
+
+def _text(value):
+    """The text of a SymbolicConstant or a string, None for None."""
+    return None if value is None else str(value)
+
+
+class _Chunks(object):
+    """The chunk files of the arrays of a directory of the store."""
+
+    def __init__(self, store, directory, chunk_size):
+        self.store = store
+        self.directory = directory
+        self.chunk_size = chunk_size
+        self.files = {}
+        self.last = {}
+
+    def write(self, name, array, key=None):
+        """Append an array to the chunk files of **name** and return its reference. If a **key** is given and the
+        previous array written with this key is equal, its reference is returned instead."""
+        if key is not None and key in self.last:
+            previous, reference = self.last[key]
+            if previous.shape == array.shape and numpy.array_equal(previous, array):
+                return reference
+        chunk, offset = self.files.get(name, (0, 0))
+        if offset and offset + array.nbytes > self.chunk_size:
+            chunk, offset = chunk + 1, 0
+        relative = "/".join([self.directory, "%s-%04d.bin" % (name, chunk)])
+        path = os.path.join(self.store, *relative.split("/"))
+        if not offset and not os.path.isdir(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path))
+        with open(path, "ab" if offset else "wb") as f:
+            f.write(array.tobytes() if hasattr(array, "tobytes") else array.tostring())
+        self.files[name] = chunk, offset + array.nbytes
+        reference = dict(file=relative, offset=offset, dtype=array.dtype.str, shape=list(array.shape))
+        if key is not None:
+            self.last[key] = array, reference
+        return reference
+
+
+def _array(values, dtype):
+    """A C-contiguous little-endian array, None if there are no values."""
+    if values is None:
+        return None
+    array = numpy.asarray(values)
+    if not array.size:
+        return None
+    if dtype is None:
+        dtype = "<f8" if array.dtype == numpy.float64 else "<f4"
+    return numpy.ascontiguousarray(array, dtype=dtype)
+
+
+def _block_array(block, name):
+    """An array of a block, the double precision one if the single precision one is not available."""
+    try:
+        return getattr(block, name, None)
+    except Exception:  # the data are in double precision
+        return getattr(block, name + "Double", None)
+
+
+class Exporter(object):
+    """Export the field output of an output database to a directory store.
+
+    Parameters
+    ----------
+    odb
+        The output database, opened with ``odbAccess.openOdb``.
+    store : str
+        The directory of the store.
+    steps : list of str, optional
+        The names of the steps to export, by default all of them.
+    fields : list of str, optional
+        The names of the field outputs to export, by default all of them.
+    frames : str, optional
+        ``all`` to export all the frames of the steps, or ``last`` only the last one, by default "all".
+    chunk_size : int, optional
+        The maximum size of a chunk file in bytes, unless it holds a single array, by default 256 MB.
+    mesh : bool, optional
+        Export the node labels and coordinates of the instances, and the node and element labels of the sets of the
+        assembly and of the instances, by default True.
+    """
+
+    def __init__(self, odb, store, steps=None, fields=None, frames="all", chunk_size=256 * 1024**2, mesh=True):
+        if frames not in ("all", "last"):
+            raise ValueError("Expected the frames all or last, got %r" % (frames,))
+        self.odb = odb
+        self.store = os.path.abspath(store)
+        self.steps = steps
+        self.fields = fields
+        self.frames = frames
+        self.chunk_size = chunk_size
+        self.mesh = mesh
+        self._chunks = {}
+        self.blocks = 0
+        self.bytes = 0
+
+    def _directory(self, *names):
+        directory = "/".join(_name(name) for name in names)
+        if directory not in self._chunks:
+            self._chunks[directory] = _Chunks(self.store, directory, self.chunk_size)
+        return self._chunks[directory]
+
+    def _sets(self, container, instance=None):
+        """The node and element sets of the assembly or of an instance, with the labels of their nodes or elements
+        in each instance."""
+        sets = dict(nodeSets={}, elementSets={})
+        chunks = self._directory("sets")
+        for kind, members in (("nodeSets", "nodes"), ("elementSets", "elements")):
+            for name, odb_set in getattr(container, kind, {}).items():
+                if instance:
+                    groups = [(instance, getattr(odb_set, members))]
+                else:  # the members of the sets of the assembly are grouped by instance
+                    groups = zip(odb_set.instanceNames or (), getattr(odb_set, members))
+                labels = {}
+                for instance_name, group in groups:
+                    array = numpy.array([member.label for member in group], dtype="<i4")
+                    if array.size:
+                        labels[instance_name] = chunks.write("labels", array)
+                sets[kind][name] = dict(name=name, labels=labels)
+        return sets
+
+    def _instances(self):
+        instances = {}
+        for name, instance in self.odb.rootAssembly.instances.items():
+            entry = dict(name=name, nodeLabels=None, coordinates=None, nodeSets={}, elementSets={})
+            if self.mesh and len(instance.nodes):
+                chunks = self._directory("instances", name)
+                labels = numpy.array([node.label for node in instance.nodes], dtype="<i4")
+                coordinates = numpy.array([node.coordinates for node in instance.nodes], dtype="<f4")
+                entry.update(nodeLabels=chunks.write("nodeLabels", labels),
+                             coordinates=chunks.write("coordinates", coordinates))  # fmt: skip
+            if self.mesh:
+                entry.update(self._sets(instance, name))
+            instances[name] = entry
+        return instances
+
+    def _datum_csyses(self):
+        """The datum coordinate systems of the assembly."""
+        csyses = {}
+        for name, csys in getattr(self.odb.rootAssembly, "datumCsyses", {}).items():
+            entry = dict(name=name, coordSysType=_text(csys.coordSysType))
+            for axis in ("origin", "xAxis", "yAxis", "zAxis"):
+                entry[axis] = [float(x) for x in getattr(csys, axis)]
+            csyses[name] = entry
+        return csyses
+
+    def _block(self, field, block):
+        instance = block.instance.name if block.instance is not None else ""
+        section_point = None
+        if block.sectionPoint is not None:
+            section_point = dict(number=block.sectionPoint.number, description=block.sectionPoint.description)
+        entry = dict(position=_text(block.position), type=_text(block.type), instance=instance,
+                     elementType=getattr(block, "elementType", "") or "",
+                     baseElementType=getattr(block, "baseElementType", "") or "",
+                     sectionPoint=section_point, componentLabels=list(block.componentLabels))  # fmt: skip
+        chunks = self._directory("fields", field, entry["position"], instance or "_assembly")
+        # The labels of a block are identified by its element type and section point
+        key = (entry["elementType"], section_point and section_point["number"])
+        for name, dtype in BLOCK_ARRAYS:
+            array = _array(_block_array(block, name), dtype)
+            if array is None:
+                entry[name] = None
+                continue
+            if name in DATA_ARRAYS and array.ndim == 1:
+                array = array.reshape(len(array), -1)
+            elif name == "localCoordSystem":
+                array = array.reshape(-1, 4)
+            entry[name] = chunks.write(name, array, None if name in DATA_ARRAYS else (name,) + key)
+            self.bytes += array.nbytes
+        self.blocks += 1
+        return entry
+
+    def _frame(self, directory, index, frame):
+        """Write the field outputs of a frame to its file and return the entry of the frame."""
+        fields = {}
+        for name, field in frame.fieldOutputs.items():
+            if self.fields is not None and name not in self.fields:
+                continue
+            blocks = [self._block(name, block) for block in field.bulkDataBlocks]
+            fields[name] = dict(name=name, description=field.description, type=_text(field.type),
+                                componentLabels=list(field.componentLabels),
+                                validInvariants=[_text(invariant) for invariant in field.validInvariants],
+                                bulkDataBlocks=blocks)  # fmt: skip
+        relative = "%s/frame-%05d.json" % (directory, index)
+        _dump(self.store, relative, fields)
+        return dict(index=index, frameId=frame.frameId, frameValue=frame.frameValue, description=frame.description,
+                    incrementNumber=getattr(frame, "incrementNumber", index), fieldOutputs=relative)  # fmt: skip
+
+    def _step(self, step):
+        """Write the frames of a step to their files and return the entry of the step."""
+        frames = list(enumerate(step.frames))
+        if self.frames == "last":
+            frames = frames[-1:]
+        directory = "steps/" + _name(step.name)
+        relative = directory + "/frames.json"
+        _dump(self.store, relative, [self._frame(directory, i, frame) for i, frame in frames])
+        return dict(name=step.name, number=getattr(step, "number", 0), description=step.description,
+                    domain=_text(step.domain), procedure=getattr(step, "procedure", ""), timePeriod=step.timePeriod,
+                    totalTime=step.totalTime, frameCount=len(frames), frames=relative)  # fmt: skip
+
+    def export(self):
+        """Export the field output and write the manifest.
+
+        Returns
+        -------
+        dict
+            The manifest.
+        """
+        start = time.time()
+        if not os.path.isdir(self.store):
+            os.makedirs(self.store)
+        manifest_path = os.path.join(self.store, "manifest.json")
+        if os.path.exists(manifest_path):
+            os.remove(manifest_path)
+        for directory in ("steps", "fields", "instances", "sets"):  # the chunks of a previous export
+            shutil.rmtree(os.path.join(self.store, directory), ignore_errors=True)
+        instances = self._instances()
+        assembly = self._sets(self.odb.rootAssembly) if self.mesh else dict(nodeSets={}, elementSets={})
+        assembly.update(datumCsyses=self._datum_csyses())
+        steps = [self._step(step) for name, step in self.odb.steps.items() if self.steps is None or name in self.steps]
+        manifest = dict(format=FORMAT, version=VERSION, created=time.time(), wall_time=time.time() - start,
+                        odb=dict(name=self.odb.name, path=getattr(self.odb, "path", self.odb.name)),
+                        instances=instances, rootAssembly=assembly, steps=steps)  # fmt: skip
+        _dump(self.store, "manifest.json", manifest)
+        return manifest
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Export the field output of an output database to a store.")
+    parser.add_argument("odb")
+    parser.add_argument("store")
+    parser.add_argument("--steps", help="comma separated step names, by default all of them")
+    parser.add_argument("--fields", help="comma separated field output names, by default all of them")
+    parser.add_argument("--frames", default="all", choices=("all", "last"))
+    parser.add_argument("--chunk-size", type=float, default=256, help="in megabytes")
+    parser.add_argument("--no-mesh", action="store_true")
+    options = parser.parse_args(argv)
+
+    from odbAccess import openOdb
+
+    odb = openOdb(options.odb, readOnly=True)
+    try:
+        exporter = Exporter(odb, options.store, options.steps and options.steps.split(","),
+                            options.fields and options.fields.split(","), options.frames,
+                            int(options.chunk_size * 1024**2), not options.no_mesh)  # fmt: skip
+        manifest = exporter.export()
+    finally:
+        odb.close()
+    frames = sum(step["frameCount"] for step in manifest["steps"])
+    print("Exported %d frames, %d blocks, %.1f MB in %.1f s to %s"
+          % (frames, exporter.blocks, exporter.bytes / 1024.0**2, manifest["wall_time"], exporter.store))  # fmt: skip
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,628 @@
+"""Read a store exported by :meth:`abqpy.cli.AbqpyCLI.odb_export` in plain Python, without Abaqus.
+
+The store is opened as lightweight objects that mirror those of :class:`~abaqus.Odb.Odb.Odb`::
+
+    from abqpy.odb_store import open_store
+
+    with open_store("Job-1-store") as odb:
+        stress = odb.steps["Step-1"].frames[-1].fieldOutputs["S"]
+        subset = stress.getSubset(region=odb.rootAssembly.elementSets["HEX"], position="INTEGRATION_POINT")
+        for block in subset.bulkDataBlocks:
+            print(block.elementLabels, block.data.max(axis=0))
+
+Only the manifest is read when the store is opened. The frames of a step are created from its ``frames.json`` when
+they are first accessed, the field outputs of a frame from its own file, and the arrays of their blocks are
+:class:`numpy.memmap` views of the chunk files, so the time and the memory used are proportional to the frames and
+the data that are actually read.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from typing import Any, Dict, List, Optional, Sequence, Union, overload
+
+import numpy as np
+
+from . import invariants, transformations
+from .odb_export import FORMAT, VERSION
+
+#: A reference to an array of the store, see :mod:`abqpy.odb_export`.
+Reference = Optional[Dict[str, Any]]
+
+
+class _Arrays:
+    """The arrays of a store, as views of memory maps of its chunk files, and its JSON files."""
+
+    def __init__(self, store: str):
+        self.store = store
+        self._maps: Dict[str, np.memmap] = {}
+
+    def __call__(self, reference: Reference) -> Optional[np.ndarray]:
+        if reference is None:
+            return None
+        buffer = self._maps.get(reference["file"])
+        if buffer is None:
+            path = os.path.join(self.store, *reference["file"].split("/"))
+            buffer = self._maps[reference["file"]] = np.memmap(path, dtype=np.uint8, mode="r")
+        return np.ndarray(tuple(reference["shape"]), np.dtype(reference["dtype"]), buffer, reference["offset"])
+
+    def load(self, relative: str) -> Any:
+        """Read a JSON file of the store."""
+        with open(os.path.join(self.store, *relative.split("/"))) as f:
+            return json.load(f)
+
+    def close(self):
+        self._maps.clear()
+
+
+class SectionPoint:
+    """The section point of a block, see :class:`~abaqus.Odb.SectionPoint.SectionPoint`."""
+
+    def __init__(self, number: int, description: str):
+        self.number = number
+        self.description = description
+
+    def __repr__(self) -> str:
+        return f"SectionPoint({self.number}, {self.description!r})"
+
+
+class OdbSet:
+    """A node or element set, with the labels of its nodes or elements in each instance, see
+    :class:`~abaqus.Odb.OdbSet.OdbSet`."""
+
+    def __init__(self, entry: Dict[str, Any], kind: str, arrays: _Arrays):
+        self.name: str = entry["name"]
+
+        #: ``nodes`` for a node set, ``elements`` for an element set.
+        self.kind = kind
+
+        #: The names of the instances of the nodes or elements of the set.
+        self.instanceNames = tuple(entry["labels"])
+
+        self._references: Dict[str, Reference] = entry["labels"]
+        self._arrays = arrays
+
+    @property
+    def labels(self) -> Dict[str, np.ndarray]:
+        """The labels of the nodes or elements of the set, by instance name."""
+        return {name: self._arrays(reference) for name, reference in self._references.items()}  # type: ignore
+
+    def __repr__(self) -> str:
+        return f"OdbSet({self.name!r})"
+
+
+def _sets(entries: Dict[str, Dict[str, Any]], arrays: _Arrays) -> Dict[str, Dict[str, OdbSet]]:
+    return {
+        kind: {name: OdbSet(entry, members, arrays) for name, entry in entries.get(kind, {}).items()}
+        for kind, members in (("nodeSets", "nodes"), ("elementSets", "elements"))
+    }
+
+
+class OdbInstance:
+    """A part instance, see :class:`~abaqus.Odb.OdbInstance.OdbInstance`. The nodes are available as arrays of
+    labels and coordinates if the mesh was exported."""
+
+    def __init__(self, entry: Dict[str, Any], arrays: _Arrays):
+        self.name: str = entry["name"]
+        self._entry = entry
+        self._arrays = arrays
+        sets = _sets(entry, arrays)
+        self.nodeSets = sets["nodeSets"]
+        self.elementSets = sets["elementSets"]
+
+    @property
+    def nodeLabels(self) -> Optional[np.ndarray]:
+        """The labels of the nodes, None if the mesh was not exported."""
+        return self._arrays(self._entry.get("nodeLabels"))
+
+    @property
+    def coordinates(self) -> Optional[np.ndarray]:
+        """The coordinates of the nodes, one row per node, None if the mesh was not exported."""
+        return self._arrays(self._entry.get("coordinates"))
+
+    def __repr__(self) -> str:
+        return f"OdbInstance({self.name!r})"
+
+
+class OdbDatumCsys:
+    """A datum coordinate system, see :class:`~abaqus.Odb.OdbDatumCsys.OdbDatumCsys`. Its axes are directions."""
+
+    def __init__(self, name: str, coordSysType: str, origin: Sequence[float] = (0.0, 0.0, 0.0),
+                 xAxis: Sequence[float] = (1.0, 0.0, 0.0), yAxis: Sequence[float] = (0.0, 1.0, 0.0),
+                 zAxis: Sequence[float] = (0.0, 0.0, 1.0)):  # fmt: skip
+        self.name = name
+        self.coordSysType = str(coordSysType)
+        self.origin = tuple(origin)
+        self.xAxis = tuple(xAxis)
+        self.yAxis = tuple(yAxis)
+        self.zAxis = tuple(zAxis)
+
+    def __repr__(self) -> str:
+        return f"OdbDatumCsys({self.name!r}, {self.coordSysType})"
+
+
+class OdbAssembly:
+    """The root assembly, see :class:`~abaqus.Odb.OdbAssembly.OdbAssembly`."""
+
+    def __init__(self, instances: Dict[str, OdbInstance], entry: Dict[str, Any], arrays: _Arrays):
+        self.instances = instances
+        sets = _sets(entry, arrays)
+        self.nodeSets = sets["nodeSets"]
+        self.elementSets = sets["elementSets"]
+        self.datumCsyses = {name: OdbDatumCsys(**csys) for name, csys in entry.get("datumCsyses", {}).items()}
+
+
+def _block_array(name: str, doc: str) -> property:
+    return property(lambda self: self._array(name), doc=doc)
+
+
+class FieldBulkData:
+    """A block of a field output, see :class:`~abaqus.Odb.FieldBulkData.FieldBulkData`. Its arrays are mapped
+    when they are first accessed, the rows of a subset are copied. The data computed by
+    :meth:`FieldOutput.getScalarField` and :meth:`FieldOutput.getTransformedField` are held in memory."""
+
+    def __init__(self, entry: Dict[str, Any], instance: Optional[OdbInstance], arrays: _Arrays,
+                 index: Optional[np.ndarray] = None, data: Optional[np.ndarray] = None,
+                 conjugateData: Optional[np.ndarray] = None):  # fmt: skip
+        self.position: str = entry["position"]
+        self.type: str = entry["type"]
+        self.instance = instance
+        self.elementType: str = entry["elementType"]
+        self.baseElementType: str = entry["baseElementType"]
+        self.sectionPoint = SectionPoint(**entry["sectionPoint"]) if entry["sectionPoint"] else None
+        self.componentLabels = tuple(entry["componentLabels"])
+        self._entry = entry
+        self._arrays = arrays
+
+        #: The indices of the rows of the subset, None for all the rows.
+        self._index = index
+
+        #: The computed data of the rows, None if the data are read from the store.
+        self._data = data
+
+        #: The computed imaginary part of the data of the rows, None if it is real or read from the store.
+        self._conjugateData = conjugateData
+
+    def _array(self, name: str) -> Optional[np.ndarray]:
+        if name in ("data", "conjugateData") and self._data is not None:
+            return self._data if name == "data" else self._conjugateData
+        array = self._arrays(self._entry.get(name))
+        if array is None or self._index is None:
+            return array
+        return array[self._index]
+
+    data = _block_array("data", "The data, one row per value and one column per component.")
+    conjugateData = _block_array("conjugateData", "The imaginary part of the complex data, None if it is real.")
+    nodeLabels = _block_array("nodeLabels", "The node labels of the values, None if they are not nodal.")
+    elementLabels = _block_array("elementLabels", "The element labels of the values, None if they are nodal.")
+    integrationPoints = _block_array("integrationPoints", "The integration points of the values, None if none.")
+    localCoordSystem = _block_array(
+        "localCoordSystem", "The quaternions (q1, q2, q3, q0) of the local coordinate systems of the values, or None."
+    )
+
+    @property
+    def length(self) -> int:
+        """The number of values of the block."""
+        if self._index is not None:
+            return len(self._index)
+        return self._entry["data"]["shape"][0] if self._entry["data"] else 0
+
+    @property
+    def width(self) -> int:
+        """The number of components of the values of the block."""
+        if self._data is not None:
+            return self._data.shape[1]
+        return self._entry["data"]["shape"][1] if self._entry["data"] else 0
+
+    def _subset(self, mask: np.ndarray) -> FieldBulkData:
+        rows = np.flatnonzero(mask)
+        index = rows if self._index is None else self._index[rows]
+        data = None if self._data is None else self._data[rows]
+        conjugateData = None if self._conjugateData is None else self._conjugateData[rows]
+        return FieldBulkData(self._entry, self.instance, self._arrays, index, data, conjugateData)
+
+    def _computed(self, entry: Dict[str, Any], data: np.ndarray,
+                  conjugateData: Optional[np.ndarray] = None) -> FieldBulkData:  # fmt: skip
+        """A block of the same values with computed data, and the computed imaginary part of complex data."""
+        return FieldBulkData(entry, self.instance, self._arrays, self._index, data, conjugateData)
+
+    def __repr__(self) -> str:
+        return f"FieldBulkData({self.position}, {self.elementType or self.type}, length={self.length})"
+
+
+def _keys(elementLabels: np.ndarray, integrationPoints: Optional[np.ndarray]) -> np.ndarray:
+    """The keys of the values of elements, at their integration points."""
+    keys = elementLabels.astype(np.int64) << 16
+    return keys + integrationPoints if integrationPoints is not None else keys
+
+
+def _rows(keys: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """The rows of the values among the keys."""
+    if not len(keys):
+        raise ValueError("The labels of the values are not found")
+    order = np.argsort(keys, kind="stable")
+    rows = np.minimum(np.searchsorted(keys, values, sorter=order), len(keys) - 1)
+    rows = order[rows]
+    if not np.array_equal(keys[rows], values):
+        raise ValueError("Some of the labels of the values are not found")
+    return rows
+
+
+class FieldOutput:
+    """A field output of a frame, see :class:`~abaqus.Odb.FieldOutput.FieldOutput`. Its values are available as
+    the arrays of its :attr:`bulkDataBlocks`."""
+
+    def __init__(self, entry: Dict[str, Any], bulkDataBlocks: List[FieldBulkData], frame: Optional[OdbFrame] = None):
+        self.name: str = entry["name"]
+        self.description: str = entry["description"]
+        self.type: str = entry["type"]
+        self.componentLabels = tuple(entry["componentLabels"])
+        self.validInvariants = tuple(entry["validInvariants"])
+        self.bulkDataBlocks = bulkDataBlocks
+        self._entry = entry
+
+        #: The frame of the field output, whose ``COORD`` field output locates the values at the integration points.
+        self._frame = frame
+
+    @property
+    def locations(self) -> List[str]:
+        """The positions of the blocks of the field output."""
+        return sorted({block.position for block in self.bulkDataBlocks})
+
+    def getSubset(
+        self,
+        position: Optional[str] = None,
+        region: Union[OdbSet, OdbInstance, None] = None,
+        elementType: Optional[str] = None,
+        sectionPoint: Optional[SectionPoint] = None,
+    ) -> FieldOutput:
+        """A subset of the field output, see :meth:`~abaqus.Odb.FieldOutput.FieldOutput.getSubset`.
+
+        Only the values that are stored can be selected: the values are not extrapolated to other positions, and the
+        values of a node set are selected by node label and those of an element set by element label, since the
+        connectivity of the elements is not exported.
+
+        Parameters
+        ----------
+        position : str, optional
+            The position of the values, e.g., ``NODAL`` or ``INTEGRATION_POINT``.
+        region : Union[OdbSet, OdbInstance], optional
+            The set or instance of the values.
+        elementType : str, optional
+            The element type of the values.
+        sectionPoint : SectionPoint, optional
+            The section point of the values.
+
+        Returns
+        -------
+        FieldOutput
+            The field output with the selected values.
+
+        Raises
+        ------
+        ValueError
+            If the values at the position or in the region are not stored.
+        """
+        blocks = self.bulkDataBlocks
+        if position is not None:
+            position = str(position)
+            blocks = [block for block in blocks if block.position == position]
+            if not blocks and self.bulkDataBlocks:
+                raise ValueError(
+                    f"The field output {self.name} is stored at {', '.join(self.locations)}, not at {position}, "
+                    "the values are not extrapolated"
+                )
+        if elementType is not None:
+            blocks = [block for block in blocks if block.elementType == elementType]
+        if sectionPoint is not None:
+            number = sectionPoint.number
+            blocks = [block for block in blocks if block.sectionPoint and block.sectionPoint.number == number]
+        if isinstance(region, OdbInstance):
+            blocks = [block for block in blocks if block.instance is not None and block.instance.name == region.name]
+        elif isinstance(region, OdbSet):
+            blocks = [subset for subset in (self._select(block, region) for block in blocks) if subset.length]
+        return FieldOutput(self._entry, blocks, self._frame)
+
+    def getScalarField(self, invariant: Optional[str] = None, componentLabel: Optional[str] = None) -> FieldOutput:
+        """A scalar field of a component or an invariant of the values, see
+        :meth:`~abaqus.Odb.FieldOutput.FieldOutput.getScalarField`.
+
+        The invariants are computed for whole blocks at once by :mod:`abqpy.invariants`, in double precision and
+        only from the real part of the values.
+
+        Parameters
+        ----------
+        invariant : str, optional
+            The invariant, e.g., ``MISES`` or ``MAX_PRINCIPAL``, one of the :attr:`validInvariants`.
+        componentLabel : str, optional
+            The label of the component, e.g., ``S11``, if no invariant is given.
+
+        Returns
+        -------
+        FieldOutput
+            The scalar field output, with the same positions, instances and labels.
+        """
+        if (invariant is None) == (componentLabel is None):
+            raise ValueError("Expected either an invariant or a component label")
+        if invariant is not None and str(invariant) not in self.validInvariants:
+            raise ValueError(f"The invariant {invariant} of the field output {self.name} is not valid, expected one "
+                             f"of {', '.join(self.validInvariants)}")  # fmt: skip
+        if componentLabel is not None and componentLabel not in self.componentLabels:
+            raise ValueError(f"The field output {self.name} has no component {componentLabel}")
+        blocks = []
+        for block in self.bulkDataBlocks:
+            data = block.data
+            if data is None:
+                continue
+            labels = [componentLabel] if componentLabel else []
+            entry = dict(block._entry, type="SCALAR", componentLabels=labels, conjugateData=None)
+            if invariant is None:
+                values = data[:, block.componentLabels.index(str(componentLabel))]
+            else:
+                strain = self.name in invariants.STRAIN_FIELDS
+                values = invariants.invariant(invariant, data, block.componentLabels, block.type, strain)
+            blocks.append(block._computed(entry, values.reshape(-1, 1)))
+        entry = dict(self._entry, type="SCALAR", componentLabels=[], validInvariants=[])
+        return FieldOutput(entry, blocks, self._frame)
+
+    def getTransformedField(
+        self,
+        datumCsys: OdbDatumCsys,
+        deformationField: Optional[FieldOutput] = None,
+        projected22Axis: int = 2,
+        projectionTol: float = 0.1,
+    ) -> FieldOutput:
+        """A field output with the values transformed to a coordinate system, see
+        :meth:`~abaqus.Odb.FieldOutput.FieldOutput.getTransformedField`.
+
+        The values of all the points of a block are transformed at once by :mod:`abqpy.transformations`, the
+        imaginary part of complex values (``conjugateData``) is transformed alike. The values written in local
+        coordinate systems are first rotated back to global coordinates with their ``localCoordSystem``. The points of
+        cylindrical and spherical systems are located by the coordinates of the nodes of the instance, moved by the
+        ``deformationField`` if it is given, or for the values at the integration points by the ``COORD`` field output
+        of the frame, which must be exported.
+
+        Parameters
+        ----------
+        datumCsys : OdbDatumCsys
+            The coordinate system, e.g., one of the ``datumCsyses`` of the root assembly.
+        deformationField : FieldOutput, optional
+            The nodal displacements that move the nodes of the instances, by default the undeformed coordinates are
+            used.
+        projected22Axis : int, optional
+            The axis of the coordinate system that is projected on the plane of the values of shells and planar
+            elements as their 2-axis, 1, 2 or 3, by default 2.
+        projectionTol : float, optional
+            The minimum angle in radians between the projected axis and the normal of the plane, the next axis is
+            projected where the angle is smaller, by default 0.1.
+
+        Returns
+        -------
+        FieldOutput
+            The transformed field output, with the same positions, instances and labels.
+
+        Raises
+        ------
+        ValueError
+            If the field output is scalar, has values of assembly nodes, or the points of its values are unknown.
+        """
+        if self.type == "SCALAR":
+            raise ValueError(f"The field output {self.name} is scalar, only vectors and tensors are transformed")
+        blocks = []
+        for block in self.bulkDataBlocks:
+            data = block.data
+            if data is None:
+                continue
+            if block.instance is None:
+                raise ValueError(f"Cannot transform the field output {self.name}, which has values of assembly nodes")
+            points = None if datumCsys.coordSysType == "CARTESIAN" else self._points(block, deformationField)
+            rotations = transformations.axes(datumCsys.coordSysType, datumCsys.origin, datumCsys.xAxis,
+                                             datumCsys.yAxis, points, block.length)  # fmt: skip
+            local = block.localCoordSystem
+            local = transformations.quaternions(local) if local is not None else None
+            if block.type in transformations.PLANE_TYPES:
+                normals = local[:, 2] if local is not None else np.array([0.0, 0.0, 1.0])
+                rotations = transformations.project(rotations, normals, projected22Axis, projectionTol)
+            if local is not None:  # the values are rotated from the local systems back to the global one
+                rotations = np.einsum("nij,nkj->nik", rotations, local)
+            strain = self.name in invariants.STRAIN_FIELDS
+            values = transformations.transform(data, block.componentLabels, rotations, strain)
+            conjugateData = block.conjugateData
+            if conjugateData is not None:  # the rotations are real, they apply to both parts of complex values
+                conjugateData = transformations.transform(conjugateData, block.componentLabels, rotations, strain)
+            entry = dict(block._entry, conjugateData=None, localCoordSystem=None)
+            blocks.append(block._computed(entry, values, conjugateData))
+        return FieldOutput(self._entry, blocks, self._frame)
+
+    def _points(self, block: FieldBulkData, deformationField: Optional[FieldOutput]) -> np.ndarray:
+        """The coordinates of the points of the values of a block."""
+        assert block.instance is not None
+        if block.nodeLabels is not None:
+            instance = block.instance
+            if instance.nodeLabels is None or instance.coordinates is None:
+                raise ValueError(f"The coordinates of the nodes of {instance.name} were not exported")
+            points = instance.coordinates[_rows(instance.nodeLabels, block.nodeLabels)].astype(np.float64)
+            for displacement in deformationField.bulkDataBlocks if deformationField is not None else ():
+                if displacement.instance is instance and displacement.nodeLabels is not None:
+                    rows = _rows(displacement.nodeLabels, block.nodeLabels)
+                    points[:, : displacement.width] += displacement.data[rows]
+            return points
+        coordinates = self._frame.fieldOutputs.get("COORD") if self._frame is not None else None
+        for candidate in coordinates.bulkDataBlocks if coordinates is not None else ():
+            located = (candidate.instance, candidate.position, candidate.elementType)
+            if located == (block.instance, block.position, block.elementType) and candidate.elementLabels is not None:
+                keys = _keys(candidate.elementLabels, candidate.integrationPoints)
+                return candidate.data[_rows(keys, _keys(block.elementLabels, block.integrationPoints))]
+        raise ValueError(
+            f"The points of the {block.position} values of {block.elementType} elements are not known, export the "
+            "COORD field output at this position with the field output"
+        )
+
+    def _select(self, block: FieldBulkData, region: OdbSet) -> FieldBulkData:
+        name = "nodeLabels" if region.kind == "nodes" else "elementLabels"
+        if block._entry[name] is None:
+            raise ValueError(
+                f"The {block.position} values of the field output {self.name} have no {name}, they can not be "
+                f"selected by the {region.kind} of the set {region.name}"
+            )
+        labels = region.labels.get(block.instance.name if block.instance is not None else "")
+        if labels is None:
+            return block._subset(np.zeros(block.length, dtype=bool))
+        return block._subset(np.isin(getattr(block, name), labels))
+
+    def __repr__(self) -> str:
+        return f"FieldOutput({self.name!r})"
+
+
+class OdbFrame:
+    """A frame of a step, see :class:`~abaqus.Odb.OdbFrame.OdbFrame`."""
+
+    def __init__(self, entry: Dict[str, Any], domain: str, instances: Dict[str, OdbInstance], arrays: _Arrays):
+        self.frameId: int = entry["frameId"]
+        self.frameValue: float = entry["frameValue"]
+        self.description: str = entry["description"]
+        self.incrementNumber: int = entry["incrementNumber"]
+        self.domain = domain
+        self._entry = entry
+        self._instances = instances
+        self._arrays = arrays
+        self._fieldOutputs: Optional[Dict[str, FieldOutput]] = None
+
+    @property
+    def fieldOutputs(self) -> Dict[str, FieldOutput]:
+        """The field outputs of the frame, read from the file of the frame when they are first accessed."""
+        if self._fieldOutputs is None:
+            self._fieldOutputs = {}
+            for name, entry in self._arrays.load(self._entry["fieldOutputs"]).items():
+                blocks = [
+                    FieldBulkData(block, self._instances.get(block["instance"]), self._arrays)
+                    for block in entry["bulkDataBlocks"]
+                ]
+                self._fieldOutputs[name] = FieldOutput(entry, blocks, self)
+        return self._fieldOutputs
+
+    def __repr__(self) -> str:
+        return f"OdbFrame({self.frameId}, {self.frameValue})"
+
+
+class OdbFrameArray(Sequence[OdbFrame]):
+    """The frames of a step, read from the ``frames.json`` file of the step and created when they are first
+    accessed."""
+
+    def __init__(self, entry: Dict[str, Any], instances: Dict[str, OdbInstance], arrays: _Arrays):
+        self._count: int = entry["frameCount"]
+        self._file: str = entry["frames"]
+        self._domain: str = entry["domain"]
+        self._instances = instances
+        self._arrays = arrays
+        self._entries: Optional[List[Dict[str, Any]]] = None
+        self._frames: Dict[int, OdbFrame] = {}
+
+    def __len__(self) -> int:
+        return self._count
+
+    @overload
+    def __getitem__(self, index: int) -> OdbFrame: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[OdbFrame]: ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[OdbFrame, List[OdbFrame]]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._count))]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("frame index out of range")
+        frame = self._frames.get(index)
+        if frame is None:
+            if self._entries is None:
+                self._entries = self._arrays.load(self._file)
+            frame = self._frames[index] = OdbFrame(self._entries[index], self._domain, self._instances, self._arrays)
+        return frame
+
+    def __repr__(self) -> str:
+        return f"OdbFrameArray(length={self._count})"
+
+
+class OdbStep:
+    """A step, see :class:`~abaqus.Odb.OdbStep.OdbStep`. Only the exported frames are available."""
+
+    def __init__(self, entry: Dict[str, Any], instances: Dict[str, OdbInstance], arrays: _Arrays):
+        self.name: str = entry["name"]
+        self.number: int = entry["number"]
+        self.description: str = entry["description"]
+        self.domain: str = entry["domain"]
+        self.procedure: str = entry["procedure"]
+        self.timePeriod: float = entry["timePeriod"]
+        self.totalTime: float = entry["totalTime"]
+        self.frames = OdbFrameArray(entry, instances, arrays)
+
+    def __repr__(self) -> str:
+        return f"OdbStep({self.name!r})"
+
+
+class Odb:
+    """An output database read from a store, see :class:`~abaqus.Odb.Odb.Odb`."""
+
+    def __init__(self, store: str, manifest: Dict[str, Any]):
+        #: The directory of the store.
+        self.store = store
+
+        #: The manifest of the store.
+        self.manifest = manifest
+
+        self.name: str = manifest["odb"]["name"]
+        self.path: str = manifest["odb"]["path"]
+        self._arrays = _Arrays(store)
+        instances = {name: OdbInstance(entry, self._arrays) for name, entry in manifest["instances"].items()}
+        self.rootAssembly = OdbAssembly(instances, manifest.get("rootAssembly", {}), self._arrays)
+        self.steps = {step["name"]: OdbStep(step, instances, self._arrays) for step in manifest["steps"]}
+
+    def close(self):
+        """Release the memory maps of the store, the arrays that were read remain valid."""
+        self._arrays.close()
+
+    def __enter__(self) -> Odb:
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __repr__(self) -> str:
+        return f"Odb({self.name!r}, store={self.store!r})"
+
+
+def open_store(path: str) -> Odb:
+    """Open a store exported by :meth:`abqpy.cli.AbqpyCLI.odb_export`.
+
+    Parameters
+    ----------
+    path : str
+        The directory of the store.
+
+    Returns
+    -------
+    Odb
+        The output database of the store.
+
+    Raises
+    ------
+    FileNotFoundError
+        If the store has no manifest, because it does not exist or its export did not complete.
+    ValueError
+        If the directory is not a store, or a store of another version.
+    """
+    path = os.path.abspath(path)
+    manifest_path = os.path.join(path, "manifest.json")
+    if not os.path.isfile(manifest_path):
+        raise FileNotFoundError(f"No manifest.json in {path}, the store does not exist or its export did not complete")
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+    if manifest.get("format") != FORMAT:
+        raise ValueError(f"{path} is not a store of format {FORMAT}")
+    if manifest.get("version", 0) != VERSION:
+        raise ValueError(f"The store {path} has version {manifest.get('version')}, only version {VERSION} is read, "
+                         "export it again")  # fmt: skip
+    return Odb(path, manifest)
@@ -1,6 +1,8 @@
 import os
 import sys
 import warnings
+from functools import partial
+from typing import Optional
 
 from .cli import abaqus
 from .config import config
@@ -21,35 +23,76 @@ def run(cae: bool = True) -> None:
     if config.make_docs or config.skip_abaqus:
         return
 
-    # If it is a jupyter notebook, convert it to python script
-    try:  # If it is a jupyter notebook
-        import ipynbname
-
-        filePath = ipynbname.path()
-        print("You are running a jupyter notebook, it will be converted to a pure python script.")
-        os.system(f"jupyter nbconvert --to python {filePath}")
-        filePath = os.path.relpath(filePath.with_suffix(".py"))
-    except (FileNotFoundError, ImportError, Exception):
-        # Get the main script file
-        main = sys.modules["__main__"]
-        if not hasattr(main, "__file__") or main.__file__ is None:
-            raise RuntimeError("Cannot find the main script file, please run the script in a file.")
-
-        try:
-            filePath = os.path.relpath(main.__file__)
-        except ValueError:
-            filePath = main.__file__
-
-    # Alternative to use abaqus command line options at run time
-    print("The script will be submitted to Abaqus next and the current Python session will be closed.")
-    gettrace = getattr(sys, "gettrace", None)
-    if config.debug or (gettrace is not None and gettrace()):
-        warnings.warn(
-            "You are running the script in debug mode, the script will be opened in Abaqus PDE where you can debug it."
-        )
-        abaqus.pde(script=filePath)
-    elif cae:
-        abaqus.cae(filePath, *sys.argv[1:], **config.cae.model_dump())
-    else:
-        abaqus.python(filePath, *sys.argv[1:], **config.python.model_dump())
-    sys.exit(0)
+    from .trace import tracing
+
+    # Time the phases of the run if tracing is enabled
+    with tracing("run", argv=sys.argv[1:]) as trace:
+        # If it is a jupyter notebook, convert it to python script
+        try:  # If it is a jupyter notebook
+            import ipynbname
+
+            notebook: Optional[str] = str(ipynbname.path())
+        except (FileNotFoundError, ImportError, Exception):
+            notebook = None
+        if notebook is not None:
+            from .notebook import convert_notebook
+
+            print("You are running a jupyter notebook, it will be converted to a pure python script.")
+            with trace.span("notebook conversion"):
+                filePath = os.path.relpath(convert_notebook(notebook))
+        else:
+            # Get the main script file
+            main = sys.modules["__main__"]
+            if not hasattr(main, "__file__") or main.__file__ is None:
+                raise RuntimeError("Cannot find the main script file, please run the script in a file.")
+
+            try:
+                filePath = os.path.relpath(main.__file__)
+            except ValueError:
+                filePath = main.__file__
+
+        # Alternative to use abaqus command line options at run time
+        print("The script will be submitted to Abaqus next and the current Python session will be closed.")
+        gettrace = getattr(sys, "gettrace", None)
+        if config.debug or (gettrace is not None and gettrace()):
+            warnings.warn(
+                "You are running the script in debug mode, "
+                "the script will be opened in Abaqus PDE where you can debug it."
+            )
+            sys.exit(abaqus.pde(script=filePath).returncode)
+
+        server = cae and config.server and not config.cae.gui
+        if server:
+            from .server import unsupported_options
+
+            unsupported = unsupported_options(config.cae)
+            if unsupported:
+                warnings.warn(
+                    f"The options {', '.join(unsupported)} of Abaqus/CAE are not supported by the kernel server, "
+                    "the script is run with a new Abaqus/CAE process."
+                )
+                server = False
+
+        if server:
+            options = dict(config.cae.model_dump(), mode="cae")
+            submit = partial(abaqus.server.run, filePath, *sys.argv[1:], database=config.cae.database,
+                             startup=config.cae.startup)  # fmt: skip
+        elif cae:
+            options = dict(config.cae.model_dump(), mode="cae")
+            submit = partial(abaqus.cae, filePath, *sys.argv[1:], **config.cae.model_dump())
+        else:
+            options = dict(config.python.model_dump(), mode="python")
+            submit = partial(abaqus.python, filePath, *sys.argv[1:], **config.python.model_dump())
+
+        trace.args.update(script=filePath, mode=options["mode"])
+
+        # Restore the results of an identical run from the result cache if it is enabled
+        with trace.span("submission"):
+            if config.result_cache:
+                from .cache import ResultCache
+
+                result = ResultCache.from_config().run(filePath, sys.argv[1:], options, submit)
+            else:
+                result = submit()
+        trace.args["returncode"] = result.returncode
+        sys.exit(result.returncode)
@@ -0,0 +1,402 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import re
+import shlex
+import shutil
+import signal
+import subprocess
+import sys
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from .config import config
+
+#: A callback that receives the lines of an output stream of a command, including the line endings.
+LineCallback = Callable[[str], Any]
+
+#: The time in seconds a command is given to exit after it is asked to terminate, before it is killed.
+KILL_GRACE_PERIOD = 5.0
+
+
+@dataclass
+class CommandResult:
+    """The result of a command run by :func:`run_command` or :func:`run_command_async`."""
+
+    #: The argument vector of the command.
+    args: List[str]
+
+    #: The return code of the command, -N if it was terminated by signal N (POSIX only).
+    returncode: int
+
+    #: The wall-clock time of the command in seconds.
+    wall_time: float
+
+    #: The CPU time (user and system) of the command and the child processes it waited for in seconds, None if it
+    #: is not available (Windows).
+    cpu_time: Optional[float] = None
+
+    #: Whether the command was killed because it timed out.
+    timed_out: bool = False
+
+    #: The peak disk usage in bytes of the scratch directory managed for the command, None if it had none, see
+    #: :class:`~abqpy.scratch.Scratch`.
+    scratch_usage: Optional[int] = None
+
+    def check_returncode(self):
+        """Raise a :class:`subprocess.CalledProcessError` if the return code is non-zero."""
+        if self.returncode:
+            raise subprocess.CalledProcessError(self.returncode, self.args)
+
+
+def _alive(pid: int) -> bool:
+    """Whether a process is running."""
+    if os.name == "nt":
+        tasks = subprocess.run(["tasklist", "/FI", f"PID eq {pid}", "/NH"], capture_output=True, text=True).stdout
+        return str(pid) in tasks.split()
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:  # the process of another user
+        return True
+    return True
+
+
+def _exitcode(status: int) -> int:
+    """Convert a wait status to a return code as :attr:`subprocess.Popen.returncode`."""
+    if os.WIFSIGNALED(status):
+        return -os.WTERMSIG(status)
+    return os.WEXITSTATUS(status)
+
+
+class Command:
+    """A command run in a subprocess, with its output streamed line by line to callbacks.
+
+    The command is started in a new process group (session on POSIX), so that the whole process tree, e.g., the
+    analysis processes started by the ``abaqus`` driver, is terminated when it times out or the caller is
+    interrupted: the process group is sent ``SIGTERM`` (``CTRL_BREAK_EVENT`` on Windows), so that Abaqus can close
+    its files and release its license, then killed after :data:`KILL_GRACE_PERIOD` if it is still running.
+
+    Parameters
+    ----------
+    args : Sequence[str]
+        The argument vector of the command, the executable is looked up in ``PATH`` (and ``PATHEXT`` on Windows,
+        so that ``abaqus`` finds ``abaqus.bat``).
+    cwd : str, optional
+        The working directory of the command, by default the current directory.
+    env : Mapping[str, str], optional
+        The environment variables of the command, by default the environment of the current process.
+    timeout : float, optional
+        The time in seconds after which the command is killed, by default None, i.e., no timeout.
+    stdout, stderr : Callable[[str], None], optional
+        Callbacks called from a reader thread with each line of the standard output and error streams. The streams
+        are inherited from the current process if no callback is given.
+    """
+
+    def __init__(
+        self,
+        args: Sequence[str],
+        *,
+        cwd: Optional[str] = None,
+        env: Optional[Mapping[str, str]] = None,
+        timeout: Optional[float] = None,
+        stdout: Optional[LineCallback] = None,
+        stderr: Optional[LineCallback] = None,
+    ):
+        self.args = [str(arg) for arg in args]
+        self.cwd = cwd
+        self.env = env
+        self.timeout = timeout
+        self.stdout = stdout
+        self.stderr = stderr
+        self.timed_out = False
+        self.process: Optional[subprocess.Popen] = None
+        self._lock = threading.Lock()
+        self._readers: List[threading.Thread] = []
+        self._timer: Optional[threading.Timer] = None
+        self._killer: Optional[threading.Timer] = None
+        self._start = 0.0
+
+    def start(self) -> Command:
+        """Start the command."""
+        executable = shutil.which(self.args[0]) or self.args[0]
+        group: Dict[str, Any] = dict(start_new_session=True)
+        if sys.platform == "win32":
+            group = dict(creationflags=subprocess.CREATE_NEW_PROCESS_GROUP)
+        self._start = time.perf_counter()
+        self.process = subprocess.Popen(
+            [executable, *self.args[1:]],
+            cwd=self.cwd,
+            env=None if self.env is None else dict(self.env),
+            stdout=subprocess.PIPE if self.stdout else None,
+            stderr=subprocess.PIPE if self.stderr else None,
+            text=True,
+            errors="replace",
+            bufsize=1,
+            **group,
+        )
+        for stream, callback in ((self.process.stdout, self.stdout), (self.process.stderr, self.stderr)):
+            if callback is not None:
+                reader = threading.Thread(target=self._read, args=(stream, callback), daemon=True)
+                reader.start()
+                self._readers.append(reader)
+        if self.timeout is not None:
+            self._timer = threading.Timer(self.timeout, self._expire)
+            self._timer.daemon = True
+            self._timer.start()
+        return self
+
+    @staticmethod
+    def _read(stream, callback: LineCallback):
+        with stream:
+            for line in stream:
+                callback(line)
+
+    def _expire(self):
+        self.timed_out = True
+        self.kill()
+
+    @staticmethod
+    def _signal(process: subprocess.Popen, force: bool):
+        """Ask the process group of a command to terminate, or kill it if **force** is True."""
+        try:
+            if os.name != "nt":
+                os.killpg(process.pid, signal.SIGKILL if force else signal.SIGTERM)
+            elif force:
+                subprocess.run(["taskkill", "/F", "/T", "/PID", str(process.pid)], capture_output=True)
+            else:
+                os.kill(process.pid, signal.CTRL_BREAK_EVENT)  # type: ignore[attr-defined]
+        except OSError:
+            pass
+
+    def kill(self, grace: Optional[float] = None):
+        """Terminate the command and its child processes, if it is still running.
+
+        Parameters
+        ----------
+        grace : float, optional
+            The time in seconds the processes are given to exit before they are killed, by default
+            :data:`KILL_GRACE_PERIOD`, 0 to kill them at once.
+        """
+        grace = KILL_GRACE_PERIOD if grace is None else grace
+        with self._lock:
+            process = self.process
+            if process is None or process.returncode is not None:
+                return
+            self._signal(process, force=grace <= 0)
+            if grace > 0 and self._killer is None:
+                # The child processes of the group are killed even if the command itself exits in time
+                self._killer = threading.Timer(grace, self._signal, (process, True))
+                self._killer.daemon = True
+                self._killer.start()
+
+    def wait(self) -> CommandResult:
+        """Wait for the command to finish, killing it if the waiting is interrupted."""
+        process = self.process
+        assert process is not None, "The command has not been started"
+        cpu_time = None
+        try:
+            if hasattr(os, "wait4"):
+                _, status, usage = os.wait4(process.pid, 0)
+                with self._lock:
+                    process.returncode = _exitcode(status)
+                cpu_time = usage.ru_utime + usage.ru_stime
+            else:
+                process.wait()
+        except BaseException:
+            self.kill()
+            try:  # the timer that kills the processes does not outlive the interpreter
+                process.wait(KILL_GRACE_PERIOD)
+            except BaseException:
+                pass
+            self._signal(process, force=True)
+            raise
+        finally:
+            if self._timer is not None:
+                self._timer.cancel()
+        wall_time = time.perf_counter() - self._start
+        for reader in self._readers:
+            reader.join()
+        return CommandResult(self.args, process.returncode, wall_time, cpu_time, self.timed_out)
+
+
+def run_command(
+    args: Sequence[str],
+    *,
+    cwd: Optional[str] = None,
+    env: Optional[Mapping[str, str]] = None,
+    timeout: Optional[float] = None,
+    stdout: Optional[LineCallback] = None,
+    stderr: Optional[LineCallback] = None,
+    check: bool = False,
+) -> CommandResult:
+    """Run a command and wait for it to finish, see :class:`Command` for the arguments.
+
+    Parameters
+    ----------
+    check : bool, optional
+        Raise a :class:`subprocess.CalledProcessError` if the return code is non-zero, by default False.
+
+    Returns
+    -------
+    CommandResult
+        The return code and timing of the command.
+    """
+    command = Command(args, cwd=cwd, env=env, timeout=timeout, stdout=stdout, stderr=stderr)
+    result = command.start().wait()
+    if check:
+        result.check_returncode()
+    return result
+
+
+async def run_command_async(
+    args: Sequence[str],
+    *,
+    cwd: Optional[str] = None,
+    env: Optional[Mapping[str, str]] = None,
+    timeout: Optional[float] = None,
+    stdout: Optional[LineCallback] = None,
+    stderr: Optional[LineCallback] = None,
+    check: bool = False,
+) -> CommandResult:
+    """Run a command from asyncio, see :func:`run_command` for the arguments.
+
+    The command is waited for in its own thread, so that many commands can be supervised at once, and the callbacks
+    are called in the event loop. The command is killed if the awaiting task is cancelled.
+
+    Returns
+    -------
+    CommandResult
+        The return code and timing of the command.
+    """
+    loop = asyncio.get_running_loop()
+
+    def call_soon(callback: Callable, *args):
+        try:
+            loop.call_soon_threadsafe(callback, *args)
+        except RuntimeError:  # the event loop is closed
+            pass
+
+    def in_loop(callback: Optional[LineCallback]) -> Optional[LineCallback]:
+        return None if callback is None else lambda line: call_soon(callback, line)
+
+    command = Command(args, cwd=cwd, env=env, timeout=timeout, stdout=in_loop(stdout), stderr=in_loop(stderr))
+    command.start()
+    future = loop.create_future()
+
+    def resolve(result: Optional[CommandResult], error: Optional[BaseException]):
+        if future.done():
+            return
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def wait():
+        try:
+            result, error = command.wait(), None
+        except BaseException as e:
+            result, error = None, e
+        call_soon(resolve, result, error)
+
+    threading.Thread(target=wait, daemon=True).start()
+    try:
+        result = await future
+    except asyncio.CancelledError:
+        command.kill()
+        raise
+    if check:
+        result.check_returncode()
+    return result
+
+
+def split_command(cmd: str) -> List[str]:
+    """Split a command line into its arguments like a shell would do. On Windows, the backslashes of paths are kept
+    and the double quotes, which group arguments with spaces, are removed, e.g., ``input="C:\\My Files\\a.inp"``
+    is one argument ``input=C:\\My Files\\a.inp``. The arguments are quoted again by :mod:`subprocess`."""
+    if os.name != "nt":
+        return shlex.split(cmd)
+    return [arg.replace('"', "") for arg in re.findall(r'(?:[^\s"]+|"[^"]*")+', cmd)]
+
+
+@contextmanager
+def _managed(run_options: Dict[str, Any], args: List[str],
+             stdout: LineCallback) -> Iterator[Tuple[Dict[str, Any], Callable]]:  # fmt: skip
+    """Give a command the scratch directory managed by abqpy and trace it, if they are enabled by the
+    :envvar:`ABQPY_SCRATCH` and :envvar:`ABQPY_TRACE` environment variables. Yield the options of the command and the
+    function that completes its result."""
+    scratch = None
+    if config.scratch:
+        from .scratch import Scratch
+
+        scratch = Scratch.from_config()
+    with scratch or nullcontext():
+        options = dict(run_options)
+        if scratch is not None:
+            options["env"] = scratch.environ(options["env"])
+        trace = None
+        if config.trace:
+            from .trace import trace_command
+
+            options, trace = trace_command(args, stdout, options)
+
+        def finish(result: CommandResult) -> CommandResult:
+            if scratch is not None:
+                result.scratch_usage = scratch.close()
+                stdout(f"{scratch}\n")
+            return result if trace is None else trace(result)
+
+        yield options, finish
+
+
+def run_managed(args: List[str], options: Dict[str, Any],
+                asynchronous: bool = False) -> Union[CommandResult, Awaitable[CommandResult]]:  # fmt: skip
+    """Run a command of the abqpy command line interface, see :meth:`abqpy.cli.AbqpyCLIBase.run`.
+
+    The command line is written to the stdout callback first. The command is given the scratch directory managed by
+    abqpy and traced if they are enabled.
+
+    Parameters
+    ----------
+    args : List[str]
+        The argument vector of the command.
+    options : Dict[str, Any]
+        The keyword arguments of :func:`run_command`, except **check**.
+    asynchronous : bool, optional
+        Return an awaitable of the result, see :func:`run_command_async`, by default False.
+
+    Returns
+    -------
+    CommandResult
+        The return code and timing of the command, or an awaitable of it if **asynchronous** is True.
+    """
+    message = f"Running the following command: {' '.join(args)}"
+    stdout = options["stdout"] or (lambda line: print(line, end=""))
+    for line in ("", "-" * len(message), message, "-" * len(message)):
+        stdout(line + "\n")
+    if asynchronous:
+
+        async def run() -> CommandResult:
+            with _managed(options, args, stdout) as (managed, finish):
+                return finish(await run_command_async(args, **managed))
+
+        return run()
+    with _managed(options, args, stdout) as (managed, finish):
+        return finish(run_command(args, **managed))
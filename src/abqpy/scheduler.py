@@ -0,0 +1,595 @@
+from __future__ import annotations
+
+import asyncio
+import getpass
+import json
+import math
+import os
+import shlex
+import shutil
+import signal
+import subprocess
+import time
+import uuid
+from contextlib import contextmanager, nullcontext
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+from .cli import AbqpyCLI
+from .config import config
+from .farm import Case
+from .runner import Command, CommandResult, _alive
+from .scratch import Scratch
+
+#: The statuses of the jobs of a :class:`LocalQueue`, those of :attr:`abaqus.Job.Job.Job.status` and ``UNKNOWN`` for
+#: the jobs that were running when the dispatcher was killed, their return code is not known.
+STATUSES = ("SUBMITTED", "RUNNING", "COMPLETED", "ABORTED", "TERMINATED", "UNKNOWN")
+
+#: The time in seconds after which the lock of the queue state is considered to be left by a dead process, the lock
+#: holds a token of its owner so that it is not removed by a previous owner once it has been broken.
+LOCK_TIMEOUT = 30
+
+Resources = Tuple[float, float, float]
+
+
+def _kill(pid: int):
+    """Kill a process started by the dispatcher of another process, and its child processes."""
+    if os.name == "nt":
+        subprocess.run(["taskkill", "/F", "/T", "/PID", str(pid)], capture_output=True)
+    else:
+        try:
+            os.killpg(pid, signal.SIGKILL)
+        except OSError:
+            pass
+
+
+def _unlock(lock: str, token: str):
+    """Remove a lock file only if it still holds the token of its owner, it may have been broken after
+    :data:`LOCK_TIMEOUT` and taken by another process."""
+    try:
+        with open(lock) as f:
+            if f.read() != token:
+                return
+        os.remove(lock)
+    except OSError:
+        pass
+
+
+class _Arguments(AbqpyCLI):
+    """The abqpy command line interface that returns the argument vectors of the commands instead of running them."""
+
+    def run(self, cmd: Union[str, Sequence[str]]) -> List[str]:  # type: ignore[override]
+        return shlex.split(cmd, posix=os.name != "nt") if isinstance(cmd, str) else list(cmd)
+
+
+@dataclass
+class QueuedJob:
+    """A job of a :class:`LocalQueue`."""
+
+    #: The ID of the job, unique in its queue.
+    id: int
+
+    #: The case run by the job, with its CPUs, memory and license tokens.
+    case: Case
+
+    #: The directory the job was submitted from.
+    cwd: str
+
+    #: The priority of the job, jobs with a higher priority are started first.
+    priority: int = 0
+
+    #: The estimated wall-clock time of the job in seconds, None if it is not known. Jobs with an estimate can be
+    #: started before jobs with a higher priority if they end before the higher priority jobs can start.
+    walltime: Optional[float] = None
+
+    #: The user who submitted the job.
+    user: str = ""
+
+    #: The status of the job, see :data:`STATUSES`.
+    status: str = "SUBMITTED"
+
+    #: The time the job was submitted, started and finished at, seconds since the epoch.
+    submitted: float = 0.0
+    started: Optional[float] = None
+    finished: Optional[float] = None
+
+    #: The process ID of the running job.
+    pid: Optional[int] = None
+
+    #: The return code of the job, None if it has not finished or is not known.
+    returncode: Optional[int] = None
+
+    #: Whether the job has been cancelled while it was running.
+    cancel: bool = False
+
+    #: The reason why the job was terminated.
+    error: str = ""
+
+    #: The peak disk usage in bytes of the scratch directory of the job, None if it had no managed scratch directory,
+    #: see :envvar:`ABQPY_SCRATCH`.
+    scratch_usage: Optional[int] = None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> QueuedJob:
+        return cls(**dict(data, case=Case(**data["case"])))
+
+    @property
+    def resources(self) -> Resources:
+        """The CPUs, memory and license tokens of the job."""
+        return self.case.cpus, self.case.memory, self.case.tokens or 0
+
+    def end(self, now: float) -> float:
+        """The time the job is expected to end at, infinite if it has no estimated wall-clock time."""
+        if self.walltime is None:
+            return math.inf
+        return max((self.started or now) + self.walltime, now)
+
+
+def _fits(needs: Resources, free: Resources) -> bool:
+    return all(need <= available for need, available in zip(needs, free))
+
+
+def _add(a: Resources, b: Resources, sign: int = 1) -> Resources:
+    return a[0] + sign * b[0], a[1] + sign * b[1], a[2] + sign * b[2]
+
+
+def schedule(queued: Sequence[QueuedJob], running: Sequence[QueuedJob], budget: Resources,
+             now: float) -> List[QueuedJob]:  # fmt: skip
+    """Select the queued jobs to start, by priority, with backfilling.
+
+    The queued jobs are started in the order of their priority, then of their submission, as long as they fit in
+    the resources left by the running jobs. The first job that does not fit gets a reservation at the time the
+    running jobs free enough resources, estimated from their wall-clock times. The following jobs are started
+    (backfilled) only if they fit now and do not delay the reservation: they end before it, or they only use the
+    resources the reserved job leaves free.
+
+    Parameters
+    ----------
+    queued : Sequence[QueuedJob]
+        The jobs waiting to be started.
+    running : Sequence[QueuedJob]
+        The running jobs.
+    budget : Tuple[float, float, float]
+        The CPUs, memory and license tokens shared by the jobs, infinite if they are not accounted.
+    now : float
+        The current time.
+
+    Returns
+    -------
+    List[QueuedJob]
+        The jobs to start now, in the order they should be started.
+    """
+    free = budget
+    for job in running:
+        free = _add(free, job.resources, -1)
+    started: List[QueuedJob] = []
+    reservation: Optional[float] = None  # the time the first blocked job can start at
+    extra: Resources = (0, 0, 0)  # the resources the first blocked job leaves free at the reservation
+    for job in sorted(queued, key=lambda job: (-job.priority, job.submitted, job.id)):
+        if not _fits(job.resources, free):
+            if reservation is None:
+                available, reservation = free, math.inf
+                for other in sorted([*running, *started], key=lambda other: other.end(now)):
+                    available = _add(available, other.resources)
+                    if _fits(job.resources, available):
+                        reservation = other.end(now)
+                        break
+                extra = _add(available, job.resources, -1)
+            continue
+        if reservation is not None and not (job.walltime is not None and now + job.walltime <= reservation < math.inf):
+            if not _fits(job.resources, extra):
+                continue
+            extra = _add(extra, job.resources, -1)  # the job may still run at the reservation
+        started.append(job)
+        free = _add(free, job.resources, -1)
+    return started
+
+
+@dataclass
+class QueueStatus:
+    """The jobs of a :class:`LocalQueue` and the resources they use."""
+
+    #: The name of the queue.
+    name: str
+
+    #: The jobs, in the order they were submitted.
+    jobs: List[QueuedJob] = field(default_factory=list)
+
+    #: The process ID of the dispatcher, None if it is not running.
+    dispatcher: Optional[int] = None
+
+    #: The CPUs, memory and license tokens shared by the jobs.
+    budget: Resources = (math.inf, math.inf, math.inf)
+
+    def __str__(self) -> str:
+        running = [job for job in self.jobs if job.status == "RUNNING"]
+        used = (0.0, 0.0, 0.0)
+        for job in running:
+            used = _add(used, job.resources)
+        dispatcher = "not running" if self.dispatcher is None else f"process {self.dispatcher}"
+        lines = [
+            f"Queue {self.name}, dispatcher {dispatcher}, {len(running)} running, "
+            f"{sum(job.status == 'SUBMITTED' for job in self.jobs)} waiting",
+            f"CPUs {used[0]:g}/{self.budget[0]:g}, memory {used[1]:g}/{self.budget[1]:g} MB, "
+            f"license tokens {used[2]:g}/{self.budget[2]:g}",
+            "",
+            f"{'id':>5}  {'name':<24}{'user':<12}{'status':<12}{'priority':>9}{'cpus':>6}{'code':>6}  error",
+        ]
+        for job in self.jobs:
+            code = "-" if job.returncode is None else job.returncode
+            lines.append(f"{job.id:>5}  {job.case.name:<24}{job.user:<12}{job.status:<12}{job.priority:>9}"
+                         f"{job.case.cpus:>6}{code:>6}  {job.error}")  # fmt: skip
+        return "\n".join(lines)
+
+
+class LocalQueue:
+    """A queue that runs Abaqus jobs and scripts on the local machine, within a budget of CPUs, memory and license
+    tokens, like a remote queue of :class:`~abaqus.Job.Queue.Queue` with the local machine as its host, see
+    :meth:`~abaqus.Job.Queue.Queue.localQueue` for the queues without **hostName**.
+
+    Jobs are submitted by any process, e.g., by several users of a workstation with ``abqpy queue submit``, and run
+    by one dispatcher process, ``abqpy queue dispatch``. The queue state is kept in a JSON file, so that the jobs
+    submitted while the dispatcher is not running, or restarted, are run when it starts again. The dispatcher starts
+    the jobs by priority and backfills the smaller jobs into the gaps left by the larger ones, see :func:`schedule`.
+    The output of a job is written to the ``<name>.abqpy.log`` file in its working directory.
+
+    Parameters
+    ----------
+    name : str, optional
+        The name of the queue, by default "local".
+    directory : str, optional
+        The directory where the jobs are run, in a ``<id>-<name>`` subdirectory, like the remote directory of
+        :class:`~abaqus.Job.Queue.Queue`. By default an empty string, i.e., the jobs are run in the directory they
+        were submitted from.
+    fileCopy : bool, optional
+        Whether the result files are copied from the directory of the job to the directory the job was submitted
+        from, by default True.
+    filesToCopy : str | Sequence[str], optional
+        The extensions of the files to copy, e.g., ``("log", "dat", "msg", "sta", "odb")``, or "ALL", by default
+        "ALL".
+    deleteAfterCopy : bool, optional
+        Whether the directory of the job is deleted after its files are copied, by default False.
+    description : str, optional
+        A description of the queue.
+    cpus : int, optional
+        The number of CPUs shared by the jobs, by default the :envvar:`ABQPY_QUEUE_CPUS` environment variable or the
+        number of CPUs.
+    memory : float, optional
+        The memory in megabytes shared by the jobs, by default the :envvar:`ABQPY_QUEUE_MEMORY` environment variable
+        or None, i.e., unlimited.
+    tokens : int, optional
+        The number of license tokens shared by the jobs, by default the :envvar:`ABQPY_QUEUE_TOKENS` environment
+        variable or None, i.e., unlimited.
+    state_dir : str, optional
+        The directory of the state file of the queue, ``<name>.json``, by default the :envvar:`ABQPY_QUEUE_DIR`
+        environment variable or ``~/.abqpy/queue``. It must be writable by all the users of the queue.
+    """
+
+    def __init__(
+        self,
+        name: str = "local",
+        directory: str = "",
+        fileCopy: bool = True,
+        filesToCopy: Union[str, Sequence[str]] = "ALL",
+        deleteAfterCopy: bool = False,
+        description: str = "",
+        *,
+        cpus: Optional[int] = None,
+        memory: Optional[float] = None,
+        tokens: Optional[int] = None,
+        state_dir: Optional[str] = None,
+    ):
+        self.name = name
+        self.directory = os.path.abspath(directory) if directory else ""
+        self.fileCopy = fileCopy
+        self.filesToCopy = filesToCopy if isinstance(filesToCopy, str) else [str(ext) for ext in filesToCopy]
+        self.deleteAfterCopy = deleteAfterCopy
+        self.description = description
+        self.cpus = cpus or config.queue_cpus or os.cpu_count() or 1
+        self.memory = memory or config.queue_memory or None
+        self.tokens = tokens or config.queue_tokens or None
+        state_dir = state_dir or config.queue_dir or os.path.join(os.path.expanduser("~"), ".abqpy", "queue")
+        self._state_file = os.path.join(os.path.abspath(state_dir), f"{name}.json")
+
+    @classmethod
+    def from_queue(cls, queue: Any, **kwargs) -> LocalQueue:
+        """Create a local queue from a :class:`~abaqus.Job.Queue.Queue` object, its ``queueName`` is the name of the
+        local queue.
+
+        Parameters
+        ----------
+        queue : Queue
+            The Queue object.
+        kwargs
+            The other arguments of :class:`LocalQueue`.
+        """
+        filesToCopy = queue.filesToCopy if isinstance(queue.filesToCopy, (list, tuple)) else str(queue.filesToCopy)
+        return cls(queue.queueName, queue.directory, bool(queue.fileCopy), filesToCopy, bool(queue.deleteAfterCopy),
+                   queue.description, **kwargs)  # fmt: skip
+
+    @property
+    def budget(self) -> Resources:
+        """The CPUs, memory and license tokens shared by the jobs, infinite if they are not accounted."""
+        return self.cpus, self.memory or math.inf, self.tokens or math.inf
+
+    @contextmanager
+    def _state(self) -> Iterator[Dict[str, Any]]:
+        """Lock, read and write back the state of the queue, the state file is only rewritten if it changed."""
+        os.makedirs(os.path.dirname(self._state_file), exist_ok=True)
+        lock = self._state_file + ".lock"
+        token = f"{os.getpid()}-{uuid.uuid4().hex}"
+        while True:
+            try:
+                fd = os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                try:
+                    if time.time() - os.path.getmtime(lock) > LOCK_TIMEOUT:
+                        os.remove(lock)  # left by a process that died while holding it
+                        continue
+                except OSError:
+                    continue
+                time.sleep(0.05)
+            else:
+                with os.fdopen(fd, "w") as f:
+                    f.write(token)
+                break
+        try:
+            try:
+                with open(self._state_file) as f:
+                    text = f.read()
+            except FileNotFoundError:
+                text = ""
+            data = json.loads(text) if text else {}
+            state = {
+                "next_id": data.get("next_id", 1),
+                "dispatcher": data.get("dispatcher"),
+                "jobs": [QueuedJob.from_dict(job) for job in data.get("jobs", [])],
+            }
+            yield state
+            changed = json.dumps(dict(state, jobs=[asdict(job) for job in state["jobs"]]), indent=4)
+            if changed != text:
+                temporary = f"{self._state_file}.{os.getpid()}.tmp"
+                with open(temporary, "w") as f:
+                    f.write(changed)
+                os.replace(temporary, self._state_file)
+        finally:
+            _unlock(lock, token)
+
+    def submit(
+        self,
+        script: str,
+        mode: str = "job",
+        name: Optional[str] = None,
+        cpus: int = 1,
+        memory: float = 0,
+        tokens: Optional[int] = None,
+        priority: int = 0,
+        walltime: Optional[float] = None,
+        **parameters,
+    ) -> int:
+        """Submit a job to the queue.
+
+        Parameters
+        ----------
+        script : str
+            The path of the input file in the ``job`` mode, or of the script in the ``cae`` and ``python`` modes.
+        mode : str, optional
+            How the job is run, ``job``, ``cae`` or ``python``, see :attr:`abqpy.farm.Case.mode`, by default "job".
+        name : str, optional
+            The name of the job, by default the name of the input file or script without its extension.
+        cpus : int, optional
+            The number of CPUs of the job, by default 1.
+        memory : float, optional
+            The memory of the job in megabytes, by default 0, i.e., not accounted.
+        tokens : int, optional
+            The number of license tokens of the job, by default computed from the CPUs.
+        priority : int, optional
+            The priority of the job, jobs with a higher priority are started first, by default 0.
+        walltime : float, optional
+            The estimated wall-clock time of the job in seconds, which allows it to be started before jobs with a
+            higher priority that wait for resources, by default None.
+        parameters
+            The parameters of the script, passed as ``key=value`` command line arguments.
+
+        Returns
+        -------
+        int
+            The ID of the job.
+        """
+        name = name or os.path.splitext(os.path.basename(script))[0]
+        case = Case(name, os.path.abspath(script), parameters, mode, cpus, memory, tokens)
+        job = QueuedJob(0, case, os.getcwd(), priority, walltime, getpass.getuser(), submitted=time.time())
+        if not _fits(job.resources, self.budget):
+            budget = "{:g} CPUs, {:g} MB memory and {:g} license tokens".format(*self.budget)
+            raise ValueError(f"The job needs more than the {budget} of the queue {self.name}")
+        with self._state() as state:
+            job.id = state["next_id"]
+            state["next_id"] += 1
+            state["jobs"].append(job)
+        return job.id
+
+    def status(self) -> QueueStatus:
+        """The jobs of the queue.
+
+        Returns
+        -------
+        QueueStatus
+            The jobs and the resources they use.
+        """
+        with self._state() as state:
+            dispatcher = state["dispatcher"]
+            if dispatcher is not None and not _alive(dispatcher):
+                dispatcher = None
+            return QueueStatus(self.name, state["jobs"], dispatcher, self.budget)
+
+    def cancel(self, id: int):
+        """Cancel a job, it is removed from the queue if it is waiting, or killed if it is running.
+
+        Parameters
+        ----------
+        id : int
+            The ID of the job.
+        """
+        with self._state() as state:
+            job = next((job for job in state["jobs"] if job.id == id), None)
+            if job is None:
+                raise ValueError(f"There is no job {id} in the queue {self.name}")
+            if job.status == "SUBMITTED":
+                job.status, job.finished, job.error = "TERMINATED", time.time(), "cancelled"
+            elif job.status == "RUNNING":
+                job.cancel = True  # killed by the dispatcher
+                if state["dispatcher"] is None or not _alive(state["dispatcher"]):
+                    if job.pid is not None:
+                        _kill(job.pid)
+                    job.status, job.finished, job.error = "TERMINATED", time.time(), "cancelled"
+
+    def purge(self):
+        """Remove the finished jobs from the queue."""
+        with self._state() as state:
+            state["jobs"] = [job for job in state["jobs"] if job.status in ("SUBMITTED", "RUNNING")]
+
+    def _directory(self, job: QueuedJob) -> str:
+        """The working directory of a job."""
+        if self.directory:
+            return os.path.join(self.directory, f"{job.id}-{job.case.name}")
+        return job.cwd
+
+    def _copy(self, job: QueuedJob, directory: str):
+        """Copy the result files of a job to the directory it was submitted from, like a remote queue does."""
+        if directory == job.cwd:
+            return
+        if self.fileCopy:
+            for file in os.listdir(directory):
+                path = os.path.join(directory, file)
+                extension = os.path.splitext(file)[1][1:]
+                if os.path.isfile(path) and (self.filesToCopy == "ALL" or extension in self.filesToCopy):
+                    shutil.copy2(path, job.cwd)
+        if self.deleteAfterCopy:
+            shutil.rmtree(directory, ignore_errors=True)
+
+    async def _run(self, job: QueuedJob):
+        """Run a job and record its result, the job is killed if the task is cancelled."""
+        directory = self._directory(job)
+        os.makedirs(directory, exist_ok=True)
+        method, *args = job.case.arguments()
+        env = dict(os.environ, ABQPY_QUEUE_JOB=str(job.id), ABQPY_QUEUE_CPUS=str(job.case.cpus))
+        env["ABQPY_QUEUE_MEMORY"] = f"{job.case.memory:g}"
+        scratch = Scratch.from_config() if config.scratch else None
+        if scratch is not None:
+            env = scratch.environ(env)
+        with open(os.path.join(directory, f"{job.case.name}.abqpy.log"), "w") as log, scratch or nullcontext():
+            command = Command(getattr(_Arguments(), method)(*args), cwd=directory, env=env, stdout=log.write,
+                              stderr=log.write)  # fmt: skip
+            try:
+                command.start()
+            except OSError as e:
+                self._finish(job.id, None, error=str(e))
+                return
+            with self._state() as state:
+                for other in state["jobs"]:
+                    if other.id == job.id:
+                        other.pid = command.process.pid if command.process else None
+            waiting = asyncio.get_running_loop().run_in_executor(None, command.wait)
+            try:
+                result = await asyncio.shield(waiting)
+            except asyncio.CancelledError:
+                command.kill()
+                await waiting
+                raise
+            if scratch is not None:
+                result.scratch_usage = scratch.close()
+                log.write(f"{scratch}\n")
+        self._copy(job, directory)
+        self._finish(job.id, result)
+
+    def _finish(self, id: int, result: Optional[CommandResult], error: str = ""):
+        """Record the result of a job, None if it could not be run."""
+        with self._state() as state:
+            for job in state["jobs"]:
+                if job.id == id:
+                    job.finished, job.pid, job.error = time.time(), None, error
+                    job.returncode = None if result is None else result.returncode
+                    job.scratch_usage = None if result is None else result.scratch_usage
+                    if job.cancel:
+                        job.status, job.error = "TERMINATED", "cancelled"
+                    else:
+                        job.status = "COMPLETED" if job.returncode == 0 else "ABORTED"
+
+    async def dispatch_async(self, poll: float = 1.0, until_empty: bool = False):
+        """Run the jobs of the queue from asyncio, see :meth:`dispatch`."""
+        tasks: Dict[int, asyncio.Task] = {}
+        adopted, cancelled = set(), set()
+        with self._state() as state:
+            if state["dispatcher"] is not None and _alive(state["dispatcher"]):
+                raise RuntimeError(f"The queue {self.name} is already dispatched by process {state['dispatcher']}")
+            state["dispatcher"] = os.getpid()
+            for job in state["jobs"]:
+                if job.status == "RUNNING":  # left by a dispatcher that was killed
+                    if job.pid is not None and _alive(job.pid):
+                        adopted.add(job.id)
+                    else:
+                        job.status, job.finished, job.pid, job.error = "UNKNOWN", time.time(), None, "interrupted"
+        try:
+            while True:
+                with self._state() as state:
+                    now = time.time()
+                    for job in state["jobs"]:
+                        if job.status != "RUNNING":
+                            continue
+                        if job.id in adopted and (job.pid is None or not _alive(job.pid)):
+                            job.status, job.finished, job.pid = "UNKNOWN", now, None
+                            job.error = "the dispatcher was restarted while the job was running"
+                            if job.cancel:
+                                job.status, job.error = "TERMINATED", "cancelled"
+                        elif job.cancel and job.id in tasks and job.id not in cancelled:
+                            tasks[job.id].cancel()
+                            cancelled.add(job.id)
+                        elif job.cancel and job.id in adopted and job.pid is not None:
+                            _kill(job.pid)
+                    queued = [job for job in state["jobs"] if job.status == "SUBMITTED"]
+                    running = [job for job in state["jobs"] if job.status == "RUNNING"]
+                    for job in schedule(queued, running, self.budget, now):
+                        job.status, job.started = "RUNNING", now
+                        tasks[job.id] = asyncio.ensure_future(self._run(job))
+                for id, task in list(tasks.items()):
+                    if task.done():
+                        del tasks[id]
+                        if task.cancelled():
+                            self._finish(id, None)  # cancelled by the user
+                        elif task.exception() is not None:
+                            self._finish(id, None, error=repr(task.exception()))
+                if until_empty and not queued and not running and not tasks:
+                    break
+                # Check the queue again when a job ends, or after the polling interval
+                if tasks:
+                    await asyncio.wait(list(tasks.values()), timeout=poll, return_when=asyncio.FIRST_COMPLETED)
+                else:
+                    await asyncio.sleep(poll)
+        finally:
+            for task in tasks.values():
+                task.cancel()
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+            with self._state() as state:
+                state["dispatcher"] = None
+                for job in state["jobs"]:
+                    if job.id in tasks and job.status == "RUNNING" and not job.cancel:  # run again by the next one
+                        job.status, job.started, job.pid = "SUBMITTED", None, None
+
+    def dispatch(self, poll: float = 1.0, until_empty: bool = False):
+        """Run the jobs of the queue, until interrupted.
+
+        Only one dispatcher can run a queue at a time. The jobs it is running when it is interrupted are killed and
+        run again by the next dispatcher. If it is killed, the jobs keep running, and the next dispatcher waits for
+        them to end, but their return code is not known.
+
+        Parameters
+        ----------
+        poll : float, optional
+            The interval in seconds at which the queue is checked for new and cancelled jobs, by default 1.0.
+        until_empty : bool, optional
+            Return when there are no more jobs to run, by default False.
+        """
+        try:
+            asyncio.run(self.dispatch_async(poll, until_empty))
+        except KeyboardInterrupt:
+            pass
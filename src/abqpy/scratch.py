@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import os
+import re
+import shutil
+import tempfile
+import threading
+import warnings
+from typing import Dict, List, Mapping, Optional
+
+from .config import config
+from .runner import _alive
+
+#: The types of the network filesystems, scratch directories on them are skipped: the Abaqus scratch files are
+#: written and read many times during an analysis, which is slow over the network.
+NETWORK_FILESYSTEMS = {"nfs", "nfs4", "cifs", "smbfs", "smb3", "afs", "ncpfs", "lustre", "gpfs", "beegfs", "ceph",
+                       "glusterfs", "fuse.sshfs", "fuse.glusterfs", "9p"}  # fmt: skip
+
+#: The prefix of the managed scratch directories, followed by the process ID of their owner.
+PREFIX = "abqpy-scratch-"
+
+
+def filesystem(path: str) -> Optional[str]:
+    """The type of the filesystem of a path, e.g., ``tmpfs`` or ``ext4``, None if it is not known (only Linux mount
+    tables are read)."""
+    try:
+        with open("/proc/mounts") as f:
+            mounts = [line.split() for line in f]
+    except OSError:
+        return None
+    path, best = os.path.realpath(path), None
+    for mount in mounts:
+        point = mount[1].replace("\\040", " ")
+        if path == point or path.startswith(point.rstrip("/") + "/"):
+            if best is None or len(point) >= len(best[1]):
+                best = mount
+    return best[2] if best else None
+
+
+def usage(path: str) -> int:
+    """The disk space in bytes used by the files of a directory and its subdirectories."""
+    total = 0
+    try:
+        entries = list(os.scandir(path))
+    except OSError:
+        return 0
+    for entry in entries:
+        try:
+            if entry.is_dir(follow_symlinks=False):
+                total += usage(entry.path)
+            elif entry.is_file(follow_symlinks=False):
+                stat = entry.stat(follow_symlinks=False)
+                total += getattr(stat, "st_blocks", 0) * 512 or stat.st_size
+        except OSError:  # a file deleted by the analysis in the meantime
+            continue
+    return total
+
+
+def clean(root: str):
+    """Remove the managed scratch directories left in a directory by processes that were killed."""
+    try:
+        names = os.listdir(root)
+    except OSError:
+        return
+    for name in names:
+        match = re.match(rf"{PREFIX}(\d+)-", name)
+        if match and int(match.group(1)) != os.getpid() and not _alive(int(match.group(1))):
+            shutil.rmtree(os.path.join(root, name), ignore_errors=True)
+
+
+class Scratch:
+    """A scratch directory of a command, on a fast local filesystem, that is removed when the command ends.
+
+    The directory is passed to the command and to the analyses it starts in the ``TMPDIR``, ``TEMP`` and ``TMP``
+    environment variables, which Abaqus uses as its scratch directory unless the ``scratch`` parameter of the
+    environment file or of the command line is set. Its disk usage is sampled while the command runs.
+
+    Parameters
+    ----------
+    root : str
+        The directory in which the scratch directory is created.
+    interval : float, optional
+        The time in seconds between two samples of the disk usage, by default 1.
+    """
+
+    def __init__(self, root: str, interval: float = 1.0):
+        os.makedirs(root, exist_ok=True)
+        self.path = tempfile.mkdtemp(prefix=f"{PREFIX}{os.getpid()}-", dir=root)
+        self.interval = interval
+
+        #: The peak disk usage of the scratch directory in bytes.
+        self.peak = 0
+
+        self._stop = threading.Event()
+        self._monitor: Optional[threading.Thread] = None
+
+    @staticmethod
+    def candidates() -> List[str]:
+        """The candidate scratch roots, in order of preference: those of the :envvar:`ABQPY_SCRATCH_DIRS`
+        environment variable, by default the usual local scratch directories and the temporary directory."""
+        if config.scratch_dirs:
+            return [os.path.expanduser(path) for path in config.scratch_dirs.split(os.pathsep) if path]
+        if os.name == "nt":
+            return [tempfile.gettempdir()]
+        return ["/local/scratch", "/scratch", tempfile.gettempdir(), "/var/tmp"]
+
+    @classmethod
+    def select(cls, candidates: Optional[List[str]] = None, min_free: Optional[float] = None) -> Optional[str]:
+        """Select the first candidate scratch root that is a writable directory on a local filesystem with enough
+        free space.
+
+        Parameters
+        ----------
+        candidates : List[str], optional
+            The candidate scratch roots, by default :meth:`candidates`.
+        min_free : float, optional
+            The free space in megabytes needed in the scratch root, by default :envvar:`ABQPY_SCRATCH_MIN_FREE`.
+
+        Returns
+        -------
+        str
+            The scratch root, None if no candidate is suitable.
+        """
+        min_free = config.scratch_min_free if min_free is None else min_free
+        for root in cls.candidates() if candidates is None else candidates:
+            if not os.path.isdir(root) or not os.access(root, os.W_OK | os.X_OK):
+                continue
+            if filesystem(root) in NETWORK_FILESYSTEMS:
+                continue
+            if shutil.disk_usage(root).free >= min_free * 1024**2:
+                return root
+        return None
+
+    @classmethod
+    def from_config(cls) -> Optional[Scratch]:
+        """Create a scratch directory in the root selected by :meth:`select`, after removing the scratch
+        directories left there by killed processes. A warning is issued and None is returned if no root is
+        suitable, the command then uses the scratch directory of its environment."""
+        root = cls.select()
+        if root is None:
+            warnings.warn(
+                f"No scratch directory with {config.scratch_min_free:g} MB free on a local filesystem among "
+                f"{cls.candidates()}, the scratch directory of the environment is used, see ABQPY_SCRATCH_DIRS"
+            )
+            return None
+        clean(root)
+        return cls(root)
+
+    def environ(self, env: Optional[Mapping[str, str]] = None) -> Dict[str, str]:
+        """The environment variables of a command with this scratch directory, by default those of the current
+        process."""
+        env = dict(os.environ if env is None else env)
+        env.update(TMPDIR=self.path, TEMP=self.path, TMP=self.path, ABQPY_SCRATCH_DIR=self.path)
+        return env
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak, usage(self.path))
+
+    def start(self) -> Scratch:
+        """Start sampling the disk usage of the scratch directory."""
+        self._monitor = threading.Thread(target=self._sample, daemon=True)
+        self._monitor.start()
+        return self
+
+    def close(self) -> int:
+        """Stop sampling the disk usage and remove the scratch directory.
+
+        Returns
+        -------
+        int
+            The peak disk usage of the scratch directory in bytes.
+        """
+        self._stop.set()
+        if self._monitor is not None:
+            self._monitor.join()
+            self._monitor = None
+        if os.path.isdir(self.path):
+            self.peak = max(self.peak, usage(self.path))
+            shutil.rmtree(self.path, ignore_errors=True)
+        return self.peak
+
+    def __enter__(self) -> Scratch:
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __str__(self) -> str:
+        return f"Scratch directory {self.path}: peak usage {self.peak / 1024**2:.1f} MB"
@@ -0,0 +1,261 @@
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+from .config import AbaqusCAEConfig, config
+from .runner import CommandResult, LineCallback
+
+#: The request loop run by the kernel.
+KERNEL_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "kernel.py")
+
+#: The Abaqus/CAE options supported by :meth:`KernelServer.run`, the others are fixed when the kernel starts.
+KERNEL_OPTIONS = ("database", "startup")
+
+
+def unsupported_options(options: AbaqusCAEConfig) -> List[str]:
+    """The Abaqus/CAE options that differ from their defaults and are not supported by the kernel.
+
+    Parameters
+    ----------
+    options : AbaqusCAEConfig
+        The Abaqus/CAE options, e.g., ``config.cae``.
+    """
+    defaults = AbaqusCAEConfig().model_dump()
+    changed = {name for name, value in options.model_dump().items() if value != defaults[name]}
+    return sorted(changed - set(KERNEL_OPTIONS))
+
+
+class KernelCrashedError(RuntimeError):
+    """The kernel exited before it answered a request."""
+
+
+class KernelServer:
+    """A persistent Abaqus/CAE kernel that runs scripts without starting Abaqus/CAE and checking out a license for
+    each of them.
+
+    The kernel is started on the first request with ``abaqus cae noGUI=kernel.py`` and keeps running in the
+    background, it runs the scripts one at a time, sent over a local socket, and streams their output back, see
+    :mod:`abqpy.kernel`. Each script runs with a fresh namespace, a new model database and its own ``sys.argv`` and
+    working directory, but the environment variables of the kernel are those it was started with. The kernel exits
+    after it is idle for the idle timeout, and is restarted if it crashed.
+
+    Parameters
+    ----------
+    directory : str, optional
+        The directory of the state and log files of the kernel, by default the :envvar:`ABQPY_SERVER_DIR` environment
+        variable or ``~/.abqpy/server``.
+    idle_timeout : float, optional
+        The time in seconds after which an idle kernel exits, 0 for no timeout, by default the
+        :envvar:`ABQPY_SERVER_IDLE_TIMEOUT` environment variable or 1800.
+    startup_timeout : float, optional
+        The time in seconds to wait for the kernel to start, by default 300.
+    standin : bool, optional
+        Run the request loop with the current Python interpreter instead of Abaqus/CAE, to test the server without
+        Abaqus, by default False.
+    cwd : str, optional
+        The working directory of the scripts, by default the current directory.
+    stdout, stderr : Callable[[str], None], optional
+        Callbacks called with each line of the standard output and error streams of the scripts, by default the lines
+        are written to the streams of the current process.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        idle_timeout: Optional[float] = None,
+        startup_timeout: float = 300,
+        standin: bool = False,
+        *,
+        cwd: Optional[str] = None,
+        stdout: Optional[LineCallback] = None,
+        stderr: Optional[LineCallback] = None,
+    ):
+        directory = directory or config.server_dir or os.path.join(os.path.expanduser("~"), ".abqpy", "server")
+        self._directory = os.path.abspath(directory)
+        self._idle_timeout = config.server_idle_timeout if idle_timeout is None else idle_timeout
+        self._startup_timeout = startup_timeout
+        self._standin = standin
+        self._cwd = cwd
+        self._stdout = stdout or (lambda line: print(line, end="", flush=True))
+        self._stderr = stderr or (lambda line: print(line, end="", file=sys.stderr, flush=True))
+
+    @property
+    def _state_file(self) -> str:
+        return os.path.join(self._directory, "kernel.json")
+
+    def _state(self) -> Optional[Dict[str, Any]]:
+        """The port, process ID and token of the running kernel, None if it is not running."""
+        try:
+            with open(self._state_file) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _connect(self, state: Dict[str, Any]) -> Optional[socket.socket]:
+        """Connect to a kernel, None if it is not listening anymore."""
+        try:
+            return socket.create_connection(("127.0.0.1", state["port"]), timeout=10)
+        except OSError:
+            return None
+
+    def _request(self, request: Dict[str, Any], start: bool = True):
+        """Send a request to the kernel, starting it first if necessary, and iterate over the replies."""
+        state = self._state()
+        sock = None if state is None else self._connect(state)
+        if state is None or sock is None:
+            if not start:
+                return
+            state = self._start()
+            sock = self._connect(state)
+            if sock is None:
+                raise KernelCrashedError(f"Cannot connect to the kernel, see {self._log_file}")
+        with sock, sock.makefile("rb") as reader:
+            sock.settimeout(None)
+            try:
+                sock.sendall(json.dumps(dict(request, token=state["token"])).encode() + b"\n")
+                for line in reader:
+                    yield json.loads(line)
+            except ConnectionError:  # the kernel crashed
+                return
+
+    @property
+    def _log_file(self) -> str:
+        return os.path.join(self._directory, "kernel.log")
+
+    def _start(self) -> Dict[str, Any]:
+        """Start a kernel and wait for its state file, or wait for the kernel another process is starting."""
+        os.makedirs(self._directory, exist_ok=True)
+        lock = self._state_file + ".lock"
+        try:
+            os.close(os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+        except FileExistsError:
+            if time.time() - os.path.getmtime(lock) < self._startup_timeout:
+                return self._wait(None)
+            os.remove(lock)  # left by a process that died while starting a kernel
+            return self._start()
+        try:
+            if os.path.exists(self._state_file):  # the kernel is gone
+                os.remove(self._state_file)
+            if self._standin:
+                args = [sys.executable, KERNEL_SCRIPT]
+            else:
+                abaqus = os.environ.get("ABAQUS_BAT_PATH", "abaqus")
+                args = [shutil.which(abaqus) or abaqus, "cae", f"noGUI={KERNEL_SCRIPT}", "--"]
+            args += [self._state_file, str(self._idle_timeout)]
+            group: Dict[str, Any] = dict(start_new_session=True)
+            if sys.platform == "win32":
+                group = dict(creationflags=subprocess.CREATE_NEW_PROCESS_GROUP | subprocess.DETACHED_PROCESS)
+            env = dict(os.environ, ABQPY_SKIP_ABAQUS="true") if self._standin else None
+            with open(self._log_file, "a") as log:
+                process = subprocess.Popen(args, cwd=self._directory, env=env, stdin=subprocess.DEVNULL, stdout=log,
+                                           stderr=subprocess.STDOUT, **group)  # fmt: skip
+            return self._wait(process)
+        finally:
+            os.remove(lock)
+
+    def _wait(self, process: Optional[subprocess.Popen]) -> Dict[str, Any]:
+        """Wait for the state file of a starting kernel."""
+        deadline = time.monotonic() + self._startup_timeout
+        while time.monotonic() < deadline:
+            state = self._state()
+            if state is not None:
+                return state
+            if process is not None and process.poll() is not None:
+                break
+            time.sleep(0.1)
+        if process is not None:
+            process.kill()
+        raise KernelCrashedError(f"The kernel did not start, see {self._log_file}")
+
+    def _ping(self, start: bool) -> Optional[Dict[str, Any]]:
+        reply = next(self._request({"command": "ping"}, start=start), None)
+        return None if reply is None else {key: value for key, value in reply.items() if key != "event"}
+
+    def start(self) -> Dict[str, Any]:
+        """Start the kernel if it is not running.
+
+        Returns
+        -------
+        Dict[str, Any]
+            The status of the kernel, see :meth:`status`.
+        """
+        status = self._ping(start=True)
+        if status is None:
+            raise KernelCrashedError(f"The kernel does not answer, see {self._log_file}")
+        return status
+
+    def status(self) -> Optional[Dict[str, Any]]:
+        """The status of the kernel.
+
+        Returns
+        -------
+        Dict[str, Any]
+            The process ID, the number of scripts run and the uptime in seconds of the kernel, None if it is not
+            running.
+        """
+        return self._ping(start=False)
+
+    def stop(self):
+        """Stop the kernel if it is running."""
+        for _ in self._request({"command": "stop"}, start=False):
+            pass
+
+    def run(
+        self, script: str, *args: str, database: Optional[str] = None, startup: Optional[str] = None
+    ) -> CommandResult:
+        """Run a script in the kernel, starting the kernel if it is not running.
+
+        The script is sent again to a new kernel if the kernel exits before it starts the script. If the kernel
+        crashes while running the script, the return code is -1 and the next request starts a new kernel.
+
+        Parameters
+        ----------
+        script : str
+            The name of the python script to run.
+        args : str
+            Extra arguments of the script, in ``sys.argv[1:]``.
+        database : str, optional
+            The name of the model database to open before running the script, by default None.
+        startup : str, optional
+            The name of a script to run before the script, in the same namespace, by default None.
+
+        Returns
+        -------
+        CommandResult
+            The return code and the wall-clock time of the script.
+        """
+        cwd = os.path.abspath(self._cwd or os.getcwd())
+        request: Dict[str, Any] = {"script": script, "args": [str(arg) for arg in args], "cwd": cwd}
+        request.update(database=database, startup=startup)
+        begin = time.perf_counter()
+        for attempt in range(2):
+            started, returncode = False, None
+            for reply in self._request(request):
+                event = reply["event"]
+                if event == "start":
+                    started = True
+                elif event in ("stdout", "stderr"):
+                    (self._stdout if event == "stdout" else self._stderr)(reply["data"])
+                elif event == "exit":
+                    returncode = reply["code"]
+            if started or attempt:
+                break
+            self._forget()
+        if returncode is None:  # the kernel crashed, make sure that the next request starts a new one
+            self._forget()
+            returncode = -1
+        return CommandResult(["kernel", script, *request["args"]], returncode, time.perf_counter() - begin)
+
+    def _forget(self):
+        """Forget a kernel that does not answer, if it is still running it exits after the idle timeout."""
+        try:
+            os.remove(self._state_file)
+        except OSError:
+            pass
@@ -0,0 +1,362 @@
+from __future__ import annotations
+
+import json
+import os
+import re
+import statistics
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from .config import config
+
+if TYPE_CHECKING:
+    from .runner import CommandResult, LineCallback
+
+#: The lines of the Abaqus driver that begin and end a phase of a job, e.g., ``Begin Abaqus/Standard Analysis``.
+BEGIN_END = re.compile(r"^\s*(Begin|End) (.+?)\s*$")
+
+#: The lines of the Abaqus driver that begin and end waiting for a license.
+LICENSE_WAIT = re.compile(r"(?i)\b(queu\w*|wait\w*)\b.*\blicen[cs]e")
+LICENSE_READY = re.compile(r"(?i)\bchecked out\b")
+
+#: The names of the Chrome trace threads of the span categories.
+THREADS = {"abqpy": 1, "abaqus": 2, "script": 3}
+
+
+@dataclass
+class Span:
+    """A phase of a traced invocation, or an instant marker if it has no end."""
+
+    #: The name of the phase.
+    name: str
+
+    #: The time the phase started at, seconds since the epoch.
+    start: float
+
+    #: The time the phase ended at, None for an instant marker.
+    end: Optional[float] = None
+
+    #: Where the phase comes from: ``abqpy``, ``abaqus`` (the output of the Abaqus driver) or ``script`` (the markers
+    #: of the script).
+    category: str = "abqpy"
+
+    #: Extra data of the phase.
+    args: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def duration(self) -> float:
+        return 0.0 if self.end is None else self.end - self.start
+
+
+class Trace:
+    """The phase timings of an invocation of :func:`abqpy.run` or of an abqpy command.
+
+    Parameters
+    ----------
+    name : str
+        The name of the invocation, e.g., ``run`` or the Abaqus command.
+    args
+        Extra data of the invocation, e.g., the script.
+    """
+
+    def __init__(self, name: str, **args):
+        self.id = f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        self.name = name
+        self.args = args
+        self.start = time.time()
+        self.end: Optional[float] = None
+        self.spans: List[Span] = []
+
+    @contextmanager
+    def span(self, name: str, category: str = "abqpy", **args) -> Iterator[Span]:
+        """Time a phase of the invocation."""
+        span = Span(name, time.time(), None, category, args)
+        try:
+            yield span
+        finally:
+            span.end = time.time()
+            self.spans.append(span)
+
+    def markers(self, path: str):
+        """Read the markers written by a script to a file, see :func:`mark`, and delete it."""
+        try:
+            with open(path) as f:
+                lines = f.readlines()
+            os.remove(path)
+        except OSError:
+            return
+        begun: Dict[str, List[Dict[str, Any]]] = {}
+        for line in lines:
+            try:
+                marker = json.loads(line)
+            except ValueError:  # a marker being written when the script was killed
+                continue
+            phase = marker.get("ph", "i")
+            if phase == "B":
+                begun.setdefault(marker["name"], []).append(marker)
+            elif phase == "E" and begun.get(marker["name"]):
+                begin = begun[marker["name"]].pop()
+                self.spans.append(Span(marker["name"], begin["ts"], marker["ts"], "script", begin.get("args", {})))
+            else:
+                self.spans.append(Span(marker["name"], marker["ts"], None, "script", marker.get("args", {})))
+
+    def phases(self) -> Dict[str, float]:
+        """The total time of each phase in seconds."""
+        phases: Dict[str, float] = {}
+        for span in self.spans:
+            if span.end is not None:
+                phases[span.name] = phases.get(span.name, 0.0) + span.duration
+        return phases
+
+    def summary(self) -> Dict[str, Any]:
+        """The JSON line of the invocation, with the total time of each phase."""
+        end = self.end or time.time()
+        return dict(id=self.id, name=self.name, args=self.args, start=self.start, wall_time=end - self.start,
+                    phases=self.phases())  # fmt: skip
+
+    def chrome(self, pid: int = 1) -> List[Dict[str, Any]]:
+        """The events of the invocation in the Chrome trace event format, one thread per span category."""
+        events: List[Dict[str, Any]] = [dict(name="process_name", ph="M", pid=pid, args=dict(name=self.id))]
+        events += [dict(name="thread_name", ph="M", pid=pid, tid=tid, args=dict(name=category))
+                   for category, tid in THREADS.items()]  # fmt: skip
+        end = self.end or time.time()
+        events.append(dict(name=self.name, cat="abqpy", ph="X", ts=self.start * 1e6, dur=(end - self.start) * 1e6,
+                           pid=pid, tid=THREADS["abqpy"], args=self.args))  # fmt: skip
+        for span in sorted(self.spans, key=lambda span: span.start):
+            event = dict(name=span.name, cat=span.category, ts=span.start * 1e6, pid=pid,
+                         tid=THREADS.get(span.category, 1), args=span.args)  # fmt: skip
+            if span.end is None:
+                event.update(ph="i", s="t")
+            else:
+                event.update(ph="X", dur=span.duration * 1e6)
+            events.append(event)
+        return events
+
+    def write(self, directory: str):
+        """Append the summary of the invocation to ``runs.jsonl`` and write its Chrome trace to ``<id>.json``."""
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, "runs.jsonl"), "a") as f:
+            f.write(json.dumps(self.summary()) + "\n")
+        with open(os.path.join(directory, f"{self.id}.json"), "w") as f:
+            json.dump(dict(traceEvents=self.chrome(), displayTimeUnit="ms"), f)
+
+
+class OutputPhases:
+    """Time the phases of an Abaqus command from the lines of its output: the launch until the first line, the
+    ``Begin ...`` and ``End ...`` phases of the Abaqus driver, and the license waits."""
+
+    def __init__(self, trace: Trace):
+        self.trace = trace
+        self.start = time.time()
+        self.launched = False
+        self.begun: Dict[str, float] = {}
+        self.waiting: Optional[float] = None
+
+    def __call__(self, line: str):
+        now = time.time()
+        if not self.launched:
+            self.launched = True
+            self.trace.spans.append(Span("launch", self.start, now, "abaqus"))
+        match = BEGIN_END.match(line)
+        if match and match.group(1) == "Begin":
+            self.begun[match.group(2)] = now
+        elif match and match.group(2) in self.begun:
+            self.trace.spans.append(Span(match.group(2), self.begun.pop(match.group(2)), now, "abaqus"))
+        elif self.waiting is None and LICENSE_WAIT.search(line):
+            self.waiting = now
+        elif self.waiting is not None and LICENSE_READY.search(line):
+            self.trace.spans.append(Span("license wait", self.waiting, now, "abaqus"))
+            self.waiting = None
+
+
+_current: List[Trace] = []
+
+
+def current() -> Optional[Trace]:
+    """The trace of the invocation of :func:`abqpy.run` being traced, None if there is none."""
+    return _current[-1] if _current else None
+
+
+@contextmanager
+def tracing(name: str, **args) -> Iterator[Trace]:
+    """Trace an invocation, the trace is only kept if the :envvar:`ABQPY_TRACE` environment variable is set, and
+    written when the invocation ends. The commands it runs are traced in the same trace."""
+    trace = Trace(name, **args)
+    if not config.trace:
+        yield trace
+        return
+    _current.append(trace)
+    try:
+        yield trace
+    finally:
+        _current.remove(trace)
+        trace.end = time.time()
+        trace.write(TraceLog.from_config().directory)
+
+
+def trace_command(
+    args: List[str], stdout: LineCallback, options: Dict[str, Any]
+) -> Tuple[Dict[str, Any], Callable[[CommandResult], CommandResult]]:
+    """Time the phases of a command, in the trace of :func:`abqpy.run` or in a trace of its own. Return the options
+    of the command, see :func:`~abqpy.runner.run_command`, and the function that records its result."""
+    name = " ".join([os.path.splitext(os.path.basename(args[0]))[0], *args[1:2]])
+    trace, owned = current(), False
+    if trace is None:
+        trace, owned = Trace(name, args=args), True
+    directory = TraceLog.from_config().directory
+    os.makedirs(directory, exist_ok=True)
+    markers = os.path.join(directory, f"{trace.id}-{uuid.uuid4().hex[:8]}.markers.jsonl")
+    phases = OutputPhases(trace)
+    options = dict(options, env=dict(options["env"] or os.environ, ABQPY_TRACE_MARKERS=markers),
+                   stdout=lambda line: (phases(line), stdout(line)))  # fmt: skip
+
+    def finish(result: CommandResult) -> CommandResult:
+        data = dict(args=args, returncode=result.returncode, cpu_time=result.cpu_time)
+        if result.scratch_usage is not None:
+            data["scratch_usage"] = result.scratch_usage
+        trace.spans.append(Span("command", phases.start, time.time(), "abqpy", data))
+        trace.markers(markers)
+        if owned:
+            trace.end = time.time()
+            trace.args["returncode"] = result.returncode
+            trace.write(directory)
+        return result
+
+    return options, finish
+
+
+def mark(name: str, phase: str = "i", **args):
+    """Write a marker of the script run by a traced command, when it is run with a Python interpreter that can import
+    abqpy. Other scripts can write the same JSON line to the file named by the ``ABQPY_TRACE_MARKERS`` environment
+    variable.
+
+    Parameters
+    ----------
+    name : str
+        The name of the marker, or of the phase it begins or ends.
+    phase : str, optional
+        ``B`` to begin a phase, ``E`` to end it, or ``i`` for an instant marker, by default "i".
+    args
+        Extra data of the marker.
+    """
+    path = os.environ.get("ABQPY_TRACE_MARKERS")
+    if path:
+        with open(path, "a") as f:
+            f.write(json.dumps(dict(name=name, ph=phase, ts=time.time(), args=args)) + "\n")
+
+
+@dataclass
+class PhaseStatistics:
+    """The statistics of the time of a phase over the traced invocations."""
+
+    #: The number of invocations with the phase.
+    count: int
+    mean: float
+    median: float
+    p95: float
+    max: float
+
+
+@dataclass
+class TraceSummary:
+    """The statistics of the phases of the traced invocations."""
+
+    #: The number of invocations.
+    runs: int
+
+    #: The statistics of each phase, and of the whole invocations (``wall_time``).
+    phases: Dict[str, PhaseStatistics]
+
+    def __str__(self) -> str:
+        lines = [f"{'phase':<40}{'count':>7}{'mean [s]':>10}{'median':>10}{'p95':>10}{'max':>10}"]
+        for name, s in self.phases.items():
+            lines.append(f"{name[:39]:<40}{s.count:>7}{s.mean:>10.2f}{s.median:>10.2f}{s.p95:>10.2f}{s.max:>10.2f}")
+        lines.append(f"\n{self.runs} traced runs")
+        return "\n".join(lines)
+
+
+class TraceLog:
+    """The directory of the traces of the invocations, see :envvar:`ABQPY_TRACE_DIR`.
+
+    Parameters
+    ----------
+    directory : str
+        The directory of the ``runs.jsonl`` file and of the Chrome trace files.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = os.path.abspath(directory)
+
+    @classmethod
+    def from_config(cls) -> TraceLog:
+        """The trace directory configured by the :envvar:`ABQPY_TRACE_DIR` environment variable, by default
+        ``~/.abqpy/traces``."""
+        return cls(config.trace_dir or os.path.join(os.path.expanduser("~"), ".abqpy", "traces"))
+
+    def runs(self, name: Optional[str] = None) -> List[Dict[str, Any]]:
+        """The summaries of the traced invocations, see :meth:`Trace.summary`.
+
+        Parameters
+        ----------
+        name : str, optional
+            Only the invocations with this name, e.g., ``run``, by default all of them.
+        """
+        try:
+            with open(os.path.join(self.directory, "runs.jsonl")) as f:
+                runs = [json.loads(line) for line in f if line.strip()]
+        except OSError:
+            return []
+        return [run for run in runs if name is None or run["name"] == name]
+
+    def summary(self, name: Optional[str] = None) -> TraceSummary:
+        """The statistics of the phases of the traced invocations.
+
+        Parameters
+        ----------
+        name : str, optional
+            Only the invocations with this name, e.g., ``run``, by default all of them.
+        """
+        runs = self.runs(name)
+        times: Dict[str, List[float]] = {"wall_time": [run["wall_time"] for run in runs]}
+        for run in runs:
+            for phase, duration in run["phases"].items():
+                times.setdefault(phase, []).append(duration)
+        phases = {}
+        for phase, values in times.items():
+            if values:
+                values.sort()
+                p95 = values[min(len(values) - 1, int(0.95 * len(values)))]
+                phases[phase] = PhaseStatistics(len(values), statistics.mean(values), statistics.median(values), p95,
+                                                values[-1])  # fmt: skip
+        return TraceSummary(len(runs), phases)
+
+    def merge(self, output: str = "trace.json", last: Optional[int] = None) -> str:
+        """Merge the Chrome traces of the invocations into one file, with one process per invocation, to compare
+        them in ``chrome://tracing`` or https://ui.perfetto.dev.
+
+        Parameters
+        ----------
+        output : str, optional
+            The path of the merged trace, by default "trace.json".
+        last : int, optional
+            Only the last invocations, by default all of them.
+
+        Returns
+        -------
+        str
+            The path of the merged trace.
+        """
+        events = []
+        for pid, run in enumerate(self.runs()[-last if last else 0 :], 1):
+            try:
+                with open(os.path.join(self.directory, f"{run['id']}.json")) as f:
+                    trace = json.load(f)
+            except OSError:
+                continue
+            events += [dict(event, pid=pid) for event in trace["traceEvents"]]
+        with open(output, "w") as f:
+            json.dump(dict(traceEvents=events, displayTimeUnit="ms"), f)
+        return os.path.abspath(output)
@@ -0,0 +1,186 @@
+"""Vectorized transformations of vector and tensor values to datum coordinate systems, see
+:meth:`abqpy.odb_store.FieldOutput.getTransformedField`.
+
+The orientation of a coordinate system at a point is a rotation matrix whose rows are the directions of its axes 1, 2
+and 3 in global coordinates, so that the components of a vector ``v`` in the system are ``R v`` and those of a
+tensor ``T`` are ``R T R^T``. The rotations of all the values of a block are stacked in an array of shape
+``(n, 3, 3)`` and applied at once with :func:`numpy.einsum`.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Optional, Sequence
+
+import numpy as np
+
+from .invariants import INDICES, components
+
+#: The types of coordinate systems.
+SYSTEMS = ("CARTESIAN", "CYLINDRICAL", "SPHERICAL")
+
+#: The types of tensors whose values are in a plane, e.g., of shells or of planar elements. They are transformed to
+#: a system in the same plane, whose 2-axis is the projection of an axis of the datum coordinate system.
+PLANE_TYPES = ("TENSOR_3D_PLANAR", "TENSOR_3D_SURFACE", "TENSOR_2D_PLANAR", "TENSOR_2D_SURFACE")
+
+
+def _unit(vectors: np.ndarray) -> np.ndarray:
+    norm = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.where(norm > 0, norm, 1)
+
+
+def _fallback(vectors: np.ndarray, default: np.ndarray) -> np.ndarray:
+    """The unit vectors, the default where they are zero."""
+    norm = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return np.where(norm > 1e-12, vectors / np.where(norm > 0, norm, 1), default)
+
+
+def axes(
+    coordSysType: str,
+    origin: Sequence[float],
+    xAxis: Sequence[float],
+    yAxis: Sequence[float],
+    points: Optional[np.ndarray] = None,
+    count: int = 1,
+) -> np.ndarray:
+    """The orientations of a coordinate system at points.
+
+    The axes of a cylindrical system are the radial direction, the circumferential direction around its Z axis and
+    its Z axis. Those of a spherical system are the radial direction, the circumferential direction around its Z axis
+    and their cross product. On the Z axis, where these directions are not defined, those of the X and Y axes are used.
+
+    Parameters
+    ----------
+    coordSysType : str
+        The type of the coordinate system, one of :data:`SYSTEMS`.
+    origin : Sequence[float]
+        The origin of the coordinate system.
+    xAxis : Sequence[float]
+        The direction of its X axis.
+    yAxis : Sequence[float]
+        A direction in its X-Y plane, usually that of its Y axis.
+    points : np.ndarray, optional
+        The global coordinates of the points, one row per point, only needed by cylindrical and spherical systems.
+    count : int, optional
+        The number of points of a cartesian system if no points are given, by default 1.
+
+    Returns
+    -------
+    np.ndarray
+        The rotations from global coordinates to the system, of shape ``(n, 3, 3)``.
+    """
+    x = _unit(np.asarray(xAxis, dtype=np.float64))
+    z = _unit(np.cross(x, np.asarray(yAxis, dtype=np.float64)))
+    y = np.cross(z, x)
+    coordSysType = str(coordSysType)
+    if coordSysType == "CARTESIAN":
+        return np.broadcast_to(np.stack([x, y, z]), (len(points) if points is not None else count, 3, 3))
+    if coordSysType not in SYSTEMS:
+        raise ValueError(f"Unknown coordinate system type {coordSysType}, expected one of {', '.join(SYSTEMS)}")
+    if points is None:
+        raise ValueError(f"The points are needed by a {coordSysType} coordinate system")
+    d = np.asarray(points, dtype=np.float64).reshape(len(points), -1) - np.asarray(origin, dtype=np.float64)
+    if coordSysType == "CYLINDRICAL":
+        e1 = _fallback(d - (d @ z)[:, None] * z, x)
+        e3 = np.broadcast_to(z, e1.shape)
+        return np.stack([e1, np.cross(e3, e1), e3], axis=1)
+    e1 = _fallback(d, x)
+    e2 = _fallback(np.cross(z, e1), y)
+    return np.stack([e1, e2, np.cross(e1, e2)], axis=1)
+
+
+def quaternions(q: np.ndarray) -> np.ndarray:
+    """The rotations from global to local coordinates of the quaternions ``(q1, q2, q3, q0)`` of the
+    ``localCoordSystem`` of a block, of shape ``(n, 3, 3)``."""
+    q = _unit(np.asarray(q, dtype=np.float64).reshape(-1, 4))
+    x, y, z, w = q.T
+    # The rotation matrix of the quaternion turns the global axes into the local ones: its columns are the local axes
+    rotation = np.stack(
+        [
+            [1 - 2 * (y * y + z * z), 2 * (x * y - w * z), 2 * (x * z + w * y)],
+            [2 * (x * y + w * z), 1 - 2 * (x * x + z * z), 2 * (y * z - w * x)],
+            [2 * (x * z - w * y), 2 * (y * z + w * x), 1 - 2 * (x * x + y * y)],
+        ]
+    )
+    return np.ascontiguousarray(rotation.transpose(2, 1, 0))
+
+
+def project(orientations: np.ndarray, normals: np.ndarray, projected22Axis: int = 2, projectionTol: float = 0.1):
+    """The orientations of in-plane systems, whose 2-axis is the projection of an axis of the given orientations on
+    the planes of the normals, and whose 3-axis is the normal.
+
+    Parameters
+    ----------
+    orientations : np.ndarray
+        The rotations to the datum coordinate system at the points, of shape ``(n, 3, 3)``.
+    normals : np.ndarray
+        The unit normals of the planes, of shape ``(n, 3)``.
+    projected22Axis : int, optional
+        The axis of the datum coordinate system that is projected, 1, 2 or 3, by default 2.
+    projectionTol : float, optional
+        The minimum angle in radians between the projected axis and the normal, the next axis is projected where
+        the angle is smaller, by default 0.1.
+
+    Returns
+    -------
+    np.ndarray
+        The rotations to the in-plane systems, of shape ``(n, 3, 3)``.
+    """
+    if projected22Axis not in (1, 2, 3):
+        raise ValueError(f"Expected the projected axis 1, 2 or 3, got {projected22Axis}")
+    index = projected22Axis - 1
+    normals = np.broadcast_to(normals, (len(orientations), 3))
+    axis = orientations[:, index]
+    near = np.abs(np.einsum("ni,ni->n", axis, normals)) > np.cos(projectionTol)
+    axis = np.where(near[:, None], orientations[:, (index + 1) % 3], axis)
+    e2 = _unit(axis - np.einsum("ni,ni->n", axis, normals)[:, None] * normals)
+    return np.stack([np.cross(e2, normals), e2, normals], axis=1)
+
+
+def transform(
+    data: np.ndarray,
+    labels: Sequence[str],
+    rotations: np.ndarray,
+    engineering_shear: bool = False,
+) -> np.ndarray:
+    """Transform vector or tensor values.
+
+    Parameters
+    ----------
+    data : np.ndarray
+        The values, one row per value and one column per component.
+    labels : Sequence[str]
+        The labels of the components, e.g., ``("U1", "U2")`` or ``("S11", "S22", "S33", "S12")``. The components
+        that are not given are zero, and only those that are given are returned.
+    rotations : np.ndarray
+        The rotations from the coordinate system of the values to the new one, of shape ``(n, 3, 3)``.
+    engineering_shear : bool, optional
+        Whether the shear components are engineering shear strains, by default False.
+
+    Returns
+    -------
+    np.ndarray
+        The transformed values, with the data type of the values.
+    """
+    data = np.asarray(data).reshape(len(data), -1)
+    if all(re.search(r"\d\d$", label) for label in labels):
+        c = components(data, labels, engineering_shear)
+        tensors = np.empty((len(data), 3, 3))
+        for (i, j), row in INDICES.items():
+            tensors[:, i - 1, j - 1] = c[row]
+        tensors = np.einsum("nij,njk,nlk->nil", rotations, tensors, rotations, optimize=True)
+        result = np.empty(data.shape)
+        for column, label in enumerate(labels):
+            i, j = int(label[-2]), int(label[-1])
+            result[:, column] = tensors[:, i - 1, j - 1] * (2 if engineering_shear and i != j else 1)
+        return result.astype(data.dtype, copy=False)
+    vectors = np.zeros((len(data), 3))
+    indices = []
+    for column, label in enumerate(labels):
+        match = re.search(r"([123])$", label)
+        if match is None:
+            raise ValueError(f"{label} is not the label of a component of a vector or a tensor")
+        indices.append(int(match.group(1)) - 1)
+        vectors[:, indices[-1]] = data[:, column]
+    vectors = np.einsum("nij,nj->ni", rotations, vectors)
+    return vectors[:, indices].astype(data.dtype, copy=False)
@@ -0,0 +1,378 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+import json
+import os
+import re
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from .cli import AbqpyCLI
+from .config import config
+from .monitor import JobMonitor
+
+#: The name of the trial jobs, in the working directories of the trials.
+TRIAL_JOB = "trial"
+
+
+@dataclass(frozen=True)
+class Settings:
+    """The parallelization and memory settings of an analysis job."""
+
+    #: The number of CPUs, the ``cpus`` option of the ``abaqus`` command and :attr:`~abaqus.Job.ModelJob.numCpus`.
+    cpus: int = 1
+
+    #: The number of parallel domains, the ``domains`` option and :attr:`~abaqus.Job.ModelJob.numDomains`, None for
+    #: the default of Abaqus (the number of CPUs).
+    domains: Optional[int] = None
+
+    #: The memory in megabytes, the ``memory`` option and :attr:`~abaqus.Job.ModelJob.memory`, None for the default
+    #: of the environment file.
+    memory: Optional[float] = None
+
+    @property
+    def name(self) -> str:
+        """A name of the settings, e.g., ``c4-d8-m2000``, also the working directory of their trial."""
+        parts = [f"c{self.cpus}"] + ([f"d{self.domains}"] if self.domains else [])
+        return "-".join(parts + ([f"m{self.memory:g}"] if self.memory else []))
+
+    def command_options(self) -> List[str]:
+        """The options of the ``abaqus job=...`` command with these settings."""
+        options = [f"cpus={self.cpus}"] + ([f"domains={self.domains}"] if self.domains else [])
+        return options + ([f"memory={self.memory:g} mb"] if self.memory else [])
+
+    def job_options(self) -> Dict[str, Any]:
+        """The keyword arguments of :meth:`~abaqus.Job.JobMdb.JobMdb.Job` with these settings, the memory is in
+        megabytes (``memoryUnits=MEGA_BYTES``)."""
+        options: Dict[str, Any] = dict(numCpus=self.cpus, numDomains=self.domains or self.cpus)
+        if self.memory:
+            options.update(memory=int(self.memory), memoryUnits="MEGA_BYTES")
+        return options
+
+    def __str__(self) -> str:
+        return " ".join(self.command_options())
+
+
+@dataclass
+class Trial:
+    """The result of a trial analysis of a :class:`Tuner`."""
+
+    #: The settings of the trial.
+    settings: Settings
+
+    #: The working directory of the trial.
+    directory: str = ""
+
+    #: The number of increments timed, those completed after the first read of the status file with increments.
+    increments: int = 0
+
+    #: The wall-clock time per increment in seconds, None if no increment completed after the first read.
+    time_per_increment: Optional[float] = None
+
+    #: The wall-clock time in seconds until the first read of the status file with increments, i.e., the
+    #: pre-processing and the first increments.
+    preprocessing: Optional[float] = None
+
+    #: The wall-clock time of the trial in seconds.
+    wall_time: float = 0.0
+
+    #: The reason why the trial has no time per increment.
+    error: str = ""
+
+
+@dataclass
+class TuningResult:
+    """The trials of a :class:`Tuner` and the recommended settings."""
+
+    #: The model family.
+    family: str
+
+    #: The trials, in the order of the grid.
+    trials: List[Trial]
+
+    #: The recommended settings, None if no trial succeeded.
+    best: Optional[Settings] = None
+
+    @property
+    def returncode(self) -> int:
+        """0 if settings are recommended, 1 otherwise."""
+        return int(self.best is None)
+
+    def __str__(self) -> str:
+        lines = [f"{'settings':<24}{'increments':>11}{'s/increment':>13}{'pre [s]':>10}{'wall [s]':>10}  error"]
+        for t in self.trials:
+            per = f"{t.time_per_increment:.3f}" if t.time_per_increment is not None else "-"
+            pre = f"{t.preprocessing:.1f}" if t.preprocessing is not None else "-"
+            lines.append(f"{t.settings.name:<24}{t.increments:>11}{per:>13}{pre:>10}{t.wall_time:>10.1f}  {t.error}")
+        best = f"recommended for {self.family}: {self.best}" if self.best else "none"
+        lines.append(f"\n{len(self.trials)} trials, {best}")
+        return "\n".join(lines)
+
+
+def recommend(trials: Sequence[Trial], tolerance: float = 0.05) -> Optional[Settings]:
+    """The settings of the cheapest trial that is at most **tolerance** slower per increment than the fastest one:
+    the fewest CPUs (which need the fewest license tokens), then the least memory, then the fastest.
+
+    Parameters
+    ----------
+    trials : Sequence[Trial]
+        The trials.
+    tolerance : float, optional
+        The relative slowdown traded for fewer resources, by default 0.05.
+    """
+    timed = [(trial.time_per_increment, trial.settings) for trial in trials if trial.time_per_increment is not None]
+    if not timed:
+        return None
+    fastest = min(seconds for seconds, _ in timed)
+    good = [(seconds, settings) for seconds, settings in timed if seconds <= fastest * (1 + tolerance)]
+    return min(good, key=lambda good: (good[1].cpus, good[1].memory or 0, good[0]))[1]
+
+
+def _axis(values: Union[int, float, Sequence, None]) -> List[Any]:
+    """The values of an axis of the grid, given as a single value or a sequence."""
+    if values is None:
+        return []
+    return [values] if isinstance(values, (int, float)) else list(values)
+
+
+class TuningStore:
+    """The recommended settings of the model families, in a JSON file, see :envvar:`ABQPY_TUNING_FILE`.
+
+    Parameters
+    ----------
+    path : str
+        The path of the JSON file.
+    """
+
+    def __init__(self, path: str):
+        self.path = os.path.abspath(path)
+
+    @classmethod
+    def from_config(cls) -> TuningStore:
+        """The store configured by the :envvar:`ABQPY_TUNING_FILE` environment variable, by default
+        ``~/.abqpy/tuning.json``."""
+        return cls(config.tuning_file or os.path.join(os.path.expanduser("~"), ".abqpy", "tuning.json"))
+
+    def _load(self) -> Dict[str, Any]:
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def families(self) -> Dict[str, Any]:
+        """The model families with their recommended settings, the time of their tuning and their trials."""
+        return self._load()
+
+    def best(self, family: str) -> Optional[Settings]:
+        """The recommended settings of a model family, None if it has not been tuned.
+
+        Parameters
+        ----------
+        family : str
+            The model family.
+        """
+        entry = self._load().get(family)
+        return Settings(**entry["best"]) if entry and entry.get("best") else None
+
+    def complete(self, family: str, cpus: Optional[int], memory: Optional[int]) -> Tuple[Optional[int], Optional[int]]:
+        """The **cpus** and **memory** options completed with the recommended settings of a model family.
+
+        Parameters
+        ----------
+        family : str
+            The model family.
+        cpus : int, optional
+            The number of processors, kept if it is given.
+        memory : int, optional
+            The amount of memory, kept if it is given.
+        """
+        best = self.best(family)
+        if best is not None:
+            cpus = best.cpus if cpus is None else cpus
+            memory = int(best.memory) if memory is None and best.memory else memory
+        return cpus, memory
+
+    def record(self, result: TuningResult):
+        """Record the trials and the recommended settings of a model family, replacing the previous ones."""
+        families = self._load()
+        trials = [dict(asdict(trial), settings=asdict(trial.settings)) for trial in result.trials]
+        best = asdict(result.best) if result.best else None
+        families[result.family] = dict(best=best, tuned=time.time(), trials=trials)
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        temporary = f"{self.path}.{os.getpid()}.tmp"
+        with open(temporary, "w") as f:
+            json.dump(families, f, indent=4)
+        os.replace(temporary, self.path)
+
+
+class Tuner:
+    """Find the fastest CPU, domain and memory settings of a model with short trial analyses.
+
+    A trial runs the input file with a setting of the grid, ``abaqus job=trial input=... cpus=... domains=...
+    memory=... interactive``, in its own working directory, follows its status file with a
+    :class:`~abqpy.monitor.JobMonitor` and kills it once **increments** increments have completed after the first
+    read of the status file with increments. The time per increment is timed from that read, so it excludes the
+    pre-processing, and is accurate to about **interval** divided by the increments timed. Trials run in parallel as
+    long as their CPUs and memory fit in the budgets, concurrent trials compete for the memory bandwidth, so set the
+    **budget** to the largest number of CPUs of the grid to time the trials one at a time. The recommended settings,
+    see :func:`recommend`, are recorded for the model family in the :class:`TuningStore`.
+
+    Parameters
+    ----------
+    input : str
+        The input file of the model.
+    family : str, optional
+        The model family the settings are recommended for, by default the name of the input file without its
+        extension and trailing digits, e.g., ``bracket`` for ``bracket-12.inp``.
+    cpus : int | Sequence[int], optional
+        The numbers of CPUs of the grid, by default the powers of two up to the number of CPUs.
+    domains : int | Sequence[int], optional
+        The numbers of domains of the grid, by default the number of CPUs. Combinations where the number of domains
+        is not a multiple of the number of CPUs are skipped, as Abaqus rejects them.
+    memory : float | Sequence[float], optional
+        The memory settings of the grid in megabytes, by default the setting of the environment file.
+    increments : int, optional
+        The number of increments timed per trial, by default 10.
+    directory : str, optional
+        The directory of the working directories of the trials, by default "tuning".
+    budget : int, optional
+        The number of CPUs shared by the running trials, by default the number of CPUs.
+    memory_budget : float, optional
+        The memory in megabytes shared by the running trials, by default unlimited.
+    timeout : float, optional
+        The time in seconds after which a trial is killed, by default None, i.e., no timeout.
+    options : Dict[str, Any], optional
+        Extra options of the ``abaqus`` command, e.g., ``{"mp_mode": "threads"}``.
+    interval : float, optional
+        The time in seconds between two reads of the status file, by default 0.5.
+    """
+
+    def __init__(
+        self,
+        input: str,
+        family: Optional[str] = None,
+        cpus: Union[int, Sequence[int], None] = None,
+        domains: Union[int, Sequence[int], None] = None,
+        memory: Union[float, Sequence[float], None] = None,
+        increments: int = 10,
+        directory: str = "tuning",
+        budget: Optional[int] = None,
+        memory_budget: Optional[float] = None,
+        timeout: Optional[float] = None,
+        options: Optional[Dict[str, Any]] = None,
+        interval: float = 0.5,
+    ):
+        if increments < 1:
+            raise ValueError(f"Expected at least one increment, got {increments}")
+        self.input = os.path.abspath(input)
+        stem = os.path.splitext(os.path.basename(input))[0]
+        self.family = family or re.sub(r"[-_.]*\d+$", "", stem) or stem
+        total = os.cpu_count() or 1
+        self.cpus = _axis(cpus) or [2**i for i in range(total.bit_length()) if 2**i <= total]
+        self.domains: List[Optional[int]] = _axis(domains) or [None]
+        self.memory: List[Optional[float]] = _axis(memory) or [None]
+        self.increments = increments
+        self.directory = os.path.abspath(directory)
+        self.budget = budget or total
+        self.memory_budget = memory_budget
+        self.timeout = timeout
+        self.options = options or {}
+        self.interval = interval
+
+    def grid(self) -> List[Settings]:
+        """The settings of the trials."""
+        grid = itertools.product(self.cpus, self.domains, self.memory)
+        return [Settings(cpus, domains, memory) for cpus, domains, memory in grid if not domains or domains % cpus == 0]
+
+    async def _trial(self, settings: Settings) -> Trial:
+        """Run a trial analysis until enough increments are timed."""
+        trial = Trial(settings, os.path.join(self.directory, self.family, settings.name))
+        os.makedirs(trial.directory, exist_ok=True)
+        for file in os.listdir(trial.directory):
+            if file.startswith(f"{TRIAL_JOB}."):
+                os.remove(os.path.join(trial.directory, file))
+        options = [f"{key}={value}" for key, value in self.options.items()]
+        args = [f"job={TRIAL_JOB}", f"input={self.input}", *settings.command_options(), *options, "interactive"]
+        start = time.perf_counter()
+        polls: List[Tuple[float, int]] = []  # the times of the reads with new increments, and the increments done
+        done, step, increment = 0, None, 0
+        with open(os.path.join(trial.directory, "abqpy.log"), "w") as log:
+            cli = AbqpyCLI(cwd=trial.directory, timeout=self.timeout, stdout=log.write, stderr=log.write,
+                           asynchronous=True)  # fmt: skip
+            task = asyncio.ensure_future(cli.abaqus(*args, ask_delete="OFF"))
+            monitor = JobMonitor(TRIAL_JOB, trial.directory, self.interval)
+            while True:
+                ended, now = task.done(), time.perf_counter()
+                for message in monitor.poll():
+                    if message.type == "STATUS":  # Abaqus/Explicit only writes some of the increments
+                        data = message.data
+                        done += data["increment"] - (increment if data["step"] == step else 0)
+                        step, increment = data["step"], data["increment"]
+                if done and (not polls or done > polls[-1][1]):
+                    polls.append((now, done))
+                if ended or len(polls) > 1 and polls[-1][1] - polls[0][1] >= self.increments:
+                    break
+                await asyncio.wait([task], timeout=self.interval)
+            task.cancel()
+            try:
+                result = await task
+            except asyncio.CancelledError:
+                result = None
+            except OSError as e:
+                trial.error = str(e)
+                result = None
+        trial.wall_time = time.perf_counter() - start
+        if polls:
+            trial.preprocessing = polls[0][0] - start
+        if len(polls) > 1:
+            (first, before), (last, after) = polls[0], polls[-1]
+            trial.increments = after - before
+            trial.time_per_increment = (last - first) / trial.increments
+        elif not trial.error:
+            code = f" with code {result.returncode}" if result is not None else ""
+            trial.error = f"the analysis ended{code} after {done} increments"
+        return trial
+
+    def _fits(self, settings: Settings, running: List[Settings]) -> bool:
+        if running and sum(s.cpus for s in running) + settings.cpus > self.budget:
+            return False
+        memory = sum(s.memory or 0 for s in running) + (settings.memory or 0)
+        return not running or self.memory_budget is None or memory <= self.memory_budget
+
+    async def run_async(self) -> TuningResult:
+        """Run the trials from asyncio, and record the recommended settings.
+
+        Returns
+        -------
+        TuningResult
+            The trials and the recommended settings.
+        """
+        grid = self.grid()
+        trials: Dict[int, Trial] = {}
+        pending = list(range(len(grid)))
+        running: Dict[asyncio.Task, int] = {}
+        while pending or running:
+            for i in list(pending):
+                if self._fits(grid[i], [grid[j] for j in running.values()]):
+                    pending.remove(i)
+                    running[asyncio.ensure_future(self._trial(grid[i]))] = i
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                trials[running.pop(task)] = task.result()
+        ordered = [trials[i] for i in range(len(grid))]
+        result = TuningResult(self.family, ordered, recommend(ordered))
+        TuningStore.from_config().record(result)
+        return result
+
+    def run(self) -> TuningResult:
+        """Run the trials, and record the recommended settings.
+
+        Returns
+        -------
+        TuningResult
+            The trials and the recommended settings.
+        """
+        return asyncio.run(self.run_async())
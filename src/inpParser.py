@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 from abaqus.InputFileParser.InputFile import InputFile
+from abaqus.InputFileParser.InputFileWriter import InputFileWriter
 
 __all__ = [
     "InputFile",
+    "InputFileWriter",
 ]
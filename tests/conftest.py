@@ -21,3 +21,24 @@ def pytest_configure(config: pytest.Config) -> None:
     os.environ["ABQPY_SKIP_ABAQUS"] = "true"
     os.chdir(os.path.dirname(os.path.abspath(__file__)))
     sys.path.insert(0, os.path.abspath("../src"))
+
+
+@pytest.fixture
+def fake_abaqus(tmp_path_factory: pytest.TempPathFactory, monkeypatch: pytest.MonkeyPatch) -> str:
+    """Point the ``ABAQUS_BAT_PATH`` environment variable to a stand-in for the ``abaqus`` command, see
+    ``fake_abaqus.py``.
+
+    Returns:
+        str: The path of the stand-in command.
+    """
+    script = os.path.abspath("fake_abaqus.py")
+    directory = tmp_path_factory.mktemp("bin")
+    if os.name == "nt":
+        path = directory / "abaqus.bat"
+        path.write_text(f'@"{sys.executable}" "{script}" %*\n')
+    else:
+        path = directory / "abaqus"
+        path.write_text(f'#!/bin/sh\nexec "{sys.executable}" "{script}" "$@"\n')
+        path.chmod(0o755)
+    monkeypatch.setenv("ABAQUS_BAT_PATH", str(path))
+    return str(path)
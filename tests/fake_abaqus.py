@@ -0,0 +1,46 @@
+"""A stand-in for the ``abaqus`` command to test the command line interface without Abaqus.
+
+It echoes its arguments and runs the script of ``abaqus cae noGUI=script.py -- args`` and
+``abaqus python script.py args`` with the current interpreter. The ``exit=N`` and ``sleep=S`` options exit with
+code N and sleep S seconds before exiting. ``abaqus job=name input=file`` writes the status file of an
+Abaqus/Standard analysis of ``increments=N`` increments (by default 100) of ``increment_time=T / cpus`` seconds each
+(by default 0.1 s).
+"""
+
+import runpy
+import sys
+import time
+
+
+def analysis(job, increments, increment_time):
+    with open(f"{job}.sta", "w") as f:
+        f.write(" STEP  INC ATT SEVERE EQUIL TOTAL  TOTAL      STEP       INC OF\n")
+        for increment in range(1, increments + 1):
+            time.sleep(increment_time)
+            f.write(f"   1  {increment:>4}   1     0     1     1  {increment / 100:g}  {increment / 100:g}  0.01\n")
+            f.flush()
+        f.write(" THE ANALYSIS HAS COMPLETED SUCCESSFULLY\n")
+
+
+def main(argv):
+    print("abaqus", *argv, flush=True)
+    print("fake abaqus stderr", file=sys.stderr, flush=True)
+    options = dict(arg.split("=", 1) for arg in argv if "=" in arg and not arg.startswith("-"))
+    time.sleep(float(options.get("sleep", 0)))
+    script, args = None, []
+    if argv[:1] == ["cae"]:
+        script = options.get("noGUI", options.get("script"))
+        args = argv[argv.index("--") + 1 :] if "--" in argv else []
+    elif argv[:1] == ["python"] and len(argv) > 1:
+        script, args = argv[1], [arg for arg in argv[2:] if arg.split("=")[0] not in ("sim", "log", "exit", "sleep")]
+    if script:
+        sys.argv = [script, *args]
+        runpy.run_path(script, run_name="__main__")
+    if "job" in options and "input" in options:
+        analysis(options["job"], int(options.get("increments", 100)),
+                 float(options.get("increment_time", 0.1)) / int(options.get("cpus", 1)))  # fmt: skip
+    return int(options.get("exit", 0))
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
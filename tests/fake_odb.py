@@ -0,0 +1,121 @@
+"""A stand-in for an output database opened with ``odbAccess.openOdb``, to test the ODB export without Abaqus.
+
+The output database has an instance of 4 nodes and two steps, ``Step-1`` with 3 frames and ``Step-2`` with 2 frames,
+with the nodal displacements ``U``, and the stresses ``S`` at the integration points of two C3D8 elements (2
+integration points each) and one C3D4 element. The assembly has the node set ``TOP`` of the nodes 3 and 4 and the
+element set ``HEX`` of the C3D8 elements, the instance has the element set ``TET`` of the C3D4 element. The stresses
+of the C3D4 element are written in a local coordinate system rotated by 90 degrees about the Z axis, the coordinates
+of the integration points are the ``COORD`` field output, and the assembly has the cylindrical coordinate system
+``CYL`` about the Z axis. The values of frame ``i`` of step ``n`` are computed by :func:`values`.
+"""
+
+from types import SimpleNamespace
+
+import numpy as np
+
+NODES = np.array([1, 2, 3, 4], dtype=np.int32)
+COORDINATES = np.array([[0, 0, 0], [1, 0, 0], [0, 1, 0], [0, 0, 1]], dtype=np.float32)
+STRESS_COMPONENTS = ("S11", "S22", "S33", "S12", "S13", "S23")
+
+#: The elements, integration points and element types of the stress blocks.
+STRESS_BLOCKS = (
+    ("C3D8", np.array([1, 1, 2, 2], dtype=np.int32), np.array([1, 2, 1, 2], dtype=np.int32)),
+    ("C3D4", np.array([3], dtype=np.int32), np.array([1], dtype=np.int32)),
+)
+
+#: The quaternion (q1, q2, q3, q0) of the local coordinate system of the C3D4 element.
+C3D4_ORIENTATION = np.array([[0, 0, np.sqrt(0.5), np.sqrt(0.5)]], dtype=np.float32)
+
+#: The coordinates of the integration points of the stress blocks.
+POINTS = (
+    np.array([[1, 0, 0], [1, 1, 0], [0, 1, 1], [-1, 1, 2]], dtype=np.float32),
+    np.array([[0, -2, 0]], dtype=np.float32),
+)
+
+
+def values(step: int, frame: int, count: int, components: int, seed: int = 0) -> np.ndarray:
+    """The values of a block of a frame."""
+    return np.random.RandomState(1000 * step + 10 * frame + seed).uniform(-100, 100, (count, components)).astype("f4")
+
+
+class DoubleBlock(SimpleNamespace):
+    """A block of an output database written in double precision, its ``data`` and ``conjugateData`` raise, see
+    :class:`~abaqus.Odb.FieldBulkData.FieldBulkData`, the values are ``dataDouble`` and ``conjugateDataDouble``."""
+
+    @property
+    def data(self):
+        raise RuntimeError("The data are in double precision, use dataDouble")
+
+    @property
+    def conjugateData(self):
+        raise RuntimeError("The data are in double precision, use conjugateDataDouble")
+
+
+def double(block: SimpleNamespace) -> DoubleBlock:
+    """The double precision copy of a block."""
+    attributes = dict(vars(block))
+    attributes["dataDouble"] = attributes.pop("data").astype("f8")
+    attributes["conjugateDataDouble"] = attributes.pop("conjugateData")
+    return DoubleBlock(**attributes)
+
+
+def _frame(step: int, index: int, instance: SimpleNamespace) -> SimpleNamespace:
+    displacement = SimpleNamespace(
+        position="NODAL", type="VECTOR", instance=instance, elementType="", baseElementType="", sectionPoint=None,
+        componentLabels=("U1", "U2", "U3"), data=values(step, index, 4, 3), conjugateData=None, nodeLabels=NODES,
+        elementLabels=np.array([], dtype=np.int32), integrationPoints=np.array([], dtype=np.int32),
+    )  # fmt: skip
+    stresses = [
+        SimpleNamespace(
+            position="INTEGRATION_POINT", type="TENSOR_3D_FULL", instance=instance, elementType=element_type,
+            baseElementType=element_type, sectionPoint=None, componentLabels=STRESS_COMPONENTS,
+            data=values(step, index, len(elements), 6, seed=i + 1), conjugateData=None,
+            nodeLabels=np.array([], dtype=np.int32), elementLabels=elements, integrationPoints=points,
+            localCoordSystem=C3D4_ORIENTATION if element_type == "C3D4" else None,
+        )  # fmt: skip
+        for i, (element_type, elements, points) in enumerate(STRESS_BLOCKS)
+    ]
+    # The coordinates of the integration points, in the reverse order of the stresses
+    coordinates = [
+        SimpleNamespace(
+            position="INTEGRATION_POINT", type="VECTOR", instance=instance, elementType=element_type,
+            baseElementType=element_type, sectionPoint=None, componentLabels=("COOR1", "COOR2", "COOR3"),
+            data=xyz[::-1], conjugateData=None, nodeLabels=np.array([], dtype=np.int32),
+            elementLabels=elements[::-1], integrationPoints=points[::-1],
+        )  # fmt: skip
+        for (element_type, elements, points), xyz in zip(STRESS_BLOCKS, POINTS)
+    ]
+    fields = {
+        "U": SimpleNamespace(name="U", description="Spatial displacement", type="VECTOR",
+                             componentLabels=("U1", "U2", "U3"), validInvariants=("MAGNITUDE",),
+                             bulkDataBlocks=[displacement]),
+        "S": SimpleNamespace(name="S", description="Stress components", type="TENSOR_3D_FULL",
+                             componentLabels=STRESS_COMPONENTS,
+                             validInvariants=("MISES", "TRESCA", "PRESS", "INV3", "MAX_PRINCIPAL", "MID_PRINCIPAL",
+                                              "MIN_PRINCIPAL"),
+                             bulkDataBlocks=stresses),
+        "COORD": SimpleNamespace(name="COORD", description="Coordinates", type="VECTOR",
+                                 componentLabels=("COOR1", "COOR2", "COOR3"), validInvariants=(),
+                                 bulkDataBlocks=coordinates),
+    }  # fmt: skip
+    return SimpleNamespace(frameId=index, frameValue=0.5 * index, description=f"Increment {index}",
+                           incrementNumber=index, fieldOutputs=fields)  # fmt: skip
+
+
+def openOdb(path: str, readOnly: bool = True) -> SimpleNamespace:
+    nodes = [SimpleNamespace(label=int(label), coordinates=tuple(xyz)) for label, xyz in zip(NODES, COORDINATES)]
+    elements = [SimpleNamespace(label=label) for label in (1, 2, 3)]
+    tet = SimpleNamespace(name="TET", elements=elements[2:])
+    instance = SimpleNamespace(name="PART-1-1", nodes=nodes, nodeSets={}, elementSets={"TET": tet})
+    steps = {}
+    for number, (name, frames) in enumerate((("Step-1", 3), ("Step-2", 2)), 1):
+        steps[name] = SimpleNamespace(name=name, number=number, description="", domain="TIME", procedure="*STATIC",
+                                      timePeriod=1.0, totalTime=number - 1.0,
+                                      frames=[_frame(number, i, instance) for i in range(frames)])  # fmt: skip
+    top = SimpleNamespace(name="TOP", instanceNames=(instance.name,), nodes=[nodes[2:]])
+    hex = SimpleNamespace(name="HEX", instanceNames=(instance.name,), elements=[elements[:2]])
+    cylindrical = SimpleNamespace(coordSysType="CYLINDRICAL", origin=(0.0, 0.0, 0.0), xAxis=(1.0, 0.0, 0.0),
+                                  yAxis=(0.0, 1.0, 0.0), zAxis=(0.0, 0.0, 1.0))  # fmt: skip
+    assembly = SimpleNamespace(instances={instance.name: instance}, nodeSets={"TOP": top}, elementSets={"HEX": hex},
+                               datumCsyses={"CYL": cylindrical})  # fmt: skip
+    return SimpleNamespace(name=path, path=path, rootAssembly=assembly, steps=steps, close=lambda: None)
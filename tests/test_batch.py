@@ -0,0 +1,42 @@
+import os
+
+from abqpy.batch import BatchScript, PythonBatch
+from abqpy.cli import AbqpyCLI
+
+SCRIPT = """\
+import os, sys
+assert "leaked" not in globals()
+leaked = True
+print("run", sys.argv[1:], os.path.basename(os.getcwd()))
+if sys.argv[1:] == ["crash"]:
+    os._exit(3)
+if sys.argv[1:] == ["error"]:
+    raise ValueError("boom")
+sys.exit(int(sys.argv[-1]) if sys.argv[-1].isdigit() else 0)
+"""
+
+
+def test_python_batch(fake_abaqus, tmp_path):
+    (tmp_path / "script.py").write_text(SCRIPT)
+    (tmp_path / "data").mkdir()
+    lines = []
+    scripts = [BatchScript.parse(line, str(tmp_path)) for line in ("script.py a", "script.py 2", "script.py error")]
+    scripts += [BatchScript.parse({"script": "script.py", "args": ["crash"]}, str(tmp_path))]
+    scripts += [BatchScript.parse({"script": "script.py", "args": ["b c"], "cwd": "data"}, str(tmp_path))]
+    batch = PythonBatch(scripts, str(tmp_path / "logs"), cwd=str(tmp_path), stdout=lines.append)
+    result = batch.run()
+    assert [r.returncode for r in result.results] == [0, 2, 1, -1, 0]
+    assert result.processes == 2 and result.returncode == 1
+    assert "code 3" in result.results[3].error and "2 of 5 scripts succeeded" in str(result)
+    with open(result.results[0].log) as f:
+        assert f.read() == f"run ['a'] {tmp_path.name}\n"
+    with open(result.results[2].log) as f:
+        assert "ValueError: boom" in f.read()
+    with open(result.results[4].log) as f:
+        assert f.read() == "run ['b c'] data\n"
+    assert not any("##abqpy-batch##" in line for line in lines) and "fake abaqus stderr\n" not in lines
+
+    (tmp_path / "scripts.txt").write_text("# comment\nscript.py 0\n\nscript.py 4\n")
+    result = AbqpyCLI(cwd=str(tmp_path), stdout=lines.append).python_batch("script.py 5", file="scripts.txt")
+    assert [r.returncode for r in result.results] == [5, 0, 4]
+    assert os.path.exists(tmp_path / "python-batch" / "0002-script.log")
@@ -0,0 +1,45 @@
+import inspect
+
+from abqpy.decorators import (
+    abaqus_class_doc,
+    abaqus_method_doc,
+    add_link_in_class_docstring,
+    add_link_in_method_docstring,
+)
+
+CLASS_DOCSTRING = """The Queue object.
+
+    .. note::
+        This object can be accessed by::
+
+            session.queues[name]
+    """
+METHOD_DOCSTRING = """This method creates a Queue object.
+
+        Parameters
+        ----------
+        name
+            A String specifying the name of the new Queue object.
+        """
+
+
+def test_class_doc():
+    @abaqus_class_doc
+    class Queue:
+        __doc__ = CLASS_DOCSTRING
+
+    expected = add_link_in_class_docstring("Queue", CLASS_DOCSTRING, label="Queue")
+    assert type(vars(Queue)["__doc__"]).__name__ == "_LazyClassDocstring"
+    assert Queue().__doc__ == expected
+    assert Queue.__doc__ == expected and vars(Queue)["__doc__"] == expected
+    assert inspect.getdoc(Queue) == inspect.cleandoc(expected)
+
+
+def test_method_doc():
+    def queue(self):
+        pass
+
+    queue.__doc__, queue.__qualname__ = METHOD_DOCSTRING, "Queue.queue"
+    expected = add_link_in_method_docstring("Queue", "queue", METHOD_DOCSTRING, label="Queue.queue")
+    assert "help.3ds.com" in expected and expected != METHOD_DOCSTRING
+    assert abaqus_method_doc(queue).__doc__ == expected
@@ -0,0 +1,81 @@
+from types import SimpleNamespace
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import fake_odb  # noqa: E402
+
+from abqpy.envelopes import (  # noqa: E402
+    Envelope,
+    maxEnvelope,
+    minEnvelope,
+    reduce_store,
+)
+from abqpy.invariants import invariant  # noqa: E402
+from abqpy.odb_export import Exporter  # noqa: E402
+
+#: The steps and frames of the stand-in output database, in order.
+FRAMES = [(1, 0), (1, 1), (1, 2), (2, 0), (2, 1)]
+
+
+def test_envelope():
+    odb = fake_odb.openOdb("Job-1.odb")
+    fields = [frame.fieldOutputs["S"] for step in odb.steps.values() for frame in step.frames]
+    envelope = maxEnvelope(fields, invariant="MISES")
+    mises = np.array([invariant("MISES", fake_odb.values(s, f, 4, 6, seed=1), fake_odb.STRESS_COMPONENTS)
+                      for s, f in FRAMES])  # fmt: skip
+    block = envelope.blocks["INTEGRATION_POINT", "PART-1-1", "C3D8", None]
+    assert np.allclose(block.values, mises.max(axis=0)) and np.array_equal(block.index, mises.argmax(axis=0))
+    assert np.array_equal(block.elementLabels, [1, 1, 2, 2]) and block.nodeLabels is None
+    assert len(envelope.blocks) == 2 and envelope.count == 5 and str(envelope).startswith("Max MISES of 5 frames: ")
+
+    # Streamed in two chunks and merged
+    first, second = Envelope("min", componentLabel="S11"), Envelope("min", componentLabel="S11")
+    for index, field in enumerate(fields):
+        (first if index < 2 else second).add(field, index)
+    merged = first.merge(second)
+    s11 = np.array([fake_odb.values(s, f, 4, 6, seed=1)[:, 0] for s, f in FRAMES])
+    block = merged.blocks["INTEGRATION_POINT", "PART-1-1", "C3D8", None]
+    assert np.allclose(block.values, s11.min(axis=0)) and np.array_equal(block.index, s11.argmin(axis=0))
+    assert np.array_equal(minEnvelope(fields, componentLabel="S11").blocks[block.key].index, block.index)
+
+    with pytest.raises(ValueError, match="not scalar"):
+        maxEnvelope(fields)
+    with pytest.raises(ValueError):
+        Envelope("mean")
+
+    # Empty blocks
+    empty = SimpleNamespace(**dict(vars(fields[0].bulkDataBlocks[0]), data=np.zeros((0, 6), dtype="f4")))
+    envelope = maxEnvelope([SimpleNamespace(name="S", bulkDataBlocks=[empty])], invariant="MISES")
+    assert envelope.blocks[block.key].values.shape == (0,)
+
+
+def test_envelope_double_precision():
+    odb = fake_odb.openOdb("Job-1.odb")
+    fields = [frame.fieldOutputs["S"] for step in odb.steps.values() for frame in step.frames]
+    doubles = [SimpleNamespace(name=field.name, bulkDataBlocks=list(map(fake_odb.double, field.bulkDataBlocks)))
+               for field in fields]  # fmt: skip
+    with pytest.raises(RuntimeError):
+        doubles[0].bulkDataBlocks[0].data
+    envelope, expected = maxEnvelope(doubles, invariant="MISES"), maxEnvelope(fields, invariant="MISES")
+    for key, block in expected.blocks.items():
+        assert np.allclose(envelope.blocks[key].values, block.values)
+        assert np.array_equal(envelope.blocks[key].elementLabels, block.elementLabels)
+
+
+def test_reduce_store(tmp_path):
+    store = str(tmp_path / "store")
+    Exporter(fake_odb.openOdb("Job-1.odb"), store).export()
+    serial, frames = reduce_store(store, "U", invariant="MAGNITUDE")
+    assert frames == [("Step-1", 0), ("Step-1", 1), ("Step-1", 2), ("Step-2", 0), ("Step-2", 1)]
+    magnitudes = np.array([np.linalg.norm(fake_odb.values(s, f, 4, 3), axis=1) for s, f in FRAMES])
+    block = serial.blocks["NODAL", "PART-1-1", "", None]
+    assert np.allclose(block.values, magnitudes.max(axis=0)) and np.array_equal(block.index, magnitudes.argmax(axis=0))
+    assert np.array_equal(block.nodeLabels, fake_odb.NODES)
+
+    parallel, _ = reduce_store(store, "U", invariant="MAGNITUDE", workers=2, chunks=3)
+    assert parallel.count == 5 and np.array_equal(parallel.blocks[block.key].index, block.index)
+    assert np.array_equal(parallel.blocks[block.key].values, block.values)
+    step, _ = reduce_store(store, "S", "min", invariant="MIN_PRINCIPAL", steps=["Step-2"])
+    assert step.count == 2 and set(step.blocks["INTEGRATION_POINT", "PART-1-1", "C3D4", None].index) <= {0, 1}
@@ -0,0 +1,75 @@
+import json
+import os
+
+from abqpy.cli import AbqpyCLI
+from abqpy.farm import Case, JobFarm, license_tokens
+
+SCRIPT = """\
+import json, os, sys, time
+start = time.time()
+time.sleep(0.5)
+with open("times.json", "w") as f:
+    json.dump([start, time.time(), sys.argv[1:], os.environ["ABQPY_FARM_CASE"]], f)
+"""
+
+
+def max_running(results) -> int:
+    """The maximum number of cases that ran at once, from the times written by the cases."""
+    times = []
+    for result in results:
+        with open(os.path.join(result.directory, "times.json")) as f:
+            start, end, *_ = json.load(f)
+        times += [(start, 1), (end, -1)]
+    running = peak = 0
+    for _, change in sorted(times):
+        running += change
+        peak = max(peak, running)
+    return peak
+
+
+def test_farm(fake_abaqus, tmp_path):
+    script = tmp_path / "script.py"
+    script.write_text(SCRIPT)
+    cases = [Case(f"case-{i}", str(script), {"x": i}, mode="python") for i in range(4)]
+    cases.append(Case("big", str(script), mode="python", cpus=8))
+    cases.append(Case("failed", str(script), {"exit": 3}, mode="python"))
+    farm = JobFarm(cases, directory=str(tmp_path / "farm"), workers=4, cpus=4, tokens=2 * license_tokens(1))
+    results = farm.run()
+    assert results.returncode == 1
+    assert [result.returncode for result in results.results] == [0, 0, 0, 0, -1, 3]
+    assert results.results[4].error == "needs 8 CPUs of 4"
+    assert max_running(results.results[:4] + results.results[5:]) == 2
+    with open(os.path.join(results.results[1].directory, "times.json")) as f:
+        assert json.load(f)[2:] == [["x=1"], "case-1"]
+    with open(os.path.join(results.results[1].directory, "abqpy.log")) as f:
+        assert "fake abaqus stderr" in f.read()
+    with open(tmp_path / "farm" / "farm.json") as f:
+        assert [case["returncode"] for case in json.load(f)["cases"]] == [0, 0, 0, 0, -1, 3]
+    assert "4 of 6 cases succeeded" in str(results)
+
+
+def test_farm_error(fake_abaqus, tmp_path, monkeypatch):
+    # A case that raises is recorded as failed, the other cases still run
+    arguments = Case.arguments
+    monkeypatch.setattr(Case, "arguments", lambda case: ["unknown"] if case.name == "broken" else arguments(case))
+    (tmp_path / "script.py").write_text(SCRIPT)
+    cases = [Case(name, str(tmp_path / "script.py"), mode="python") for name in ("broken", "ok")]
+    results = JobFarm(cases, directory=str(tmp_path / "farm")).run()
+    assert [result.returncode for result in results.results] == [-1, 0]
+    assert results.results[0].error.startswith("AttributeError(")
+
+
+def test_farm_table(fake_abaqus, tmp_path):
+    (tmp_path / "script.py").write_text(SCRIPT)
+    (tmp_path / "cases.csv").write_text("name,x,cpus,mode\na,1,2,python\nb,2,1,cae\nc,3,1,python\n")
+    cli = AbqpyCLI()
+    results = cli.farm(
+        str(tmp_path / "cases.csv"), str(tmp_path / "script.py"), directory=str(tmp_path / "farm"), cpus=4
+    )
+    assert results.returncode == 0
+    assert [(r.case.name, r.case.cpus, r.case.parameters) for r in results.results] == [
+        ("a", 2, {"x": 1}),
+        ("b", 1, {"x": 2}),
+        ("c", 1, {"x": 3}),
+    ]
+    assert results.results[1].result.args[1:3] == ["cae", f"noGUI={tmp_path / 'script.py'}"]
@@ -0,0 +1,266 @@
+import os
+import sys
+
+import pytest
+
+from inpParser import InputFile
+
+MAIN = """\
+*HEADING
+Test model
+** Parts
+*PART, NAME="Part 1"
+*NODE, NSET=ALL
+1, 0.0, 0.0, 0.0
+2, 1.0, 0.0, 0.0
+3, 1.0, 1.0, 0.0
+4, 0.0, 1.0, 0.0
+*ELEMENT, TYPE=C3D20R,
+  ELSET=EALL
+1, 1, 2, 3, 4, 1, 2, 3, 4, 1, 2, 3, 4, 1, 2, 3,
+4, 1, 2, 3, 4
+*INCLUDE, INPUT=sets.inp
+*END PART
+*MATERIAL, NAME=Steel
+*ELASTIC
+210000., 0.3
+*DENSITY
+7.8e-9,
+*INCLUDE, INPUT=missing.inp
+*STEP
+*STATIC
+*END STEP
+** trailing comment
+"""
+
+SETS = """\
+*NSET, NSET=TOP, GENERATE
+3, 4, 1
+*ELSET, ELSET=E1
+1,
+"""
+
+
+@pytest.fixture
+def inp(tmp_path):
+    (tmp_path / "main.inp").write_text(MAIN)
+    (tmp_path / "sets.inp").write_text(SETS)
+    return tmp_path
+
+
+def test_parse(inp):
+    inputFile = InputFile("main.inp", str(inp))
+    keywords = inputFile.parse()
+    assert [keyword.name for keyword in keywords] == [
+        "HEADING",
+        "PART",
+        "NODE",
+        "ELEMENT",
+        "NSET",
+        "ELSET",
+        "END PART",
+        "MATERIAL",
+        "ELASTIC",
+        "DENSITY",
+        "STEP",
+        "STATIC",
+        "END STEP",
+    ]
+    assert inputFile.includes == ("sets.inp",) and inputFile.missingIncludes == ("missing.inp",)
+    heading, part, node, element, nset = keywords[:5]
+    assert heading.data == (("Test model",),)
+    assert part.parameter == {"name": "Part 1"} and part.comments == ("Parts",)
+    assert node.data[1] == (2, 1.0, 0.0, 0.0) and isinstance(node.data[1][0], int)
+    assert element.parameter == {"type": "C3D20R", "elset": "EALL"}
+    assert element.data == ((1, 1, 2, 3, 4, 1, 2, 3, 4, 1, 2, 3, 4, 1, 2, 3, 4, 1, 2, 3, 4),)
+    assert nset.parameter == {"nset": "TOP", "generate": ""} and nset.data == ((3, 4, 1),)
+    assert keywords[-4].data == ((7.8e-9,),) and keywords[-1].comments == ("trailing comment",)
+    with pytest.raises(ValueError):
+        inputFile.parse()
+
+
+def test_include_cycle(inp):
+    (inp / "sets.inp").write_text(SETS + "*INCLUDE, INPUT=main.inp\n")
+    with pytest.raises(ValueError, match=r"includes itself: .*main.inp -> .*sets.inp -> .*main.inp"):
+        InputFile("main.inp", str(inp)).parse()
+    # A file included twice, but not in itself, is not a cycle
+    (inp / "sets.inp").write_text(SETS)
+    (inp / "twice.inp").write_text("*INCLUDE, INPUT=sets.inp\n*INCLUDE, INPUT=sets.inp\n")
+    assert InputFile("twice.inp", str(inp)).parse().findAll("NSET")[1].data == ((3, 4, 1),)
+
+
+def test_parse_options(inp):
+    keywords = InputFile("main.inp", str(inp)).parse(organize=True, bulk=False)
+    assert [keyword.name for keyword in keywords] == ["HEADING", "PART", "MATERIAL", "STEP"]
+    part, material, step = keywords[1:]
+    assert [keyword.name for keyword in part.suboptions] == ["NODE", "ELEMENT", "NSET", "ELSET", "END PART"]
+    assert part.suboptions[0].data == ()
+    assert [keyword.name for keyword in material.suboptions] == ["ELASTIC", "DENSITY"]
+    assert [keyword.name for keyword in step.suboptions] == ["STATIC", "END STEP"]
+
+
+def test_parse_pyarray(inp):
+    pytest.importorskip("numpy")
+    node = InputFile("main.inp", str(inp)).parse(usePyArray=True)[2]
+    assert node.data.shape == (4, 4) and node.data.colZeroIsInt
+    assert node.data[1, 0] == 2 and isinstance(node.data[1, 0], int) and isinstance(node.data[1, 1], float)
+    assert node.data.tolist()[3] == [4, 0.0, 1.0, 0.0]
+
+
+def test_abaqus_ndarray():
+    from array import array
+
+    np = pytest.importorskip("numpy")
+    from abaqus.InputFileParser.AbaqusNDarray import AbaqusNDarray
+
+    buffer = array("d", [1, 0.5, 2.0, 2, 1.5, 3.0, 3, 2.5, 4.0])
+    data = AbaqusNDarray.fromBuffer(buffer, 3, colZeroIsInt=True)
+    assert np.shares_memory(data, np.frombuffer(buffer)) and np.shares_memory(data[1:], data)
+    assert data[1][0] == 2 and isinstance(data[1][0], int) and data[1:][0].tolist() == [2, 1.5, 3.0]
+    assert data.labels.tolist() == [1, 2, 3] and data.values.shape == (3, 2)
+    assert data.labels is data.labels and data.labels.dtype == np.int64
+    assert np.shares_memory(data[1:].labels, data.labels)
+    data[0, 0] = 7
+    data[1:][0] = [5, 1.5, 3.0]
+    assert data.labels.tolist() == [7, 5, 3] and data.copy().labels.tolist() == [7, 5, 3]
+    assert not data[:, 1:].colZeroIsInt and isinstance(data[:, 1:][0, 0], float)
+
+
+def test_parse_cache(inp, tmp_path, monkeypatch):
+    pytest.importorskip("numpy")
+    from abaqus.InputFileParser import _ParseCache
+
+    monkeypatch.setattr(_ParseCache.config, "inp_cache_dir", str(tmp_path / "cache"))
+    cold = InputFile("main.inp", str(inp)).parse()
+    monkeypatch.setattr(sys.modules[InputFile.__module__], "_DataBlock", None)  # a warm parse does not tokenize
+    warm = InputFile("main.inp", str(inp))
+    keywords = warm.parse(organize=True, usePyArray=True)
+    assert warm.includes == ("sets.inp",) and warm.missingIncludes == ("missing.inp",)
+    assert [keyword.name for keyword in keywords[1].suboptions] == ["NODE", "ELEMENT", "NSET", "ELSET", "END PART"]
+    node = keywords[1].suboptions[0]
+    assert node.data.colZeroIsInt and node.data.tolist() == [list(row) for row in cold[2].data]
+    assert not node.data.flags.writeable and node.data.labels.tolist() == [1, 2, 3, 4]
+    assert [(k.name, k.parameter, k.data, k.comments) for k in InputFile("main.inp", str(inp)).parse()] == [
+        (k.name, k.parameter, k.data, k.comments) for k in cold
+    ]
+    monkeypatch.undo()
+    monkeypatch.setattr(_ParseCache.config, "inp_cache_dir", str(tmp_path / "cache"))
+
+    # The stats of a touched but unchanged file are written back to the index, it is not hashed again
+    os.utime(inp / "sets.inp", ns=(0, 10**9))
+    InputFile("main.inp", str(inp)).parse()
+    monkeypatch.setattr(_ParseCache, "_hash", None)
+    InputFile("main.inp", str(inp)).parse()
+    monkeypatch.undo()
+    monkeypatch.setattr(_ParseCache.config, "inp_cache_dir", str(tmp_path / "cache"))
+    # The unfinished entries left by crashed writers are evicted
+    crashed = tmp_path / "cache" / ".crashed-entry"
+    crashed.mkdir()
+    os.utime(crashed, (0, 0))
+
+    (inp / "sets.inp").write_text(SETS.replace("3, 4, 1", "1, 4, 1"))
+    assert InputFile("main.inp", str(inp)).parse()[4].data == ((1, 4, 1),)
+    main = inp / "main.inp"
+    main.write_text(main.read_text().replace("*STEP", "*STEP, NAME=Changed"))
+    assert InputFile("main.inp", str(inp)).parse()[-3].parameter == {"name": "Changed"}
+    monkeypatch.setattr(_ParseCache.config, "inp_cache_size", 0)
+    InputFile("main.inp", str(inp)).parse(bulk=False)
+    assert not os.listdir(tmp_path / "cache")
+
+
+@pytest.mark.parametrize("workers", [0, 2])
+def test_parse_vectorized(tmp_path, monkeypatch, workers):
+    pytest.importorskip("numpy")
+    from abaqus.InputFileParser import _DataBlock
+
+    lines = ["*NODE"] + [f"{i}, {i / 3}, {-i}e-3, 0" for i in range(1, 101)]
+    lines += ["*ELEMENT, TYPE=C3D20"] + [f"{i}, {', '.join(['1'] * 15)},\n{', '.join(['2'] * 5)}" for i in range(50)]
+    lines += ["*ELEMENT, TYPE=C3D8"] + ["1, 1, 2, 3, 4, 5, 6, 7, 8"] * 9 + ["2, 1, 2"] + ["3, 1.5, 2, 3, 4, 5, 6, 7, 8"]
+    lines += ["*NSET, NSET=A"] + ["1, 2, 3,"] * 10 + ["4, a"]
+    (tmp_path / "main.inp").write_text("\n".join(lines))
+    monkeypatch.setattr(_DataBlock, "CHUNK_LINES", 7)
+    monkeypatch.setattr(sys.modules[InputFile.__module__].config, "inp_parse_workers", workers)
+    serial = InputFile("main.inp", str(tmp_path))._parse(str(tmp_path / "main.inp"), False, True, False)
+    for usePyArray in (False, True):
+        keywords = InputFile("main.inp", str(tmp_path)).parse(usePyArray=usePyArray)
+        for keyword, expected in zip(keywords, serial):
+            data = keyword.data if isinstance(keyword.data, tuple) else tuple(map(tuple, keyword.data.tolist()))
+            assert data == expected.data and [type(value) for row in data for value in row] == [
+                type(value) for row in expected.data for value in row
+            ]
+    assert keywords[0].data.colZeroIsInt and keywords[1].data.shape == (50, 21)
+    assert serial[2].data[-2:] == ((2, 1, 2), (3, 1.5, 2, 3, 4, 5, 6, 7, 8))
+
+
+def test_keyword_index(inp):
+    inputFile = InputFile("main.inp", str(inp))
+    keywords = inputFile.parse(organize=True, bulk=False)
+    assert keywords._keywordIndex is not None  # built by parse
+    assert keywords.find("elset", name="e1") is keywords[1].suboptions[3]
+    assert keywords.find("NSET", name="TOP", generate="") is keywords[1].suboptions[2]
+    assert keywords.find("NSET", generate="no") is None and keywords.find("STEP") is keywords[-1]
+    assert [keyword.name for keyword in keywords.findAll("ELEMENT")] == ["ELEMENT"]
+
+    element = keywords.find("ELEMENT")
+    assert element.data == () and element.readData()[0][-1] == 4
+    assert keywords.atOffset(element.offset) is element and keywords.atOffset(1) is None
+    nset = keywords.find("NSET")
+    assert nset.file == str(inp / "sets.inp") and keywords.atOffset(nset.offset, nset.file) is nset
+    assert nset.readData() == ((3, 4, 1),)
+    with pytest.raises(ValueError):
+        type(element)("ELEMENT").readData()
+
+    keywords.append(type(element)("ELSET", {"elset": "e2"}))
+    assert keywords.find("ELSET", name="E2") is keywords[-1]
+
+    # Modifying the suboptions of a keyword or reassigning them refreshes the index of the whole sequence
+    part = keywords.find("PART")
+    part.suboptions.append(type(element)("ELSET", {"elset": "added"}))
+    assert keywords.find("ELSET", name="ADDED") is part.suboptions[-1]
+    del part.suboptions[-1]
+    assert keywords.find("ELSET", name="ADDED") is None
+    part.suboptions = type(keywords)()
+    assert keywords.find("ELEMENT") is None
+
+    # Modifying a sequence only makes the indexes of the sequences that contain it stale
+    material, step = keywords.find("MATERIAL"), keywords.find("STEP")
+    assert step.suboptions.find("STATIC") is step.suboptions[0]
+    index = step.suboptions._keywordIndex
+    material.suboptions.append(type(element)("PLASTIC"))
+    material.suboptions[0].name = "EXPANSION"
+    assert keywords.find("PLASTIC") is material.suboptions[-1] and keywords.find("EXPANSION") is not None
+    assert step.suboptions.find("STATIC") is step.suboptions[0] and step.suboptions._keywordIndex is index
+
+
+@pytest.mark.parametrize("workers", [0, 2])
+def test_input_file_writer(tmp_path, workers):
+    np = pytest.importorskip("numpy")
+    from inpParser import InputFileWriter
+
+    nodes = np.random.default_rng(0).random((100, 3))
+    elements = np.arange(1, 2001).reshape(100, 20)
+    with InputFileWriter("mesh.inp", str(tmp_path), workers=workers, chunkSize=7) as writer:
+        writer.writeKeyword("HEADING", data=[("Generated mesh",)])
+        writer.writeNodes(nodes, nset="ALL", include="nodes.inp")
+        writer.writeElements(elements, elementType="C3D20R", labels=range(101, 201), elset="ALL",
+                             include="elements.inp")  # fmt: skip
+        writer.writeSet("NSET", "EVEN", range(2, 101, 2))
+        writer.writeSet("ELSET", "SOME", [101, 105, 106] * 7, instance="Part 1")
+        writer.writeKeyword("MATERIAL", {"NAME": "Steel"})
+        writer.writeKeyword("ELASTIC", data=[(210000.0, 0.3)])
+        writer.writeKeyword("USER MATERIAL", {"CONSTANTS": 20}, data=np.arange(20.0).reshape(1, 20))
+
+    with open(tmp_path / "mesh.inp") as f:
+        assert max(line.count(",") for line in f if not line.startswith("*")) <= 16
+    keywords = InputFile("mesh.inp", str(tmp_path)).parse(usePyArray=True)
+    names = ["HEADING", "NODE", "ELEMENT", "NSET", "ELSET", "MATERIAL", "ELASTIC", "USER MATERIAL"]
+    assert [keyword.name for keyword in keywords] == names
+    node, element, nset, elset = keywords[1:5]
+    assert node.parameter == {"nset": "ALL"} and (node.data.labels == np.arange(1, 101)).all()
+    assert (node.data.values == nodes).all()
+    assert (element.data.labels == np.arange(101, 201)).all() and (element.data.values == elements).all()
+    assert nset.parameter == {"nset": "EVEN", "generate": ""} and nset.data.tolist() == [[2, 100, 2]]
+    assert elset.parameter == {"elset": "SOME", "instance": "Part 1"}
+    assert [label for row in elset.data for label in row] == [101, 105, 106] * 7
+    assert keywords[-2].data.tolist() == [[210000.0, 0.3]]
+    assert [value for row in keywords[-1].data for value in row] == list(range(20))
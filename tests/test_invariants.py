@@ -0,0 +1,101 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import fake_odb  # noqa: E402
+
+from abqpy.invariants import invariant  # noqa: E402
+from abqpy.odb_export import Exporter  # noqa: E402
+from abqpy.odb_store import open_store  # noqa: E402
+
+#: The component labels of the tensor types, and the components of a full tensor they are.
+TYPES = {
+    "TENSOR_3D_FULL": ("S11", "S22", "S33", "S12", "S13", "S23"),
+    "TENSOR_3D_PLANAR": ("S11", "S22", "S33", "S12"),
+    "TENSOR_3D_SURFACE": ("S11", "S22", "S12"),
+    "TENSOR_2D_PLANAR": ("S11", "S22", "S12"),
+}
+
+
+def reference(value, labels):
+    """The invariants of a value, computed one at a time."""
+    tensor = np.zeros((3, 3))
+    for component, label in zip(value, labels):
+        i, j = int(label[-2]) - 1, int(label[-1]) - 1
+        tensor[i, j] = tensor[j, i] = component
+    deviator = tensor - np.trace(tensor) / 3 * np.eye(3)
+    principals = np.linalg.eigvalsh(tensor)
+    inplane = np.linalg.eigvalsh(tensor[:2, :2])
+    return dict(
+        MISES=np.sqrt(1.5 * np.sum(deviator * deviator)),
+        TRESCA=principals[2] - principals[0],
+        PRESS=-np.trace(tensor) / 3,
+        INV3=np.cbrt(4.5 * np.trace(deviator @ deviator @ deviator)),
+        MIN_PRINCIPAL=principals[0],
+        MID_PRINCIPAL=principals[1],
+        MAX_PRINCIPAL=principals[2],
+        MIN_INPLANE_PRINCIPAL=inplane[0],
+        MAX_INPLANE_PRINCIPAL=inplane[1],
+        OUTOFPLANE_PRINCIPAL=tensor[2, 2],
+    )
+
+
+@pytest.mark.parametrize("type, labels", TYPES.items())
+def test_invariant(type, labels):
+    data = np.random.RandomState(0).uniform(-100, 100, (50, len(labels))).astype("f4")
+    expected = [reference(value, labels) for value in data]
+    for name in expected[0]:
+        if type == "TENSOR_3D_FULL" and "PLANE" in name:
+            with pytest.raises(ValueError):
+                invariant(name, data, labels, type)
+            continue
+        assert np.allclose(invariant(name, data, labels, type), [values[name] for values in expected]), name
+
+
+def test_invariant_special_cases():
+    # Repeated principal values
+    data = np.array([[5.0, 5, 5, 0, 0, 0], [2, 0, 0, 0, 0, 0], [0, 0, 0, 0, 0, 0]])
+    labels = TYPES["TENSOR_3D_FULL"]
+    assert np.allclose(invariant("MAX_PRINCIPAL", data, labels), [5, 2, 0])
+    assert np.allclose(invariant("MID_PRINCIPAL", data, labels), [5, 0, 0])
+    assert np.allclose(invariant("TRESCA", data, labels), [0, 2, 0])
+    # Empty blocks
+    for name in ("MISES", "TRESCA", "MAX_PRINCIPAL", "MAX_INPLANE_PRINCIPAL", "MAGNITUDE"):
+        assert invariant(name, np.zeros((0, 6)), labels).shape == (0,)
+
+    data = np.ones((2, 3))
+    assert np.allclose(invariant("MAGNITUDE", data, ("U1", "U2", "U3"), "VECTOR"), np.sqrt(3))
+    with pytest.raises(ValueError):
+        invariant("MISES", data, ("U1", "U2", "U3"), "VECTOR")
+    with pytest.raises(ValueError):
+        invariant("MISES", data, ("U1", "U2", "U3"))
+    with pytest.raises(ValueError):
+        invariant("VOLUME", data, ("S11", "S22", "S12"))
+    # The engineering shear strains are halved
+    strain = invariant("MAX_PRINCIPAL", np.array([[0.0, 0.0, 0.2]]), ("E11", "E22", "E12"), engineering_shear=True)
+    assert np.allclose(strain, 0.1)
+
+
+def test_get_scalar_field(tmp_path):
+    store = str(tmp_path / "store")
+    Exporter(fake_odb.openOdb("Job-1.odb"), store).export()
+    with open_store(store) as odb:
+        frame = odb.steps["Step-1"].frames[2]
+        stress = frame.fieldOutputs["S"]
+        mises = stress.getScalarField(invariant="MISES")
+        assert mises.type == "SCALAR" and [block.length for block in mises.bulkDataBlocks] == [4, 1]
+        data = fake_odb.values(1, 2, 4, 6, seed=1)
+        expected = [reference(value, fake_odb.STRESS_COMPONENTS)["MISES"] for value in data]
+        assert mises.bulkDataBlocks[0].data.shape == (4, 1)
+        assert np.allclose(mises.bulkDataBlocks[0].data[:, 0], expected)
+        # Subsets of the scalar field select the computed values
+        subset = mises.getSubset(region=odb.rootAssembly.elementSets["HEX"]).bulkDataBlocks[0]
+        assert np.allclose(subset.data[:, 0], expected) and np.array_equal(subset.elementLabels, [1, 1, 2, 2])
+        s22 = stress.getScalarField(componentLabel="S22").bulkDataBlocks[0]
+        assert np.array_equal(s22.data[:, 0], data[:, 1]) and s22.componentLabels == ("S22",)
+        magnitude = frame.fieldOutputs["U"].getScalarField(invariant="MAGNITUDE").bulkDataBlocks[0]
+        assert np.allclose(magnitude.data[:, 0], np.linalg.norm(fake_odb.values(1, 2, 4, 3), axis=1))
+        with pytest.raises(ValueError):
+            stress.getScalarField(invariant="MAGNITUDE")
+        with pytest.raises(ValueError):
+            stress.getScalarField(componentLabel="U1")
@@ -0,0 +1,43 @@
+import os
+import subprocess
+import sys
+
+SRC = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+SNIPPET = """
+import sys
+
+from abaqus import *
+import abaqus
+
+assert "abaqus.Mdb.Mdb" not in sys.modules and "abaqus.Session.Session" not in sys.modules
+assert "Mdb" not in abaqus.__all__ and "mdb" in abaqus.__all__
+assert "abaqus.Optimization" not in sys.modules
+assert abaqus.Optimization.__name__ == "abaqus.Optimization"
+
+assert mdb.models["Model-1"] is not None
+assert isinstance(mdb, abaqus.Mdb) and abaqus.Mdb.__module__ == "abaqus.Mdb.Mdb"
+from abaqus import Odb, Session
+
+assert isinstance(session, Session) and isinstance(Odb, type)
+"""
+
+
+def test_lazy_import():
+    env = dict(os.environ, ABQPY_SKIP_ABAQUS="true", ABQPY_LAZY_IMPORT="true")
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [SRC, env.get("PYTHONPATH")]))
+    result = subprocess.run([sys.executable, "-c", SNIPPET], env=env, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+
+
+def test_lazy_object_operators():
+    from abqpy.lazy import LazyObject
+
+    created = []
+    proxy = LazyObject(lambda: created.append(1) or {"a": 1})
+    assert not created
+    assert proxy == {"a": 1} and proxy != {} and bool(proxy) and len(proxy) == 1
+    assert list(proxy) == ["a"] and "a" in proxy and proxy["a"] == 1
+    proxy["b"] = 2
+    del proxy["a"]
+    assert proxy == {"b": 2} and str(proxy) == "{'b': 2}" and created == [1]
+    assert not LazyObject(list)
@@ -0,0 +1,84 @@
+import asyncio
+
+from abqpy.monitor import FileTail, JobMonitor, monitor_jobs
+
+STA = """\
+ SUMMARY OF JOB INFORMATION:
+ STEP  INC ATT SEVERE EQUIL TOTAL  TOTAL      STEP       INC OF       DOF    IF
+               DISCON ITERS ITERS  TIME/    TIME/LPF    TIME/LPF    MONITOR RIKS
+               ITERS               FREQ
+   1     1   1     0     2     2  0.100      0.100      0.1000
+   1     2   1U    0     5     5  0.100      0.100      0.1000
+   1     2   2     0     3     3  0.125      0.0250     0.02500
+   2     1   1     0     1     1  1.12       1.00       1.000
+ THE ANALYSIS HAS COMPLETED SUCCESSFULLY
+"""
+
+MSG = """\
+ ***WARNING: THE STRAIN INCREMENT HAS EXCEEDED FIFTY TIMES THE STRAIN TO CAUSE
+             FIRST YIELD AT 2 POINTS
+
+ ***NOTE: THE SOLUTION APPEARS TO BE DIVERGING.
+"""
+
+LOG = """\
+Abaqus JOB {job}
+Begin Analysis Input File Processor
+End Analysis Input File Processor
+Begin Abaqus/Standard Analysis
+End Abaqus/Standard Analysis
+Abaqus JOB {job} COMPLETED
+"""
+
+
+def test_file_tail(tmp_path):
+    path = tmp_path / "job.sta"
+    tail = FileTail(str(path))
+    assert tail.read() == []
+    path.write_bytes(b"first\nsec")
+    assert tail.read() == [(0, "first")]
+    with open(path, "ab") as f:
+        f.write(b"ond\r\nthird\n")
+    assert tail.read() == [(6, "second"), (14, "third")] and tail.read() == []
+    path.write_bytes(b"new\n")  # truncated
+    assert tail.read() == [(-1, None), (0, "new")]
+    path.unlink()
+    path.write_bytes(b"rotated\n")  # replaced
+    assert tail.read()[0] == (-1, None)
+
+
+def test_monitor(tmp_path):
+    async def write(job: str, delay: float):
+        await asyncio.sleep(delay)
+        log = LOG.format(job=job).splitlines(keepends=True)
+        for extension, text in (("log", "".join(log[:-1])), ("sta", STA), ("msg", MSG), ("log", log[-1])):
+            with open(tmp_path / f"{job}.{extension}", "a") as f:
+                for line in text.splitlines(keepends=True):
+                    f.write(line)
+                    f.flush()
+                    await asyncio.sleep(0.001)
+
+    async def main():
+        writers = [asyncio.ensure_future(write(job, delay)) for job, delay in (("Job-1", 0.05), ("Job-2", 0.2))]
+        messages = [message async for message in monitor_jobs(["Job-1", "Job-2"], str(tmp_path), interval=0.02)]
+        await asyncio.gather(*writers)
+        return messages
+
+    messages = asyncio.run(main())
+    for job in ("Job-1", "Job-2"):
+        types = [message.type for message in messages if message.jobName == job]
+        assert types[0] == "JOB_SUBMITTED" and types[-1] == "JOB_COMPLETED"
+        assert [t for t in types if t not in ("JOB_SUBMITTED", "STARTED", "JOB_COMPLETED")] == [
+            "STEP", "STATUS", "WARNING", "STATUS", "END_STEP", "STEP", "STATUS", "END_STEP", "COMPLETED", "WARNING"
+        ]  # fmt: skip
+    cutback = next(message for message in messages if message.data.get("cutback"))
+    assert (cutback.data["step"], cutback.data["increment"], cutback.data["attempts"]) == (1, 2, 1)
+    status = [message for message in messages if message.type == "STATUS"][1]
+    assert status.data["stepTime"] == 0.025 and status.data["totalTime"] == 0.125 and status.data["iterations"] == 3
+    warning = [message for message in messages if message.type == "WARNING" and "cutback" not in message.data][0]
+    assert warning.data["message"].endswith("CAUSE FIRST YIELD AT 2 POINTS")
+
+    (tmp_path / "Job-3.sta").write_text(STA.replace("COMPLETED SUCCESSFULLY", "NOT BEEN COMPLETED"))
+    monitor, aborted = JobMonitor("Job-3", str(tmp_path)), []
+    monitor.add_message_callback("ABORTED", aborted.append)
+    assert asyncio.run(monitor.wait_for_completion(timeout=5)).type == "ABORTED" and len(aborted) == 1
@@ -0,0 +1,38 @@
+import os
+
+import pytest
+
+from abqpy.notebook import convert_notebook
+
+
+def test_convert_notebook(tmp_path):
+    nbformat = pytest.importorskip("nbformat")
+    notebook = nbformat.v4.new_notebook()
+    notebook.cells = [
+        nbformat.v4.new_markdown_cell("# Title"),
+        nbformat.v4.new_code_cell("%matplotlib inline\nimport os\n!ls\nprint('é')", execution_count=1),
+        nbformat.v4.new_code_cell("%%bash\necho 1"),
+        nbformat.v4.new_code_cell("for i in range(2):\n    %time f(i)\nfiles = !ls\nx, y = %who_ls\nz = 5 % 3"),
+    ]
+    path = str(tmp_path / "notebook.ipynb")
+    nbformat.write(notebook, path)
+
+    script = convert_notebook(path)
+    assert script == str(tmp_path / "notebook.py")
+    with open(script, encoding="utf-8") as f:
+        source = f.read()
+    assert "Title" not in source and "# In[1]:" in source
+    assert "pass  # %matplotlib inline\nimport os\npass  # !ls\nprint('é')\n" in source
+    assert "# %%bash\n# echo 1\n" in source
+    assert "    pass  # %time f(i)\npass  # files = !ls\npass  # x, y = %who_ls\nz = 5 % 3\n" in source
+    compile(source, script, "exec")
+
+    # The script is only written again when the notebook changes
+    mtime = os.stat(script).st_mtime_ns
+    os.utime(script, ns=(mtime - 10**9, mtime - 10**9))
+    assert convert_notebook(path) == script and os.stat(script).st_mtime_ns == mtime - 10**9
+    notebook.cells.append(nbformat.v4.new_code_cell("x = 1"))
+    nbformat.write(notebook, path)
+    convert_notebook(path)
+    with open(script, encoding="utf-8") as f:
+        assert f.read().endswith("x = 1\n")
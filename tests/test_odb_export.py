@@ -0,0 +1,77 @@
+import json
+import os
+
+import pytest
+
+from abqpy.cli import AbqpyCLI
+
+np = pytest.importorskip("numpy")
+
+import fake_odb  # noqa: E402
+
+from abqpy.odb_export import Exporter  # noqa: E402
+
+
+def read(store, reference):
+    """Read an array of the store."""
+    count = int(np.prod(reference["shape"]))
+    with open(os.path.join(store, reference["file"]), "rb") as f:
+        f.seek(reference["offset"])
+        data = f.read(count * np.dtype(reference["dtype"]).itemsize)
+    return np.frombuffer(data, reference["dtype"]).reshape(reference["shape"])
+
+
+def load(store, relative):
+    """Read a JSON file of the store."""
+    with open(os.path.join(store, relative)) as f:
+        return json.load(f)
+
+
+def test_exporter(tmp_path):
+    store = str(tmp_path / "store")
+    manifest = Exporter(fake_odb.openOdb("Job-1.odb"), store, chunk_size=200).export()
+    with open(os.path.join(store, "manifest.json")) as f:
+        assert json.load(f) == json.loads(json.dumps(manifest))
+    assert manifest["format"] == "abqpy-odb-store"
+    assert [step["name"] for step in manifest["steps"]] == ["Step-1", "Step-2"]
+    instance = manifest["instances"]["PART-1-1"]
+    assert np.array_equal(read(store, instance["coordinates"]), fake_odb.COORDINATES)
+    assert np.array_equal(read(store, instance["elementSets"]["TET"]["labels"]["PART-1-1"]), [3])
+    assert np.array_equal(read(store, manifest["rootAssembly"]["nodeSets"]["TOP"]["labels"]["PART-1-1"]), [3, 4])
+
+    assert [step["frameCount"] for step in manifest["steps"]] == [3, 2]
+    frames = load(store, manifest["steps"][1]["frames"])
+    assert [frame["frameValue"] for frame in frames] == [0.0, 0.5]
+    assert frames[1]["fieldOutputs"] == "steps/Step-2/frame-00001.json"
+    blocks = load(store, frames[1]["fieldOutputs"])["S"]["bulkDataBlocks"]
+    assert [block["elementType"] for block in blocks] == ["C3D8", "C3D4"]
+    assert np.array_equal(read(store, blocks[1]["data"]), fake_odb.values(2, 1, 1, 6, seed=2))
+    assert np.array_equal(read(store, blocks[0]["elementLabels"]), [1, 1, 2, 2])
+    assert np.array_equal(read(store, blocks[0]["integrationPoints"]), [1, 2, 1, 2])
+    assert blocks[0]["nodeLabels"] is None and blocks[0]["conjugateData"] is None
+    assert blocks[0]["data"]["file"].startswith("fields/S/INTEGRATION_POINT/PART-1-1/data-")
+    # The labels are written once, the data of each frame are appended to chunks of at most 200 bytes
+    fields = [load(store, frame["fieldOutputs"]) for step in manifest["steps"] for frame in load(store, step["frames"])]
+    assert fields[0]["S"]["bulkDataBlocks"][0]["elementLabels"] == blocks[0]["elementLabels"]
+    data = [field["U"]["bulkDataBlocks"][0]["data"] for field in fields]
+    assert [(ref["file"][-8:-4], ref["offset"]) for ref in data] == [("0000", 0), ("0000", 48), ("0000", 96),
+                                                                     ("0000", 144), ("0001", 0)]  # fmt: skip
+    assert np.array_equal(read(store, data[2]), fake_odb.values(1, 2, 4, 3))
+
+
+def test_odb_export(fake_abaqus, tmp_path, monkeypatch):
+    # An odbAccess module that opens the stand-in output database, for the script run by the fake abaqus command
+    (tmp_path / "odbAccess.py").write_text("from fake_odb import openOdb\n")
+    monkeypatch.setenv("PYTHONPATH", os.pathsep.join([str(tmp_path), os.path.abspath(".")]))
+    lines = []
+    cli = AbqpyCLI(cwd=str(tmp_path), stdout=lines.append, stderr=lines.append)
+    result = cli.odb_export("Job-1.odb", fields="U", frames="last", mesh=False)
+    assert result.returncode == 0, "".join(lines)
+    assert result.args[-4:] == ["--frames=last", "--chunk-size=256", "--no-mesh", "--fields=U"]
+    store = str(tmp_path / "Job-1-store")
+    manifest = load(store, "manifest.json")
+    assert [step["frameCount"] for step in manifest["steps"]] == [1, 1]
+    assert manifest["instances"]["PART-1-1"]["coordinates"] is None and not manifest["rootAssembly"]["nodeSets"]
+    frame = load(store, manifest["steps"][0]["frames"])[0]
+    assert frame["index"] == 2 and list(load(store, frame["fieldOutputs"])) == ["U"]
+    assert any(line.startswith("Exported 2 frames, 2 blocks") for line in lines)
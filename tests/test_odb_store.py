@@ -0,0 +1,54 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import fake_odb  # noqa: E402
+
+from abqpy.odb_export import Exporter  # noqa: E402
+from abqpy.odb_store import open_store  # noqa: E402
+
+
+def test_open_store(tmp_path):
+    store = str(tmp_path / "store")
+    with pytest.raises(FileNotFoundError):
+        open_store(store)
+    Exporter(fake_odb.openOdb("Job-1.odb"), store, chunk_size=200).export()
+    with open_store(store) as odb:
+        assert odb.name == "Job-1.odb" and list(odb.steps) == ["Step-1", "Step-2"]
+        instance = odb.rootAssembly.instances["PART-1-1"]
+        assert np.array_equal(instance.coordinates, fake_odb.COORDINATES)
+        assert isinstance(instance.coordinates.base, np.memmap)
+        frames = odb.steps["Step-2"].frames
+        assert len(frames) == 2 and frames._entries is None
+        frame = frames[-1]
+        assert frame is frames[1] and frames[:1][0].frameValue == 0.0
+        assert (frame.frameId, frame.frameValue, frame.incrementNumber) == (1, 0.5, 1)
+        stress = frame.fieldOutputs["S"]
+        assert stress.locations == ["INTEGRATION_POINT"] and "MISES" in stress.validInvariants
+        assert [(block.elementType, block.length, block.width) for block in stress.bulkDataBlocks] == [
+            ("C3D8", 4, 6),
+            ("C3D4", 1, 6),
+        ]
+        assert np.array_equal(stress.bulkDataBlocks[1].data, fake_odb.values(2, 1, 1, 6, seed=2))
+        assert stress.bulkDataBlocks[0].instance is instance
+
+        # Element sets select by element label, subsets compose
+        hexahedra = stress.getSubset(region=odb.rootAssembly.elementSets["HEX"])
+        assert [block.elementType for block in hexahedra.bulkDataBlocks] == ["C3D8"]
+        second = hexahedra.getSubset(region=odb.rootAssembly.elementSets["HEX"]).bulkDataBlocks[0]
+        assert second.length == 4
+        tet = stress.getSubset(region=instance.elementSets["TET"], position="INTEGRATION_POINT")
+        assert np.array_equal(tet.bulkDataBlocks[0].elementLabels, [3])
+        assert stress.getSubset(elementType="C3D4").bulkDataBlocks[0].length == 1
+        assert len(stress.getSubset(region=instance).bulkDataBlocks) == 2
+        with pytest.raises(ValueError, match="not extrapolated"):
+            stress.getSubset(position="NODAL")
+        with pytest.raises(ValueError, match="no nodeLabels"):
+            stress.getSubset(region=odb.rootAssembly.nodeSets["TOP"])
+
+        # Node sets select by node label
+        top = frame.fieldOutputs["U"].getSubset(region=odb.rootAssembly.nodeSets["TOP"]).bulkDataBlocks[0]
+        assert np.array_equal(top.nodeLabels, [3, 4])
+        assert np.array_equal(top.data, fake_odb.values(2, 1, 4, 3)[2:])
+        assert top.conjugateData is None
+        assert odb.steps["Step-1"].frames[1].fieldOutputs is not frame.fieldOutputs
@@ -0,0 +1,74 @@
+import json
+import os
+
+from abqpy.cache import ResultCache
+from abqpy.cli import AbqpyCLI
+
+SCRIPT = """\
+import sys
+with open("job.dat", "w") as f:
+    f.write("result " + " ".join(sys.argv[1:]) + open("model.inp").read())
+with open("calls.txt", "a") as f:
+    f.write("call\\n")
+"""
+
+
+def test_result_cache(fake_abaqus, tmp_path):
+    cwd = tmp_path / "work"
+    cwd.mkdir()
+    (cwd / "script.py").write_text(SCRIPT)
+    (cwd / "model.inp").write_text("*NODE\n")
+    cache = ResultCache(str(tmp_path / "store"), inputs=["*.inp"])
+    calls = []
+
+    def submit():
+        calls.append(1)
+        return AbqpyCLI(cwd=str(cwd), stdout=lambda line: None, stderr=lambda line: None).python("script.py", "a")
+
+    assert cache.run("script.py", ["a"], {"mode": "python"}, submit, str(cwd)).returncode == 0
+    assert len(calls) == 1 and (cwd / "job.dat").read_text() == "result a*NODE\n"
+
+    # a hit restores the outputs without running the script
+    (cwd / "job.dat").unlink()
+    (cwd / "calls.txt").unlink()
+    result = cache.run("script.py", ["a"], {"mode": "python"}, submit, str(cwd))
+    assert result.returncode == 0 and result.args[0] == "cache" and len(calls) == 1
+    assert (cwd / "job.dat").read_text() == "result a*NODE\n" and (cwd / "calls.txt").read_text() == "call\n"
+
+    # other arguments, options or inputs miss, the restored files are detached from the store before the run
+    key = cache.key("script.py", ["a"], {"mode": "python"}, str(cwd))
+    cache.run("script.py", ["b"], {"mode": "python"}, submit, str(cwd))
+    cache.run("script.py", ["b"], {"mode": "cae"}, submit, str(cwd))
+    (cwd / "model.inp").write_text("*ELEMENT\n")
+    cache.run("script.py", ["b"], {"mode": "cae"}, submit, str(cwd))
+    assert len(calls) == 4 and (cwd / "calls.txt").read_text() == "call\n" * 4
+    assert cache.restore(key, str(tmp_path)) and (tmp_path / "calls.txt").read_text() == "call\n"
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["stores"], stats["entries"]) == (2, 4, 4, 4)
+
+    # eviction by age, then by size
+    os.utime(cache._entry(key), (0, 0))
+    cache.evict()
+    assert cache.stats()["entries"] == 3
+    cache.size = 0
+    cache.evict()
+    assert cache.stats()["entries"] == 0 and cache.stats()["size"] == 0 and cache.stats()["evictions"] == 4
+
+
+def test_result_cache_inputs_outputs(fake_abaqus, tmp_path):
+    cwd = tmp_path / "work"
+    cwd.mkdir()
+    (cwd / "script.py").write_text(SCRIPT)
+    (cwd / "model.inp").write_text("*NODE\n")
+    cache = ResultCache(str(tmp_path / "store"), outputs=["*.dat"])
+
+    def submit():
+        return AbqpyCLI(cwd=str(cwd), stdout=lambda line: None, stderr=lambda line: None).python("script.py")
+
+    # the modules next to the script are inputs, only the files matching the output patterns are recorded
+    key = cache.key("script.py", [], {}, str(cwd))
+    (cwd / "helpers.py").write_text("")
+    assert cache.key("script.py", [], {}, str(cwd)) != key
+    cache.run("script.py", [], {}, submit, str(cwd))
+    with open(cache._entry(cache.key("script.py", [], {}, str(cwd)))) as f:
+        assert [path for path, _, _ in json.load(f)["files"]] == ["job.dat"]
@@ -0,0 +1,74 @@
+import asyncio
+import signal
+import sys
+import time
+
+import pytest
+
+from abqpy import runner
+from abqpy.cli import AbqpyCLI
+from abqpy.runner import run_command, run_command_async
+
+
+def test_run_command():
+    stdout, stderr = [], []
+    code = "import sys; print('out'); print('err', file=sys.stderr); sum(range(10**6)); sys.exit(3)"
+    result = run_command([sys.executable, "-c", code], stdout=stdout.append, stderr=stderr.append)
+    assert result.returncode == 3 and stdout == ["out\n"] and stderr == ["err\n"] and not result.timed_out
+    assert result.wall_time > 0 and (result.cpu_time is None or result.cpu_time > 0)
+
+    result = run_command([sys.executable, "-c", "import time; time.sleep(10)"], timeout=0.5)
+    assert result.timed_out and result.returncode != 0 and result.wall_time < 5
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="POSIX signals")
+def test_run_command_terminate(monkeypatch):
+    # The command is asked to terminate first, so that it can clean up
+    code = "import signal, sys, time; signal.signal(signal.SIGTERM, lambda *args: sys.exit(print('clean')))\n"
+    code += "print('ready'); time.sleep(10)"
+    lines = []
+    result = run_command([sys.executable, "-u", "-c", code], timeout=1, stdout=lines.append)
+    assert result.timed_out and result.returncode == 0 and lines == ["ready\n", "clean\n"]
+
+    # Then killed after the grace period if it ignores the request
+    monkeypatch.setattr(runner, "KILL_GRACE_PERIOD", 0.5)
+    code = "import signal, time; signal.signal(signal.SIGTERM, signal.SIG_IGN); print('ready'); time.sleep(10)"
+    result = run_command([sys.executable, "-u", "-c", code], timeout=1, stdout=lines.append)
+    assert result.timed_out and result.returncode == -signal.SIGKILL and result.wall_time < 5
+
+
+def test_run_command_async():
+    lines = []
+
+    async def main():
+        args = [sys.executable, "-c", "import time; time.sleep(1); print('done')"]
+        return await asyncio.gather(*(run_command_async(args, stdout=lines.append) for _ in range(4)))
+
+    start = time.perf_counter()
+    results = asyncio.run(main())
+    assert [result.returncode for result in results] == [0] * 4 and lines == ["done\n"] * 4
+    assert time.perf_counter() - start < 3.5
+
+
+def test_cli(fake_abaqus, tmp_path):
+    (tmp_path / "script.py").write_text("import sys; print('args', sys.argv[1:])")
+    lines = []
+    cli = AbqpyCLI(cwd=str(tmp_path), stdout=lines.append, stderr=lines.append)
+    result = cli.cae("script.py", "a b", "c", database="my model.cae")
+    assert result.returncode == 0 and result.args[0] == fake_abaqus
+    assert result.args[1:] == ["cae", "noGUI=script.py", "database=my model.cae", "--", "a b", "c"]
+    assert "args ['a b', 'c']\n" in lines
+    assert cli.python("script.py", "exit=2", sim="x.sim").returncode == 2
+
+    async def main():
+        return await AbqpyCLI(cwd=str(tmp_path), asynchronous=True, stdout=lines.append).help()
+
+    assert asyncio.run(main()).args[1:] == ["help"]
+
+
+def test_split_command(monkeypatch):
+    assert runner.split_command("abaqus job=x 'a b'") == ["abaqus", "job=x", "a b"]
+    monkeypatch.setattr(runner.os, "name", "nt")
+    command = r'abaqus job=x input="C:\My Files\a b.inp" "C:\Program Files\s.py" cpus=2 ""'
+    assert runner.split_command(command) == ["abaqus", "job=x", r"input=C:\My Files\a b.inp",
+                                             r"C:\Program Files\s.py", "cpus=2", ""]  # fmt: skip
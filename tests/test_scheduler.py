@@ -0,0 +1,86 @@
+import math
+import os
+
+import pytest
+
+from abqpy.farm import Case
+from abqpy.scheduler import LocalQueue, QueuedJob, schedule
+
+
+def job(id, cpus, priority=0, walltime=None, started=None):
+    status = "SUBMITTED" if started is None else "RUNNING"
+    return QueuedJob(id, Case(f"job-{id}", "job.inp", cpus=cpus), "", priority, walltime, status=status,
+                     submitted=id, started=started)  # fmt: skip
+
+
+def ids(jobs):
+    return [job.id for job in jobs]
+
+
+def test_schedule():
+    budget = (8, math.inf, math.inf)
+    # By priority, then by submission
+    assert ids(schedule([job(1, 4), job(2, 4, priority=1), job(3, 4)], [], budget, 0)) == [2, 1]
+    # The blocked job 2 can start at 100, when job 1 ends, job 4 ends before and job 5 uses the CPU job 2 leaves
+    running = [job(1, 6, walltime=100, started=0)]
+    queued = [job(2, 7), job(3, 2, walltime=200), job(4, 1, walltime=50), job(5, 1, walltime=500)]
+    assert ids(schedule(queued, running, budget, 10)) == [4, 5]
+    # Without estimates, jobs are only backfilled into the CPUs the blocked job leaves free
+    running = [job(1, 6, started=0)]
+    assert ids(schedule([job(2, 6), job(3, 2), job(4, 1, walltime=1)], running, budget, 10)) == [3]
+    assert ids(schedule([job(2, 8), job(3, 2)], running, budget, 10)) == []
+
+
+SCRIPT = """\
+import os, sys
+with open("result.txt", "w") as f:
+    f.write(" ".join(sys.argv[1:] + [os.environ["ABQPY_QUEUE_CPUS"]]))
+sys.exit(int(os.environ["ABQPY_QUEUE_JOB"]) == 2)
+"""
+
+
+def test_local_queue(fake_abaqus, tmp_path, monkeypatch):
+    script = tmp_path / "script.py"
+    script.write_text(SCRIPT)
+    monkeypatch.chdir(tmp_path)
+    queue = LocalQueue("test", str(tmp_path / "run"), filesToCopy=["txt"], cpus=2, state_dir=str(tmp_path / "state"))
+    assert queue.submit(str(script), mode="python", name="first", x=1) == 1
+    assert queue.submit(str(script), mode="python", name="second", cpus=2) == 2
+    assert queue.submit(str(script), mode="python", name="cancelled") == 3
+    queue.cancel(3)
+
+    # The queue is kept until a dispatcher runs it
+    queue = LocalQueue("test", str(tmp_path / "run"), filesToCopy=["txt"], cpus=2, state_dir=str(tmp_path / "state"))
+    queue.dispatch(poll=0.1, until_empty=True)
+    status = queue.status()
+    assert [job.status for job in status.jobs] == ["COMPLETED", "ABORTED", "TERMINATED"]
+    assert [job.returncode for job in status.jobs] == [0, 1, None]
+    assert status.dispatcher is None and "cancelled" in str(status)
+    assert (tmp_path / "result.txt").read_text() == "2"  # the result of the last job is copied back
+    assert (tmp_path / "run" / "1-first" / "result.txt").read_text() == "x=1 1"
+    with open(os.path.join(tmp_path, "run", "1-first", "first.abqpy.log")) as f:
+        assert "fake abaqus stderr" in f.read()
+
+    queue.purge()
+    assert queue.status().jobs == []
+
+
+def test_queue_state(tmp_path):
+    from abaqus.Job.Queue import Queue
+
+    queue = Queue("local", "test", directory=str(tmp_path / "run")).localQueue(cpus=2, state_dir=str(tmp_path))
+    assert (queue.name, queue.directory, queue.filesToCopy, queue.cpus) == ("test", str(tmp_path / "run"), "ALL", 2)
+    with pytest.raises(ValueError, match="remote host"):
+        Queue("remote", "test", hostName="cluster").localQueue()
+
+    # The state file is only rewritten when the state changes
+    queue.submit("job.inp")
+    mtime = os.stat(tmp_path / "test.json").st_mtime_ns
+    os.utime(tmp_path / "test.json", ns=(mtime - 10**9, mtime - 10**9))
+    queue.status()
+    assert os.stat(tmp_path / "test.json").st_mtime_ns == mtime - 10**9
+
+    # A lock broken after its timeout and taken by another process is not removed by its previous owner
+    with queue._state():
+        (tmp_path / "test.json.lock").write_text("other")
+    assert (tmp_path / "test.json.lock").read_text() == "other"
@@ -0,0 +1,39 @@
+import os
+
+from abqpy.cli import AbqpyCLI
+from abqpy.config import config
+from abqpy.scratch import PREFIX, Scratch, clean
+
+SCRIPT = """\
+import os, tempfile, time
+print("scratch", tempfile.gettempdir(), flush=True)
+with open(os.path.join(tempfile.gettempdir(), "job.sim"), "wb") as f:
+    f.write(os.urandom(2 * 1024**2))
+    f.flush()
+    time.sleep(0.3)
+"""
+
+
+def test_scratch(fake_abaqus, tmp_path, monkeypatch):
+    root = tmp_path / "scratch"
+    root.mkdir()
+    stale = root / f"{PREFIX}999999999-old"
+    stale.mkdir()
+    monkeypatch.setattr(config, "scratch", True)
+    monkeypatch.setattr(config, "scratch_dirs", os.pathsep.join([str(tmp_path / "missing"), str(root)]))
+    monkeypatch.setattr(config, "scratch_min_free", 0)
+    assert Scratch.select() == str(root) and Scratch.select(min_free=1e12) is None
+
+    (tmp_path / "script.py").write_text(SCRIPT)
+    lines = []
+    result = AbqpyCLI(cwd=str(tmp_path), stdout=lines.append).python("script.py")
+    assert result.returncode == 0 and result.scratch_usage >= 2 * 1024**2
+    path = next(line.split()[1] for line in lines if line.startswith("scratch "))
+    assert os.path.dirname(path) == str(root) and os.path.basename(path).startswith(f"{PREFIX}{os.getpid()}-")
+    assert os.listdir(root) == [] and lines[-1].startswith(f"Scratch directory {path}: peak usage 2.0 MB")
+
+    os.makedirs(stale)
+    own = Scratch(str(root))
+    clean(str(root))
+    assert not stale.exists() and os.path.isdir(own.path)
+    assert own.close() == 0 and not os.path.exists(own.path)
@@ -0,0 +1,53 @@
+import os
+import time
+
+from abqpy.config import AbaqusCAEConfig
+from abqpy.server import KernelServer, unsupported_options
+
+
+def test_kernel_server(tmp_path):
+    (tmp_path / "helper.py").write_text("calls = []\n")
+    (tmp_path / "script.py").write_text(
+        "import os, sys, helper\n"
+        "helper.calls.append(1)\n"
+        "assert 'leaked' not in globals()\n"
+        "leaked = True\n"
+        "print('run', sys.argv[1:], os.path.basename(os.getcwd()), len(helper.calls))\n"
+        "sys.exit(int(sys.argv[-1]))\n"
+    )
+    (tmp_path / "error.py").write_text("raise ValueError('boom')\n")
+    (tmp_path / "crash.py").write_text("import os; os._exit(1)\n")
+    lines = []
+    server = KernelServer(str(tmp_path / "server"), standin=True, cwd=str(tmp_path), stdout=lines.append,
+                          stderr=lines.append)  # fmt: skip
+    assert server.status() is None
+    try:
+        assert server.run("script.py", "a b", 0).returncode == 0
+        assert server.run("script.py", "c", 3).returncode == 3
+        assert lines == [f"run ['a b', '0'] {tmp_path.name} 1\n", f"run ['c', '3'] {tmp_path.name} 1\n"]
+        status = server.status()
+        assert status["requests"] == 2 and status["pid"] != os.getpid()
+
+        lines.clear()
+        assert server.run("error.py").returncode == 1 and "ValueError: boom\n" in lines
+
+        assert server.run("crash.py").returncode == -1 and server.status() is None
+        assert server.run("script.py", 0).returncode == 0 and server.status()["pid"] != status["pid"]
+
+        lines.clear()
+        (tmp_path / "startup.py").write_text("value = 'started'\n")
+        (tmp_path / "value.py").write_text("print(value)\n")
+        assert server.run("value.py", startup="startup.py").returncode == 0 and lines == ["started\n"]
+    finally:
+        server.stop()
+    assert server.status() is None
+
+    server = KernelServer(str(tmp_path / "server"), idle_timeout=0.5, standin=True)
+    assert server.start()["requests"] == 0
+    time.sleep(1.5)
+    assert server.status() is None
+
+
+def test_unsupported_options():
+    assert unsupported_options(AbaqusCAEConfig(database="model.cae", startup="startup.py")) == []
+    assert unsupported_options(AbaqusCAEConfig(replay="abaqus.rpy", envstartup=False)) == ["envstartup", "replay"]
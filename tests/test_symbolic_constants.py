@@ -0,0 +1,31 @@
+import copy
+import pickle
+
+import pytest
+
+from abaqus.UtilityAndView.abaqusConstants import (
+    OFF,
+    ON,
+    YES,
+    AbaqusBoolean,
+    SymbolicConstant,
+    abaqusConstants,
+)
+
+
+def test_interned():
+    assert SymbolicConstant("YES") is YES and abaqusConstants["YES"] is YES
+    assert SymbolicConstant("ON") is ON and AbaqusBoolean(0) is OFF and isinstance(ON, AbaqusBoolean)
+    assert SymbolicConstant("NEW_CONSTANT") is SymbolicConstant("NEW_CONSTANT")
+    assert YES.getId() == id(SymbolicConstant("YES")) and YES.getText() == YES.name == "YES"
+    assert repr(YES) == str(YES) == "YES" and YES == "YES"
+    assert copy.deepcopy(YES) is YES and pickle.loads(pickle.dumps(YES)) is YES
+    assert pickle.loads(pickle.dumps(ON)) is ON
+
+
+def test_frozen():
+    assert YES in abaqusConstants and "YES" in abaqusConstants and len(abaqusConstants) == len(list(abaqusConstants))
+    with pytest.raises(AttributeError):
+        abaqusConstants.YES = abaqusConstants.NO
+    with pytest.raises(ValueError):
+        SymbolicConstant("lower_case")
@@ -0,0 +1,54 @@
+import json
+import os
+
+from abqpy.cli import AbqpyCLI
+from abqpy.config import config
+from abqpy.trace import TraceLog, tracing
+
+SCRIPT = """\
+import json, os, time
+def mark(name, phase="i"):
+    with open(os.environ["ABQPY_TRACE_MARKERS"], "a") as f:
+        f.write(json.dumps(dict(name=name, ph=phase, ts=time.time())) + "\\n")
+mark("mesh", "B")
+time.sleep(0.1)
+mark("mesh", "E")
+print("Begin Abaqus/Standard Analysis", flush=True)
+time.sleep(0.1)
+print("End Abaqus/Standard Analysis", flush=True)
+mark("done")
+"""
+
+
+def test_trace(fake_abaqus, tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "trace", True)
+    monkeypatch.setattr(config, "trace_dir", str(tmp_path / "traces"))
+    (tmp_path / "script.py").write_text(SCRIPT)
+    lines = []
+    cli = AbqpyCLI(cwd=str(tmp_path), stdout=lines.append)
+    assert cli.python("script.py").returncode == 0
+    with tracing("run", script="script.py") as trace:
+        with trace.span("notebook conversion"):
+            pass
+        cli.python("script.py", "exit=2")
+    assert "Begin Abaqus/Standard Analysis\n" in lines
+
+    log = TraceLog(str(tmp_path / "traces"))
+    runs = log.runs()
+    assert [run["name"] for run in runs] == ["abaqus python", "run"] and len(log.runs("run")) == 1
+    phases = runs[0]["phases"]
+    assert {"launch", "command", "mesh", "Abaqus/Standard Analysis"} <= set(phases)
+    assert phases["mesh"] >= 0.1 and phases["Abaqus/Standard Analysis"] >= 0.1
+    assert runs[0]["args"]["returncode"] == 0 and "notebook conversion" in runs[1]["phases"]
+    with open(tmp_path / "traces" / f"{runs[1]['id']}.json") as f:
+        events = json.load(f)["traceEvents"]
+    command = next(event for event in events if event["name"] == "command")
+    assert command["ph"] == "X" and command["args"]["returncode"] == 2
+    assert any(event["name"] == "done" and event["ph"] == "i" for event in events)
+    assert not [file for file in os.listdir(tmp_path / "traces") if file.endswith(".markers.jsonl")]
+
+    summary = log.summary()
+    assert summary.runs == 2 and summary.phases["command"].count == 2 and "wall_time" in str(summary)
+    merged = log.merge(str(tmp_path / "merged.json"))
+    with open(merged) as f:
+        assert {event["pid"] for event in json.load(f)["traceEvents"]} == {1, 2}
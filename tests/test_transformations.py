@@ -0,0 +1,118 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import fake_odb  # noqa: E402
+
+from abqpy.invariants import invariant  # noqa: E402
+from abqpy.odb_export import Exporter  # noqa: E402
+from abqpy.odb_store import OdbDatumCsys, open_store  # noqa: E402
+from abqpy.transformations import axes, project, quaternions, transform  # noqa: E402
+
+FULL = ("S11", "S22", "S33", "S12", "S13", "S23")
+
+
+def matrices(data, labels=FULL):
+    """The tensors of values, one at a time."""
+    result = np.zeros((len(data), 3, 3))
+    for tensor, value in zip(result, data):
+        for component, label in zip(value, labels):
+            i, j = int(label[-2]) - 1, int(label[-1]) - 1
+            tensor[i, j] = tensor[j, i] = component
+    return result
+
+
+def test_axes():
+    angle = np.radians(30)
+    rotation = axes("CARTESIAN", (5, 5, 5), (np.cos(angle), np.sin(angle), 0), (-np.sin(angle), np.cos(angle), 0))
+    assert rotation.shape == (1, 3, 3) and np.allclose(rotation[0] @ [np.cos(angle), np.sin(angle), 0], [1, 0, 0])
+    points = np.array([[2, 2, 7], [0, 0, 3], [0, 0, 0]])
+    cylindrical = axes("CYLINDRICAL", (1, 1, 0), (1, 0, 0), (0, 1, 0), points + [1, 1, 0])
+    assert np.allclose(cylindrical[0], [[0.5**0.5, 0.5**0.5, 0], [-(0.5**0.5), 0.5**0.5, 0], [0, 0, 1]])
+    assert np.allclose(cylindrical[2], np.eye(3))
+    # On the Z axis of a spherical system the 2-axis is the Y axis, at the origin the system is cartesian
+    spherical = axes("SPHERICAL", (0, 0, 0), (1, 0, 0), (0, 1, 0), points)
+    assert np.allclose(spherical[0, 0], np.array([2, 2, 7]) / np.sqrt(57))
+    assert np.allclose(spherical[1], [[0, 0, 1], [0, 1, 0], [-1, 0, 0]]) and np.allclose(spherical[2], np.eye(3))
+    assert np.allclose(np.einsum("nij,nkj->nik", spherical, spherical), np.eye(3))
+    with pytest.raises(ValueError):
+        axes("CYLINDRICAL", (0, 0, 0), (1, 0, 0), (0, 1, 0))
+
+
+def test_transform():
+    data = np.random.RandomState(0).uniform(-100, 100, (20, 6))
+    rotations = axes("SPHERICAL", (0, 0, 0), (1, 0, 0), (0, 1, 0), np.random.RandomState(1).normal(size=(20, 3)))
+    expected = [r @ t @ r.T for r, t in zip(rotations, matrices(data))]
+    assert np.allclose(matrices(transform(data, FULL, rotations)), expected)
+    assert np.allclose(invariant("MISES", transform(data, FULL, rotations), FULL), invariant("MISES", data, FULL))
+    # Engineering shear strains
+    strain = transform(np.array([[0.0, 0.0, 0.0, 0.2, 0, 0]]), FULL, axes("CARTESIAN", 0, (1, 1, 0), (-1, 1, 0)), True)
+    assert np.allclose(strain, [[0.1, -0.1, 0, 0, 0, 0]])
+    vectors = transform(data[:, :3].astype("f4"), ("U1", "U2", "U3"), rotations)
+    assert vectors.dtype == np.float32 and np.allclose(vectors, np.einsum("nij,nj->ni", rotations, data[:, :3]))
+
+
+def test_quaternions_and_projection():
+    local = quaternions(fake_odb.C3D4_ORIENTATION)
+    assert np.allclose(local[0], [[0, 1, 0], [-1, 0, 0], [0, 0, 1]], atol=1e-7)
+    identity = np.eye(3)[None].repeat(2, axis=0)
+    normals = np.array([[0, 0, 1], [0, 1, 0]])
+    projected = project(identity, normals)
+    assert np.allclose(projected[0], np.eye(3)) and np.allclose(projected[1], [[-1, 0, 0], [0, 0, 1], [0, 1, 0]])
+    assert np.allclose(project(identity, normals, projected22Axis=1)[0], [[0, -1, 0], [1, 0, 0], [0, 0, 1]])
+    # In-plane values rotated by 90 degrees
+    surface = transform(np.array([[1.0, 2.0, 3.0]]), ("S11", "S22", "S12"), local)
+    assert np.allclose(surface, [[2, 1, -3]])
+
+
+def test_get_transformed_field(tmp_path):
+    store = str(tmp_path / "store")
+    source = fake_odb.openOdb("Job-1.odb")
+    source.steps["Step-1"].frames[1].fieldOutputs["U"].bulkDataBlocks[0].conjugateData = fake_odb.values(1, 1, 4, 3, 5)
+    Exporter(source, store).export()
+    with open_store(store) as odb:
+        csys = odb.rootAssembly.datumCsyses["CYL"]
+        assert csys.coordSysType == "CYLINDRICAL" and csys.zAxis == (0, 0, 1)
+        frame = odb.steps["Step-1"].frames[1]
+
+        # Nodal displacements at the nodes moved by the displacements
+        displacement = frame.fieldOutputs["U"]
+        radial = displacement.getTransformedField(csys, deformationField=displacement).bulkDataBlocks[0]
+        points = fake_odb.COORDINATES + fake_odb.values(1, 1, 4, 3)
+        rotations = axes("CYLINDRICAL", (0, 0, 0), (1, 0, 0), (0, 1, 0), points)
+        expected = np.einsum("nij,nj->ni", rotations, fake_odb.values(1, 1, 4, 3))
+        assert np.allclose(radial.data, expected, rtol=1e-5) and np.array_equal(radial.nodeLabels, fake_odb.NODES)
+        # The imaginary part of complex values is rotated alike
+        expected = np.einsum("nij,nj->ni", rotations, fake_odb.values(1, 1, 4, 3, 5))
+        assert np.allclose(radial.conjugateData, expected, rtol=1e-5)
+        transformed = displacement.getTransformedField(csys)
+        top = transformed.getSubset(region=odb.rootAssembly.nodeSets["TOP"]).bulkDataBlocks[0]
+        assert np.array_equal(top.conjugateData, transformed.bulkDataBlocks[0].conjugateData[2:])
+
+        # Stresses at the integration points located by COORD, the C3D4 stresses are in a local system
+        stress = frame.fieldOutputs["S"]
+        cylindrical = stress.getTransformedField(csys).bulkDataBlocks
+        rotations = axes("CYLINDRICAL", (0, 0, 0), (1, 0, 0), (0, 1, 0), fake_odb.POINTS[0])
+        expected = [r @ t @ r.T for r, t in zip(rotations, matrices(fake_odb.values(1, 1, 4, 6, seed=1)))]
+        assert np.allclose(matrices(cylindrical[0].data), expected, atol=1e-3)
+        assert cylindrical[1].localCoordSystem is None and stress.bulkDataBlocks[1].localCoordSystem is not None
+        (tensor,) = matrices(fake_odb.values(1, 1, 1, 6, seed=2))
+        local = quaternions(fake_odb.C3D4_ORIENTATION)[0]
+        # The point (0, -2, 0) has the radial direction -Y, so the local axes 1, 2 are the cylindrical -1, -2
+        to_cylindrical = np.diag([-1, -1, 1])
+        assert np.allclose(matrices(cylindrical[1].data)[0], to_cylindrical @ tensor @ to_cylindrical.T, atol=1e-3)
+        identity = OdbDatumCsys("GLOBAL", "CARTESIAN")
+        assert np.allclose(matrices(stress.getTransformedField(identity).bulkDataBlocks[1].data)[0],
+                           local.T @ tensor @ local, atol=1e-3)  # fmt: skip
+        subset = stress.getSubset(region=odb.rootAssembly.elementSets["HEX"]).getTransformedField(csys)
+        assert np.allclose(subset.bulkDataBlocks[0].data, cylindrical[0].data)
+        with pytest.raises(ValueError, match="scalar"):
+            stress.getScalarField(invariant="MISES").getTransformedField(csys)
+
+    # Without the COORD field output the integration points are not located
+    Exporter(fake_odb.openOdb("Job-1.odb"), store, fields=["S"]).export()
+    with open_store(store) as odb:
+        stress = odb.steps["Step-1"].frames[1].fieldOutputs["S"]
+        with pytest.raises(ValueError, match="COORD"):
+            stress.getTransformedField(odb.rootAssembly.datumCsyses["CYL"])
+        assert stress.getTransformedField(OdbDatumCsys("GLOBAL", "CARTESIAN")).bulkDataBlocks[0].length == 4
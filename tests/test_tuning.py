@@ -0,0 +1,35 @@
+import json
+
+from abqpy.cli import AbqpyCLI
+from abqpy.config import config
+from abqpy.tuning import Settings, Trial, TuningStore, recommend
+
+
+def test_recommend():
+    trials = [Trial(Settings(1), time_per_increment=4.0), Trial(Settings(2), time_per_increment=2.05),
+              Trial(Settings(4), time_per_increment=2.0), Trial(Settings(8), error="failed")]  # fmt: skip
+    assert recommend(trials) == Settings(2) and recommend(trials, tolerance=0) == Settings(4)
+    assert recommend(trials[3:]) is None
+    assert Settings(4, 8, 2000).job_options() == dict(numCpus=4, numDomains=8, memory=2000, memoryUnits="MEGA_BYTES")
+
+
+def test_tune(fake_abaqus, tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "tuning_file", str(tmp_path / "tuning.json"))
+    (tmp_path / "bracket-12.inp").write_text("*Heading\n")
+    cli = AbqpyCLI(cwd=str(tmp_path), stdout=lambda line: None)
+    result = cli.tune("bracket-12.inp", cpus=(1, 4), domains=(2, 4), increments=3, budget=8)
+    assert [trial.settings.name for trial in result.trials] == ["c1-d2", "c1-d4", "c4-d4"]
+    assert all(trial.increments >= 3 and trial.time_per_increment for trial in result.trials)
+    fast, slow = result.trials[2].time_per_increment, result.trials[0].time_per_increment
+    assert fast < 0.06 < 0.09 < slow and result.best == Settings(4, 4) and result.returncode == 0
+    # The trials are killed once enough increments are timed
+    with open(tmp_path / "tuning" / "bracket" / "c1-d2" / "trial.sta") as f:
+        assert "COMPLETED" not in f.read()
+    assert "recommended for bracket: cpus=4 domains=4" in str(result)
+
+    assert TuningStore.from_config().best("bracket") == Settings(4, 4)
+    with open(tmp_path / "tuning.json") as f:
+        assert len(json.load(f)["bracket"]["trials"]) == 3
+    lines = []
+    AbqpyCLI(cwd=str(tmp_path), stdout=lines.append).optimization("task", "job", family="bracket")
+    assert "cpus=4" in lines[2] and "memory" not in lines[2]